@@ -12,6 +12,8 @@ import datetime
 from typing import Dict, List, Any, Optional
 import jsonschema
 
+from app.utils.compiled_schemas import get_schema_registry
+
 # Configure logging
 logger = logging.getLogger("agent_sdk")
 
@@ -105,7 +107,7 @@ class Agent:
             return True
         
         try:
-            jsonschema.validate(instance=data, schema=self.schema)
+            get_schema_registry().validate(self.schema, data)
             return True
         except jsonschema.exceptions.ValidationError as e:
             logger.error(f"Schema validation failed: {str(e)}")
@@ -140,10 +142,8 @@ def validate_schema(data: Dict[str, Any], schema_path: str) -> bool:
     try:
         schema_file = os.path.join(os.getcwd(), schema_path)
         if os.path.exists(schema_file):
-            with open(schema_file, 'r') as f:
-                schema = json.load(f)
-            
-            jsonschema.validate(instance=data, schema=schema)
+            # Parsed and compiled once, reloaded when the file changes
+            get_schema_registry().validate(schema_file, data)
             return True
         else:
             logger.warning(f"Schema file not found: {schema_file}")
@@ -114,12 +114,14 @@ async def get_pending_tasks(
     suggested_agent: Optional[str] = None,
     status: str = "pending",
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    after: Optional[str] = None
 ):
     """
     Get pending tasks
     
-    This endpoint returns pending tasks with optional filtering.
+    This endpoint returns pending tasks with optional filtering. Pass the
+    task_id of the last task of a page as `after` to get the next page.
     """
     logger.info(f"Getting pending tasks with filters: origin_agent={origin_agent}, suggested_agent={suggested_agent}, status={status}")
     task_manager = get_task_persistence_manager()
@@ -130,7 +132,8 @@ async def get_pending_tasks(
             suggested_agent=suggested_agent,
             status=status,
             limit=limit,
-            offset=offset
+            offset=offset,
+            after=after
         )
         
         logger.info(f"Found {len(tasks)} pending tasks")
@@ -206,19 +209,25 @@ async def execute_task(
 @router.get("/chains", response_model=List[Dict[str, Any]])
 async def get_chains(
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    before: Optional[str] = None,
+    before_updated_at: Optional[str] = None
 ):
     """
     Get execution chains
     
-    This endpoint returns execution chains with pagination.
+    This endpoint returns execution chains with pagination. Pass the chain_id
+    and updated_at of the last chain of a page as `before` and
+    `before_updated_at` to get the next page.
     """
     logger.info(f"Getting execution chains with limit: {limit}, offset: {offset}")
     from app.core.execution_chain_logger import get_execution_chain_logger
     
     try:
         chain_logger = get_execution_chain_logger()
-        chains = await chain_logger.get_chains(limit=limit, offset=offset)
+        chains = await chain_logger.get_chains(
+            limit=limit, offset=offset, before=before, before_updated_at=before_updated_at
+        )
         
         logger.info(f"Found {len(chains)} execution chains")
         return chains
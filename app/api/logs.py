@@ -11,11 +11,12 @@ logger = logging.getLogger("api")
 router = APIRouter()
 
 @router.get("/logs/latest")
-async def get_latest_logs(limit: int = 10, agent_name: Optional[str] = None):
+async def get_latest_logs(limit: int = 10, agent_name: Optional[str] = None, before: Optional[str] = None):
     """
     Get the latest activity logs
     
-    This endpoint returns the most recent activity logs from the system.
+    This endpoint returns the most recent activity logs from the system. Pass
+    the id of the last log of a page as `before` to get the next page.
     """
     logger.info(f"Getting latest logs. Limit: {limit}, Agent: {agent_name}")
     print("✅ /logs/latest endpoint hit")
@@ -25,7 +26,7 @@ async def get_latest_logs(limit: int = 10, agent_name: Optional[str] = None):
         execution_logger = get_execution_logger()
         
         # Get the latest logs
-        logs = await execution_logger.get_logs(agent_name=agent_name, limit=limit)
+        logs = await execution_logger.get_logs(agent_name=agent_name, limit=limit, before=before)
         
         # If no logs are found, return mock data
         if not logs:
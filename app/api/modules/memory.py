@@ -6,9 +6,10 @@ import datetime
 from typing import Dict, Any, List, Optional
 
 import os
-import json
 import traceback
 
+from app.api.modules.memory_writer import get_memory_writer
+
 # Configure logging
 logger = logging.getLogger("app.api.modules.memory")
 logging.basicConfig(level=logging.INFO) # Basic config, adjust as needed
@@ -77,19 +78,16 @@ async def write_memory(memory_data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
     try:
-        # Ensure log directory exists (already created, but good practice)
-        os.makedirs(log_dir, exist_ok=True)
-
         logger.info(f"Attempting to write memory type '{memory_type}' for agent {agent_id} to {log_file}")
-        with open(log_file, "a") as f:
-            json.dump(log_entry, f)
-            f.write("\n") # Write each entry as a new line (JSON Lines format)
-        
+        # Queue the entry on the background group-commit writer; the ack resolves
+        # once the batch containing it has been appended (and fsynced per policy)
+        ack = await get_memory_writer().submit(log_file, log_entry)
+
         logger.info(f"✅ Successfully wrote memory type '{memory_type}' for agent {agent_id} to {log_file}")
         return {
             "status": "success",
             "message": "Memory write successful to file.",
-            "written": True,
+            "written": ack["written"],
             "file": log_file,
             "timestamp": timestamp
         }
@@ -0,0 +1,283 @@
+"""
+Background group-commit writer for JSON Lines memory logs.
+
+write_memory() used to open, append and close loop_trace.json or
+reflection_thread.json on every call, from inside the event loop. This module
+moves that I/O onto a single background writer: entries are queued, coalesced
+into batched appends per file, flushed on a configurable interval and fsynced
+according to a configurable policy. Callers await an ack that resolves once
+their batch has been written.
+
+Files are rotated by size into gzip-compressed segments
+(``loop_trace.json.<timestamp>.gz``) and only the newest segments are kept.
+
+Configuration (environment variables):
+    MEMORY_WRITER_FLUSH_INTERVAL  seconds to linger for more entries (default 0)
+    MEMORY_WRITER_MAX_BATCH       max entries per batch (default 1000)
+    MEMORY_WRITER_FSYNC           "always", "interval" or "never" (default "always")
+    MEMORY_WRITER_FSYNC_INTERVAL  seconds between fsyncs for "interval" (default 1.0)
+    MEMORY_WRITER_MAX_BYTES       rotate once a file reaches this size (default 50 MB)
+    MEMORY_WRITER_MAX_SEGMENTS    compressed segments kept per file (default 10)
+"""
+import asyncio
+import datetime
+import glob
+import gzip
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("app.api.modules.memory_writer")
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+# Sentinel placed on the queue to stop the writer task
+_STOP = object()
+
+
+class MemoryWriter:
+    """
+    Asyncio-queue based group-commit writer for JSON Lines files.
+
+    All file I/O runs on a single worker thread, so appends to the same file
+    stay ordered and the event loop never blocks on disk.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.0,
+        max_batch_size: int = 1000,
+        fsync_policy: str = "always",
+        fsync_interval: float = 1.0,
+        max_file_bytes: int = 50 * 1024 * 1024,
+        max_segments: int = 10,
+    ):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync_policy '{fsync_policy}', expected one of {FSYNC_POLICIES}")
+
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.max_file_bytes = max_file_bytes
+        self.max_segments = max_segments
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-writer")
+        self._last_fsync: Dict[str, float] = {}
+        # Entries taken off the queue but not yet handed to the worker thread
+        self._batch: List[Tuple[str, str, asyncio.Future]] = []
+
+        self.stats = {
+            "entries_written": 0,
+            "batches_written": 0,
+            "fsyncs": 0,
+            "rotations": 0,
+            "errors": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "MemoryWriter":
+        """Create a writer configured from MEMORY_WRITER_* environment variables."""
+        return cls(
+            flush_interval=float(os.getenv("MEMORY_WRITER_FLUSH_INTERVAL", "0.0")),
+            max_batch_size=int(os.getenv("MEMORY_WRITER_MAX_BATCH", "1000")),
+            fsync_policy=os.getenv("MEMORY_WRITER_FSYNC", "always"),
+            fsync_interval=float(os.getenv("MEMORY_WRITER_FSYNC_INTERVAL", "1.0")),
+            max_file_bytes=int(os.getenv("MEMORY_WRITER_MAX_BYTES", str(50 * 1024 * 1024))),
+            max_segments=int(os.getenv("MEMORY_WRITER_MAX_SEGMENTS", "10")),
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background writer task on the running event loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._task = self._loop.create_task(self._run())
+        logger.info("✅ Memory writer started (fsync=%s, flush_interval=%ss)", self.fsync_policy, self.flush_interval)
+
+    async def submit(self, path: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue an entry for appending to path and wait until its batch is written.
+
+        Args:
+            path: Target JSON Lines file
+            entry: JSON-serializable entry
+
+        Returns:
+            Ack dict with written=True once the batch is durable per the fsync policy
+        """
+        if not self.running:
+            self.start()
+
+        line = json.dumps(entry) + "\n"
+        future = self._loop.create_future()
+        await self._queue.put((path, line, future))
+        return await future
+
+    async def shutdown(self) -> None:
+        """Flush everything still queued and stop the writer task."""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        logger.info("✅ Memory writer flushed and stopped")
+
+    def _abandon(self) -> None:
+        """
+        Release a writer whose event loop is gone.
+
+        Entries still queued can no longer be acked, but their lines are
+        handed to the worker thread so they still reach disk.
+        """
+        leftover = list(self._batch)
+        self._batch = []
+        while self._queue is not None and not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                leftover.append(item)
+
+        grouped: Dict[str, List[str]] = {}
+        for path, line, _ in leftover:
+            grouped.setdefault(path, []).append(line)
+        if leftover:
+            logger.warning(f"⚠️ Event loop of memory writer went away, flushing {len(leftover)} unacked entries")
+        for path, lines in grouped.items():
+            self._executor.submit(self._write_batch, path, lines)
+        self._executor.shutdown(wait=False)
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = self._batch = [item]
+            stop = False
+            deadline = self._loop.time() + self.flush_interval
+
+            # Coalesce whatever arrives within the flush window
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    # Entries arriving while the previous batch was on disk are
+                    # already queued; only linger if a flush window is configured
+                    timeout = deadline - self._loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._batch = []
+            await self._commit(batch)
+            if stop:
+                return
+
+    async def _commit(self, batch: List[Tuple[str, str, asyncio.Future]]) -> None:
+        grouped: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        for path, line, future in batch:
+            grouped.setdefault(path, []).append((line, future))
+
+        for path, items in grouped.items():
+            lines = [line for line, _ in items]
+            try:
+                ack = await self._loop.run_in_executor(self._executor, self._write_batch, path, lines)
+                for _, future in items:
+                    if not future.done():
+                        future.set_result(dict(ack))
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"❌ Error writing batch of {len(lines)} entries to {path}: {str(e)}")
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _write_batch(self, path: str, lines: List[str]) -> Dict[str, Any]:
+        """Append lines to path in one write. Runs on the writer thread."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        with open(path, "a") as f:
+            f.write("".join(lines))
+            f.flush()
+            fsynced = self._should_fsync(path)
+            if fsynced:
+                os.fsync(f.fileno())
+                self._last_fsync[path] = time.monotonic()
+                self.stats["fsyncs"] += 1
+            size = f.tell()
+
+        self.stats["entries_written"] += len(lines)
+        self.stats["batches_written"] += 1
+
+        if self.max_file_bytes and size >= self.max_file_bytes:
+            self._rotate(path)
+
+        return {"written": True, "file": path, "batch_size": len(lines), "fsynced": fsynced}
+
+    def _should_fsync(self, path: str) -> bool:
+        if self.fsync_policy == "always":
+            return True
+        if self.fsync_policy == "interval":
+            return time.monotonic() - self._last_fsync.get(path, 0.0) >= self.fsync_interval
+        return False
+
+    def _rotate(self, path: str) -> None:
+        """Move path into a gzip-compressed segment and prune old segments."""
+        stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        rotated = f"{path}.{stamp}"
+        os.replace(path, rotated)
+
+        with open(rotated, "rb") as src, gzip.open(rotated + ".gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(rotated)
+        self.stats["rotations"] += 1
+        logger.info(f"Rotated {path} into {rotated}.gz")
+
+        segments = sorted(glob.glob(glob.escape(path) + ".*.gz"))
+        for old in segments[:-self.max_segments] if self.max_segments else []:
+            os.remove(old)
+
+
+_writer: Optional[MemoryWriter] = None
+
+
+def get_memory_writer() -> MemoryWriter:
+    """
+    Get the process-wide memory writer.
+
+    A new writer is created if none exists or if the previous one was bound to
+    a different event loop (e.g. successive asyncio.run() calls). The previous
+    writer's remaining entries are flushed and its worker thread released.
+    """
+    global _writer
+    loop = asyncio.get_running_loop()
+    if _writer is None or (_writer._loop is not None and _writer._loop is not loop):
+        if _writer is not None:
+            _writer._abandon()
+        _writer = MemoryWriter.from_env()
+    return _writer
+
+
+async def shutdown_memory_writer() -> None:
+    """Flush-on-shutdown hook; safe to call when no writer was started."""
+    if _writer is not None:
+        await _writer.shutdown()
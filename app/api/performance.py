@@ -103,7 +103,8 @@ async def get_agent_feedback(
     agent_name: str,
     limit: int = Query(10, description="Maximum number of feedback entries to return"),
     offset: int = Query(0, description="Offset for pagination"),
-    successful_only: Optional[bool] = Query(None, description="Filter by success status")
+    successful_only: Optional[bool] = Query(None, description="Filter by success status"),
+    before: Optional[str] = Query(None, description="Return entries older than this feedback ID")
 ):
     """
     Get feedback for a specific agent
@@ -118,7 +119,8 @@ async def get_agent_feedback(
         agent_name=agent_name,
         limit=limit,
         offset=offset,
-        successful_only=successful_only
+        successful_only=successful_only,
+        before=before
     )
     
     return feedback
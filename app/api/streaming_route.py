@@ -10,6 +10,7 @@ import inspect
 import time
 import asyncio
 import json
+from contextlib import aclosing
 from typing import Dict, Any, AsyncGenerator, List
 
 # Import agent registry
@@ -32,35 +33,47 @@ except Exception as e:
 logger.info(f"📡 Streaming Router module loaded from {__file__}")
 logger.info(f"📡 Streaming Router object created: {router}")
 
-# Enhanced processing stages for more detailed progress updates
-PROCESSING_STAGES = [
-    {"status": "initializing", "message": "Initializing agent systems"},
-    {"status": "analyzing", "message": "Analyzing request parameters"},
-    {"status": "processing", "message": "Processing request data"},
-    {"status": "thinking", "message": "Formulating response"},
-    {"status": "finalizing", "message": "Finalizing agent response"}
-]
+def encode_frame(data: Dict[str, Any], sse: bool = False) -> bytes:
+    """
+    Encode one stream frame as an NDJSON line or a Server-Sent Event.
+    """
+    payload = json.dumps(data)
+    if sse:
+        return f"data: {payload}\n\n".encode()
+    return payload.encode() + b'\n'
+
+def wants_sse(request: Request) -> bool:
+    """
+    Whether the client asked for SSE framing via ?format=sse or the Accept header.
+    """
+    if request.query_params.get("format") == "sse":
+        return True
+    return "text/event-stream" in request.headers.get("accept", "")
 
-# Streaming response generator with enhanced progress reporting
-async def stream_response(request: Request) -> AsyncGenerator[bytes, None]:
+# Streaming response generator that forwards provider token deltas
+async def stream_response(request: Request, sse: bool = False) -> AsyncGenerator[bytes, None]:
     """
     Stream the response to avoid buffering the entire response in memory.
-    This helps with large payloads and improves response time perception.
-    Enhanced with detailed progress updates and better error handling.
+    Provider token deltas are forwarded as they arrive, one frame per delta.
+    
+    Each frame is only pulled from the provider after the previous one has
+    been sent, so a slow client applies backpressure upstream. If the client
+    disconnects, Starlette cancels this generator and closing the provider
+    stream aborts the upstream request.
     """
     start_time = time.time()
     logger.info(f"🔄 Starting streaming response at {start_time}")
     
     # Stream the response header with metadata
-    yield json.dumps({
+    yield encode_frame({
         "status": "streaming",
         "message": "Processing request",
         "timestamp": time.time(),
         "metadata": {
             "request_id": f"agent-{int(start_time)}",
-            "stream_type": "ndjson"
+            "stream_type": "sse" if sse else "ndjson"
         }
-    }).encode() + b'\n'
+    }, sse)
     
     # Get the request body with enhanced error handling
     try:
@@ -83,33 +96,33 @@ async def stream_response(request: Request) -> AsyncGenerator[bytes, None]:
                 body = json.loads(raw_body.decode())
                 logger.info("🔄 Parsed body directly with timeout")
             except asyncio.TimeoutError:
-                yield json.dumps({
+                yield encode_frame({
                     "status": "error",
                     "message": "Request body parsing timed out",
                     "error": "Timeout while reading request body",
                     "time": time.time() - start_time
-                }).encode() + b'\n'
+                }, sse)
                 logger.error("🔥 Timeout while parsing request body")
                 return
             except json.JSONDecodeError as e:
-                yield json.dumps({
+                yield encode_frame({
                     "status": "error",
                     "message": "Invalid JSON in request body",
                     "error": str(e),
                     "time": time.time() - start_time
-                }).encode() + b'\n'
+                }, sse)
                 logger.error(f"🔥 JSON decode error: {str(e)}")
                 return
         
         # Stream body parsing success with timing
         body_parse_time = time.time() - body_parse_start
-        yield json.dumps({
+        yield encode_frame({
             "status": "progress",
             "stage": "body_parsed",
             "message": f"Request body parsed successfully in {body_parse_time:.4f}s",
             "timestamp": time.time(),
             "elapsed": time.time() - start_time
-        }).encode() + b'\n'
+        }, sse)
         
         # Get agent_id and task input from request body
         agent_id = body.get("agent_id", "").lower() if body else ""
@@ -140,64 +153,54 @@ async def stream_response(request: Request) -> AsyncGenerator[bytes, None]:
         else:
             logger.warning(f"⚠️ Unknown agent_id requested: {agent_id}")
         
-        # Process the request with detailed progress updates
-        for i, stage in enumerate(PROCESSING_STAGES):
-            # Calculate dynamic delay based on stage complexity
-            # Earlier stages are faster, later stages take more time
-            stage_delay = 0.2 * (i + 1)
+        # If OpenAI provider is available and we have task input, stream a dynamic response
+        if openai_provider and task_input and agent_instance and personality:
+            # Create a prompt chain with system message based on agent personality
+            prompt_chain = {
+                "system": f"You are {personality['name']}, an AI assistant with a {personality['tone']} tone. {personality['description']}",
+                "temperature": 0.7,
+                "max_tokens": 1000
+            }
             
-            # Stream progress update for this stage
-            yield json.dumps({
-                "status": "progress",
-                "stage": stage["status"],
-                "message": stage["message"],
-                "progress": (i + 1) / len(PROCESSING_STAGES) * 100,
-                "timestamp": time.time(),
-                "elapsed": time.time() - start_time
-            }).encode() + b'\n'
+            # Log the messages being sent to OpenAI
+            logger.info(f"📤 Streaming from OpenAI - Agent: {agent_id}, Input: {task_input}")
             
-            # Simulate processing with backpressure handling
-            await asyncio.sleep(stage_delay)
-        
-        # Prepare the final response with enhanced metadata
-        processing_time = time.time() - start_time
-        
-        # If OpenAI provider is available and we have task input, use it for dynamic responses
-        if openai_provider and task_input and agent_instance and personality:
+            provider_start = time.time()
+            done = None
             try:
-                # Create a prompt chain with system message based on agent personality
-                prompt_chain = {
-                    "system": f"You are {personality['name']}, an AI assistant with a {personality['tone']} tone. {personality['description']}",
-                    "temperature": 0.7,
-                    "max_tokens": 1000
-                }
-                
-                # Log the messages being sent to OpenAI
-                logger.info(f"📤 Sending to OpenAI - Agent: {agent_id}, Input: {task_input}")
-                
-                # Process the request through OpenAI
-                openai_response = await openai_provider.process_with_prompt_chain(
+                async with aclosing(openai_provider.stream_with_prompt_chain(
                     prompt_chain=prompt_chain,
                     user_input=task_input
-                )
+                )) as deltas:
+                    async for frame in deltas:
+                        if frame["type"] == "delta":
+                            yield encode_frame({
+                                "status": "delta",
+                                "content": frame["content"]
+                            }, sse)
+                        elif frame["type"] == "done":
+                            done = frame
                 
-                # Return the dynamic response from OpenAI
+                processing_time = time.time() - start_time
                 response_data = {
                     "status": "success",
                     "agent": personality["name"],
-                    "message": openai_response["content"],
+                    "message": done["content"],
                     "tone": personality["tone"],
                     "received": body,
+                    "usage": done.get("usage"),
                     "processing": {
                         "total_time": processing_time,
                         "body_parse_time": body_parse_time,
                         "processing_time": processing_time - body_parse_time,
-                        "stages_completed": len(PROCESSING_STAGES),
+                        "time_to_first_token": (provider_start - start_time) + done["time_to_first_token"],
+                        "provider_time_to_first_token": done["time_to_first_token"],
                         "timestamp": time.time()
                     }
                 }
             except Exception as e:
-                logger.error(f"🔥 OpenAI processing error: {str(e)}")
+                logger.error(f"🔥 OpenAI streaming error: {str(e)}")
+                processing_time = time.time() - start_time
                 # Fall back to static response if OpenAI fails
                 response_data = {
                     "status": "success",
@@ -209,12 +212,12 @@ async def stream_response(request: Request) -> AsyncGenerator[bytes, None]:
                         "total_time": processing_time,
                         "body_parse_time": body_parse_time,
                         "processing_time": processing_time - body_parse_time,
-                        "stages_completed": len(PROCESSING_STAGES),
                         "timestamp": time.time()
                     }
                 }
         # Use the appropriate personality response based on agent_id
         elif personality:
+            processing_time = time.time() - start_time
             response_data = {
                 "status": "success",
                 "agent": personality["name"],
@@ -225,12 +228,12 @@ async def stream_response(request: Request) -> AsyncGenerator[bytes, None]:
                     "total_time": processing_time,
                     "body_parse_time": body_parse_time,
                     "processing_time": processing_time - body_parse_time,
-                    "stages_completed": len(PROCESSING_STAGES),
                     "timestamp": time.time()
                 }
             }
         else:
             # Default response for unknown agent_id
+            processing_time = time.time() - start_time
             response_data = {
                 "status": "success",
                 "agent": agent_id or "unknown",
@@ -241,13 +244,12 @@ async def stream_response(request: Request) -> AsyncGenerator[bytes, None]:
                     "total_time": processing_time,
                     "body_parse_time": body_parse_time,
                     "processing_time": processing_time - body_parse_time,
-                    "stages_completed": len(PROCESSING_STAGES),
                     "timestamp": time.time()
                 }
             }
         
         # Stream the final response
-        yield json.dumps(response_data).encode() + b'\n'
+        yield encode_frame(response_data, sse)
         logger.info(f"🔄 Streaming response completed in {processing_time:.4f}s for agent: {agent_id}")
         
     except Exception as e:
@@ -265,7 +267,7 @@ async def stream_response(request: Request) -> AsyncGenerator[bytes, None]:
                 "error_location": inspect.currentframe().f_code.co_name
             }
         }
-        yield json.dumps(error_data).encode() + b'\n'
+        yield encode_frame(error_data, sse)
         logger.error(f"🔥 Streaming error after {error_time:.4f}s: {str(e)}")
 
 @router.post("/delegate-stream")
@@ -276,16 +278,21 @@ async def delegate_stream(request: Request):
     1. Avoiding request timeouts by sending data incrementally
     2. Providing immediate feedback to the client
     3. Reducing memory usage for large responses
-    4. Handling complex operations with detailed progress updates
+    4. Forwarding model tokens as they are generated
+    
+    Frames are NDJSON by default; pass ?format=sse or Accept: text/event-stream
+    for Server-Sent Events.
     
     Modified to use the agent registry for agent lookups.
     """
     logger.info(f"🔄 Streaming delegate route executed from {inspect.currentframe().f_code.co_filename}")
     
+    sse = wants_sse(request)
+    
     # Return streaming response with enhanced headers
     return StreamingResponse(
-        stream_response(request),
-        media_type="application/x-ndjson",
+        stream_response(request, sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
         headers={
             "X-Streaming-Mode": "enabled",
             "X-Agent-Version": "1.0.0",
@@ -10,6 +10,8 @@ from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from pydantic import BaseModel
 
+from app.core.routing_index import KeywordIndex
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -42,6 +44,7 @@ class AgentRouter:
         
         # Initialize agent profiles
         self._agent_profiles = self._load_agent_profiles()
+        self._build_routing_index()
         
         # Initialize agent workload
         self._agent_workload = {agent_type: 0 for agent_type in self._agent_profiles.keys()}
@@ -130,6 +133,36 @@ class AgentRouter:
         
         return profiles
     
+    def _build_routing_index(self):
+        """
+        Index the specialties and capabilities of the loaded agent profiles
+        
+        Specialties and capability names are lowercased once here. Task
+        types and required capabilities are looked up by name, and task
+        descriptions are matched against all keywords in a single pass.
+        """
+        self._specialty_agents: Dict[str, List[str]] = {}
+        self._capability_agents: Dict[str, List[Tuple[str, float]]] = {}
+        keywords = []
+        
+        for agent_type, profile in self._agent_profiles.items():
+            for specialty in dict.fromkeys(s.lower() for s in profile.specialties):
+                self._specialty_agents.setdefault(specialty, []).append(agent_type)
+            
+            agent_capabilities = {c.capability_name.lower(): c.confidence for c in profile.capabilities}
+            for capability, confidence in agent_capabilities.items():
+                self._capability_agents.setdefault(capability, []).append((agent_type, confidence))
+            
+            for specialty in profile.specialties:
+                keywords.append((specialty, (agent_type, 1.0, f"Task mentions specialty: {specialty}")))
+            for capability in profile.capabilities:
+                keywords.append((
+                    capability.capability_name,
+                    (agent_type, 0.5, f"Task mentions capability: {capability.capability_name}")
+                ))
+        
+        self._keyword_index = KeywordIndex(keywords)
+    
     def route_task(self, task_description: str, task_type: Optional[str] = None, 
                   required_capabilities: Optional[List[str]] = None) -> Tuple[str, float, str]:
         """
@@ -150,41 +183,85 @@ class AgentRouter:
             "required_capabilities": required_capabilities
         })
         
-        # Score each agent
+        scores, reasons = self._score_requirements(task_type, required_capabilities)
+        return self._select_agent(task_description, scores, reasons)
+    
+    def route_many(self, task_descriptions: List[str], task_type: Optional[str] = None,
+                   required_capabilities: Optional[List[str]] = None) -> List[Tuple[str, float, str]]:
+        """
+        Route several tasks, such as the subtasks of a plan
+        
+        The task type and required capabilities are scored once for the
+        whole batch; each task is routed as route_task would route it.
+        
+        Args:
+            task_descriptions: Descriptions of the tasks
+            task_type: Optional type shared by the tasks
+            required_capabilities: Optional list of capabilities required by the tasks
+            
+        Returns:
+            List of (agent_type, confidence, reason), one per task
+        """
+        # Log the routing request
+        self._log_routing_event("route_many_request", {
+            "task_descriptions": task_descriptions,
+            "task_type": task_type,
+            "required_capabilities": required_capabilities
+        })
+        
+        scores, reasons = self._score_requirements(task_type, required_capabilities)
+        return [
+            self._select_agent(task_description, dict(scores), {a: list(r) for a, r in reasons.items()})
+            for task_description in task_descriptions
+        ]
+    
+    def _score_requirements(self, task_type: Optional[str],
+                            required_capabilities: Optional[List[str]]) -> Tuple[Dict[str, float], Dict[str, List[str]]]:
+        """
+        Score each agent on the task type and required capabilities
+        
+        Args:
+            task_type: Optional type of task
+            required_capabilities: Optional list of required capabilities
+            
+        Returns:
+            Tuple of (scores, reasons) by agent type
+        """
         scores = {agent_type: 0.0 for agent_type in self._agent_profiles.keys()}
         reasons = {agent_type: [] for agent_type in self._agent_profiles.keys()}
         
         # Score based on task type
         if task_type:
-            for agent_type, profile in self._agent_profiles.items():
-                if task_type.lower() in [s.lower() for s in profile.specialties]:
-                    scores[agent_type] += 2.0
-                    reasons[agent_type].append(f"Specializes in {task_type}")
+            for agent_type in self._specialty_agents.get(task_type.lower(), []):
+                scores[agent_type] += 2.0
+                reasons[agent_type].append(f"Specializes in {task_type}")
         
         # Score based on required capabilities
         if required_capabilities:
-            for agent_type, profile in self._agent_profiles.items():
-                agent_capabilities = {c.capability_name.lower(): c.confidence for c in profile.capabilities}
-                for capability in required_capabilities:
-                    if capability.lower() in agent_capabilities:
-                        confidence = agent_capabilities[capability.lower()]
-                        scores[agent_type] += confidence
-                        reasons[agent_type].append(f"Has capability: {capability} ({confidence:.2f})")
+            for capability in required_capabilities:
+                for agent_type, confidence in self._capability_agents.get(capability.lower(), []):
+                    scores[agent_type] += confidence
+                    reasons[agent_type].append(f"Has capability: {capability} ({confidence:.2f})")
         
-        # Score based on keywords in task description
-        task_lower = task_description.lower()
-        for agent_type, profile in self._agent_profiles.items():
-            # Check for specialty keywords
-            for specialty in profile.specialties:
-                if specialty.lower() in task_lower:
-                    scores[agent_type] += 1.0
-                    reasons[agent_type].append(f"Task mentions specialty: {specialty}")
+        return scores, reasons
+    
+    def _select_agent(self, task_description: str, scores: Dict[str, float],
+                      reasons: Dict[str, List[str]]) -> Tuple[str, float, str]:
+        """
+        Add the description keyword and workload scores and pick the best agent
+        
+        Args:
+            task_description: Description of the task
+            scores: Scores by agent type, updated in place
+            reasons: Reasons by agent type, updated in place
             
-            # Check for capability keywords
-            for capability in profile.capabilities:
-                if capability.capability_name.lower() in task_lower:
-                    scores[agent_type] += 0.5
-                    reasons[agent_type].append(f"Task mentions capability: {capability.capability_name}")
+        Returns:
+            Tuple of (agent_type, confidence, reason)
+        """
+        # Score based on specialty and capability keywords in task description
+        for agent_type, weight, reason in self._keyword_index.matches(task_description.lower()):
+            scores[agent_type] += weight
+            reasons[agent_type].append(reason)
         
         # Adjust for workload
         for agent_type in scores:
@@ -1,10 +1,11 @@
 import os
-import json
 import uuid
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from app.core.log_segment_store import LogSegmentStore, get_log_store, iter_json_files
+
 class BehaviorFeedbackData(BaseModel):
     """Model for behavior feedback data"""
     feedback_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -20,14 +21,32 @@ class BehaviorManager:
     Manager for behavior feedback loop
     
     This class handles storing and retrieving behavior feedback data
-    to help agents adapt their behavior over time.
+    to help agents adapt their behavior over time. Feedback is kept in a
+    segmented log store indexed by agent name; the per-agent feedback
+    directories of earlier versions are imported on first start.
     """
     
-    def __init__(self):
-        """Initialize the BehaviorManager"""
-        # Set up logging directory
+    def __init__(self, store: Optional[LogSegmentStore] = None):
+        """
+        Initialize the BehaviorManager
+        
+        Args:
+            store: Log store to use (defaults to the shared behavior feedback store)
+        """
+        self.store = store if store is not None else get_log_store(
+            "behavior_feedback",
+            key_fields=("feedback_id",),
+            time_field="timestamp",
+            index_fields=("agent_name",)
+        )
+        
+        # Migrate the logging directory of earlier versions
         self.logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "behavior_logs")
-        os.makedirs(self.logs_dir, exist_ok=True)
+        if os.path.isdir(self.logs_dir):
+            self.store.import_records(
+                os.path.realpath(self.logs_dir),
+                (entry for _, entry in iter_json_files(self.logs_dir, depth=1))
+            )
     
     async def record_feedback(
         self,
@@ -59,14 +78,8 @@ class BehaviorManager:
             task_metadata=task_metadata or {}
         )
         
-        # Ensure agent directory exists
-        agent_dir = os.path.join(self.logs_dir, agent_name)
-        os.makedirs(agent_dir, exist_ok=True)
-        
         # Save feedback data
-        feedback_file = os.path.join(agent_dir, f"{feedback_data.feedback_id}.json")
-        with open(feedback_file, "w") as f:
-            json.dump(feedback_data.dict(), f, indent=2)
+        self.store.append(feedback_data.dict())
         
         return feedback_data.feedback_id
     
@@ -75,47 +88,29 @@ class BehaviorManager:
         agent_name: str,
         limit: int = 10,
         offset: int = 0,
-        successful_only: Optional[bool] = None
+        successful_only: Optional[bool] = None,
+        before: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Get feedback for a specific agent
+        Get feedback for a specific agent, newest first
         
         Args:
             agent_name: Name of the agent
             limit: Maximum number of feedback entries to return
             offset: Offset for pagination
             successful_only: Filter by success status
+            before: Return entries older than this feedback ID, as the next
+                page of an earlier listing
             
         Returns:
             List of feedback data
         """
-        # Ensure agent directory exists
-        agent_dir = os.path.join(self.logs_dir, agent_name)
-        if not os.path.exists(agent_dir):
-            return []
-        
-        # Get all feedback files
-        feedback_files = [f for f in os.listdir(agent_dir) if f.endswith(".json")]
-        
-        # Sort by modification time (newest first)
-        feedback_files.sort(key=lambda f: os.path.getmtime(os.path.join(agent_dir, f)), reverse=True)
-        
-        # Load and filter feedback data
-        feedback_entries = []
-        for feedback_file in feedback_files:
-            with open(os.path.join(agent_dir, feedback_file), "r") as f:
-                data = json.load(f)
-                
-                # Apply success filter if specified
-                if successful_only is not None and data.get("was_successful") != successful_only:
-                    continue
-                
-                feedback_entries.append(data)
-        
-        # Apply pagination
-        feedback_entries = feedback_entries[offset:offset + limit]
-        
-        return feedback_entries
+        return self.store.query(
+            filters={"agent_name": agent_name, "was_successful": successful_only},
+            limit=limit,
+            offset=offset,
+            before=before
+        )
     
     async def get_feedback_summary(
         self,
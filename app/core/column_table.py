@@ -0,0 +1,571 @@
+"""
+Column Table
+
+Columnar in-memory table used by the spreadsheet analyzer. Each column is a
+typed NumPy array plus a boolean null mask:
+
+- integer  int64
+- float    float64
+- boolean  bool
+- string   object array of str
+- object   object array of mixed Python values
+
+Null cells hold a placeholder (0, False, "" or None) and are only ever read
+through the mask, so filters, group-bys and statistics work on whole arrays
+instead of per-cell isinstance checks.
+
+CSV files are parsed in fixed-size chunks: each chunk of text rows is
+converted to typed arrays before the next one is read, so peak memory is the
+typed columns plus one chunk of text. A column that turns out to mix numbers
+and text across chunks is re-read as text in a second pass.
+"""
+import csv
+import re
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_CHUNK_ROWS = 65536
+
+# Operators understood by Column.compare
+COMPARE_OPERATORS = ("eq", "ne", "gt", "lt", "gte", "lte", "contains", "startswith", "endswith")
+
+_ORDERING = {
+    "gt": np.greater,
+    "lt": np.less,
+    "gte": np.greater_equal,
+    "lte": np.less_equal,
+}
+_ORDERING_PY = {
+    "gt": lambda a, b: a > b,
+    "lt": lambda a, b: a < b,
+    "gte": lambda a, b: a >= b,
+    "lte": lambda a, b: a <= b,
+}
+_FILL = {"boolean": False, "integer": 0, "float": 0.0, "string": "", "object": None}
+_DTYPE = {"boolean": bool, "integer": np.int64, "float": np.float64, "string": object, "object": object}
+_PY_KIND = {bool: "boolean", int: "integer", float: "float", str: "string"}
+_NUMERIC = ("integer", "float", "boolean")
+_DATE_RE = re.compile(r"^\d+-\d+-\d+$")
+
+
+def _elementwise(fn: Callable[[Any], bool], values: np.ndarray) -> np.ndarray:
+    """Apply a Python predicate to every element of an object array."""
+    if not len(values):
+        return np.zeros(0, dtype=bool)
+    return np.frompyfunc(fn, 1, 1)(values).astype(bool)
+
+
+def _hash_codes(values: List[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """
+    Code values by first appearance with a dict.
+
+    Hashing beats sorting for Python strings, which NumPy compares one
+    object at a time.
+    """
+    lookup: Dict[Any, int] = {}
+    codes = np.fromiter((lookup.setdefault(value, len(lookup)) for value in values), dtype=np.intp, count=len(values))
+    return codes, list(lookup)
+
+
+def _object_array(values: Sequence[Any]) -> np.ndarray:
+    # Assign into an empty array so lists or tuples stay single cells
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+class Column:
+    """
+    One typed column and its null mask.
+    """
+
+    __slots__ = ("values", "nulls", "kind")
+
+    def __init__(self, values: np.ndarray, nulls: np.ndarray, kind: str):
+        """
+        Initialize a column.
+
+        Args:
+            values: Column values; null cells hold a placeholder
+            nulls: Boolean mask of null cells
+            kind: Storage kind (integer, float, boolean, string or object)
+        """
+        self.values = values
+        self.nulls = nulls
+        self.kind = kind
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @classmethod
+    def from_values(cls, values: Sequence[Any]) -> "Column":
+        """
+        Build a column from Python values, None meaning null.
+
+        Ints mixed with floats are stored as floats; any other mix of types is
+        stored as an object column.
+        """
+        nulls = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+        kinds = {_PY_KIND.get(type(value), "object") for value in values if value is not None}
+        if kinds == {"integer", "float"}:
+            kinds = {"float"}
+        kind = kinds.pop() if len(kinds) == 1 else "object"
+
+        if kind in ("string", "object"):
+            array = _object_array(values)
+            if kind == "string":
+                array[nulls] = ""
+        else:
+            fill = _FILL[kind]
+            array = np.array([fill if value is None else value for value in values], dtype=_DTYPE[kind])
+        return cls(array, nulls, kind)
+
+    @classmethod
+    def parse(cls, cells: Sequence[str]) -> "Column":
+        """
+        Build a column from CSV text cells; empty cells are null.
+
+        The column is the narrowest of boolean ("true"/"false"), integer,
+        float and string that every non-empty cell parses as.
+        """
+        raw = _object_array(cells)
+        nulls = raw == ""
+        present = raw[~nulls]
+        if not len(present):
+            return cls(np.zeros(len(raw), dtype=bool), nulls, "empty")
+
+        kind, parsed = "string", None
+        if present[0].strip().lower() in ("true", "false"):
+            lowered = np.char.lower(np.char.strip(present.astype(str)))
+            if np.all((lowered == "true") | (lowered == "false")):
+                kind, parsed = "boolean", lowered == "true"
+        else:
+            # Object-to-number casts call int() / float() per cell and stop at the first failure
+            for candidate, dtype in (("integer", np.int64), ("float", np.float64)):
+                try:
+                    parsed = present.astype(dtype)
+                    kind = candidate
+                    break
+                except (ValueError, OverflowError):
+                    continue
+
+        if kind == "string":
+            return cls(raw, nulls, kind)
+        values = np.full(len(raw), _FILL[kind], dtype=_DTYPE[kind])
+        values[~nulls] = parsed
+        return cls(values, nulls, kind)
+
+    @classmethod
+    def concat(cls, chunks: List["Column"]) -> "Column":
+        """
+        Concatenate chunk columns, promoting them to a common kind.
+
+        Boolean mixed with numbers, or anything mixed with strings, becomes a
+        string column; values of numeric chunks are then rendered with str()
+        (read_csv re-reads the original text instead).
+        """
+        kind = _common_kind(chunks)
+        values = []
+        for chunk in chunks:
+            if chunk.kind == kind:
+                values.append(chunk.values)
+            elif chunk.kind == "empty":
+                values.append(np.full(len(chunk), _FILL[kind], dtype=_DTYPE[kind]))
+            elif kind == "float":
+                values.append(chunk.values.astype(np.float64))
+            else:
+                rendered = _object_array([str(value) for value in chunk.values.tolist()])
+                rendered[chunk.nulls] = ""
+                values.append(rendered)
+        if not values:
+            return cls(np.empty(0, dtype=object), np.zeros(0, dtype=bool), kind)
+        return cls(np.concatenate(values), np.concatenate([chunk.nulls for chunk in chunks]), kind)
+
+    # ------------------------------------------------------------------ access
+
+    @property
+    def is_numeric(self) -> bool:
+        """Whether values are stored as numbers (booleans included)."""
+        return self.kind in _NUMERIC
+
+    def take(self, index: Any) -> "Column":
+        """Column of the rows selected by an index array, mask or slice."""
+        return Column(self.values[index], self.nulls[index], self.kind)
+
+    def valid(self) -> np.ndarray:
+        """Values of the non-null cells."""
+        return self.values[~self.nulls]
+
+    def first_valid(self) -> Any:
+        """First non-null value as a Python object, or None."""
+        if not len(self) or self.nulls.all():
+            return None
+        value = self.values[int(np.argmin(self.nulls))]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def numeric_mask(self) -> np.ndarray:
+        """Mask of cells holding an int, float or bool value."""
+        if self.is_numeric:
+            return ~self.nulls
+        if self.kind == "object":
+            return _elementwise(lambda value: isinstance(value, (int, float)), self.values)
+        return np.zeros(len(self), dtype=bool)
+
+    def tolist(self) -> List[Any]:
+        """Values as Python objects, None for nulls."""
+        values = self.values.tolist()
+        for index in np.flatnonzero(self.nulls).tolist():
+            values[index] = None
+        return values
+
+    # ------------------------------------------------------------- predicates
+
+    def equals(self, value: Any) -> np.ndarray:
+        """Mask of cells equal to value, with Python equality semantics."""
+        if value is None:
+            return self.nulls.copy()
+        if self.kind == "object":
+            return _elementwise(lambda cell: cell == value, self.values) & ~self.nulls
+        if isinstance(value, str) != (self.kind == "string"):
+            return np.zeros(len(self), dtype=bool)
+        if self.kind != "string" and not isinstance(value, (int, float, np.number)):
+            return np.zeros(len(self), dtype=bool)
+        return np.asarray(self.values == value, dtype=bool) & ~self.nulls
+
+    def compare(self, op: str, value: Any) -> np.ndarray:
+        """
+        Mask of cells matching a filter operator.
+
+        eq / ne compare any value; gt / lt / gte / lte only match numbers and
+        contains / startswith / endswith only match strings. Nulls match
+        nothing but "ne" (and "eq" None).
+
+        Args:
+            op: One of COMPARE_OPERATORS
+            value: Operand
+
+        Returns:
+            Boolean mask
+        """
+        if op == "eq":
+            return self.equals(value)
+        if op == "ne":
+            return ~self.equals(value)
+        if op in _ORDERING:
+            if self.is_numeric:
+                return _ORDERING[op](self.values, value) & ~self.nulls
+            if self.kind == "object":
+                compare = _ORDERING_PY[op]
+                return _elementwise(lambda cell: isinstance(cell, (int, float)) and compare(cell, value), self.values)
+            return np.zeros(len(self), dtype=bool)
+        if op in ("contains", "startswith", "endswith"):
+            if self.kind == "string":
+                # Test each distinct string once, then map the answers back to rows
+                codes, uniques = _hash_codes(self.values.tolist())
+                if op == "contains":
+                    matches = [value in unique for unique in uniques]
+                else:
+                    matches = [getattr(unique, op)(value) for unique in uniques]
+                return np.array(matches, dtype=bool)[codes] & ~self.nulls
+            if self.kind == "object":
+                if op == "contains":
+                    return _elementwise(lambda cell: isinstance(cell, str) and value in cell, self.values)
+                return _elementwise(lambda cell: isinstance(cell, str) and getattr(cell, op)(value), self.values)
+            return np.zeros(len(self), dtype=bool)
+        raise ValueError(f"Unsupported filter operator: {op}")
+
+    # --------------------------------------------------------------- grouping
+
+    def factorize(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Code every row by the str() of its value ("None" for nulls).
+
+        Returns:
+            (codes per row, label per code)
+        """
+        if self.kind == "object":
+            codes, labels = _hash_codes([str(value) for value in self.values.tolist()])
+            return codes, _object_array(labels)
+
+        if self.kind == "string":
+            codes, uniques = _hash_codes(self.valid().tolist())
+        else:
+            uniques, codes = np.unique(self.valid(), return_inverse=True)
+            uniques = uniques.tolist()
+        labels = [str(value) for value in uniques] + ["None"]
+        full = np.full(len(self), len(uniques), dtype=np.intp)
+        full[~self.nulls] = codes.reshape(-1)
+        # Distinct values can share a label (e.g. the string "None" and null)
+        labels, remap = np.unique(_object_array(labels), return_inverse=True)
+        return remap.reshape(-1)[full], labels
+
+    def value_counts(self) -> Tuple[List[Any], np.ndarray]:
+        """
+        Count the distinct non-null values.
+
+        Returns:
+            (distinct values in order of first appearance, count of each)
+        """
+        values = self.valid()
+        if self.is_numeric:
+            uniques, first_rows, counts = np.unique(values, return_index=True, return_counts=True)
+            order = np.argsort(first_rows)
+            return uniques[order].tolist(), counts[order]
+        codes, uniques = _hash_codes(values.tolist())
+        return uniques, np.bincount(codes, minlength=len(uniques))
+
+    def aggregate(self, groups: np.ndarray, group_count: int, func: str) -> List[Any]:
+        """
+        Reduce the column's non-null values per group.
+
+        Args:
+            groups: Group index of every row
+            group_count: Number of groups
+            func: sum, avg, min, max, count, first or last
+
+        Returns:
+            One Python value per group; None for groups without values
+        """
+        valid = ~self.nulls
+        order = np.argsort(groups[valid], kind="stable")
+        codes = groups[valid][order]
+        values = self.values[valid][order]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.zeros(0, dtype=np.intp)
+        ends = np.r_[starts[1:], len(codes)].astype(np.intp)
+
+        if func == "count":
+            reduced = (ends - starts).tolist()
+        elif func == "first":
+            reduced = values[starts].tolist()
+        elif func == "last":
+            reduced = values[ends - 1].tolist()
+        elif self.is_numeric and func in ("sum", "avg", "min", "max"):
+            if func in ("sum", "avg"):
+                summed = values.astype(np.int64) if self.kind == "boolean" else values
+                reduced = np.add.reduceat(summed, starts) if len(starts) else summed[:0]
+                if func == "avg":
+                    reduced = reduced / (ends - starts)
+            else:
+                ufunc = np.minimum if func == "min" else np.maximum
+                reduced = ufunc.reduceat(values, starts) if len(starts) else values[:0]
+            reduced = reduced.tolist()
+        elif func in ("sum", "avg", "min", "max"):
+            reduce_py = {"sum": sum, "min": min, "max": max, "avg": lambda seq: sum(seq) / len(seq)}[func]
+            reduced = [reduce_py(values[start:end].tolist()) for start, end in zip(starts, ends)]
+        else:
+            raise ValueError(f"Unsupported aggregation: {func}")
+
+        result: List[Any] = [None] * group_count
+        for group, value in zip(codes[starts].tolist(), reduced):
+            result[group] = value
+        return result
+
+
+class ColumnTable:
+    """
+    Ordered set of equal-length columns.
+    """
+
+    def __init__(self, columns: Dict[str, Column]):
+        """
+        Initialize a table.
+
+        Args:
+            columns: Columns by name, in display order
+        """
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    @property
+    def column_names(self) -> List[str]:
+        """Column names in display order."""
+        return list(self.columns)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, Any]]) -> "ColumnTable":
+        """
+        Build a table from row dicts; keys missing from a row are nulls.
+
+        Args:
+            rows: Row dictionaries
+
+        Returns:
+            ColumnTable with the union of the rows' keys, in first-seen order
+        """
+        names: Dict[str, None] = {}
+        for row in rows:
+            names.update(dict.fromkeys(row))
+        return cls({name: Column.from_values([row.get(name) for row in rows]) for name in names})
+
+    @classmethod
+    def read_csv(
+        cls,
+        path: str,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        skip_rows: int = 0,
+        max_rows: Optional[int] = None,
+        column_slice: Optional[slice] = None,
+    ) -> "ColumnTable":
+        """
+        Read a CSV file with a header row, chunk by chunk.
+
+        Args:
+            path: CSV file path
+            chunk_rows: Rows parsed per chunk
+            skip_rows: Data rows to skip after the header
+            max_rows: Maximum number of data rows to read
+            column_slice: Slice of columns to keep
+
+        Returns:
+            ColumnTable of the file
+        """
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return cls({})
+            if column_slice is not None:
+                header = header[column_slice]
+            header = _unique_names(header)
+            width = len(header)
+            rows = islice(reader, skip_rows, None if max_rows is None else skip_rows + max_rows)
+
+            chunks: List[List[Column]] = [[] for _ in header]
+            while True:
+                batch = list(islice(rows, chunk_rows))
+                if column_slice is not None:
+                    batch = [row[column_slice] for row in batch]
+                if not batch:
+                    break
+                batch = [row if len(row) == width else (row + [""] * width)[:width] for row in batch]
+                for chunk_columns, cells in zip(chunks, zip(*batch)):
+                    chunk_columns.append(Column.parse(cells))
+
+        # Columns whose chunks disagree on a number/string type keep their original text
+        text_indexes = [
+            index for index, chunk_columns in enumerate(chunks)
+            if _common_kind(chunk_columns) == "string"
+            and any(chunk.kind not in ("string", "empty") for chunk in chunk_columns)
+        ]
+        text_columns = cls._read_text(path, text_indexes, skip_rows, max_rows, column_slice) if text_indexes else {}
+        return cls({
+            name: text_columns[index] if index in text_columns else Column.concat(chunk_columns)
+            for index, (name, chunk_columns) in enumerate(zip(header, chunks))
+        })
+
+    @staticmethod
+    def _read_text(
+        path: str,
+        indexes: List[int],
+        skip_rows: int,
+        max_rows: Optional[int],
+        column_slice: Optional[slice],
+    ) -> Dict[int, Column]:
+        """Re-read columns of a CSV file as string columns, keyed by index."""
+        cells: Dict[int, List[str]] = {index: [] for index in indexes}
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in islice(reader, skip_rows, None if max_rows is None else skip_rows + max_rows):
+                if column_slice is not None:
+                    row = row[column_slice]
+                for index, column_cells in cells.items():
+                    column_cells.append(row[index] if index < len(row) else "")
+        columns = {}
+        for index, column_cells in cells.items():
+            raw = _object_array(column_cells)
+            columns[index] = Column(raw, raw == "", "string")
+        return columns
+
+    # -------------------------------------------------------------- reshaping
+
+    def take(self, index: Any) -> "ColumnTable":
+        """Table of the rows selected by an index array, mask or slice."""
+        return ColumnTable({name: column.take(index) for name, column in self.columns.items()})
+
+    def select(self, names: Iterable[str]) -> "ColumnTable":
+        """Table of the named columns that exist, in the given order."""
+        return ColumnTable({name: self.columns[name] for name in names if name in self.columns})
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Rows as dicts of Python values, None for nulls."""
+        names = self.column_names
+        return [dict(zip(names, values)) for values in zip(*(column.tolist() for column in self.columns.values()))]
+
+    def group_by(self, names: Sequence[str]) -> Tuple[np.ndarray, List[Tuple[str, ...]]]:
+        """
+        Group rows by the str() of their values in the named columns.
+
+        A column missing from the table groups as "None".
+
+        Args:
+            names: Columns to group by
+
+        Returns:
+            (group index of every row, group keys), groups in order of first appearance
+        """
+        row_count = len(self)
+        combined = np.zeros(row_count, dtype=np.int64)
+        codes_by_column = []
+        for name in names:
+            if name in self.columns:
+                codes, labels = self.columns[name].factorize()
+            else:
+                codes, labels = np.zeros(row_count, dtype=np.intp), np.array(["None"], dtype=object)
+            codes_by_column.append((codes, labels))
+            # Re-densify after every column so the combined code never overflows
+            _, combined = np.unique(combined * len(labels) + codes, return_inverse=True)
+            combined = combined.reshape(-1)
+
+        if not row_count:
+            return np.zeros(0, dtype=np.intp), []
+        _, first_rows, inverse = np.unique(combined, return_index=True, return_inverse=True)
+        order = np.argsort(first_rows)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+
+        keys = []
+        for row in first_rows[order].tolist():
+            keys.append(tuple(labels[codes[row]] for codes, labels in codes_by_column))
+        return rank[inverse.reshape(-1)], keys
+
+
+def _common_kind(chunks: List[Column]) -> str:
+    """Kind that a list of chunk columns is promoted to."""
+    kinds = {chunk.kind for chunk in chunks} - {"empty"}
+    if not kinds:
+        return "object"
+    if len(kinds) == 1:
+        return kinds.pop()
+    if kinds <= {"integer", "float"}:
+        return "float"
+    return "string"
+
+
+def _unique_names(names: List[str]) -> List[str]:
+    """Suffix repeated header names with .1, .2, ..."""
+    seen: Dict[str, int] = {}
+    unique = []
+    for name in names:
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        unique.append(name)
+    return unique
+
+
+def is_date_string(value: str) -> bool:
+    """Whether a string looks like a dash-separated date (e.g. 2025-01-31)."""
+    return len(value) >= 8 and bool(_DATE_RE.match(value))
@@ -0,0 +1,268 @@
+"""
+DAG Scheduler Module
+Event-driven executor for dependency graphs of async tasks.
+
+Tasks become ready when their in-degree drops to zero and are started from a
+ready queue as soon as a slot frees up; the scheduler sleeps on
+asyncio.wait(FIRST_COMPLETED) rather than polling. Cycles are rejected before
+anything runs, and when a task fails every task that transitively depends on
+it is cancelled.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+ORDERINGS = ("fifo", "priority", "critical_path")
+
+
+class DAGCycleError(ValueError):
+    """Raised when the task graph contains a dependency cycle."""
+
+    def __init__(self, cycle_nodes: List[str]):
+        super().__init__(f"Dependency cycle detected among tasks: {', '.join(sorted(cycle_nodes))}")
+        self.cycle_nodes = cycle_nodes
+
+
+def topological_order(graph: Dict[str, List[str]]) -> List[str]:
+    """
+    Kahn's algorithm over a {task_id: [dependency ids]} graph.
+
+    Dependencies that are not themselves nodes of the graph are ignored here.
+
+    Args:
+        graph: Mapping of task ID to the IDs it depends on
+
+    Returns:
+        Task IDs in dependency order
+
+    Raises:
+        DAGCycleError: If the graph has a cycle
+    """
+    in_degree = {node: 0 for node in graph}
+    dependents: Dict[str, List[str]] = {node: [] for node in graph}
+    for node, deps in graph.items():
+        for dep in set(deps):
+            if dep in graph:
+                in_degree[node] += 1
+                dependents[dep].append(node)
+
+    queue = deque(node for node, degree in in_degree.items() if degree == 0)
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for child in dependents[node]:
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                queue.append(child)
+
+    if len(order) != len(graph):
+        raise DAGCycleError([node for node, degree in in_degree.items() if degree > 0])
+    return order
+
+
+class DAGScheduler:
+    """
+    Runs a dependency graph of async tasks with bounded parallelism.
+    """
+
+    def __init__(self, max_parallel: int = 3, ordering: str = "fifo"):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_parallel: Maximum number of tasks running at once
+            ordering: Ready-queue order: "fifo", "priority" (highest first) or
+                "critical_path" (longest remaining chain first, then priority)
+        """
+        if ordering not in ORDERINGS:
+            raise ValueError(f"Invalid ordering '{ordering}', expected one of {ORDERINGS}")
+        self.max_parallel = max(1, max_parallel)
+        self.ordering = ordering
+
+    async def run(
+        self,
+        graph: Dict[str, List[str]],
+        execute: Callable[[str], Awaitable[Any]],
+        priorities: Optional[Dict[str, float]] = None,
+        estimates: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Execute every task in the graph respecting dependencies.
+
+        A task fails if execute raises or returns False.
+
+        Args:
+            graph: Mapping of task ID to the IDs it depends on
+            execute: Coroutine function called with a task ID
+            priorities: Optional per-task priority (higher runs first)
+            estimates: Optional per-task duration estimates for critical-path
+                ordering (defaults to 1 per task)
+
+        Returns:
+            Dict with completed, failed and cancelled task IDs, per-task wall
+            times, the measured critical path and the total wall time
+
+        Raises:
+            DAGCycleError: If the graph has a cycle (raised before any task runs)
+        """
+        order = topological_order(graph)
+        priorities = priorities or {}
+
+        in_degree: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = {node: [] for node in graph}
+        missing: Dict[str, List[str]] = {}
+        for node, deps in graph.items():
+            unique = set(deps)
+            in_degree[node] = sum(1 for dep in unique if dep in graph)
+            for dep in unique:
+                if dep in graph:
+                    dependents[dep].append(node)
+                else:
+                    missing.setdefault(node, []).append(dep)
+
+        rank = self._rank(order, graph, dependents, priorities, estimates)
+        counter = itertools.count()
+        ready: List[tuple] = []
+
+        def push(node: str) -> None:
+            heapq.heappush(ready, (rank(node), next(counter), node))
+
+        completed: List[str] = []
+        failed: List[str] = []
+        cancelled: List[str] = []
+        errors: Dict[str, str] = {}
+        timings: Dict[str, Dict[str, float]] = {}
+        finished = set()
+
+        def cancel_dependents(root: str) -> None:
+            stack = list(dependents[root])
+            while stack:
+                node = stack.pop()
+                if node in finished:
+                    continue
+                finished.add(node)
+                cancelled.append(node)
+                stack.extend(dependents[node])
+
+        # Tasks with dependencies outside the graph can never run
+        for node in order:
+            if node in missing and node not in finished:
+                finished.add(node)
+                cancelled.append(node)
+                errors[node] = f"Missing dependencies: {', '.join(sorted(missing[node]))}"
+                cancel_dependents(node)
+
+        for node in order:
+            if in_degree[node] == 0 and node not in finished:
+                push(node)
+
+        started_at = time.perf_counter()
+        running: Dict[asyncio.Task, str] = {}
+
+        try:
+            while ready or running:
+                while ready and len(running) < self.max_parallel:
+                    _, _, node = heapq.heappop(ready)
+                    if node in finished:
+                        continue
+                    timings[node] = {"start": time.perf_counter() - started_at}
+                    running[asyncio.ensure_future(execute(node))] = node
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    end = time.perf_counter() - started_at
+                    timings[node]["end"] = end
+                    timings[node]["wall_time"] = end - timings[node]["start"]
+                    finished.add(node)
+
+                    error = future.exception()
+                    if error is None and future.result() is not False:
+                        completed.append(node)
+                        for child in dependents[node]:
+                            in_degree[child] -= 1
+                            if in_degree[child] == 0 and child not in finished:
+                                push(child)
+                    else:
+                        failed.append(node)
+                        if error is not None:
+                            errors[node] = str(error)
+                        cancel_dependents(node)
+        finally:
+            # Never leave orphaned tasks behind (e.g. when the caller is cancelled)
+            for future in running:
+                future.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return {
+            "completed_tasks": completed,
+            "failed_tasks": failed,
+            "cancelled_tasks": cancelled,
+            "errors": errors,
+            "task_times": timings,
+            "critical_path": self._measured_critical_path(graph, completed, timings),
+            "total_time": time.perf_counter() - started_at,
+        }
+
+    def _rank(
+        self,
+        order: List[str],
+        graph: Dict[str, List[str]],
+        dependents: Dict[str, List[str]],
+        priorities: Dict[str, float],
+        estimates: Optional[Dict[str, float]],
+    ) -> Callable[[str], tuple]:
+        """Build the heap key for the configured ordering (smaller runs first)."""
+        if self.ordering == "fifo":
+            return lambda node: ()
+        if self.ordering == "priority":
+            return lambda node: (-priorities.get(node, 0),)
+
+        # Longest estimated chain from each node to a sink, in reverse topological order
+        estimates = estimates or {}
+        remaining: Dict[str, float] = {}
+        for node in reversed(order):
+            tail = max((remaining[child] for child in dependents[node]), default=0.0)
+            remaining[node] = estimates.get(node, 1.0) + tail
+        return lambda node: (-remaining[node], -priorities.get(node, 0))
+
+    @staticmethod
+    def _measured_critical_path(
+        graph: Dict[str, List[str]],
+        completed: Iterable[str],
+        timings: Dict[str, Dict[str, float]],
+    ) -> Dict[str, Any]:
+        """
+        Walk back from the last task to finish, always following the
+        dependency that finished last: the chain that bounded the makespan.
+        """
+        completed = set(completed)
+        if not completed:
+            return {"tasks": [], "duration": 0.0}
+
+        node = max(completed, key=lambda n: timings[n]["end"])
+        path = [node]
+        while True:
+            deps = [dep for dep in graph.get(node, []) if dep in completed]
+            if not deps:
+                break
+            node = max(deps, key=lambda n: timings[n]["end"])
+            path.append(node)
+        path.reverse()
+
+        return {
+            "tasks": path,
+            "duration": timings[path[-1]]["end"] - timings[path[0]]["start"],
+        }
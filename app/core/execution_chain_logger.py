@@ -1,10 +1,11 @@
 import os
-import json
 import uuid
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from app.core.log_segment_store import LogSegmentStore, get_log_store, iter_json_files
+
 class ChainStep(BaseModel):
     """Model for a step in an execution chain"""
     chain_id: str
@@ -29,12 +30,54 @@ class ExecutionChain(BaseModel):
 class ExecutionChainLogger:
     """
     Logger for execution chains in multi-agent workflows
+    
+    Chains (without their steps) and steps are kept in two segmented log
+    stores: each chain update appends a new version of the chain, and steps
+    are indexed by chain ID and agent name. The per-chain directories of
+    earlier versions are imported on first start.
     """
     
-    def __init__(self, log_dir: Optional[str] = None):
-        # Set up logging directory
+    def __init__(
+        self,
+        log_dir: Optional[str] = None,
+        chain_store: Optional[LogSegmentStore] = None,
+        step_store: Optional[LogSegmentStore] = None
+    ):
+        self.chain_store = chain_store if chain_store is not None else get_log_store(
+            "execution_chains",
+            key_fields=("chain_id",),
+            time_field="updated_at",
+            index_fields=("status",)
+        )
+        self.step_store = step_store if step_store is not None else get_log_store(
+            "execution_chain_steps",
+            key_fields=("chain_id", "step_number"),
+            time_field="timestamp",
+            index_fields=("chain_id", "agent_name")
+        )
+        
+        # Migrate the log directory of earlier versions
         self.log_dir = log_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "execution_chain_logs")
-        os.makedirs(self.log_dir, exist_ok=True)
+        if os.path.isdir(self.log_dir):
+            self._import_log_dir(self.log_dir)
+    
+    def _import_log_dir(self, log_dir: str) -> None:
+        """
+        Import chain.json and step_<n>.json files of per-chain directories
+        
+        Args:
+            log_dir: Directory of chain directories
+        """
+        chains, steps = [], []
+        for path, data in iter_json_files(log_dir, depth=1):
+            if os.path.basename(path) == "chain.json":
+                chains.append({key: value for key, value in data.items() if key != "steps"})
+            elif os.path.basename(path).startswith("step_"):
+                steps.append(data)
+        
+        source = os.path.realpath(log_dir)
+        self.step_store.import_records(source, steps)
+        self.chain_store.import_records(source, chains)
     
     async def create_chain(self, metadata: Optional[Dict[str, Any]] = None) -> ExecutionChain:
         """
@@ -48,10 +91,6 @@ class ExecutionChainLogger:
         """
         chain = ExecutionChain(metadata=metadata or {})
         
-        # Create directory for this chain
-        chain_dir = os.path.join(self.log_dir, chain.chain_id)
-        os.makedirs(chain_dir, exist_ok=True)
-        
         # Log the initial chain state
         await self._log_chain(chain)
         
@@ -102,19 +141,13 @@ class ExecutionChainLogger:
         )
         
         # Log the step
-        chain_dir = os.path.join(self.log_dir, chain_id)
-        os.makedirs(chain_dir, exist_ok=True)
-        
-        step_file = os.path.join(chain_dir, f"step_{step_number}.json")
-        with open(step_file, "w") as f:
-            json.dump(step.dict(), f, indent=2)
+        self.step_store.append(step.dict())
         
         # Update the chain
-        chain = await self.get_chain(chain_id)
-        if chain:
-            chain.steps.append(step)
-            chain.updated_at = datetime.now().isoformat()
-            await self._log_chain(chain)
+        chain_data = self.chain_store.get(chain_id)
+        if chain_data:
+            chain_data["updated_at"] = datetime.now().isoformat()
+            self.chain_store.append(chain_data)
         
         return step
     
@@ -150,14 +183,12 @@ class ExecutionChainLogger:
         Returns:
             ExecutionChain object or None if not found
         """
-        chain_file = os.path.join(self.log_dir, chain_id, "chain.json")
+        chain_data = self.chain_store.get(chain_id)
         
-        if not os.path.exists(chain_file):
+        if not chain_data:
             return None
         
-        with open(chain_file, "r") as f:
-            chain_data = json.load(f)
-            return ExecutionChain(**chain_data)
+        return self._assemble(chain_data)
     
     async def get_step(self, chain_id: str, step_number: int) -> Optional[ChainStep]:
         """
@@ -170,49 +201,61 @@ class ExecutionChainLogger:
         Returns:
             ChainStep object or None if not found
         """
-        step_file = os.path.join(self.log_dir, chain_id, f"step_{step_number}.json")
+        step_data = self.step_store.get(f"{chain_id}:{step_number}")
         
-        if not os.path.exists(step_file):
+        if not step_data:
             return None
         
-        with open(step_file, "r") as f:
-            step_data = json.load(f)
-            return ChainStep(**step_data)
+        return ChainStep(**step_data)
     
     async def get_chains(
         self,
         limit: int = 10,
         offset: int = 0,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        before: Optional[str] = None,
+        before_updated_at: Optional[str] = None
     ) -> List[ExecutionChain]:
         """
-        Get execution chains with optional filtering
+        Get execution chains with optional filtering, most recently updated first
         
         Args:
             limit: Maximum number of chains to return
             offset: Offset for pagination
             status: Filter by status
+            before: Return chains updated before the chain with this ID, as
+                the next page of an earlier listing
+            before_updated_at: updated_at of the before chain as listed; keeps
+                the next page in place if that chain was updated since, which
+                would otherwise move it to the front and repeat rows
             
         Returns:
             List of ExecutionChain objects
         """
-        # Get all chain directories
-        chain_dirs = [d for d in os.listdir(self.log_dir) if os.path.isdir(os.path.join(self.log_dir, d))]
-        
-        # Sort by modification time (newest first)
-        chain_dirs.sort(key=lambda d: os.path.getmtime(os.path.join(self.log_dir, d, "chain.json")) if os.path.exists(os.path.join(self.log_dir, d, "chain.json")) else 0, reverse=True)
+        chains = self.chain_store.query(
+            filters={"status": status},
+            limit=limit,
+            offset=offset,
+            before=before,
+            before_version=(before, before_updated_at) if before and before_updated_at else None
+        )
         
-        # Apply pagination
-        chain_dirs = chain_dirs[offset:offset + limit]
+        return [self._assemble(chain_data) for chain_data in chains]
+    
+    def _assemble(self, chain_data: Dict[str, Any]) -> ExecutionChain:
+        """
+        Build an ExecutionChain from a stored chain and its stored steps
         
-        # Load chains
-        chains = []
-        for chain_id in chain_dirs:
-            chain = await self.get_chain(chain_id)
-            if chain and (status is None or chain.status == status):
-                chains.append(chain)
+        Args:
+            chain_data: Stored chain, without steps
+            
+        Returns:
+            ExecutionChain object with its steps in step order
+        """
+        steps = self.step_store.query(filters={"chain_id": chain_data["chain_id"]}, limit=None)
+        steps.sort(key=lambda step: step["step_number"])
         
-        return chains
+        return ExecutionChain(**chain_data, steps=[ChainStep(**step) for step in steps])
     
     async def _log_chain(self, chain: ExecutionChain) -> None:
         """
@@ -221,12 +264,7 @@ class ExecutionChainLogger:
         Args:
             chain: ExecutionChain object to log
         """
-        chain_dir = os.path.join(self.log_dir, chain.chain_id)
-        os.makedirs(chain_dir, exist_ok=True)
-        
-        chain_file = os.path.join(chain_dir, "chain.json")
-        with open(chain_file, "w") as f:
-            json.dump(chain.dict(), f, indent=2)
+        self.chain_store.append(chain.dict(exclude={"steps"}))
 
 # Singleton instance
 _execution_chain_logger = None
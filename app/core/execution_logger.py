@@ -1,18 +1,33 @@
 import os
-import json
 import time
 import uuid
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
+from app.core.log_segment_store import LogSegmentStore, get_log_store, iter_json_files
+
 class ExecutionLogger:
     """
     System-wide execution logger for agent interactions
+    
+    Log entries are kept in a segmented log store indexed by agent name; the
+    one-file-per-entry logs of earlier versions are imported on first start.
     """
-    def __init__(self, log_dir: Optional[str] = None):
-        # Set up logging directory
+    def __init__(self, log_dir: Optional[str] = None, store: Optional[LogSegmentStore] = None):
+        self.store = store if store is not None else get_log_store(
+            "execution_logs",
+            key_fields=("id",),
+            time_field="timestamp",
+            index_fields=("agent_name",)
+        )
+        
+        # Migrate the log directory of earlier versions
         self.log_dir = log_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "execution_logs")
-        os.makedirs(self.log_dir, exist_ok=True)
+        if os.path.isdir(self.log_dir):
+            self.store.import_records(
+                os.path.realpath(self.log_dir),
+                (entry for _, entry in iter_json_files(self.log_dir))
+            )
     
     async def log_execution(
         self,
@@ -60,10 +75,8 @@ class ExecutionLogger:
             "metadata": metadata or {}
         }
         
-        # Save log entry to file
-        log_file = os.path.join(self.log_dir, f"{log_id}.json")
-        with open(log_file, "w") as f:
-            json.dump(log_entry, f, indent=2)
+        # Append log entry to the store
+        self.store.append(log_entry)
         
         return log_id
     
@@ -77,53 +90,34 @@ class ExecutionLogger:
         Returns:
             Log entry or None if not found
         """
-        log_file = os.path.join(self.log_dir, f"{log_id}.json")
-        
-        if not os.path.exists(log_file):
-            return None
-        
-        with open(log_file, "r") as f:
-            return json.load(f)
+        return self.store.get(log_id)
     
     async def get_logs(
         self,
         agent_name: Optional[str] = None,
         limit: int = 10,
-        offset: int = 0
+        offset: int = 0,
+        before: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Get log entries with optional filtering
+        Get log entries with optional filtering, newest first
         
         Args:
             agent_name: Filter by agent name
             limit: Maximum number of logs to return
             offset: Offset for pagination
+            before: Return entries older than this log ID, as the next page
+                of an earlier listing
             
         Returns:
             List of log entries
         """
-        # Get all log files
-        log_files = [f for f in os.listdir(self.log_dir) if f.endswith(".json")]
-        
-        # Sort by modification time (newest first)
-        log_files.sort(key=lambda f: os.path.getmtime(os.path.join(self.log_dir, f)), reverse=True)
-        
-        # Apply pagination
-        log_files = log_files[offset:offset + limit]
-        
-        # Load log entries
-        logs = []
-        for log_file in log_files:
-            with open(os.path.join(self.log_dir, log_file), "r") as f:
-                log_entry = json.load(f)
-                
-                # Filter by agent name if specified
-                if agent_name and log_entry.get("agent_name") != agent_name:
-                    continue
-                
-                logs.append(log_entry)
-        
-        return logs
+        return self.store.query(
+            filters={"agent_name": agent_name},
+            limit=limit,
+            offset=offset,
+            before=before
+        )
 
 # Singleton instance
 _execution_logger = None
@@ -0,0 +1,565 @@
+"""
+Log Segment Store Module
+
+Append-only, segmented store for time-ordered log records such as execution
+logs, execution chains and behavior feedback. Records are appended as JSON
+lines to the active segment file. Once it holds `segment_records` records it
+is sealed and its index is written next to it:
+
+- a sparse time index: the time and byte offset of every SPARSE_INTERVAL-th
+  record, used to seek to records and to bound time range queries;
+- the sequence number of the latest version of each record key, so a record
+  appended again under the same key (such as a chain with a new status)
+  supersedes the earlier version;
+- postings of sequence numbers per value of the secondary index fields (such
+  as agent_name or chain_id).
+
+Opening a store loads the segment indexes and scans only the active segment.
+Queries walk candidates newest first, driven by the shortest postings list of
+the filtered fields, apply every filter and only then paginate. The key of the
+last record of a page is the cursor for the next one. For records that are
+appended again when they change, the cursor is the key and time of the version
+the page showed, so the cursor does not move when that record is updated.
+Retention deletes whole sealed segments.
+
+Records are expected to be appended in time order, and a store directory has
+a single writing process.
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Configure logging
+logger = logging.getLogger("app.core.log_segment_store")
+
+DEFAULT_LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "log_segments")
+
+# Records per segment file
+DEFAULT_SEGMENT_RECORDS = 1000
+
+# Every SPARSE_INTERVAL-th record of a segment is in its time index
+SPARSE_INTERVAL = 32
+
+# Records read from a segment per seek
+_READ_CHUNK = 64
+
+
+class _Segment:
+    """One segment file and its in-memory index."""
+
+    def __init__(self, path: str, first_seq: int):
+        self.path = path
+        self.first_seq = first_seq
+        self.count = 0
+        self.size = 0
+        self.sealed = False
+        self.min_time: Optional[str] = None
+        self.max_time: Optional[str] = None
+        self.sparse: List[Tuple[str, int]] = []
+        # Only kept until the segment is sealed and its index written
+        self.keys: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[Any, List[int]]] = {}
+
+    @property
+    def end_seq(self) -> int:
+        return self.first_seq + self.count
+
+    @property
+    def index_path(self) -> str:
+        return self.path[:-len(".log")] + ".idx"
+
+
+class LogSegmentStore:
+    """
+    Segmented append-only log of JSON records with time and field indexes.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        key_fields: Sequence[str] = ("id",),
+        time_field: str = "timestamp",
+        index_fields: Sequence[str] = (),
+        segment_records: int = DEFAULT_SEGMENT_RECORDS,
+        max_age: Optional[timedelta] = None
+    ):
+        """
+        Initialize the store, loading the segments in directory.
+
+        Args:
+            directory: Directory holding the segment files
+            key_fields: Record fields that together identify a record
+            time_field: Record field with the ISO timestamp records are ordered by
+            index_fields: Record fields with a secondary index
+            segment_records: Records per segment
+            max_age: Drop sealed segments older than this whenever a segment is sealed
+        """
+        self.directory = directory
+        self.key_fields = tuple(key_fields)
+        self.time_field = time_field
+        self.index_fields = tuple(index_fields)
+        self.segment_records = segment_records
+        self.max_age = max_age
+
+        self._lock = threading.RLock()
+        self._segments: List[_Segment] = []
+        self._starts: List[int] = []
+        self._next_seq = 0
+        self._latest: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[Any, List[int]]] = {field: {} for field in self.index_fields}
+        self._file = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    # ------------------------------------------------------------------ load
+
+    def _open(self) -> None:
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(".log"))
+        for position, name in enumerate(names):
+            segment = _Segment(os.path.join(self.directory, name), int(name[:-len(".log")]))
+            if not self._load_index(segment):
+                self._scan(segment)
+                if segment.count == 0:
+                    os.remove(segment.path)
+                    continue
+                if position < len(names) - 1:
+                    # Sealed, but its index was never written
+                    self._seal(segment)
+            self._segments.append(segment)
+            self._starts.append(segment.first_seq)
+            self._next_seq = segment.end_seq
+
+    def _load_index(self, segment: _Segment) -> bool:
+        try:
+            with open(segment.index_path, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not set(self.index_fields) <= set(index["postings"]):
+            # Indexed with other fields; rebuild from the records
+            return False
+
+        segment.count = index["count"]
+        segment.size = index["size"]
+        segment.min_time = index["min_time"]
+        segment.max_time = index["max_time"]
+        segment.sparse = [tuple(entry) for entry in index["sparse"]]
+        segment.sealed = True
+        self._latest.update(index["keys"])
+        for field in self.index_fields:
+            postings = self._postings[field]
+            for value, seqs in index["postings"][field]:
+                postings.setdefault(value, []).extend(seqs)
+        return True
+
+    def _scan(self, segment: _Segment) -> None:
+        offset = 0
+        with open(segment.path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn trailing record from a crash mid-append
+                    logger.warning(f"Truncating unreadable record in log segment {segment.path}")
+                    break
+                self._track(segment, record, offset)
+                offset += len(line)
+        if offset != os.path.getsize(segment.path):
+            os.truncate(segment.path, offset)
+        segment.size = offset
+
+    def _track(self, segment: _Segment, record: Dict[str, Any], offset: int) -> int:
+        seq = segment.end_seq
+        time = record.get(self.time_field) or ""
+        if segment.count % SPARSE_INTERVAL == 0:
+            segment.sparse.append((time, offset))
+        if segment.min_time is None or time < segment.min_time:
+            segment.min_time = time
+        if segment.max_time is None or time > segment.max_time:
+            segment.max_time = time
+        segment.count += 1
+
+        key = self.key_of(record)
+        segment.keys[key] = seq
+        self._latest[key] = seq
+        for field in self.index_fields:
+            value = record.get(field)
+            if value is not None:
+                segment.postings.setdefault(field, {}).setdefault(value, []).append(seq)
+                self._postings[field].setdefault(value, []).append(seq)
+        return seq
+
+    def _seal(self, segment: _Segment) -> None:
+        index = {
+            "count": segment.count,
+            "size": segment.size,
+            "min_time": segment.min_time,
+            "max_time": segment.max_time,
+            "sparse": segment.sparse,
+            "keys": segment.keys,
+            "postings": {
+                field: list(segment.postings.get(field, {}).items()) for field in self.index_fields
+            },
+        }
+        temp_path = segment.index_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(temp_path, segment.index_path)
+
+        segment.sealed = True
+        segment.keys = {}
+        segment.postings = {}
+
+    # ---------------------------------------------------------------- writes
+
+    def key_of(self, record: Dict[str, Any]) -> str:
+        """Key identifying a record: its key fields joined with ":"."""
+        return ":".join(str(record[field]) for field in self.key_fields)
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """
+        Append a record, superseding any earlier record with the same key.
+
+        Args:
+            record: JSON-serializable record with the key and time fields
+
+        Returns:
+            Sequence number of the record
+        """
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            if not self._segments or self._segments[-1].sealed:
+                segment = _Segment(os.path.join(self.directory, f"{self._next_seq:012d}.log"), self._next_seq)
+                self._segments.append(segment)
+                self._starts.append(segment.first_seq)
+            segment = self._segments[-1]
+
+            if self._file is None:
+                self._file = open(segment.path, "ab")
+            self._file.write(line)
+            self._file.flush()
+
+            seq = self._track(segment, record, segment.size)
+            segment.size += len(line)
+            self._next_seq = segment.end_seq
+
+            if segment.count >= self.segment_records:
+                self._file.close()
+                self._file = None
+                self._seal(segment)
+                if self.max_age is not None:
+                    self.drop_segments((datetime.now() - self.max_age).isoformat())
+            return seq
+
+    def drop_segments(self, before: str) -> int:
+        """
+        Delete sealed segments whose records are all older than a time.
+
+        Args:
+            before: ISO timestamp; segments with every record older are deleted
+
+        Returns:
+            Number of segments deleted
+        """
+        with self._lock:
+            dropped = 0
+            while self._segments and self._segments[0].sealed and self._segments[0].max_time < before:
+                segment = self._segments.pop(0)
+                self._starts.pop(0)
+                for path in (segment.path, segment.index_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                dropped += 1
+            if not dropped:
+                return 0
+
+            first = self._starts[0] if self._starts else self._next_seq
+            self._latest = {key: seq for key, seq in self._latest.items() if seq >= first}
+            for postings in self._postings.values():
+                for value in list(postings):
+                    seqs = postings[value]
+                    cut = bisect.bisect_left(seqs, first)
+                    if cut == len(seqs):
+                        del postings[value]
+                    elif cut:
+                        del seqs[:cut]
+
+            logger.info(f"Dropped {dropped} log segments older than {before} from {self.directory}")
+            return dropped
+
+    def import_records(self, source: str, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append records from another source, once per source.
+
+        Records are appended in time order.
+
+        Args:
+            source: Identifier of the source, such as a legacy log directory
+            records: Records to import
+
+        Returns:
+            Number of records imported (0 if the source was imported before)
+        """
+        imports_path = os.path.join(self.directory, "imports.json")
+        with self._lock:
+            imports = {}
+            if os.path.exists(imports_path):
+                with open(imports_path, "r") as f:
+                    imports = json.load(f)
+            if source in imports:
+                return 0
+
+            records = sorted(records, key=lambda record: record.get(self.time_field) or "")
+            for record in records:
+                self.append(record)
+
+            imports[source] = {"imported_at": datetime.now().isoformat(), "records": len(records)}
+            with open(imports_path + ".tmp", "w") as f:
+                json.dump(imports, f, indent=2)
+            os.replace(imports_path + ".tmp", imports_path)
+
+        if records:
+            logger.info(f"Imported {len(records)} records from {source} into {self.directory}")
+        return len(records)
+
+    def close(self) -> None:
+        """Close the active segment file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # ----------------------------------------------------------------- reads
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def _read(self, seqs: Iterable[int]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        # Reads descending sequence numbers in chunks within one segment
+        chunk: List[int] = []
+        segment = None
+        for seq in seqs:
+            if chunk and (seq < segment.first_seq or len(chunk) >= _READ_CHUNK):
+                yield from self._read_chunk(segment, chunk)
+                chunk = []
+            if not chunk:
+                segment = self._segments[bisect.bisect_right(self._starts, seq) - 1]
+            chunk.append(seq)
+        if chunk:
+            yield from self._read_chunk(segment, chunk)
+
+    def _read_chunk(self, segment: _Segment, seqs: List[int]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        sample = (seqs[-1] - segment.first_seq) // SPARSE_INTERVAL
+        seq = segment.first_seq + sample * SPARSE_INTERVAL
+        wanted = set(seqs)
+        records = {}
+        with open(segment.path, "rb") as f:
+            f.seek(segment.sparse[sample][1])
+            for line in f:
+                if seq in wanted:
+                    records[seq] = json.loads(line)
+                if seq >= seqs[0]:
+                    break
+                seq += 1
+        for seq in seqs:
+            yield seq, records[seq]
+
+    def _upper_seq(self, until: str) -> int:
+        # Exclusive bound below which every record at or before until lies
+        for segment in self._segments:
+            if segment.max_time <= until:
+                continue
+            for sample, (time, _) in enumerate(segment.sparse):
+                if time > until:
+                    return segment.first_seq + sample * SPARSE_INTERVAL
+            return segment.end_seq
+        return self._next_seq
+
+    def _lower_seq(self, since: str) -> int:
+        # Inclusive bound from which every record at or after since lies
+        for segment in self._segments:
+            if segment.max_time < since:
+                continue
+            lower = segment.first_seq
+            for sample, (time, _) in enumerate(segment.sparse):
+                if time >= since:
+                    break
+                lower = segment.first_seq + sample * SPARSE_INTERVAL
+            return lower
+        return self._next_seq
+
+    def _version_seq(self, key: str, time: str) -> int:
+        # Exclusive bound below which every record older than the version of
+        # key stamped time lies: that version's sequence number while it is
+        # stored, even if it was superseded
+        seq = self._latest.get(key)
+        if seq is not None and (next(self._read([seq]))[1].get(self.time_field) or "") == time:
+            return seq
+
+        lower = self._starts[0]
+        for seq, record in self._read(range(self._upper_seq(time) - 1, lower - 1, -1)):
+            record_time = record.get(self.time_field) or ""
+            if record_time < time:
+                return seq + 1
+            if record_time == time and self.key_of(record) == key:
+                return seq
+        return lower
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest record with a key.
+
+        Args:
+            key: Record key, as returned by key_of
+
+        Returns:
+            The record, or None if not found
+        """
+        with self._lock:
+            seq = self._latest.get(key)
+            if seq is None:
+                return None
+            return next(self._read([seq]))[1]
+
+    def query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = 10,
+        offset: int = 0,
+        before: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        before_version: Optional[Tuple[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the latest records, newest first.
+
+        Filters are applied before pagination.
+
+        Args:
+            filters: Field values records must have; None values are ignored
+            limit: Maximum number of records to return, or None for all
+            offset: Number of matching records to skip
+            before: Only records older than the record with this key (the
+                last key of the previous page)
+            since: Only records at or after this ISO timestamp
+            until: Only records at or before this ISO timestamp
+            predicate: Further condition records must meet
+            before_version: Only records older than the version of a record
+                with this (key, time), as shown as the last record of the
+                previous page; unlike before, it does not move if that record
+                is appended again later
+
+        Returns:
+            List of records
+        """
+        filters = {field: value for field, value in (filters or {}).items() if value is not None}
+        results: List[Dict[str, Any]] = []
+        if limit is not None and limit <= 0:
+            return results
+
+        with self._lock:
+            if not self._segments:
+                return results
+            lower, upper = self._starts[0], self._next_seq
+            if before is not None:
+                if before not in self._latest:
+                    return results
+                upper = min(upper, self._latest[before])
+            if before_version is not None:
+                upper = min(upper, self._version_seq(*before_version))
+            if until is not None:
+                upper = min(upper, self._upper_seq(until))
+            if since is not None:
+                lower = max(lower, self._lower_seq(since))
+
+            indexed = [self._postings[field].get(value, []) for field, value in filters.items()
+                       if field in self._postings]
+            if indexed:
+                postings = min(indexed, key=len)
+                high = bisect.bisect_left(postings, upper)
+                low = bisect.bisect_left(postings, lower)
+                candidates = (postings[position] for position in range(high - 1, low - 1, -1))
+            else:
+                candidates = iter(range(upper - 1, lower - 1, -1))
+
+            skipped = 0
+            for seq, record in self._read(candidates):
+                if self._latest.get(self.key_of(record)) != seq:
+                    continue
+                if any(record.get(field) != value for field, value in filters.items()):
+                    continue
+                time = record.get(self.time_field) or ""
+                if (since is not None and time < since) or (until is not None and time > until):
+                    continue
+                if predicate is not None and not predicate(record):
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                results.append(record)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+
+def iter_json_files(directory: str, depth: int = 0) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Read a legacy one-JSON-file-per-entry log directory.
+
+    Args:
+        directory: Directory to read
+        depth: Levels of subdirectories to descend into
+
+    Returns:
+        Iterator of (path, entry) pairs; unreadable files are skipped
+    """
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isdir(path):
+            if depth > 0:
+                yield from iter_json_files(path, depth - 1)
+        elif name.endswith(".json"):
+            try:
+                with open(path, "r") as f:
+                    yield path, json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable log file {path}: {e}")
+
+
+_stores: Dict[str, LogSegmentStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_log_store(name: str, **options: Any) -> LogSegmentStore:
+    """
+    Get the process-wide log store with a name.
+
+    Stores live in LOG_SEGMENT_DIR (default app/data/log_segments); setting
+    LOG_RETENTION_DAYS drops segments older than that many days.
+
+    Args:
+        name: Store name, used as its directory name
+        **options: LogSegmentStore options, used when the store is first opened
+
+    Returns:
+        The LogSegmentStore
+    """
+    with _stores_lock:
+        store = _stores.get(name)
+        if store is None:
+            retention_days = os.getenv("LOG_RETENTION_DAYS")
+            if retention_days and "max_age" not in options:
+                options["max_age"] = timedelta(days=float(retention_days))
+            store = LogSegmentStore(os.path.join(os.getenv("LOG_SEGMENT_DIR", DEFAULT_LOG_DIR), name), **options)
+            _stores[name] = store
+        return store
@@ -6,6 +6,27 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from app.core.pattern_scanner import get_pattern_scanner
+
+# Patterns that indicate an agent needs user input
+NUDGE_PATTERNS = [
+    r"i am unsure",
+    r"i('m| am) not sure",
+    r"user input needed",
+    r"need(s|ed)? (more|additional) (information|input|clarification)",
+    r"blocked",
+    r"cannot proceed",
+    r"can't proceed",
+    r"unable to (proceed|continue)",
+    r"insufficient (information|data|details)",
+    r"clarification (is )?needed",
+    r"please (provide|specify|clarify)",
+    r"would (need|require) (more|additional)",
+    r"don't have enough (information|data|details)",
+    r"missing (information|data|details)",
+    r"unclear (what|how|which|where|when)"
+]
+
 class NudgeData(BaseModel):
     """Model for nudge data"""
     agent_name: str
@@ -32,23 +53,10 @@ class NudgeManager:
         os.makedirs(self.log_dir, exist_ok=True)
         
         # Define patterns that indicate an agent needs user input
-        self.nudge_patterns = [
-            r"i am unsure",
-            r"i('m| am) not sure",
-            r"user input needed",
-            r"need(s|ed)? (more|additional) (information|input|clarification)",
-            r"blocked",
-            r"cannot proceed",
-            r"can't proceed",
-            r"unable to (proceed|continue)",
-            r"insufficient (information|data|details)",
-            r"clarification (is )?needed",
-            r"please (provide|specify|clarify)",
-            r"would (need|require) (more|additional)",
-            r"don't have enough (information|data|details)",
-            r"missing (information|data|details)",
-            r"unclear (what|how|which|where|when)"
-        ]
+        self.nudge_patterns = list(NUDGE_PATTERNS)
+        self._nudge_rules = get_pattern_scanner().register(
+            "nudge_manager", [(pattern, pattern) for pattern in self.nudge_patterns], re.IGNORECASE
+        )
     
     async def check_for_nudge(
         self,
@@ -80,22 +88,14 @@ class NudgeManager:
         combined_reflection = f"{rationale} {assumptions} {improvement_suggestions} {confidence_level} {failure_points}".lower()
         
         # Check if any nudge patterns are present
-        nudge_needed = False
-        matched_pattern = None
-        
-        for pattern in self.nudge_patterns:
-            if re.search(pattern, combined_reflection, re.IGNORECASE):
-                nudge_needed = True
-                matched_pattern = pattern
-                break
+        found = self._nudge_rules.search(combined_reflection)
         
         # Also check the output text for patterns
-        if not nudge_needed:
-            for pattern in self.nudge_patterns:
-                if re.search(pattern, output_text, re.IGNORECASE):
-                    nudge_needed = True
-                    matched_pattern = pattern
-                    break
+        if found is None:
+            found = self._nudge_rules.search(output_text)
+        
+        nudge_needed = found is not None
+        matched_pattern = found[0] if found else None
         
         # If nudge is needed, generate a nudge message
         if nudge_needed:
@@ -0,0 +1,338 @@
+"""
+Shared multi-pattern scanning engine for the safety passes.
+
+Each safety module registers its regex rules once as a named rule set. From
+every registered pattern the scanner derives the literals a match has to
+contain (read from the parsed regex), as a list of factors that are all
+required, each a set of alternative literals. The literals of all rule sets
+are compiled into one gate expression, nested by common prefixes, that runs
+over the lowercased text.
+
+Scanning a text runs the gate over it in a single pass and records which
+literals occur; a rule is only run with its own compiled pattern when every
+one of its factors occurred. Matches are therefore exactly the ones a separate
+``re.finditer`` per pattern would produce, in the same order, while rules
+that cannot match are skipped. Gate results are cached per text, so several
+modules scanning the same agent output share one pass.
+"""
+
+import functools
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse
+
+# Configure logging
+logger = logging.getLogger("app.core.pattern_scanner")
+
+# Number of recently scanned texts whose gate results are kept
+GATE_CACHE_SIZE = 8
+
+# Factors with shorter literals match almost anywhere and are not gated on
+MIN_LITERAL_LENGTH = 3
+
+_REPEATS = tuple(
+    getattr(sre_parse, name) for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_parse, name)
+)
+
+Factor = Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A compiled pattern and the payload its matches are routed back to."""
+
+    key: Any
+    pattern: str
+    regex: "re.Pattern"
+    factors: Optional[Tuple[Factor, ...]]
+
+
+def _score(factor: Factor) -> Tuple[int, int]:
+    # Longer literals are more selective; fewer alternatives break ties
+    return min(len(literal) for literal in factor), -len(factor)
+
+
+def _branch_factor(branches) -> Optional[Factor]:
+    literals: Dict[str, None] = {}
+    for branch in branches:
+        factors = _sequence_factors(branch)
+        if not factors:
+            return None
+        literals.update(dict.fromkeys(max(factors, key=_score)))
+    return tuple(literals)
+
+
+def _sequence_factors(items) -> List[Factor]:
+    factors: List[Factor] = []
+    run: List[str] = []
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            factors.append(("".join(run),))
+            run = []
+        if op is sre_parse.SUBPATTERN:
+            factors.extend(_sequence_factors(av[-1]))
+        elif op is sre_parse.BRANCH:
+            factor = _branch_factor(av[1])
+            if factor:
+                factors.append(factor)
+        elif op in _REPEATS and av[0] >= 1:
+            factors.extend(_sequence_factors(av[2]))
+        elif op is sre_parse.IN:
+            if all(item_op is sre_parse.LITERAL for item_op, _ in av):
+                factors.append(tuple(chr(item_av) for _, item_av in av))
+        elif op is getattr(sre_parse, "ATOMIC_GROUP", None):
+            factors.extend(_sequence_factors(av))
+    if run:
+        factors.append(("".join(run),))
+    return factors
+
+
+def required_literals(pattern: str, flags: int = 0) -> Optional[Tuple[Factor, ...]]:
+    """
+    Get the literals every match of a pattern contains.
+
+    Args:
+        pattern: Regular expression source
+        flags: Flags the pattern is compiled with
+
+    Returns:
+        Factors that are all required, each a tuple of alternative literals,
+        or None if none could be derived
+    """
+    try:
+        factors = _sequence_factors(sre_parse.parse(pattern, flags))
+    except Exception as e:
+        logger.debug(f"Could not derive literals from {pattern!r}: {e}")
+        return None
+    return tuple(dict.fromkeys(factors)) or None
+
+
+def _gate_factors(factors: Optional[Tuple[Factor, ...]]) -> Optional[Tuple[Factor, ...]]:
+    # The gate compares lowercased text, which is only exact for literals made of
+    # ASCII or caseless characters; rules without such factors are always run
+    if factors is None:
+        return None
+    gated = [
+        tuple(dict.fromkeys(literal.lower() for literal in factor))
+        for factor in factors
+        if all(char.isascii() or char.lower() == char.upper() == char for literal in factor for char in literal)
+    ]
+    selective = [factor for factor in gated if _score(factor)[0] >= MIN_LITERAL_LENGTH]
+    if not selective and gated:
+        selective = [max(gated, key=_score)]
+    return tuple(selective) or None
+
+
+@functools.lru_cache(maxsize=4096)
+def _folds_to_ascii(char: str) -> bool:
+    # Non-ASCII characters that case-insensitive matching treats as an ASCII
+    # letter (such as the long s or the Kelvin sign) defeat lowercasing
+    return re.match(r"[a-z]", char, re.IGNORECASE) is not None
+
+
+def _trie_pattern(literals: Iterable[str]) -> str:
+    """
+    Build a regex matching any of the literals, nested by common prefixes.
+
+    Args:
+        literals: Literals to match
+
+    Returns:
+        Regular expression source that prefers the longest literal
+    """
+    trie: Dict[str, dict] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class RuleSet:
+    """An ordered group of rules registered by one module."""
+
+    def __init__(self, scanner: "PatternScanner", name: str, rules: List[Rule], flags: int = 0):
+        self.scanner = scanner
+        self.name = name
+        self.rules = rules
+        self.flags = flags
+
+    def _candidates(self, text: str) -> Iterator[Rule]:
+        found = self.scanner.literals_in(text)
+        for rule in self.rules:
+            if found is None or rule.factors is None or all(
+                any(literal in found for literal in factor) for factor in rule.factors
+            ):
+                yield rule
+
+    def finditer(self, text: str) -> Iterator[Tuple[Any, "re.Match"]]:
+        """
+        Find all matches, ordered by rule and then by position.
+
+        Args:
+            text: The text to scan
+
+        Returns:
+            Iterator of (rule key, match) pairs
+        """
+        for rule in self._candidates(text):
+            for match in rule.regex.finditer(text):
+                yield rule.key, match
+
+    def search(self, text: str) -> Optional[Tuple[Any, "re.Match"]]:
+        """
+        Find the first rule, in registration order, that matches anywhere.
+
+        Args:
+            text: The text to scan
+
+        Returns:
+            (rule key, match) pair, or None if no rule matches
+        """
+        for rule in self._candidates(text):
+            match = rule.regex.search(text)
+            if match:
+                return rule.key, match
+        return None
+
+
+class PatternScanner:
+    """Registry of rule sets sharing one literal gate."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rule_sets: Dict[str, RuleSet] = {}
+        self._literals: Set[str] = set()
+        self._generation = 0
+        self._gate: Optional["re.Pattern"] = None
+        self._prefixes: Dict[str, FrozenSet[str]] = {}
+        self._cache: "OrderedDict[str, Optional[FrozenSet[str]]]" = OrderedDict()
+
+    def register(self, name: str, rules: Iterable[Tuple[Any, str]], flags: int = 0) -> RuleSet:
+        """
+        Compile and register a rule set.
+
+        Registering the same name again with identical patterns returns the
+        existing rule set; different patterns replace it.
+
+        Args:
+            name: Unique rule set name
+            rules: (key, pattern) pairs in scan order
+            flags: Flags every pattern is compiled with
+
+        Returns:
+            The registered rule set
+        """
+        rules = list(rules)
+        with self._lock:
+            existing = self._rule_sets.get(name)
+            if existing and existing.flags == flags \
+                    and [(rule.key, rule.pattern) for rule in existing.rules] == rules:
+                return existing
+
+            compiled = [
+                Rule(
+                    key=key,
+                    pattern=pattern,
+                    regex=re.compile(pattern, flags),
+                    factors=_gate_factors(required_literals(pattern, flags)),
+                )
+                for key, pattern in rules
+            ]
+            rule_set = RuleSet(self, name, compiled, flags)
+            self._rule_sets[name] = rule_set
+
+            # The gate only ever grows, so replaced rule sets stay covered
+            literals = {literal for rule in compiled for factor in rule.factors or () for literal in factor}
+            if not literals <= self._literals:
+                self._literals |= literals
+                self._generation += 1
+                self._gate = None
+                self._cache.clear()
+            return rule_set
+
+    def _build_gate(self) -> None:
+        # The gate reports the longest literal starting at a position; every
+        # shorter literal matching there is a prefix of it
+        self._prefixes = {
+            literal: frozenset(other for other in self._literals if literal.startswith(other))
+            for literal in self._literals
+        }
+        self._gate = re.compile(_trie_pattern(self._literals) or r"(?!)")
+
+    def literals_in(self, text: str) -> Optional[FrozenSet[str]]:
+        """
+        Run the gate over a text.
+
+        Args:
+            text: The text to scan
+
+        Returns:
+            Lowercased gate literals occurring in the text, or None if the
+            text cannot be gated and every rule has to run
+        """
+        while True:
+            with self._lock:
+                if text in self._cache:
+                    self._cache.move_to_end(text)
+                    return self._cache[text]
+                if self._gate is None:
+                    self._build_gate()
+                gate, prefixes, generation = self._gate, self._prefixes, self._generation
+
+            if not text.isascii() and any(_folds_to_ascii(char) for char in set(text) if ord(char) > 127):
+                found = None
+            else:
+                # Restart one character after each hit so overlapping literals are seen
+                lowered = text.lower()
+                longest = set()
+                search = gate.search
+                match = search(lowered)
+                while match:
+                    longest.add(match.group())
+                    match = search(lowered, match.start() + 1)
+                found = frozenset().union(*(prefixes[literal] for literal in longest))
+
+            with self._lock:
+                # A rule set registered meanwhile may not be covered by this gate
+                if generation != self._generation:
+                    continue
+                self._cache[text] = found
+                while len(self._cache) > GATE_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+                return found
+
+
+# Singleton instance
+_pattern_scanner = None
+
+
+def get_pattern_scanner() -> PatternScanner:
+    """
+    Get the shared PatternScanner instance.
+    """
+    global _pattern_scanner
+    if _pattern_scanner is None:
+        _pattern_scanner = PatternScanner()
+    return _pattern_scanner
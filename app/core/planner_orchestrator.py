@@ -12,12 +12,12 @@ import json
 import uuid
 import time
 import logging
-import asyncio
-from typing import Dict, Any, List, Optional, Union, Tuple, Set
+from typing import Dict, Any, List, Optional, Union, Tuple
 from datetime import datetime
 
 # Fix import path from app.tools.agent_router to app.core.agent_router
 from app.core.agent_router import get_agent_router, find_agent
+from app.core.dag_scheduler import DAGScheduler, DAGCycleError
 from app.core.task_state_manager import TaskStateManager, get_task_state_manager
 from app.core.agent_coordinator import AgentCoordinator, get_agent_coordinator
 from app.core.vector_memory import VectorMemorySystem
@@ -81,6 +81,11 @@ class PlannerOrchestrator:
         # Parse the result to extract subtasks
         subtasks = self._parse_subtasks(result)
         
+        # Route the subtasks without an assigned agent in one batch
+        unassigned = [i for i, subtask in enumerate(subtasks) if not subtask.get("assigned_agent")]
+        routed = self.agent_router.route_many([subtasks[i]["description"] for i in unassigned])
+        routed_agents = {i: agent_type for i, (agent_type, _, _) in zip(unassigned, routed)}
+        
         # Create task states for each subtask
         for i, subtask in enumerate(subtasks):
             subtask_id = f"{goal_id}_subtask_{i+1}"
@@ -93,11 +98,7 @@ class PlannerOrchestrator:
                     dependencies.append(dep_id)
             
             # Determine assigned agent
-            assigned_agent = subtask.get("assigned_agent")
-            if not assigned_agent:
-                # Route task to appropriate agent
-                agent_type, confidence, reason = self.agent_router.route_task(subtask["description"])
-                assigned_agent = agent_type
+            assigned_agent = subtask.get("assigned_agent") or routed_agents[i]
             
             # Create task state
             await self.task_state_manager.create_task(
@@ -118,7 +119,7 @@ class PlannerOrchestrator:
                     {
                         "task_id": f"{goal_id}_subtask_{i+1}",
                         "description": subtask["description"],
-                        "assigned_agent": subtask.get("assigned_agent") or self.agent_router.route_task(subtask["description"])[0]
+                        "assigned_agent": subtask.get("assigned_agent") or routed_agents[i]
                     }
                     for i, subtask in enumerate(subtasks)
                 ]
@@ -127,19 +128,26 @@ class PlannerOrchestrator:
         
         return goal_id
     
-    async def execute_goal(self, goal_id: str, max_parallel: int = 3) -> Dict[str, Any]:
+    async def execute_goal(self, goal_id: str, max_parallel: int = 3,
+                           ordering: str = "critical_path") -> Dict[str, Any]:
         """
         Execute a goal by executing its subtasks
         
+        Subtasks run on a DAG scheduler: a task starts as soon as its last
+        dependency completes and a slot is free, and a failed task cancels
+        everything that depends on it.
+        
         Args:
             goal_id: ID of the goal to execute
             max_parallel: Maximum number of tasks to execute in parallel
+            ordering: Ready-queue order ("fifo", "priority" or "critical_path")
             
         Returns:
-            Dictionary containing execution results
+            Dictionary containing execution results, per-task wall times and
+            the measured critical path
         """
         # Get all tasks for the goal
-        tasks = await self.task_state_manager.get_tasks_for_goal(goal_id)
+        tasks = await self.task_state_manager.get_goal_tasks(goal_id)
         if not tasks:
             logger.error(f"No tasks found for goal: {goal_id}")
             return {
@@ -156,90 +164,79 @@ class PlannerOrchestrator:
             }
         )
         
-        # Track task status
-        pending_tasks = set()
-        running_tasks = set()
-        completed_tasks = []
-        failed_tasks = []
+        graph = {task.task_id: list(task.dependencies or []) for task in tasks}
+        priorities = {task.task_id: task.priority or 0 for task in tasks}
         
-        # Initialize pending tasks with tasks that have no dependencies
-        for task in tasks:
-            task_id = task["task_id"]
-            dependencies = task.get("dependencies", [])
-            
-            if not dependencies:
-                pending_tasks.add(task_id)
+        scheduler = DAGScheduler(max_parallel=max_parallel, ordering=ordering)
+        try:
+            outcome = await scheduler.run(graph, self._execute_task, priorities=priorities)
+        except DAGCycleError as e:
+            logger.error(f"Cannot execute goal {goal_id}: {str(e)}")
+            self._log_execution(
+                goal_id=goal_id,
+                action="fail_goal",
+                details={
+                    "error": str(e)
+                }
+            )
+            return {
+                "success": False,
+                "goal_id": goal_id,
+                "error": str(e)
+            }
         
-        # Execute tasks until all are completed or failed
-        while pending_tasks or running_tasks:
-            # Start pending tasks if there are slots available
-            while pending_tasks and len(running_tasks) < max_parallel:
-                task_id = pending_tasks.pop()
-                running_tasks.add(task_id)
-                
-                # Execute task in background
-                asyncio.create_task(self._execute_task(
-                    task_id=task_id,
-                    running_tasks=running_tasks,
-                    completed_tasks=completed_tasks,
-                    failed_tasks=failed_tasks
-                ))
-            
-            # Wait for a short time
-            await asyncio.sleep(0.1)
-            
-            # Check for newly available tasks
-            for task in tasks:
-                task_id = task["task_id"]
-                
-                # Skip tasks that are already processed
-                if (task_id in pending_tasks or 
-                    task_id in running_tasks or 
-                    task_id in completed_tasks or 
-                    task_id in failed_tasks):
-                    continue
-                
-                # Check if all dependencies are completed
-                dependencies = task.get("dependencies", [])
-                if all(dep in completed_tasks for dep in dependencies):
-                    pending_tasks.add(task_id)
+        # Cancelled tasks never started and stay blocked; record why
+        if outcome["cancelled_tasks"]:
+            self._log_execution(
+                goal_id=goal_id,
+                action="cancel_tasks",
+                details={
+                    task_id: outcome["errors"].get(task_id, "A dependency failed")
+                    for task_id in outcome["cancelled_tasks"]
+                }
+            )
         
         # Log goal completion
         self._log_execution(
             goal_id=goal_id,
             action="complete_goal",
             details={
-                "completed_tasks": len(completed_tasks),
-                "failed_tasks": len(failed_tasks)
+                "completed_tasks": len(outcome["completed_tasks"]),
+                "failed_tasks": len(outcome["failed_tasks"]),
+                "cancelled_tasks": len(outcome["cancelled_tasks"]),
+                "critical_path": outcome["critical_path"],
+                "total_time": outcome["total_time"]
             }
         )
         
         return {
             "success": True,
             "goal_id": goal_id,
-            "completed_tasks": completed_tasks,
-            "failed_tasks": failed_tasks
+            "completed_tasks": outcome["completed_tasks"],
+            "failed_tasks": outcome["failed_tasks"],
+            "cancelled_tasks": outcome["cancelled_tasks"],
+            "task_times": outcome["task_times"],
+            "critical_path": outcome["critical_path"],
+            "total_time": outcome["total_time"]
         }
     
-    async def _execute_task(self, task_id: str, running_tasks: Set[str], 
-                           completed_tasks: List[str], failed_tasks: List[str]) -> None:
+    async def _execute_task(self, task_id: str) -> bool:
         """
         Execute a single task and update its status.
         
         Args:
             task_id: Unique identifier for the task
-            running_tasks: Set of task IDs that are currently running
-            completed_tasks: List to append completed task IDs to
-            failed_tasks: List to append failed task IDs to
+            
+        Returns:
+            True if the task completed, False if it failed
         """
+        task = None
         try:
             # Get task information
             task = await self.task_state_manager.get_task(task_id)
             if not task:
                 logger.error(f"Task not found: {task_id}")
-                running_tasks.remove(task_id)
-                failed_tasks.append(task_id)
-                return
+                return False
             
             logger.info(f"Executing task: {task.task_description} (ID: {task_id})")
             
@@ -258,9 +255,7 @@ class PlannerOrchestrator:
                     status="failed",
                     error=f"Agent not found: {task.assigned_agent}"
                 )
-                running_tasks.remove(task_id)
-                failed_tasks.append(task_id)
-                return
+                return False
             
             # Execute the task
             result = await agent.run(
@@ -290,9 +285,7 @@ class PlannerOrchestrator:
                 }
             )
             
-            # Update tracking lists
-            running_tasks.remove(task_id)
-            completed_tasks.append(task_id)
+            return True
             
         except Exception as e:
             logger.error(f"Error executing task {task_id}: {str(e)}")
@@ -306,7 +299,7 @@ class PlannerOrchestrator:
             
             # Log task failure
             self._log_execution(
-                goal_id=task.goal_id,
+                goal_id=task.goal_id if task else task_id.rsplit("_subtask_", 1)[0],
                 action="fail_task",
                 details={
                     "task_id": task_id,
@@ -314,9 +307,7 @@ class PlannerOrchestrator:
                 }
             )
             
-            # Update tracking lists
-            running_tasks.remove(task_id)
-            failed_tasks.append(task_id)
+            return False
     
     def _parse_subtasks(self, planner_result: str) -> List[Dict[str, Any]]:
         """
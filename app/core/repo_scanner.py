@@ -0,0 +1,587 @@
+"""
+Repository Scanner
+
+Incremental directory scanner behind RepoLoader.
+
+- Directories are listed with os.scandir, so file types and sizes come from
+  the directory entry instead of separate isdir / isfile / getsize calls.
+- .gitignore files are honored at every level (last matching rule wins,
+  ignored directories are not entered).
+- File contents are read on a thread pool while the walk continues.
+- A persistent manifest keeps (path, size, mtime, sha1) and the last contents
+  read for every file; a rescan only rereads files whose size or mtime
+  changed. Files modified within RACY_WINDOW_NS of being recorded are always
+  reread, since a same-size write in the same mtime tick would go unnoticed.
+- iter_files streams file records as they are found; scan_tree builds the
+  nested structure RepoLoader returns.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Configure logging
+logger = logging.getLogger("app.core.repo_scanner")
+
+DEFAULT_MANIFEST_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "repo_manifest.db")
+
+# Files changed this recently (ns) when recorded are reread on the next scan
+RACY_WINDOW_NS = 2_000_000_000
+
+BINARY_PLACEHOLDER = "<binary file>"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha1 TEXT,
+    contents TEXT,
+    PRIMARY KEY (root, path)
+);
+"""
+
+# Files read per thread pool task
+READ_BATCH = 32
+
+# SQLite's default limit on host parameters per statement
+_MAX_PARAMS = 900
+
+
+@dataclass
+class FileRecord:
+    """A scanned file."""
+    name: str
+    path: str
+    extension: str
+    size: int
+    mtime_ns: int
+    sha1: Optional[str] = None
+    contents: Optional[str] = None
+
+    def info(self) -> Dict[str, Any]:
+        """File entry in the shape of RepoLoader's structure."""
+        info = {"name": self.name, "path": self.path, "extension": self.extension, "size": self.size}
+        if self.contents is not None:
+            info["contents"] = self.contents
+        return info
+
+
+# ---------------------------------------------------------------- .gitignore
+
+
+def _translate(pattern: str) -> str:
+    """Regex body for a gitignore glob ("*", "?", "[...]" and "**")."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                if pattern.startswith("**/", i):
+                    out.append("(?:.*/)?")
+                    i += 3
+                else:
+                    out.append(".*")
+                    i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body[0] in "!^":
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_gitignore(lines: Iterable[str]) -> List[Tuple[re.Pattern, bool, bool]]:
+    """
+    Compile gitignore lines.
+
+    Args:
+        lines: Lines of a .gitignore file
+
+    Returns:
+        List of (regex over "/"-separated relative paths, negated, directories only)
+    """
+    rules = []
+    for line in lines:
+        line = line.rstrip("\n").rstrip("\r")
+        if not line.endswith("\\ "):
+            line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate or line.startswith("\\!") or line.startswith("\\#"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        # A slash anywhere but the end anchors the pattern to the .gitignore's directory
+        anchored = "/" in line
+        body = _translate(line.lstrip("/"))
+        regex = re.compile(("^" if anchored else "(?:^|.*/)") + body + "$", re.DOTALL)
+        rules.append((regex, negate, dir_only))
+    return rules
+
+
+def _ignored(ignores: Sequence[Tuple[str, List[Tuple[re.Pattern, bool, bool]]]], path: str, is_dir: bool) -> bool:
+    """Whether a "/"-separated root-relative path is ignored by the active .gitignore files."""
+    ignored = False
+    for base, rules in ignores:
+        relative = path[len(base) + 1:] if base else path
+        for regex, negate, dir_only in rules:
+            if (is_dir or not dir_only) and regex.match(relative):
+                ignored = not negate
+    return ignored
+
+
+# ------------------------------------------------------------------ manifest
+
+
+class ScanManifest:
+    """
+    SQLite record of scanned files per repository root.
+    """
+
+    def __init__(self, db_path: Optional[str] = DEFAULT_MANIFEST_PATH):
+        """
+        Initialize the manifest.
+
+        Args:
+            db_path: SQLite file, or None for an in-memory database
+        """
+        self.db_path = db_path
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+
+    def entries(self, root: str) -> Dict[str, Tuple[int, int, Optional[str], bool]]:
+        """
+        Recorded files of a root, without their contents.
+
+        Args:
+            root: Absolute repository root
+
+        Returns:
+            Dict of path -> (size, mtime_ns, sha1, has contents)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, size, mtime_ns, sha1, contents IS NOT NULL FROM files WHERE root = ?", (root,)
+            ).fetchall()
+        return {path: (size, mtime_ns, sha1, bool(has_contents)) for path, size, mtime_ns, sha1, has_contents in rows}
+
+    def contents(self, root: str, paths: Sequence[str]) -> Dict[str, str]:
+        """
+        Recorded contents of some files.
+
+        Args:
+            root: Absolute repository root
+            paths: Relative file paths
+
+        Returns:
+            Dict of path -> contents for the paths that have contents
+        """
+        found: Dict[str, str] = {}
+        with self._lock:
+            for start in range(0, len(paths), _MAX_PARAMS):
+                chunk = list(paths[start:start + _MAX_PARAMS])
+                found.update(self._conn.execute(
+                    f"SELECT path, contents FROM files WHERE root = ? AND contents IS NOT NULL "
+                    f"AND path IN ({','.join('?' * len(chunk))})",
+                    [root, *chunk],
+                ).fetchall())
+        return found
+
+    def record(self, root: str, records: Sequence[FileRecord]) -> None:
+        """
+        Store scanned files; files without contents keep their recorded contents if unchanged.
+
+        Args:
+            root: Absolute repository root
+            records: Files to store
+        """
+        racy_after = time.time_ns() - RACY_WINDOW_NS
+        rows = [
+            (root, r.path, r.size, -1 if r.mtime_ns > racy_after else r.mtime_ns, r.sha1, r.contents)
+            for r in records
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO files (root, path, size, mtime_ns, sha1, contents) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(root, path) DO UPDATE SET "
+                "sha1 = CASE WHEN excluded.sha1 IS NULL AND size = excluded.size AND mtime_ns = excluded.mtime_ns "
+                "THEN sha1 ELSE excluded.sha1 END, "
+                "contents = CASE WHEN excluded.contents IS NULL AND size = excluded.size "
+                "AND mtime_ns = excluded.mtime_ns THEN contents ELSE excluded.contents END, "
+                "size = excluded.size, mtime_ns = excluded.mtime_ns",
+                rows,
+            )
+
+    def forget(self, root: str, paths: Iterable[str]) -> int:
+        """
+        Remove files from the manifest.
+
+        Args:
+            root: Absolute repository root
+            paths: Relative file paths
+
+        Returns:
+            Number of files removed
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "DELETE FROM files WHERE root = ? AND path = ?", [(root, path) for path in paths]
+            )
+            return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# ------------------------------------------------------------------- scanner
+
+
+def _read_file(path: str) -> Tuple[Optional[str], Optional[str]]:
+    """Read a file; return (sha1, text), text being BINARY_PLACEHOLDER for non-UTF-8 files."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        logger.warning(f"Could not read {path}: {e}")
+        return None, None
+    try:
+        # Same newline handling as reading in text mode
+        text = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    except UnicodeDecodeError:
+        text = BINARY_PLACEHOLDER
+    return hashlib.sha1(data).hexdigest(), text
+
+
+class _Scan:
+    """State of one scan: options, manifest snapshot and change tracking."""
+
+    def __init__(
+        self,
+        root: str,
+        manifest: Optional[ScanManifest],
+        file_types: Optional[Sequence[str]],
+        exclude_dirs: Sequence[str],
+        include_contents: bool,
+        max_file_size: int,
+        respect_gitignore: bool,
+    ):
+        self.root = root
+        self.key = os.path.realpath(root)
+        self.manifest = manifest
+        self.file_types = set(file_types) if file_types else None
+        self.exclude_dirs = set(exclude_dirs)
+        self.include_contents = include_contents
+        self.max_file_size = max_file_size
+        self.respect_gitignore = respect_gitignore
+        self.known = manifest.entries(self.key) if manifest else {}
+        self.seen: set = set()
+        self.changed: List[FileRecord] = []
+        self.stats = {"files": 0, "directories": 0, "read": 0, "reused": 0, "removed": 0}
+
+    def list_directory(
+        self,
+        path: str,
+        relative_path: str,
+        ignores: tuple,
+        ancestors: frozenset,
+    ) -> Tuple[List[Tuple[str, str, str, tuple, frozenset]], List[FileRecord], List[FileRecord], List[FileRecord]]:
+        """
+        List one directory.
+
+        Returns:
+            (subdirectories as (name, path, relative path, ignores, ancestors),
+             file records, records whose contents must be read,
+             records to store in the manifest once read)
+        """
+        with os.scandir(path) as it:
+            entries = list(it)
+
+        if self.respect_gitignore and any(entry.name == ".gitignore" for entry in entries):
+            try:
+                with open(os.path.join(path, ".gitignore"), encoding="utf-8", errors="replace") as f:
+                    ignores = ignores + ((relative_path.replace(os.sep, "/"), parse_gitignore(f)),)
+            except OSError:
+                pass
+
+        subdirs, records, to_read, reusable, dirty = [], [], [], [], []
+        for entry in entries:
+            item_relative_path = os.path.join(relative_path, entry.name) if relative_path else entry.name
+            match_path = item_relative_path.replace(os.sep, "/")
+            try:
+                if entry.is_dir():
+                    if entry.name in self.exclude_dirs or (ignores and _ignored(ignores, match_path, True)):
+                        continue
+                    real_path = os.path.realpath(entry.path) if entry.is_symlink() else entry.path
+                    if real_path in ancestors:
+                        continue  # Symlink back into the tree
+                    subdirs.append((entry.name, entry.path, item_relative_path, ignores, ancestors | {real_path}))
+                    continue
+                if not entry.is_file():
+                    continue
+                _, ext = os.path.splitext(entry.name)
+                ext = ext.lower()
+                if self.file_types is not None and ext not in self.file_types:
+                    continue
+                if ignores and _ignored(ignores, match_path, False):
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            record = FileRecord(entry.name, item_relative_path, ext, stat.st_size, stat.st_mtime_ns)
+            records.append(record)
+            self.seen.add(item_relative_path)
+
+            known = self.known.get(item_relative_path)
+            unchanged = known is not None and known[0] == record.size and known[1] == record.mtime_ns
+            if unchanged:
+                record.sha1 = known[2]
+            if self.include_contents and record.size <= self.max_file_size:
+                if unchanged and known[3]:
+                    reusable.append(record)
+                else:
+                    to_read.append(record)
+            elif not unchanged:
+                dirty.append(record)
+
+        if reusable:
+            contents = self.manifest.contents(self.key, [record.path for record in reusable])
+            for record in reusable:
+                record.contents = contents.get(record.path)
+                if record.contents is None:
+                    to_read.append(record)
+                else:
+                    self.stats["reused"] += 1
+        dirty.extend(to_read)
+
+        self.stats["files"] += len(records)
+        self.stats["directories"] += len(subdirs)
+        return subdirs, records, to_read, dirty
+
+    def finish(self, complete: bool) -> Dict[str, int]:
+        """Record changed files and, after a complete walk, forget vanished ones."""
+        if self.manifest is not None:
+            if self.changed:
+                self.manifest.record(self.key, self.changed)
+            if complete:
+                gone = [path for path in self.known if path not in self.seen]
+                if gone:
+                    self.stats["removed"] = self.manifest.forget(self.key, gone)
+        self.changed = []
+        return self.stats
+
+
+class RepoScanner:
+    """
+    Scans repository trees, rereading only files changed since the last scan.
+    """
+
+    def __init__(self, manifest: Optional[ScanManifest] = None, max_workers: int = 8):
+        """
+        Initialize the scanner.
+
+        Args:
+            manifest: Manifest of previous scans, or None to always read files
+            max_workers: Threads reading file contents
+        """
+        self.manifest = manifest
+        self.max_workers = max_workers
+
+    def _start(self, root: str, **options: Any) -> _Scan:
+        return _Scan(root, self.manifest, **options)
+
+    def _read(self, scan: _Scan, records: List[FileRecord], pool: ThreadPoolExecutor) -> Dict[int, Future]:
+        """Queue reads in batches of READ_BATCH files; return the future of each record by id."""
+        scan.stats["read"] += len(records)
+        futures = {}
+        for start in range(0, len(records), READ_BATCH):
+            batch = records[start:start + READ_BATCH]
+            future = pool.submit(_read_batch, scan.root, batch)
+            futures.update((id(record), future) for record in batch)
+        return futures
+
+    def scan_tree(
+        self,
+        root: str,
+        include_contents: bool = False,
+        file_types: Optional[Sequence[str]] = None,
+        exclude_dirs: Sequence[str] = (),
+        max_file_size: int = 1024 * 1024,
+        respect_gitignore: bool = True,
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """
+        Scan a directory into a nested structure.
+
+        Args:
+            root: Directory to scan
+            include_contents: Whether to include file contents
+            file_types: File extensions to include, or None for all
+            exclude_dirs: Directory names to skip
+            max_file_size: Maximum file size to include contents for
+            respect_gitignore: Whether to skip files matched by .gitignore
+
+        Returns:
+            Tuple of ({"files": [...], "directories": [...]}, scan statistics)
+        """
+        scan = self._start(
+            root, file_types=file_types, exclude_dirs=exclude_dirs, include_contents=include_contents,
+            max_file_size=max_file_size, respect_gitignore=respect_gitignore,
+        )
+        pending: List[Future] = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            def build(path: str, relative_path: str, ignores: tuple, ancestors: frozenset) -> Dict[str, Any]:
+                subdirs, records, to_read, dirty = scan.list_directory(path, relative_path, ignores, ancestors)
+                pending.extend(set(self._read(scan, to_read, pool).values()))
+                scan.changed.extend(dirty)
+                return {
+                    "files": records,
+                    "directories": [
+                        {"name": name, "path": sub_relative, "structure": build(sub_path, sub_relative, sub_ignores, sub_ancestors)}
+                        for name, sub_path, sub_relative, sub_ignores, sub_ancestors in subdirs
+                    ],
+                }
+
+            tree = build(root, "", (), frozenset({os.path.realpath(root)}))
+            for future in pending:
+                future.result()
+
+        stats = scan.finish(complete=True)
+        return _finish_tree(tree), stats
+
+    def iter_files(
+        self,
+        root: str,
+        include_contents: bool = False,
+        file_types: Optional[Sequence[str]] = None,
+        exclude_dirs: Sequence[str] = (),
+        max_file_size: int = 1024 * 1024,
+        respect_gitignore: bool = True,
+        record_batch: int = 500,
+    ) -> Iterator[FileRecord]:
+        """
+        Stream file records as directories are walked.
+
+        Records come out in walk order; contents are read ahead on the thread
+        pool. The manifest is updated every record_batch changed files and
+        vanished files are forgotten once the walk completes.
+
+        Args:
+            root: Directory to scan
+            include_contents: Whether to include file contents
+            file_types: File extensions to include, or None for all
+            exclude_dirs: Directory names to skip
+            max_file_size: Maximum file size to include contents for
+            respect_gitignore: Whether to skip files matched by .gitignore
+            record_batch: Changed files buffered before writing the manifest
+
+        Yields:
+            FileRecord for every file
+        """
+        scan = self._start(
+            root, file_types=file_types, exclude_dirs=exclude_dirs, include_contents=include_contents,
+            max_file_size=max_file_size, respect_gitignore=respect_gitignore,
+        )
+        read_ahead = self.max_workers * 4
+        complete = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            queue: deque = deque()
+            stack = [(root, "", (), frozenset({os.path.realpath(root)}))]
+            try:
+                while stack or queue:
+                    if stack and len(queue) < read_ahead:
+                        path, relative_path, ignores, ancestors = stack.pop()
+                        subdirs, records, to_read, dirty = scan.list_directory(path, relative_path, ignores, ancestors)
+                        futures = self._read(scan, to_read, pool)
+                        dirty_ids = set(map(id, dirty))
+                        queue.extend((record, futures.get(id(record)), id(record) in dirty_ids) for record in records)
+                        stack.extend((sub_path, sub_relative, sub_ignores, sub_ancestors)
+                                     for _, sub_path, sub_relative, sub_ignores, sub_ancestors in reversed(subdirs))
+                        continue
+                    record, future, is_dirty = queue.popleft()
+                    if future is not None:
+                        future.result()
+                    if is_dirty:
+                        # Stored only once read, so the manifest never records missing contents
+                        scan.changed.append(record)
+                        if len(scan.changed) >= record_batch:
+                            scan.finish(complete=False)
+                    yield record
+                complete = True
+            finally:
+                # Stop reads for records that will never be yielded
+                for _, future, _ in queue:
+                    if future is not None:
+                        future.cancel()
+                scan.finish(complete)
+
+
+def _read_batch(root: str, records: List[FileRecord]) -> None:
+    for record in records:
+        record.sha1, record.contents = _read_file(os.path.join(root, record.path))
+
+
+def _finish_tree(tree: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace file records with RepoLoader file entries."""
+    return {
+        "files": [record.info() for record in tree["files"]],
+        "directories": [
+            {"name": d["name"], "path": d["path"], "structure": _finish_tree(d["structure"])}
+            for d in tree["directories"]
+        ],
+    }
+
+
+_manifest: Optional[ScanManifest] = None
+_manifest_lock = threading.Lock()
+
+
+def get_repo_manifest() -> ScanManifest:
+    """
+    Get the process-wide scan manifest.
+
+    The database location can be overridden with REPO_MANIFEST_DB (empty for
+    an in-memory database).
+    """
+    global _manifest
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = ScanManifest(os.getenv("REPO_MANIFEST_DB", DEFAULT_MANIFEST_PATH) or None)
+        return _manifest
@@ -0,0 +1,90 @@
+"""
+Keyword index for routing prompts to personas and agents.
+
+Routers score a text on which of their keywords occur in it, as substrings of
+the lowercased text. The index maps each keyword to the routes it scores, in
+the order the routes registered them. A keyword without whitespace can only
+occur inside one whitespace-separated token of the text, so the index keeps,
+per token seen, the entries whose keywords the token contains: matching a text
+is one split and one lookup per distinct token, instead of a substring scan of
+the whole text per keyword. The payloads returned are those of every keyword a
+per-keyword ``in`` test would have found, in registration order, so routers
+can apply them exactly as before.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Configure logging
+logger = logging.getLogger("app.core.routing_index")
+
+# Number of distinct tokens whose matching entries are kept
+TOKEN_CACHE_SIZE = 8192
+
+
+class KeywordIndex:
+    """Keywords mapped to the payloads of the routes they score."""
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]]):
+        """
+        Args:
+            entries: (keyword, payload) pairs in the order routes are scored;
+                the same keyword may appear several times
+        """
+        self._payloads: List[Any] = []
+        self._postings: Dict[str, List[int]] = {}
+        for keyword, payload in entries:
+            self._postings.setdefault(keyword.lower(), []).append(len(self._payloads))
+            self._payloads.append(payload)
+
+        # Keywords spanning whitespace are matched against the whole text
+        self._token_keywords = [k for k in self._postings if k and not any(c.isspace() for c in k)]
+        self._text_keywords = [k for k in self._postings if any(c.isspace() for c in k)]
+        self._always = tuple(self._postings.get("", ()))
+        self._tokens: Dict[str, Tuple[int, ...]] = {}
+        logger.debug(f"Indexed {len(self._postings)} routing keywords")
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def _token_entries(self, token: str) -> Tuple[int, ...]:
+        entries = tuple(
+            position
+            for keyword in self._token_keywords if keyword in token
+            for position in self._postings[keyword]
+        )
+        if len(self._tokens) >= TOKEN_CACHE_SIZE:
+            self._tokens.clear()
+        self._tokens[token] = entries
+        return entries
+
+    def matches(self, text_lower: str, tokens: Optional[Sequence[str]] = None) -> List[Any]:
+        """
+        Get the payloads of the keywords occurring in a text.
+
+        Args:
+            text_lower: The lowercased text
+            tokens: The text split on whitespace, if the caller already has it
+
+        Returns:
+            Payloads of the matching entries, in the order they were indexed
+        """
+        if tokens is None:
+            tokens = text_lower.split()
+
+        cached = self._tokens.get
+        found = set(self._always)
+        for token in set(tokens):
+            entries = cached(token)
+            if entries is None:
+                entries = self._token_entries(token)
+            if entries:
+                found.update(entries)
+        for keyword in self._text_keywords:
+            if keyword in text_lower:
+                found.update(self._postings[keyword])
+
+        if not found:
+            return []
+        payloads = self._payloads
+        return [payloads[position] for position in sorted(found)]
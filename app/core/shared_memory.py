@@ -1,6 +1,6 @@
 import os
 from typing import Dict, Any, List, Optional
-from app.core.vector_memory import VectorMemorySystem
+from app.core.vector_memory import get_vector_memory
 import json
 import time
 
@@ -9,7 +9,7 @@ class SharedMemoryLayer:
     Shared memory layer that allows agents to write to and retrieve from a global memory index
     """
     def __init__(self):
-        self.vector_memory = VectorMemorySystem()
+        self.vector_memory = get_vector_memory()
     
     async def store_memory(
         self, 
@@ -82,36 +82,16 @@ class SharedMemoryLayer:
         Returns:
             List of memory items sorted by relevance
         """
-        # Get memories from vector memory
-        memories = await self.vector_memory.search_memories(
+        # Scope, topics and agent_name are indexed metadata, so they are
+        # applied inside the top-k search instead of filtering afterwards
+        return await self.vector_memory.search_memories(
             query=query,
-            limit=limit * 2,  # Get more results for filtering
-            priority_only=priority_only
+            limit=limit,
+            priority_only=priority_only,
+            scope=scope,
+            topics=topics,
+            agent_name=agent_name
         )
-        
-        # Filter results
-        filtered_memories = []
-        for memory in memories:
-            metadata = memory.get("metadata", {})
-            
-            # Filter by scope
-            if scope and metadata.get("scope") != scope:
-                continue
-            
-            # Filter by agent_name
-            if agent_name and metadata.get("agent_name") != agent_name:
-                continue
-            
-            # Filter by topics
-            if topics:
-                memory_topics = metadata.get("topics", [])
-                if not any(topic in memory_topics for topic in topics):
-                    continue
-            
-            filtered_memories.append(memory)
-        
-        # Return limited results
-        return filtered_memories[:limit]
     
     async def format_memories_as_context(
         self, 
@@ -1,10 +1,11 @@
 import os
-import json
 import uuid
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from app.core.task_store import TaskStore, get_task_store
+
 class PendingTask(BaseModel):
     """Model for a pending task"""
     task_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -13,24 +14,38 @@ class PendingTask(BaseModel):
     suggested_agent: str
     created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
     priority: bool = False
-    status: str = "pending"  # pending, executed, cancelled
+    status: str = "pending"  # pending, claimed, executed, cancelled, error
     metadata: Dict[str, Any] = Field(default_factory=dict)
     original_input: Optional[str] = None
     original_output: Optional[str] = None
+    claimed_by: Optional[str] = None
+    claimed_at: Optional[str] = None
 
 class TaskPersistenceManager:
     """
     Manager for suggested task persistence
     
     This class handles storing and retrieving pending tasks that were suggested
-    by agents but not automatically executed.
+    by agents but not automatically executed. Tasks live in an indexed
+    TaskStore; task JSON files from the previous pending_tasks directory are
+    imported on first start.
     """
     
-    def __init__(self):
-        """Initialize the TaskPersistenceManager"""
-        # Set up storage directory
-        self.tasks_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "pending_tasks")
-        os.makedirs(self.tasks_dir, exist_ok=True)
+    def __init__(self, store: Optional[TaskStore] = None, tasks_dir: Optional[str] = None):
+        """
+        Initialize the TaskPersistenceManager
+        
+        Args:
+            store: Task store to use (defaults to the shared store)
+            tasks_dir: Directory of task JSON files written by earlier versions
+        """
+        self.store = store or get_task_store()
+        
+        # Migrate tasks stored as JSON files by earlier versions
+        self.tasks_dir = tasks_dir or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "pending_tasks"
+        )
+        self.store.import_json_dir(self.tasks_dir)
     
     async def store_pending_task(
         self,
@@ -69,9 +84,7 @@ class TaskPersistenceManager:
         )
         
         # Store the task
-        task_file = os.path.join(self.tasks_dir, f"{task.task_id}.json")
-        with open(task_file, "w") as f:
-            json.dump(task.dict(), f, indent=2)
+        self.store.insert(task.dict())
         
         return task.task_id
     
@@ -81,50 +94,34 @@ class TaskPersistenceManager:
         offset: int = 0,
         origin_agent: Optional[str] = None,
         suggested_agent: Optional[str] = None,
-        status: str = "pending"
+        status: str = "pending",
+        after: Optional[str] = None
     ) -> List[PendingTask]:
         """
-        Get pending tasks
+        Get pending tasks, newest first
         
         Args:
             limit: Maximum number of tasks to return
             offset: Offset for pagination
             origin_agent: Filter by origin agent
             suggested_agent: Filter by suggested agent
-            status: Filter by status (pending, executed, cancelled)
+            status: Filter by status (pending, claimed, executed, cancelled, error)
+            after: Return tasks after this task ID, as the next page of an
+                earlier listing
             
         Returns:
             List of pending tasks
         """
-        # Get all task files
-        task_files = [f for f in os.listdir(self.tasks_dir) if f.endswith(".json")]
-        
-        # Load all tasks
-        tasks = []
-        for task_file in task_files:
-            with open(os.path.join(self.tasks_dir, task_file), "r") as f:
-                task_data = json.load(f)
-                task = PendingTask(**task_data)
-                
-                # Apply filters
-                if status and task.status != status:
-                    continue
-                
-                if origin_agent and task.origin_agent != origin_agent:
-                    continue
-                
-                if suggested_agent and task.suggested_agent != suggested_agent:
-                    continue
-                
-                tasks.append(task)
-        
-        # Sort by creation time (newest first)
-        tasks.sort(key=lambda t: t.created_at, reverse=True)
-        
-        # Apply pagination
-        tasks = tasks[offset:offset + limit]
+        tasks = self.store.list(
+            status=status,
+            origin_agent=origin_agent,
+            suggested_agent=suggested_agent,
+            limit=limit,
+            offset=offset,
+            after=after
+        )
         
-        return tasks
+        return [PendingTask(**task_data) for task_data in tasks]
     
     async def get_task(self, task_id: str) -> Optional[PendingTask]:
         """
@@ -136,14 +133,12 @@ class TaskPersistenceManager:
         Returns:
             Task if found, None otherwise
         """
-        task_file = os.path.join(self.tasks_dir, f"{task_id}.json")
+        task_data = self.store.get(task_id)
         
-        if not os.path.exists(task_file):
+        if not task_data:
             return None
         
-        with open(task_file, "r") as f:
-            task_data = json.load(f)
-            return PendingTask(**task_data)
+        return PendingTask(**task_data)
     
     async def update_task_status(
         self,
@@ -156,29 +151,43 @@ class TaskPersistenceManager:
         
         Args:
             task_id: ID of the task
-            status: New status (pending, executed, cancelled)
+            status: New status (pending, claimed, executed, cancelled, error)
             metadata: Additional metadata to update
             
         Returns:
             Updated task if found, None otherwise
         """
-        task = await self.get_task(task_id)
+        task_data = self.store.update(task_id, status=status, metadata=metadata)
         
-        if not task:
+        if not task_data:
             return None
         
-        # Update the task
-        task.status = status
+        return PendingTask(**task_data)
+    
+    async def claim_next(
+        self,
+        agent: Optional[str] = None,
+        claimed_by: Optional[str] = None
+    ) -> Optional[PendingTask]:
+        """
+        Claim the next pending task for a worker
+        
+        High priority tasks are claimed first, then the oldest. Each task is
+        claimed by exactly one caller, also across processes.
         
-        if metadata:
-            task.metadata.update(metadata)
+        Args:
+            agent: Only claim tasks suggested for this agent
+            claimed_by: Identifier of the claiming worker
+            
+        Returns:
+            The claimed task, or None if no task is pending
+        """
+        task_data = self.store.claim_next(agent=agent, claimed_by=claimed_by)
         
-        # Store the updated task
-        task_file = os.path.join(self.tasks_dir, f"{task_id}.json")
-        with open(task_file, "w") as f:
-            json.dump(task.dict(), f, indent=2)
+        if not task_data:
+            return None
         
-        return task
+        return PendingTask(**task_data)
     
     async def execute_task(
         self,
@@ -205,7 +214,7 @@ class TaskPersistenceManager:
         if not task:
             return {"error": f"Task not found: {task_id}"}
         
-        if task.status != "pending":
+        if task.status not in ("pending", "claimed"):
             return {"error": f"Task is not pending: {task_id}", "status": task.status}
         
         try:
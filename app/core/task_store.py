@@ -0,0 +1,306 @@
+"""
+Task Store Module
+
+SQLite-backed queue for the tasks agents suggest but do not execute
+automatically. Each task is one row holding its full JSON body, with the
+fields used for filtering and ordering duplicated into indexed columns:
+
+- (status, created_at) for listing tasks by status, newest first;
+- origin_agent and suggested_agent, each with status and created_at, for the
+  filtered listings;
+- partial indexes over pending tasks for claiming, priority first and then
+  oldest first.
+
+Listings support keyset pagination (continue after a given task) so pages
+stay cheap regardless of how many tasks were ever created, and `claim_next`
+moves the next pending task to "claimed" inside an immediate transaction, so
+concurrent workers, in this process or others, never claim the same task.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger("app.core.task_store")
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "pending_tasks.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    status TEXT NOT NULL,
+    origin_agent TEXT NOT NULL,
+    suggested_agent TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    body TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS tasks_status_created ON tasks (status, created_at, task_id);
+CREATE INDEX IF NOT EXISTS tasks_origin_agent ON tasks (origin_agent, status, created_at, task_id);
+CREATE INDEX IF NOT EXISTS tasks_suggested_agent ON tasks (suggested_agent, status, created_at, task_id);
+CREATE INDEX IF NOT EXISTS tasks_queue ON tasks (priority DESC, created_at, task_id)
+    WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS tasks_agent_queue ON tasks (suggested_agent, priority DESC, created_at, task_id)
+    WHERE status = 'pending';
+
+CREATE TABLE IF NOT EXISTS imports (
+    source TEXT PRIMARY KEY,
+    imported_at TEXT NOT NULL,
+    task_count INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def _row(task: Dict[str, Any]) -> tuple:
+    return (
+        task["task_id"],
+        task["created_at"],
+        task["status"],
+        task["origin_agent"],
+        task["suggested_agent"],
+        1 if task.get("priority") else 0,
+        json.dumps(task),
+    )
+
+
+class TaskStore:
+    """
+    Indexed task queue backed by SQLite.
+    """
+
+    def __init__(self, db_path: Optional[str] = DEFAULT_DB_PATH):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: SQLite file, or None for an in-memory database
+        """
+        self.db_path = db_path
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        # Autocommit mode; writes open their own immediate transactions
+        self._conn = sqlite3.connect(db_path or ":memory:", check_same_thread=False,
+                                     isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+
+    def _write(self):
+        return _ImmediateTransaction(self._conn)
+
+    def insert(self, task: Dict[str, Any]) -> None:
+        """
+        Add a task.
+
+        Args:
+            task: Task dict with at least task_id, created_at, status,
+                origin_agent and suggested_agent
+        """
+        with self._lock, self._write():
+            self._conn.execute("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)", _row(task))
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a task by ID.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            Task dict, or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list(
+        self,
+        status: Optional[str] = "pending",
+        origin_agent: Optional[str] = None,
+        suggested_agent: Optional[str] = None,
+        limit: int = 10,
+        offset: int = 0,
+        after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List tasks, newest first.
+
+        Args:
+            status: Filter by status; all statuses if empty
+            origin_agent: Filter by origin agent
+            suggested_agent: Filter by suggested agent
+            limit: Maximum number of tasks to return
+            offset: Number of matching tasks to skip
+            after: Continue after this task ID (keyset pagination)
+
+        Returns:
+            List of task dicts
+        """
+        clauses, params = [], []
+        for column, value in (("status", status), ("origin_agent", origin_agent),
+                              ("suggested_agent", suggested_agent)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+
+        with self._lock:
+            if after:
+                cursor = self._conn.execute(
+                    "SELECT created_at FROM tasks WHERE task_id = ?", (after,)
+                ).fetchone()
+                if cursor is None:
+                    return []
+                clauses.append("(created_at, task_id) < (?, ?)")
+                params.extend([cursor[0], after])
+
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            rows = self._conn.execute(
+                f"SELECT body FROM tasks {where} ORDER BY created_at DESC, task_id DESC LIMIT ? OFFSET ?",
+                (*params, max(0, limit), max(0, offset)),
+            ).fetchall()
+        return [json.loads(body) for (body,) in rows]
+
+    def update(
+        self,
+        task_id: str,
+        status: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **fields: Any
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update a task's status, metadata or other fields.
+
+        Args:
+            task_id: ID of the task
+            status: New status
+            metadata: Metadata entries to merge into the task's metadata
+            **fields: Other task fields to set
+
+        Returns:
+            Updated task dict, or None if not found
+        """
+        with self._lock, self._write():
+            row = self._conn.execute("SELECT body FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+            if row is None:
+                return None
+            task = json.loads(row[0])
+            task.update(fields)
+            if status:
+                task["status"] = status
+            if metadata:
+                task.setdefault("metadata", {}).update(metadata)
+            self._conn.execute("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)", _row(task))
+        return task
+
+    def claim_next(self, agent: Optional[str] = None, claimed_by: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Atomically claim the next pending task, high priority first, then oldest.
+
+        Args:
+            agent: Only claim tasks suggested for this agent
+            claimed_by: Identifier of the claiming worker (defaults to agent)
+
+        Returns:
+            The claimed task dict, or None if no task is pending
+        """
+        if agent:
+            query = ("SELECT task_id FROM tasks INDEXED BY tasks_agent_queue "
+                     "WHERE status = 'pending' AND suggested_agent = ? "
+                     "ORDER BY priority DESC, created_at, task_id LIMIT 1")
+            params = (agent,)
+        else:
+            query = ("SELECT task_id FROM tasks INDEXED BY tasks_queue WHERE status = 'pending' "
+                     "ORDER BY priority DESC, created_at, task_id LIMIT 1")
+            params = ()
+
+        with self._lock, self._write():
+            row = self._conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            return self.update(
+                row[0], status="claimed",
+                claimed_by=claimed_by or agent, claimed_at=datetime.now().isoformat(),
+            )
+
+    def import_json_dir(self, tasks_dir: str) -> int:
+        """
+        Import task JSON files from a directory, once per directory.
+
+        Args:
+            tasks_dir: Directory of <task_id>.json files
+
+        Returns:
+            Number of tasks imported (0 if the directory was imported before)
+        """
+        source = os.path.realpath(tasks_dir)
+        if not os.path.isdir(source):
+            return 0
+
+        with self._lock, self._write():
+            if self._conn.execute("SELECT 1 FROM imports WHERE source = ?", (source,)).fetchone():
+                return 0
+
+            rows = []
+            for name in sorted(os.listdir(source)):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(source, name), "r") as f:
+                        rows.append(_row(json.load(f)))
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Skipping unreadable task file {name}: {e}")
+            self._conn.executemany("INSERT OR IGNORE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute(
+                "INSERT INTO imports (source, imported_at, task_count) VALUES (?, ?, ?)",
+                (source, datetime.now().isoformat(), len(rows)),
+            )
+
+        if rows:
+            logger.info(f"Imported {len(rows)} task files from {source}")
+        return len(rows)
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        self._conn.close()
+
+
+class _ImmediateTransaction:
+    """Immediate write transaction; nested uses join the outer one."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._outer = False
+
+    def __enter__(self):
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._outer = True
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._outer:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+_store: Optional[TaskStore] = None
+
+
+def get_task_store() -> TaskStore:
+    """
+    Get the process-wide task store.
+
+    The database location can be overridden with PENDING_TASK_DB.
+    """
+    global _store
+    if _store is None:
+        _store = TaskStore(os.getenv("PENDING_TASK_DB", DEFAULT_DB_PATH) or None)
+    return _store
@@ -3,16 +3,26 @@ Tool Router for the Personal AI Agent System.
 
 This module provides dynamic discovery, routing, fallback mechanisms, and logging
 for all tools available to the agent system.
+
+Discovery is lazy: tool modules are found by scanning their source for a
+top-level `run` (cached in a manifest keyed on file mtimes) and imported on
+first use. `execute_tool_async` runs sync tools in a bounded thread pool with
+per-tool timeouts and concurrency limits.
 """
 
 import os
+import ast
+import asyncio
 import importlib
 import inspect
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Callable, Optional
 import json
 from datetime import datetime
 
+os.makedirs("app/logs/tool_logs", exist_ok=True)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,59 +35,198 @@ logging.basicConfig(
 
 logger = logging.getLogger("tool_router")
 
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "tool_manifest.json")
+MANIFEST_VERSION = 1
+
+def scan_tool_source(path: str) -> Dict[str, Any]:
+    """
+    Inspect a tool module's source for a top-level `run` without importing it.
+    
+    Args:
+        path: Path to the tool module
+        
+    Returns:
+        Dictionary with has_run, is_async, parameters and docstring
+    """
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+    
+    info = {"has_run": False, "is_async": False, "parameters": None, "docstring": None}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == "run":
+            info.update(
+                has_run=True,
+                is_async=isinstance(node, ast.AsyncFunctionDef),
+                parameters=f"({ast.unparse(node.args)})",
+                docstring=ast.get_docstring(node),
+            )
+        elif isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "run" for t in node.targets):
+            info.update(has_run=True, is_async=False, parameters=None, docstring=None)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)) and any((a.asname or a.name) == "run" for a in node.names):
+            info.update(has_run=True, is_async=False, parameters=None, docstring=None)
+    return info
+
 class ToolRouter:
     """
     Dynamic tool router that discovers, loads, and routes tool calls.
     Provides fallback mechanisms and logging for all tool executions.
     """
     
-    def __init__(self, tools_dir: str = "app/tools"):
+    def __init__(self, tools_dir: str = "app/tools", package: str = "app.tools",
+                 lazy: bool = True, manifest_path: Optional[str] = MANIFEST_PATH,
+                 max_workers: Optional[int] = None, default_timeout: Optional[float] = None,
+                 default_concurrency: Optional[int] = None):
         """
         Initialize the tool router.
         
         Args:
             tools_dir: Directory containing tool modules
+            package: Import package of the tool modules
+            lazy: Import tools on first use instead of during discovery
+            manifest_path: Discovery cache file, or None to always rescan
+            max_workers: Thread pool size for sync tools (TOOL_ROUTER_MAX_WORKERS, default 8)
+            default_timeout: Seconds before an async execution times out (TOOL_ROUTER_TIMEOUT, default 60)
+            default_concurrency: Concurrent executions per tool (TOOL_ROUTER_TOOL_CONCURRENCY, default 4)
         """
         self.tools_dir = tools_dir
+        self.package = package
+        self.lazy = lazy
+        self.manifest_path = manifest_path
         self.tools: Dict[str, Callable] = {}
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        
+        self.max_workers = max_workers or int(os.getenv("TOOL_ROUTER_MAX_WORKERS", "8"))
+        self.default_timeout = default_timeout or float(os.getenv("TOOL_ROUTER_TIMEOUT", "60"))
+        self.default_concurrency = default_concurrency or int(os.getenv("TOOL_ROUTER_TOOL_CONCURRENCY", "4"))
+        self.tool_timeouts: Dict[str, float] = {}
+        self.tool_concurrency: Dict[str, int] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
         self.discover_tools()
+    
+    @property
+    def tools_path(self) -> str:
+        if os.path.isabs(self.tools_dir):
+            return self.tools_dir
+        # Get the absolute path to the tools directory
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(base_dir, "tools")
         
     def discover_tools(self) -> None:
         """
-        Dynamically discover all available tools in the tools directory.
+        Discover all available tools in the tools directory.
         Tools must have a 'run' function to be considered valid.
+        
+        Modules are scanned, not imported; results are cached per file and
+        reused while the file's mtime and size are unchanged. With lazy=False
+        every tool is also imported immediately.
         """
         logger.info(f"Discovering tools in directory: {self.tools_dir}")
-        
-        # Get the absolute path to the tools directory
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        tools_path = os.path.join(base_dir, "tools")
+        tools_path = self.tools_path
         
         # Get all Python files in the tools directory
         try:
-            tool_files = [
-                f[:-3] for f in os.listdir(tools_path) 
-                if f.endswith('.py') and f != '__init__.py'
+            entries = [
+                entry for entry in os.scandir(tools_path)
+                if entry.name.endswith('.py') and entry.name != '__init__.py'
             ]
         except Exception as e:
             logger.error(f"Error accessing tools directory: {str(e)}")
             return
         
-        for tool_file in tool_files:
-            try:
-                # Import the module
-                module_path = f"app.tools.{tool_file}"
-                module = importlib.import_module(module_path)
-                
-                # Check if the module has a run function
-                if hasattr(module, 'run') and callable(module.run):
-                    # Register the tool with its name (file name without extension)
-                    self.tools[tool_file] = module.run
-                    logger.info(f"Successfully loaded tool: {tool_file}")
-                else:
-                    logger.warning(f"Tool {tool_file} does not have a 'run' function and will be skipped")
-            except Exception as e:
-                logger.error(f"Error loading tool {tool_file}: {str(e)}")
+        cached = self._read_manifest(tools_path)
+        files: Dict[str, Dict[str, Any]] = {}
+        changed = len(cached) != len(entries)
+        
+        for entry in entries:
+            stat = entry.stat()
+            info = cached.get(entry.name)
+            if not info or info["mtime_ns"] != stat.st_mtime_ns or info["size"] != stat.st_size:
+                changed = True
+                try:
+                    info = scan_tool_source(entry.path)
+                except Exception as e:
+                    # Unparseable source; let the import report the real error
+                    logger.error(f"Error scanning tool {entry.name[:-3]}: {str(e)}")
+                    info = {"has_run": True, "is_async": False, "parameters": None, "docstring": None}
+                info.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            files[entry.name] = info
+        
+        if changed:
+            self._write_manifest(tools_path, files)
+        
+        self.manifest = {
+            name[:-3]: info for name, info in files.items() if info["has_run"]
+        }
+        for name in sorted(files):
+            if not files[name]["has_run"]:
+                logger.warning(f"Tool {name[:-3]} does not have a 'run' function and will be skipped")
+        logger.info(f"Discovered {len(self.manifest)} tools")
+        
+        if not self.lazy:
+            for tool_name in list(self.manifest):
+                self._load_tool(tool_name)
+    
+    def _read_manifest(self, tools_path: str) -> Dict[str, Dict[str, Any]]:
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION or data.get("tools_path") != tools_path:
+                return {}
+            return data.get("files", {})
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable tool manifest: {str(e)}")
+            return {}
+    
+    def _write_manifest(self, tools_path: str, files: Dict[str, Dict[str, Any]]) -> None:
+        if not self.manifest_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": MANIFEST_VERSION, "tools_path": tools_path, "files": files}, f)
+            os.replace(tmp_path, self.manifest_path)
+        except Exception as e:
+            logger.warning(f"Could not write tool manifest: {str(e)}")
+    
+    def _load_tool(self, tool_name: str) -> Optional[Callable]:
+        """
+        Import a discovered tool on first use.
+        
+        Args:
+            tool_name: Name of the tool
+            
+        Returns:
+            The tool's run function, or None if it cannot be loaded
+        """
+        tool_func = self.tools.get(tool_name)
+        if tool_func is not None:
+            return tool_func
+        if tool_name not in self.manifest:
+            return None
+        
+        try:
+            # Import the module
+            module = importlib.import_module(f"{self.package}.{tool_name}")
+            
+            # Check if the module has a run function
+            if hasattr(module, 'run') and callable(module.run):
+                # Register the tool with its name (file name without extension)
+                self.tools[tool_name] = module.run
+                logger.info(f"Successfully loaded tool: {tool_name}")
+                return module.run
+            logger.warning(f"Tool {tool_name} does not have a 'run' function and will be skipped")
+        except Exception as e:
+            logger.error(f"Error loading tool {tool_name}: {str(e)}")
+        
+        # Don't retry a broken tool on every call
+        self.manifest.pop(tool_name, None)
+        return None
     
     def list_available_tools(self) -> List[str]:
         """
@@ -86,7 +235,7 @@ class ToolRouter:
         Returns:
             List of tool names
         """
-        return list(self.tools.keys())
+        return list(self.manifest.keys())
     
     def get_tool_info(self, tool_name: str) -> Dict[str, Any]:
         """
@@ -98,16 +247,27 @@ class ToolRouter:
         Returns:
             Dictionary with tool information
         """
-        if tool_name not in self.tools:
+        if tool_name not in self.manifest:
             return {"error": f"Tool '{tool_name}' not found"}
         
-        tool_func = self.tools[tool_name]
-        signature = inspect.signature(tool_func)
+        info = self.manifest[tool_name]
+        tool_func = self.tools.get(tool_name)
+        if tool_func is None and info["parameters"] is None:
+            # `run` is assigned or re-exported; only the module knows its signature
+            tool_func = self._load_tool(tool_name)
+            if tool_func is None:
+                return {"error": f"Tool '{tool_name}' could not be loaded"}
         
+        if tool_func is not None:
+            return {
+                "name": tool_name,
+                "parameters": str(inspect.signature(tool_func)),
+                "docstring": inspect.getdoc(tool_func) or "No documentation available"
+            }
         return {
             "name": tool_name,
-            "parameters": str(signature),
-            "docstring": inspect.getdoc(tool_func) or "No documentation available"
+            "parameters": info["parameters"],
+            "docstring": info["docstring"] or "No documentation available"
         }
     
     def execute_tool(self, tool_name: str, **kwargs) -> Dict[str, Any]:
@@ -121,32 +281,125 @@ class ToolRouter:
         Returns:
             Result of the tool execution
         """
-        if tool_name not in self.tools:
+        tool_func = self._load_tool(tool_name)
+        if tool_func is None:
             error_msg = f"Tool '{tool_name}' not found"
             logger.error(error_msg)
             return self._handle_fallback(tool_name, error_msg, kwargs)
         
         try:
-            # Log the tool execution
-            self._log_tool_execution(tool_name, kwargs)
-            
-            logger.info(f"Executing tool: {tool_name} with args: {kwargs}")
-            result = self.tools[tool_name](**kwargs)
-            logger.info(f"Tool {tool_name} executed successfully")
-            
-            # Log the tool result
-            self._log_tool_result(tool_name, result)
-            
-            # Check if we should store memory
-            if kwargs.get('store_memory', False) and 'memory_manager' in kwargs:
-                self._store_tool_memory(tool_name, kwargs, result, kwargs['memory_manager'])
+            result = self._invoke(tool_name, tool_func, kwargs)
+            return {"success": True, "result": result}
+        except Exception as e:
+            error_msg = f"Error executing tool {tool_name}: {str(e)}"
+            logger.error(error_msg)
+            return self._handle_fallback(tool_name, error_msg, kwargs)
+    
+    async def execute_tool_async(self, tool_name: str, timeout: Optional[float] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Execute a tool by name without blocking the event loop.
+        
+        Async tools are awaited directly; sync tools run in the router's
+        bounded thread pool. Executions of the same tool are limited to its
+        concurrency limit, and each one is cut off after its timeout (the
+        worker thread of a timed-out sync tool finishes in the background).
+        
+        Args:
+            tool_name: Name of the tool to execute
+            timeout: Seconds to wait; defaults to the tool's configured timeout
+            **kwargs: Arguments to pass to the tool
             
+        Returns:
+            Result of the tool execution
+        """
+        loop = asyncio.get_running_loop()
+        self._bind_loop(loop)
+        
+        tool_func = self.tools.get(tool_name)
+        if tool_func is None:
+            # First use imports the module; keep that off the loop too
+            tool_func = await loop.run_in_executor(self._get_executor(), self._load_tool, tool_name)
+        if tool_func is None:
+            error_msg = f"Tool '{tool_name}' not found"
+            logger.error(error_msg)
+            return self._handle_fallback(tool_name, error_msg, kwargs)
+        
+        timeout = timeout or self.tool_timeouts.get(tool_name, self.default_timeout)
+        try:
+            async with self._get_semaphore(tool_name):
+                if inspect.iscoroutinefunction(tool_func):
+                    self._log_tool_execution(tool_name, kwargs)
+                    logger.info(f"Executing tool: {tool_name} with args: {kwargs}")
+                    result = await asyncio.wait_for(tool_func(**kwargs), timeout)
+                    self._after_execution(tool_name, kwargs, result)
+                else:
+                    result = await asyncio.wait_for(
+                        loop.run_in_executor(self._get_executor(), self._invoke, tool_name, tool_func, kwargs),
+                        timeout
+                    )
             return {"success": True, "result": result}
+        except asyncio.TimeoutError:
+            error_msg = f"Tool {tool_name} timed out after {timeout}s"
+            logger.error(error_msg)
+            return self._handle_fallback(tool_name, error_msg, kwargs)
         except Exception as e:
             error_msg = f"Error executing tool {tool_name}: {str(e)}"
             logger.error(error_msg)
             return self._handle_fallback(tool_name, error_msg, kwargs)
     
+    def configure_tool(self, tool_name: str, timeout: Optional[float] = None,
+                       max_concurrency: Optional[int] = None) -> None:
+        """
+        Set a per-tool timeout and/or concurrency limit for execute_tool_async.
+        
+        Args:
+            tool_name: Name of the tool
+            timeout: Seconds before an execution times out
+            max_concurrency: Maximum concurrent executions of this tool
+        """
+        if timeout is not None:
+            self.tool_timeouts[tool_name] = timeout
+        if max_concurrency is not None:
+            self.tool_concurrency[tool_name] = max_concurrency
+            self._semaphores.pop(tool_name, None)
+    
+    def _invoke(self, tool_name: str, tool_func: Callable, kwargs: Dict[str, Any]) -> Any:
+        """Run a tool with execution/result logging and optional memory storage."""
+        # Log the tool execution
+        self._log_tool_execution(tool_name, kwargs)
+        
+        logger.info(f"Executing tool: {tool_name} with args: {kwargs}")
+        result = tool_func(**kwargs)
+        self._after_execution(tool_name, kwargs, result)
+        return result
+    
+    def _after_execution(self, tool_name: str, kwargs: Dict[str, Any], result: Any) -> None:
+        logger.info(f"Tool {tool_name} executed successfully")
+        
+        # Log the tool result
+        self._log_tool_result(tool_name, result)
+        
+        # Check if we should store memory
+        if kwargs.get('store_memory', False) and 'memory_manager' in kwargs:
+            self._store_tool_memory(tool_name, kwargs, result, kwargs['memory_manager'])
+    
+    def _bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Semaphores belong to one event loop (e.g. successive asyncio.run() calls)
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphores = {}
+    
+    def _get_semaphore(self, tool_name: str) -> asyncio.Semaphore:
+        if tool_name not in self._semaphores:
+            limit = self.tool_concurrency.get(tool_name, self.default_concurrency)
+            self._semaphores[tool_name] = asyncio.Semaphore(limit)
+        return self._semaphores[tool_name]
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tool-router")
+        return self._executor
+    
     def _handle_fallback(self, tool_name: str, error_msg: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """
         Handle fallback when a tool fails to execute.
@@ -188,7 +441,7 @@ class ToolRouter:
         """
         # Simple string similarity check
         return [
-            name for name in self.tools.keys()
+            name for name in self.manifest.keys()
             if name.startswith(tool_name[:3]) or tool_name.startswith(name[:3])
         ]
     
@@ -0,0 +1,378 @@
+"""
+Vector Index
+
+In-process cosine-similarity index backed by a contiguous float32 matrix of
+L2-normalized rows. Search is a single matrix-vector product followed by an
+argpartition top-k, with metadata filters applied as boolean masks built from
+small inverted indexes.
+
+Persistence is append-only:
+- vectors.npy      memory-mapped .npy matrix; a new vector is written into the
+                   next free row and the file doubles in size when full
+- metadata.jsonl   sidecar log of add/update/delete records, replayed on load
+
+Deletes are tombstones in the log; compact() rewrites both files with only the
+live rows once tombstones pile up.
+"""
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger("app.core.vector_index")
+
+# Metadata fields that get an inverted index for mask-based filtering
+INDEXED_FIELDS = ("scope", "agent_name", "topics", "priority", "project_id", "agent_id")
+
+
+class VectorIndex:
+    """
+    Append-only, memory-mapped vector index with top-k cosine search.
+    """
+
+    def __init__(self, path: str, dimension: int, initial_capacity: int = 1024,
+                 compact_ratio: float = 0.5, min_compact_rows: int = 1024):
+        """
+        Open or create an index stored in the given directory.
+
+        Args:
+            path: Directory holding vectors.npy and metadata.jsonl
+            dimension: Vector dimension
+            initial_capacity: Rows allocated when the index is created
+            compact_ratio: Compact automatically once this fraction of rows is dead
+            min_compact_rows: Never auto-compact below this many dead rows
+        """
+        self.path = path
+        self.dimension = dimension
+        self.compact_ratio = compact_ratio
+        self.min_compact_rows = min_compact_rows
+
+        self._vectors_file = os.path.join(path, "vectors.npy")
+        self._log_file = os.path.join(path, "metadata.jsonl")
+
+        self._vectors: Optional[np.memmap] = None
+        self._count = 0
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._inverted: Dict[str, Dict[Any, Set[int]]] = {field: {} for field in INDEXED_FIELDS}
+
+        os.makedirs(path, exist_ok=True)
+        self._load(initial_capacity)
+        self._log = open(self._log_file, "a")
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    @property
+    def dead_rows(self) -> int:
+        return self._count - len(self._rows)
+
+    # ------------------------------------------------------------------ storage
+
+    def _load(self, initial_capacity: int) -> None:
+        if os.path.exists(self._vectors_file):
+            self._vectors = np.load(self._vectors_file, mmap_mode="r+")
+            if self._vectors.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Index at {self.path} has dimension {self._vectors.shape[1]}, expected {self.dimension}"
+                )
+        else:
+            self._vectors = np.lib.format.open_memmap(
+                self._vectors_file, mode="w+", dtype=np.float32, shape=(initial_capacity, self.dimension)
+            )
+
+        self._alive = np.zeros(self._vectors.shape[0], dtype=bool)
+
+        if os.path.exists(self._log_file):
+            with open(self._log_file, "r") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-append; everything before it is valid
+                        logger.warning(f"Skipping unreadable line in {self._log_file}")
+                        continue
+                    self._replay(entry)
+
+        logger.info(f"Loaded vector index from {self.path}: {len(self)} live rows, {self.dead_rows} dead")
+
+    def _replay(self, entry: Dict[str, Any]) -> None:
+        op = entry.get("op")
+        if op == "add":
+            row = entry["row"]
+            if row >= self._vectors.shape[0]:
+                return
+            self._count = max(self._count, row + 1)
+            while len(self._ids) < self._count:
+                self._ids.append(None)
+            self._index_row(entry["id"], row, entry["record"])
+        elif op == "update":
+            if entry["id"] in self._rows:
+                self._reindex(entry["id"], entry["record"])
+        elif op == "delete":
+            self._unindex(entry["id"])
+
+    def _append_log(self, entry: Dict[str, Any]) -> None:
+        self._log.write(json.dumps(entry) + "\n")
+        self._log.flush()
+
+    def _grow(self) -> None:
+        """Double the row capacity of vectors.npy (amortized O(1) per add)."""
+        capacity = max(1, self._vectors.shape[0]) * 2
+        tmp_file = self._vectors_file + ".tmp"
+        grown = np.lib.format.open_memmap(tmp_file, mode="w+", dtype=np.float32, shape=(capacity, self.dimension))
+        grown[:self._count] = self._vectors[:self._count]
+        grown.flush()
+        del grown
+        self._vectors.flush()
+        self._vectors = None
+        os.replace(tmp_file, self._vectors_file)
+        self._vectors = np.load(self._vectors_file, mmap_mode="r+")
+
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:len(self._alive)] = self._alive
+        self._alive = alive
+        logger.info(f"Grew vector index at {self.path} to {capacity} rows")
+
+    # ------------------------------------------------------------ in-memory index
+
+    def _index_row(self, item_id: str, row: int, record: Dict[str, Any]) -> None:
+        if item_id in self._rows:
+            self._unindex(item_id)
+        self._rows[item_id] = row
+        self._ids[row] = item_id
+        self._records[item_id] = record
+        self._alive[row] = True
+        for field, value in self._indexed_values(record):
+            self._inverted[field].setdefault(value, set()).add(row)
+
+    def _unindex(self, item_id: str) -> None:
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return
+        record = self._records.pop(item_id)
+        self._alive[row] = False
+        self._ids[row] = None
+        for field, value in self._indexed_values(record):
+            rows = self._inverted[field].get(value)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del self._inverted[field][value]
+
+    def _reindex(self, item_id: str, record: Dict[str, Any]) -> None:
+        row = self._rows[item_id]
+        self._unindex(item_id)
+        self._index_row(item_id, row, record)
+
+    @staticmethod
+    def _indexed_values(record: Dict[str, Any]) -> Iterable[Tuple[str, Any]]:
+        metadata = record.get("metadata") or {}
+        for field in INDEXED_FIELDS:
+            value = metadata.get(field)
+            if value is None:
+                continue
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, (str, int, float, bool)):
+                        yield field, item
+            elif isinstance(value, (str, int, float, bool)):
+                yield field, value
+
+    # ---------------------------------------------------------------- public API
+
+    def add(self, item_id: str, vector: np.ndarray, record: Dict[str, Any]) -> None:
+        """
+        Add (or replace) a vector with its record.
+
+        Args:
+            item_id: Unique ID of the item
+            vector: Vector of length dimension; it is L2-normalized on insert
+            record: JSON-serializable record; record["metadata"] feeds the filters
+        """
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dimension:
+            raise ValueError(f"Vector has dimension {vector.shape[0]}, expected {self.dimension}")
+
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector = vector / norm
+
+        if self._count >= self._vectors.shape[0]:
+            self._grow()
+
+        row = self._count
+        self._vectors[row] = vector
+        self._count += 1
+        self._ids.append(None)
+
+        self._append_log({"op": "add", "id": item_id, "row": row, "record": record})
+        self._index_row(item_id, row, record)
+        self._maybe_compact()
+
+    def update(self, item_id: str, record: Dict[str, Any]) -> bool:
+        """
+        Replace the record of an existing item without touching its vector.
+
+        Returns:
+            True if updated, False if not found
+        """
+        if item_id not in self._rows:
+            return False
+        self._append_log({"op": "update", "id": item_id, "record": record})
+        self._reindex(item_id, record)
+        return True
+
+    def remove(self, item_id: str) -> bool:
+        """
+        Tombstone an item.
+
+        Returns:
+            True if removed, False if not found
+        """
+        if item_id not in self._rows:
+            return False
+        self._append_log({"op": "delete", "id": item_id})
+        self._unindex(item_id)
+        self._maybe_compact()
+        return True
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Get the record for an item, or None if not found."""
+        return self._records.get(item_id)
+
+    def latest(self, limit: int, filters: Optional[Dict[str, Any]] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Get the most recently added live items, newest first.
+
+        Args:
+            limit: Maximum number of items to return
+            filters: Metadata filters, as for search()
+
+        Returns:
+            List of (item_id, record) tuples
+        """
+        mask = self._mask(filters)
+        rows = np.flatnonzero(mask)[::-1][:limit]
+        return [(self._ids[row], self._records[self._ids[row]]) for row in rows]
+
+    def search(self, vector: np.ndarray, k: int = 5,
+               filters: Optional[Dict[str, Any]] = None) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """
+        Top-k cosine similarity search.
+
+        Args:
+            vector: Query vector of length dimension
+            k: Number of results to return
+            filters: Metadata filters; each key must be in INDEXED_FIELDS. A list
+                value matches items having any of its values.
+
+        Returns:
+            List of (item_id, score, record) tuples, best first
+        """
+        if k <= 0 or not self._rows:
+            return []
+
+        query = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(query))
+        if norm > 0:
+            query = query / norm
+
+        mask = self._mask(filters)
+        candidates = int(mask.sum())
+        if candidates == 0:
+            return []
+
+        scores = self._vectors[:self._count] @ query
+        scores = np.where(mask, scores, -np.inf)
+
+        k = min(k, candidates)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return [(self._ids[row], float(scores[row]), self._records[self._ids[row]]) for row in top]
+
+    def _mask(self, filters: Optional[Dict[str, Any]]) -> np.ndarray:
+        mask = self._alive[:self._count].copy()
+        for field, wanted in (filters or {}).items():
+            if field not in self._inverted:
+                raise ValueError(f"Cannot filter on unindexed field '{field}'")
+            values = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            field_mask = np.zeros(self._count, dtype=bool)
+            for value in values:
+                rows = self._inverted[field].get(value)
+                if rows:
+                    field_mask[np.fromiter(rows, dtype=np.int64, count=len(rows))] = True
+            mask &= field_mask
+        return mask
+
+    # ----------------------------------------------------------------- lifecycle
+
+    def _maybe_compact(self) -> None:
+        dead = self.dead_rows
+        if dead >= self.min_compact_rows and dead >= self.compact_ratio * self._count:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite vectors.npy and metadata.jsonl with only the live rows."""
+        live_rows = np.flatnonzero(self._alive[:self._count])
+        capacity = max(1024, 1 << int(max(1, len(live_rows))).bit_length())
+
+        tmp_vectors = self._vectors_file + ".tmp"
+        tmp_log = self._log_file + ".tmp"
+
+        compacted = np.lib.format.open_memmap(tmp_vectors, mode="w+", dtype=np.float32, shape=(capacity, self.dimension))
+        compacted[:len(live_rows)] = self._vectors[live_rows]
+        compacted.flush()
+        del compacted
+
+        with open(tmp_log, "w") as f:
+            for new_row, old_row in enumerate(live_rows):
+                item_id = self._ids[old_row]
+                f.write(json.dumps({"op": "add", "id": item_id, "row": new_row, "record": self._records[item_id]}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._log.close()
+        self._vectors = None
+        os.replace(tmp_vectors, self._vectors_file)
+        os.replace(tmp_log, self._log_file)
+
+        records = {self._ids[row]: self._records[self._ids[row]] for row in live_rows}
+        ordered_ids = [self._ids[row] for row in live_rows]
+
+        self._vectors = np.load(self._vectors_file, mmap_mode="r+")
+        self._count = 0
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._ids = []
+        self._rows = {}
+        self._records = {}
+        self._inverted = {field: {} for field in INDEXED_FIELDS}
+        for row, item_id in enumerate(ordered_ids):
+            self._ids.append(None)
+            self._count += 1
+            self._index_row(item_id, row, records[item_id])
+
+        self._log = open(self._log_file, "a")
+        logger.info(f"Compacted vector index at {self.path} to {len(self)} rows")
+
+    def flush(self) -> None:
+        """Flush pending vector writes to disk."""
+        if self._vectors is not None:
+            self._vectors.flush()
+        self._log.flush()
+
+    def close(self) -> None:
+        """Flush and close the index files."""
+        self.flush()
+        self._log.close()
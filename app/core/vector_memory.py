@@ -1,120 +1,167 @@
 """
 Vector Memory System
 
-This module provides a simple vector memory system for storing and retrieving text.
+This module provides a vector memory system for storing and retrieving text.
+Memories are embedded and kept in a VectorIndex (contiguous float32 matrix,
+top-k cosine search, append-only memory-mapped persistence), so writes cost
+O(1) instead of rewriting a JSON file of every memory.
 """
 import os
 import time
 import json
+import uuid
 import logging
 import asyncio
 from typing import Dict, List, Tuple, Any, Optional
 
+from app.core.vector_index import VectorIndex
+from app.modules.memory_embed import HashingEmbedder
+
 # Configure logging
 logger = logging.getLogger("app.core.vector_memory")
 
-class MockMemorySystem:
+DATA_DIR = os.path.join(os.path.dirname(__file__), "../data")
+VECTOR_INDEX_DIR = os.path.join(DATA_DIR, "vector_index")
+LEGACY_MEMORY_FILE = os.path.join(DATA_DIR, "memories.json")
+
+# One VectorIndex per directory, shared by every VectorMemorySystem in the process
+_indexes: Dict[str, VectorIndex] = {}
+
+def _format_memories_as_context(memories: List[Dict[str, Any]]) -> str:
     """
-    A mock implementation of a vector memory system.
-    This is used for development and testing.
+    Format a list of memories as context for an agent
+    
+    Args:
+        memories: List of memory items
+        
+    Returns:
+        Formatted context string
     """
+    if not memories:
+        return ""
+    
+    context_parts = ["## Relevant Past Interactions\n"]
     
-    def __init__(self):
-        """Initialize the mock memory system."""
-        self.memories = []
-        self.next_id = 1
+    for memory in memories:
+        # Format timestamp if available
+        timestamp = memory.get("created_at", "")
+        if timestamp:
+            try:
+                # Convert to more readable format
+                timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+            except:
+                # If conversion fails, use as is
+                pass
         
-        # Load existing memories if available
-        self._load_memories()
+        # Format memory
+        memory_text = f"- {timestamp}: {memory['content']}"
+        
+        # Add metadata if available and not empty
+        metadata = memory.get("metadata", {})
+        if metadata and isinstance(metadata, dict) and len(metadata) > 0:
+            # Format metadata as key-value pairs
+            metadata_str = ", ".join([f"{k}: {v}" for k, v in metadata.items()])
+            memory_text += f" [{metadata_str}]"
+        
+        context_parts.append(memory_text)
     
-    def _load_memories(self):
-        """Load memories from disk if available."""
-        try:
-            memory_file = os.path.join(os.path.dirname(__file__), "../data/memories.json")
-            if os.path.exists(memory_file):
-                with open(memory_file, "r") as f:
-                    self.memories = json.load(f)
-                
-                # Find the highest ID to continue from
-                if self.memories:
-                    highest_id = max([int(m.get("id", "0").replace("mem_", "")) for m in self.memories])
-                    self.next_id = highest_id + 1
-                
-                logger.info(f"Loaded {len(self.memories)} memories from disk")
-        except Exception as e:
-            logger.error(f"Failed to load memories from disk: {e}")
+    return "\n".join(context_parts)
+
+class VectorMemorySystem:
+    """
+    Vector memory system backed by an in-process VectorIndex.
     
-    def _save_memories(self):
-        """Save memories to disk."""
-        try:
-            # Ensure data directory exists
-            os.makedirs(os.path.join(os.path.dirname(__file__), "../data"), exist_ok=True)
-            
-            memory_file = os.path.join(os.path.dirname(__file__), "../data/memories.json")
-            with open(memory_file, "w") as f:
-                json.dump(self.memories, f, indent=2)
-            
-            logger.info(f"Saved {len(self.memories)} memories to disk")
-        except Exception as e:
-            logger.error(f"Failed to save memories to disk: {e}")
+    Metadata fields scope, topics, agent_name, priority, project_id and
+    agent_id are indexed, so SharedMemoryLayer filters are applied inside the
+    top-k search rather than after it.
+    """
     
-    async def store_memory(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> Tuple[str, Dict[str, Any]]:
+    def __init__(self, index_dir: str = VECTOR_INDEX_DIR, embedder: Optional[Any] = None):
+        """
+        Initialize the vector memory system.
+        
+        Args:
+            index_dir: Directory for the persisted index
+            embedder: Embedder from app.modules.memory_embed; defaults to HashingEmbedder
+        """
+        self.embedder = embedder or HashingEmbedder()
+        
+        index_dir = os.path.abspath(index_dir)
+        if index_dir not in _indexes:
+            _indexes[index_dir] = VectorIndex(index_dir, dimension=self.embedder.dimension)
+        self.index = _indexes[index_dir]
+    
+    async def store_memory(self, content: str, metadata: Optional[Dict[str, Any]] = None,
+                           priority: bool = False, memory_id: Optional[str] = None) -> str:
         """
         Store a text in the memory system.
         
         Args:
-            text: The text to store
+            content: The text to store
             metadata: Optional metadata about the text
+            priority: Whether this is a priority memory
+            memory_id: Optional ID; generated if not provided
             
         Returns:
-            Tuple of (memory_id, memory_object)
+            The ID of the stored memory
         """
-        # Create memory ID
-        memory_id = f"mem_{self.next_id}"
-        self.next_id += 1
+        memory_id = memory_id or f"mem_{uuid.uuid4().hex[:12]}"
+        metadata = dict(metadata or {})
+        if priority:
+            metadata["priority"] = True
         
-        # Create memory object
         memory = {
             "id": memory_id,
-            "content": text,
-            "metadata": metadata or {},
+            "content": content,
+            "metadata": metadata,
             "created_at": time.time()
         }
         
-        # Add to memories
-        self.memories.append(memory)
+        vector = self.embedder.embed_many([content])[0]
+        self.index.add(memory_id, vector, memory)
         
-        # Save to disk
-        self._save_memories()
-        
-        return memory_id, memory
+        return memory_id
     
-    async def search_memories(self, query: str, limit: int = 5) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    async def search_memories(self, query: str, limit: int = 5, priority_only: bool = False,
+                              scope: Optional[str] = None, topics: Optional[List[str]] = None,
+                              agent_name: Optional[str] = None,
+                              filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
-        Search for memories similar to the query.
+        Search for memories by cosine similarity to the query.
         
         Args:
-            query: The search query
+            query: The search query; an empty query returns the newest memories
             limit: Maximum number of results to return
+            priority_only: Whether to only return priority memories
+            scope: Filter by scope ("global" or "agent")
+            topics: Filter by topics (any of)
+            agent_name: Filter by agent name
+            filters: Additional filters on indexed metadata fields
             
         Returns:
-            Tuple of (list of memories, search metadata)
+            List of memories, best match first, each with a "score"
         """
-        # In a real implementation, this would use vector similarity search
-        # For this mock, we'll just do simple substring matching
-        results = []
+        filters = dict(filters or {})
+        if priority_only:
+            filters["priority"] = True
+        if scope:
+            filters["scope"] = scope
+        if topics:
+            filters["topics"] = list(topics)
+        if agent_name:
+            filters["agent_name"] = agent_name
         
-        for memory in self.memories:
-            if query.lower() in memory["content"].lower():
-                results.append(memory)
+        if not query or not query.strip():
+            return [dict(record) for _, record in self.index.latest(limit, filters)]
         
-        # Sort by recency (newest first)
-        results.sort(key=lambda x: x.get("created_at", 0), reverse=True)
-        
-        # Limit results
-        results = results[:limit]
+        vector = self.embedder.embed_many([query])[0]
+        results = []
+        for _, score, record in self.index.search(vector, k=limit, filters=filters):
+            memory = dict(record)
+            memory["score"] = score
+            results.append(memory)
         
-        return results, {"method": "substring_match", "query": query}
+        return results
     
     async def get_memory(self, memory_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -126,16 +173,15 @@ class MockMemorySystem:
         Returns:
             The memory object or None if not found
         """
-        for memory in self.memories:
-            if memory.get("id") == memory_id:
-                return memory
-        
-        return None
+        return self.index.get(memory_id)
     
     async def update_memory(self, memory_id: str, updates: Dict[str, Any]) -> bool:
         """
         Update a memory by ID
         
+        Content changes re-embed the memory; other updates only append a
+        record update to the metadata log.
+        
         Args:
             memory_id: The ID of the memory to update
             updates: Dictionary of fields to update
@@ -143,22 +189,24 @@ class MockMemorySystem:
         Returns:
             True if updated, False if not found
         """
-        for memory in self.memories:
-            if memory.get("id") == memory_id:
-                # Update fields
-                for key, value in updates.items():
-                    if key == "metadata" and isinstance(value, dict) and isinstance(memory.get("metadata"), dict):
-                        # Merge metadata
-                        memory["metadata"].update(value)
-                    else:
-                        memory[key] = value
-                
-                # Save changes
-                self._save_memories()
-                
-                return True
+        memory = self.index.get(memory_id)
+        if memory is None:
+            return False
+        
+        memory = json.loads(json.dumps(memory))
+        for key, value in updates.items():
+            if key == "metadata" and isinstance(value, dict) and isinstance(memory.get("metadata"), dict):
+                # Merge metadata
+                memory["metadata"].update(value)
+            else:
+                memory[key] = value
+        
+        if "content" in updates:
+            self.index.add(memory_id, self.embedder.embed_many([memory["content"]])[0], memory)
+        else:
+            self.index.update(memory_id, memory)
         
-        return False
+        return True
     
     async def tag_memory(self, memory_id: str, tags: List[str]) -> bool:
         """
@@ -171,26 +219,13 @@ class MockMemorySystem:
         Returns:
             True if tagged, False if not found
         """
-        for memory in self.memories:
-            if memory.get("id") == memory_id:
-                # Initialize metadata and tags if needed
-                if "metadata" not in memory:
-                    memory["metadata"] = {}
-                
-                if "tags" not in memory["metadata"]:
-                    memory["metadata"]["tags"] = []
-                
-                # Add new tags
-                for tag in tags:
-                    if tag not in memory["metadata"]["tags"]:
-                        memory["metadata"]["tags"].append(tag)
-                
-                # Save changes
-                self._save_memories()
-                
-                return True
+        memory = self.index.get(memory_id)
+        if memory is None:
+            return False
         
-        return False
+        existing = list((memory.get("metadata") or {}).get("tags", []))
+        existing.extend(tag for tag in tags if tag not in existing)
+        return await self.update_memory(memory_id, {"metadata": {"tags": existing}})
     
     async def set_priority(self, memory_id: str, priority: bool = True) -> bool:
         """
@@ -203,25 +238,11 @@ class MockMemorySystem:
         Returns:
             True if updated, False if not found
         """
-        for memory in self.memories:
-            if memory.get("id") == memory_id:
-                # Initialize metadata if needed
-                if "metadata" not in memory:
-                    memory["metadata"] = {}
-                
-                # Set priority flag
-                memory["metadata"]["priority"] = priority
-                
-                # Save changes
-                self._save_memories()
-                
-                return True
-        
-        return False
+        return await self.update_memory(memory_id, {"metadata": {"priority": priority}})
     
     async def delete_memory(self, memory_id: str) -> bool:
         """
-        Delete a memory by ID
+        Delete a memory by ID (tombstoned until the index is compacted)
         
         Args:
             memory_id: The ID of the memory to delete
@@ -229,16 +250,11 @@ class MockMemorySystem:
         Returns:
             True if deleted, False if not found
         """
-        for i, memory in enumerate(self.memories):
-            if memory.get("id") == memory_id:
-                self.memories.pop(i)
-                
-                # Save changes
-                self._save_memories()
-                
-                return True
-        
-        return False
+        return self.index.remove(memory_id)
+    
+    async def compact(self) -> None:
+        """Drop tombstoned memories from the persisted index."""
+        self.index.compact()
     
     async def format_memories_as_context(self, memories: List[Dict[str, Any]]) -> str:
         """
@@ -250,35 +266,142 @@ class MockMemorySystem:
         Returns:
             Formatted context string
         """
-        if not memories:
-            return ""
-        
-        context_parts = ["## Relevant Past Interactions\n"]
-        
-        for memory in memories:
-            # Format timestamp if available
-            timestamp = memory.get("created_at", "")
-            if timestamp:
-                try:
-                    # Convert to more readable format
-                    timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
-                except:
-                    # If conversion fails, use as is
-                    pass
+        return _format_memories_as_context(memories)
+
+class MockMemorySystem:
+    """
+    Memory engine used by the memory API routes.
+    
+    Keeps the original (memory_id, memory) / (results, metadata) return
+    shapes, with storage delegated to a VectorMemorySystem. Memories from the
+    legacy data/memories.json file are imported into the index once.
+    """
+    
+    def __init__(self, vector_memory: Optional[VectorMemorySystem] = None):
+        """Initialize the memory system."""
+        self.vector_memory = vector_memory or get_vector_memory()
+        
+        # Import memories saved by the previous JSON-file storage
+        self._load_memories()
+    
+    def _load_memories(self):
+        """Import legacy memories from disk into the vector index if it is empty."""
+        try:
+            if len(self.vector_memory.index) == 0 and os.path.exists(LEGACY_MEMORY_FILE):
+                with open(LEGACY_MEMORY_FILE, "r") as f:
+                    legacy_memories = json.load(f)
+                
+                embedder = self.vector_memory.embedder
+                vectors = embedder.embed_many([m.get("content", "") for m in legacy_memories])
+                for memory, vector in zip(legacy_memories, vectors):
+                    self.vector_memory.index.add(memory["id"], vector, memory)
+                
+                logger.info(f"Imported {len(legacy_memories)} legacy memories into the vector index")
+        except Exception as e:
+            logger.error(f"Failed to import legacy memories from disk: {e}")
+    
+    async def store_memory(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Store a text in the memory system.
+        
+        Args:
+            text: The text to store
+            metadata: Optional metadata about the text
             
-            # Format memory
-            memory_text = f"- {timestamp}: {memory['content']}"
+        Returns:
+            Tuple of (memory_id, memory_object)
+        """
+        memory_id = await self.vector_memory.store_memory(text, metadata)
+        return memory_id, await self.vector_memory.get_memory(memory_id)
+    
+    async def search_memories(self, query: str, limit: int = 5) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Search for memories similar to the query.
+        
+        Args:
+            query: The search query
+            limit: Maximum number of results to return
+            
+        Returns:
+            Tuple of (list of memories, search metadata)
+        """
+        results = await self.vector_memory.search_memories(query, limit)
+        return results, {"method": "vector_similarity", "query": query}
+    
+    async def get_memory(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a memory by ID
+        
+        Args:
+            memory_id: The ID of the memory to retrieve
             
-            # Add metadata if available and not empty
-            metadata = memory.get("metadata", {})
-            if metadata and isinstance(metadata, dict) and len(metadata) > 0:
-                # Format metadata as key-value pairs
-                metadata_str = ", ".join([f"{k}: {v}" for k, v in metadata.items()])
-                memory_text += f" [{metadata_str}]"
+        Returns:
+            The memory object or None if not found
+        """
+        return await self.vector_memory.get_memory(memory_id)
+    
+    async def update_memory(self, memory_id: str, updates: Dict[str, Any]) -> bool:
+        """
+        Update a memory by ID
+        
+        Args:
+            memory_id: The ID of the memory to update
+            updates: Dictionary of fields to update
             
-            context_parts.append(memory_text)
+        Returns:
+            True if updated, False if not found
+        """
+        return await self.vector_memory.update_memory(memory_id, updates)
+    
+    async def tag_memory(self, memory_id: str, tags: List[str]) -> bool:
+        """
+        Add tags to a memory
         
-        return "\n".join(context_parts)
+        Args:
+            memory_id: The ID of the memory to tag
+            tags: List of tags to add
+            
+        Returns:
+            True if tagged, False if not found
+        """
+        return await self.vector_memory.tag_memory(memory_id, tags)
+    
+    async def set_priority(self, memory_id: str, priority: bool = True) -> bool:
+        """
+        Set a memory as priority
+        
+        Args:
+            memory_id: The ID of the memory to update
+            priority: Whether this is a priority memory
+            
+        Returns:
+            True if updated, False if not found
+        """
+        return await self.vector_memory.set_priority(memory_id, priority)
+    
+    async def delete_memory(self, memory_id: str) -> bool:
+        """
+        Delete a memory by ID
+        
+        Args:
+            memory_id: The ID of the memory to delete
+            
+        Returns:
+            True if deleted, False if not found
+        """
+        return await self.vector_memory.delete_memory(memory_id)
+    
+    async def format_memories_as_context(self, memories: List[Dict[str, Any]]) -> str:
+        """
+        Format a list of memories as context for an agent
+        
+        Args:
+            memories: List of memory items
+            
+        Returns:
+            Formatted context string
+        """
+        return _format_memories_as_context(memories)
 
     # Adapter methods to match the expected API in memory_api_routes.py
     async def add_memory(self, project_id: str, content: str, metadata: Optional[Dict[str, Any]] = None, 
@@ -344,31 +467,34 @@ class MockMemorySystem:
             # Log the parameters for debugging
             logger.info(f"search_memory called with: project_id={project_id}, query={query}, limit={limit}, tags={tags}, agent_id={agent_id}, threshold={threshold}")
             
-            # Get all memories
-            results, _ = await self.search_memories(query, limit)
+            # project_id and agent_id are indexed, so they filter inside the top-k search
+            filters = {"project_id": project_id}
+            if agent_id:
+                filters["agent_id"] = agent_id
+            
+            results = await self.vector_memory.search_memories(
+                query, limit * 2 if tags else limit, filters=filters
+            )
             
             # Log initial results
             logger.info(f"Initial search returned {len(results)} results")
             
-            # Filter by project_id
             filtered_results = []
             for memory in results:
                 metadata = memory.get("metadata", {})
                 
-                # Check project_id
-                if metadata.get("project_id") != project_id:
-                    continue
-                
                 # Check tags if specified
                 if tags and not any(tag in metadata.get("tags", []) for tag in tags):
                     continue
                 
-                # Check agent_id if specified
-                if agent_id and metadata.get("agent_id") != agent_id:
+                # Check similarity threshold
+                if memory.get("score", 1.0) < threshold:
                     continue
                 
                 filtered_results.append(memory)
             
+            filtered_results = filtered_results[:limit]
+            
             # Log filtered results
             logger.info(f"After filtering, returning {len(filtered_results)} results")
             
@@ -379,8 +505,24 @@ class MockMemorySystem:
             # Re-raise to ensure the error is properly handled
             raise
 
-# Singleton instance
+# Singleton instances
 _memory_system = None
+_vector_memory = None
+
+def get_vector_memory() -> VectorMemorySystem:
+    """
+    Get the shared VectorMemorySystem instance.
+    
+    Returns:
+        The vector memory instance
+    """
+    global _vector_memory
+    
+    if _vector_memory is None:
+        _vector_memory = VectorMemorySystem()
+        logger.info("Initialized new VectorMemorySystem instance")
+    
+    return _vector_memory
 
 def get_memory_engine():
     """
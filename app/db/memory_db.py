@@ -10,6 +10,7 @@ access across the application.
 """
 
 import os
+import re
 import json
 import sqlite3
 import logging
@@ -30,6 +31,13 @@ SCHEMA_FILE = os.path.join(os.path.dirname(__file__), "memory_schema.sql")
 logger.info(f"💾 DB PATH: {os.path.abspath(DB_FILE)}")
 print(f"💾 [DB] Absolute database path: {os.path.abspath(DB_FILE)}")
 
+# Opt-in WAL journal mode with synchronous=NORMAL for write-heavy workloads
+USE_WAL = os.getenv("MEMORY_DB_WAL", "false").lower() == "true"
+
+# Query syntax accepted by search_memories: "quoted phrases" and bare terms,
+# optionally ending in * for a prefix match
+FTS_TOKEN_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
 # Thread-local storage for database connections
 thread_local = threading.local()
 
@@ -139,6 +147,8 @@ class MemoryDB:
                 
                 thread_local.connection = sqlite3.connect(self.db_path)
                 thread_local.connection.row_factory = sqlite3.Row
+                if USE_WAL:
+                    self._enable_wal(thread_local.connection)
                 logger.info(f"✅ New database connection created in thread {threading.get_ident()}")
                 print(f"🧠 [DB] New database connection created in thread {threading.get_ident()}")
             except Exception as e:
@@ -148,6 +158,18 @@ class MemoryDB:
         
         return thread_local.connection
     
+    def _enable_wal(self, conn: sqlite3.Connection):
+        """
+        Switch a connection to WAL journal mode with synchronous=NORMAL.
+
+        WAL is persistent in the database file; synchronous is per connection.
+        In WAL mode, NORMAL only fsyncs at checkpoints, which keeps commits
+        cheap while still protecting the database from corruption.
+        """
+        mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        conn.execute("PRAGMA synchronous=NORMAL")
+        logger.info(f"✅ Database journal_mode={mode}, synchronous=NORMAL")
+
     def close(self):
         """
         Close the database connection for the current thread.
@@ -162,6 +184,51 @@ class MemoryDB:
                 logger.error(f"❌ Error closing database connection: {str(e)}")
                 print(f"❌ [DB] Error closing database connection: {str(e)}")
     
+    def _prepare_memory(self, memory: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a memory dict into a row dict for the memories table.
+        
+        Args:
+            memory: A dictionary containing the memory data
+            
+        Returns:
+            A copy of the memory with JSON fields serialized
+        """
+        memory_db = memory.copy()
+        
+        # The view exposes memory_type as "type"; accept either on write
+        if "memory_type" not in memory_db and "type" in memory_db:
+            memory_db["memory_type"] = memory_db.pop("type")
+        
+        # Convert tags to JSON if it's a list
+        if "tags" in memory_db and isinstance(memory_db["tags"], list):
+            memory_db["tags"] = json.dumps(memory_db["tags"])
+        
+        # Convert agent_tone to JSON if it's a dict
+        if "agent_tone" in memory_db and isinstance(memory_db["agent_tone"], dict):
+            memory_db["agent_tone"] = json.dumps(memory_db["agent_tone"])
+        
+        # Convert metadata to JSON if it's a dict
+        if "metadata" in memory_db and isinstance(memory_db["metadata"], dict):
+            memory_db["metadata"] = json.dumps(memory_db["metadata"])
+        
+        # Extract goal_id from metadata if not provided at top level
+        if "goal_id" not in memory_db and "metadata" in memory_db:
+            metadata = memory_db["metadata"]
+            if isinstance(metadata, str):
+                try:
+                    metadata_dict = json.loads(metadata)
+                    if "goal_id" in metadata_dict:
+                        memory_db["goal_id"] = metadata_dict["goal_id"]
+                        logger.info(f"🎯 Extracted goal_id from metadata: {metadata_dict['goal_id']} for memory {memory_db['memory_id']}")
+                except:
+                    pass
+            elif isinstance(metadata, dict) and "goal_id" in metadata:
+                memory_db["goal_id"] = metadata["goal_id"]
+                logger.info(f"🎯 Extracted goal_id from metadata: {metadata['goal_id']} for memory {memory_db['memory_id']}")
+        
+        return memory_db
+    
     def write_memory(self, memory: Dict[str, Any]) -> Dict[str, Any]:
         """
         Write a memory to the database.
@@ -180,34 +247,7 @@ class MemoryDB:
             logger.info(f"💾 DB PATH: Writing to {self.get_path()}")
             
             # Prepare memory for database
-            memory_db = memory.copy()
-            
-            # Convert tags to JSON if it's a list
-            if "tags" in memory_db and isinstance(memory_db["tags"], list):
-                memory_db["tags"] = json.dumps(memory_db["tags"])
-            
-            # Convert agent_tone to JSON if it's a dict
-            if "agent_tone" in memory_db and isinstance(memory_db["agent_tone"], dict):
-                memory_db["agent_tone"] = json.dumps(memory_db["agent_tone"])
-            
-            # Convert metadata to JSON if it's a dict
-            if "metadata" in memory_db and isinstance(memory_db["metadata"], dict):
-                memory_db["metadata"] = json.dumps(memory_db["metadata"])
-            
-            # Extract goal_id from metadata if not provided at top level
-            if "goal_id" not in memory_db and "metadata" in memory_db:
-                metadata = memory_db["metadata"]
-                if isinstance(metadata, str):
-                    try:
-                        metadata_dict = json.loads(metadata)
-                        if "goal_id" in metadata_dict:
-                            memory_db["goal_id"] = metadata_dict["goal_id"]
-                            logger.info(f"🎯 Extracted goal_id from metadata: {metadata_dict['goal_id']} for memory {memory_db['memory_id']}")
-                    except:
-                        pass
-                elif isinstance(metadata, dict) and "goal_id" in metadata:
-                    memory_db["goal_id"] = metadata["goal_id"]
-                    logger.info(f"🎯 Extracted goal_id from metadata: {metadata['goal_id']} for memory {memory_db['memory_id']}")
+            memory_db = self._prepare_memory(memory)
             
             # Prepare SQL
             columns = ", ".join(memory_db.keys())
@@ -276,6 +316,49 @@ class MemoryDB:
                 
             raise
     
+    def write_memories(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Write a batch of memories to the database in a single transaction.
+        
+        Rows are grouped by column set and inserted with executemany, so the
+        whole batch costs one commit instead of one per memory. Tags are
+        indexed into memory_tags by the schema triggers.
+        
+        Args:
+            batch: A list of memory dictionaries
+            
+        Returns:
+            The memories that were written
+        """
+        if not batch:
+            return []
+        
+        conn = self._get_connection()
+        
+        try:
+            # Group rows by column set so each group is a single executemany
+            groups: Dict[Tuple[str, ...], List[List[Any]]] = {}
+            for memory in batch:
+                memory_db = self._prepare_memory(memory)
+                groups.setdefault(tuple(memory_db.keys()), []).append(list(memory_db.values()))
+            
+            with conn:
+                cursor = conn.cursor()
+                for columns, rows in groups.items():
+                    placeholders = ", ".join(["?"] * len(columns))
+                    cursor.executemany(
+                        f"INSERT OR REPLACE INTO memories ({', '.join(columns)}) VALUES ({placeholders})",
+                        rows
+                    )
+            
+            logger.info(f"✅ Batch of {len(batch)} memories written to database in one transaction")
+            return batch
+            
+        except Exception as e:
+            logger.error(f"❌ Error writing memory batch: {str(e)}")
+            print(f"❌ [DB] Error writing memory batch: {str(e)}")
+            raise
+    
     def read_memory_by_id(self, memory_id: str) -> Optional[Dict[str, Any]]:
         """
         Read a memory from the database by its ID.
@@ -338,7 +421,8 @@ class MemoryDB:
     def read_memories(self, agent_id: Optional[str] = None, memory_type: Optional[str] = None,
                      since: Optional[str] = None, project_id: Optional[str] = None,
                      task_id: Optional[str] = None, thread_id: Optional[str] = None,
-                     goal_id: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+                     goal_id: Optional[str] = None, limit: Optional[int] = None,
+                     tag: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Read memories from the database with optional filtering.
         
@@ -351,6 +435,7 @@ class MemoryDB:
             thread_id: Filter by thread ID (memory_trace_id)
             goal_id: Filter by goal ID
             limit: Maximum number of memories to return
+            tag: Filter by tag (indexed join on memory_tags)
             
         Returns:
             A list of memories matching the filters
@@ -363,37 +448,43 @@ class MemoryDB:
             logger.info(f"💾 DB PATH: Reading from {self.get_path()}")
             
             # Build SQL query
-            sql = "SELECT * FROM memory_view"
+            sql = "SELECT m.* FROM memory_view m"
             params = []
             where_clauses = []
             
+            # Tag filter goes through the memory_tags index instead of the JSON column
+            if tag:
+                sql += " JOIN memory_tags t ON t.memory_id = m.memory_id"
+                where_clauses.append("t.tag = ?")
+                params.append(tag)
+            
             # Add filters
             if agent_id:
-                where_clauses.append("agent_id = ?")
+                where_clauses.append("m.agent_id = ?")
                 params.append(agent_id)
             
             if memory_type:
-                where_clauses.append("type = ?")
+                where_clauses.append("m.type = ?")
                 params.append(memory_type)
             
             if since:
-                where_clauses.append("timestamp >= ?")
+                where_clauses.append("m.timestamp >= ?")
                 params.append(since)
             
             if project_id:
-                where_clauses.append("project_id = ?")
+                where_clauses.append("m.project_id = ?")
                 params.append(project_id)
             
             if task_id:
-                where_clauses.append("task_id = ?")
+                where_clauses.append("m.task_id = ?")
                 params.append(task_id)
             
             if thread_id:
-                where_clauses.append("memory_trace_id = ?")
+                where_clauses.append("m.memory_trace_id = ?")
                 params.append(thread_id)
                 
             if goal_id:
-                where_clauses.append("goal_id = ?")
+                where_clauses.append("m.goal_id = ?")
                 params.append(goal_id)
             
             # Add WHERE clause if filters are present
@@ -401,7 +492,7 @@ class MemoryDB:
                 sql += " WHERE " + " AND ".join(where_clauses)
             
             # Add ORDER BY clause
-            sql += " ORDER BY timestamp DESC"
+            sql += " ORDER BY m.timestamp DESC"
             
             # Add LIMIT clause if limit is provided
             if limit:
@@ -413,30 +504,7 @@ class MemoryDB:
             rows = cursor.fetchall()
             
             # Convert rows to dicts and parse JSON fields
-            memories = []
-            for row in rows:
-                memory = dict(row)
-                
-                # Parse JSON fields
-                if "tags" in memory and memory["tags"]:
-                    try:
-                        memory["tags"] = json.loads(memory["tags"])
-                    except:
-                        pass
-                
-                if "agent_tone" in memory and memory["agent_tone"]:
-                    try:
-                        memory["agent_tone"] = json.loads(memory["agent_tone"])
-                    except:
-                        pass
-                
-                if "metadata" in memory and memory["metadata"]:
-                    try:
-                        memory["metadata"] = json.loads(memory["metadata"])
-                    except:
-                        pass
-                
-                memories.append(memory)
+            memories = [self._row_to_memory(row) for row in rows]
             
             # Log success
             logger.info(f"📚 [DB] Retrieved {len(memories)} memories from database")
@@ -450,6 +518,105 @@ class MemoryDB:
             print(f"❌ [DB] Error reading memories: {str(e)}")
             raise
     
+    def search_memories(self, query: str, agent_id: Optional[str] = None,
+                        since: Optional[str] = None, until: Optional[str] = None,
+                        thread_id: Optional[str] = None, sort_order: str = "relevance",
+                        limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+        """
+        Full-text search over memory content and tags using the FTS5 index.
+        
+        Bare terms are ANDed together, "quoted text" is matched as a phrase and
+        a trailing * makes a term a prefix query (e.g. optim*).
+        
+        Args:
+            query: The search query
+            agent_id: Filter by agent ID
+            since: Filter by timestamp >= since (ISO 8601 format)
+            until: Filter by timestamp <= until (ISO 8601 format)
+            thread_id: Filter by thread ID (memory_trace_id)
+            sort_order: relevance (BM25), newest_first or oldest_first
+            limit: Maximum number of memories to return
+            offset: Number of matching memories to skip
+            
+        Returns:
+            Dict with the total match count and the requested page of memories,
+            each carrying a BM25 "score" (higher is more relevant)
+        """
+        fts_query = to_fts_query(query)
+        if not fts_query:
+            return {"total": 0, "results": []}
+        
+        try:
+            conn = self._get_connection()
+            
+            where_clauses = ["memories_fts MATCH ?"]
+            params: List[Any] = [fts_query]
+            
+            if agent_id:
+                where_clauses.append("lower(m.agent_id) = lower(?)")
+                params.append(agent_id)
+            
+            if since:
+                where_clauses.append("m.timestamp >= ?")
+                params.append(since)
+            
+            if until:
+                where_clauses.append("m.timestamp <= ?")
+                params.append(until)
+            
+            if thread_id:
+                where_clauses.append("m.memory_trace_id = ?")
+                params.append(thread_id)
+            
+            from_sql = " FROM memories_fts JOIN memories m ON m.rowid = memories_fts.rowid WHERE " + " AND ".join(where_clauses)
+            
+            total = conn.execute("SELECT COUNT(*)" + from_sql, params).fetchone()[0]
+            
+            if sort_order == "newest_first":
+                order_sql = " ORDER BY m.timestamp DESC"
+            elif sort_order == "oldest_first":
+                order_sql = " ORDER BY m.timestamp ASC"
+            else:
+                # bm25() is lower-is-better; ties fall back to recency
+                order_sql = " ORDER BY bm25(memories_fts), m.timestamp DESC"
+            
+            rows = conn.execute(
+                "SELECT m.*, m.memory_type AS type, -bm25(memories_fts) AS score"
+                + from_sql + order_sql + " LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+            
+            memories = [self._row_to_memory(row) for row in rows]
+            logger.info(f"🔎 [DB] Full-text search matched {total} memories, returning {len(memories)}")
+            
+            return {"total": total, "results": memories}
+            
+        except Exception as e:
+            logger.error(f"❌ Error searching memories: {str(e)}")
+            print(f"❌ [DB] Error searching memories: {str(e)}")
+            raise
+    
+    def _row_to_memory(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """
+        Convert a database row to a memory dict, parsing JSON fields.
+        
+        Args:
+            row: A row from the memories table or memory_view
+            
+        Returns:
+            The memory as a dict
+        """
+        memory = dict(row)
+        
+        for field in ("tags", "agent_tone", "metadata"):
+            if field in memory and memory[field]:
+                try:
+                    memory[field] = json.loads(memory[field])
+                except:
+                    pass
+        
+        return memory
+    
     def delete_memory(self, memory_id: str) -> bool:
         """
         Delete a memory from the database.
@@ -582,5 +749,30 @@ class MemoryDB:
                 
             raise
 
+def to_fts_query(query: str) -> str:
+    """
+    Translate a user search string into an FTS5 MATCH expression.
+    
+    Every term is quoted so FTS5 operators and punctuation in user input
+    cannot produce syntax errors; "quoted text" stays a phrase and a
+    trailing * on a bare term becomes a prefix query.
+    
+    Args:
+        query: The user search string
+        
+    Returns:
+        The MATCH expression, or an empty string if the query has no terms
+    """
+    terms = []
+    for phrase, word in FTS_TOKEN_PATTERN.findall(query or ""):
+        if phrase.strip():
+            terms.append('"' + phrase.replace('"', '""') + '"')
+        elif word:
+            prefix = word.endswith("*")
+            word = word.rstrip("*").replace('"', '')
+            if word:
+                terms.append('"' + word + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
 # Create a singleton instance
 memory_db = MemoryDB()
@@ -27,6 +27,74 @@ CREATE INDEX IF NOT EXISTS idx_memories_project_id ON memories(project_id);
 CREATE INDEX IF NOT EXISTS idx_memories_task_id ON memories(task_id);
 CREATE INDEX IF NOT EXISTS idx_memories_timestamp ON memories(timestamp);
 
+-- Normalized tag index: one row per (memory, tag) so tag filters use an
+-- indexed join instead of scanning the JSON tags column
+CREATE TABLE IF NOT EXISTS memory_tags (
+    memory_id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (memory_id, tag)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_memory_tags_tag ON memory_tags(tag, memory_id);
+
+-- Keep memory_tags in sync with memories.tags. INSERT OR REPLACE does not fire
+-- delete triggers, so the insert trigger clears stale tags first.
+CREATE TRIGGER IF NOT EXISTS trg_memories_tags_insert AFTER INSERT ON memories
+BEGIN
+    DELETE FROM memory_tags WHERE memory_id = NEW.memory_id;
+    INSERT OR IGNORE INTO memory_tags (memory_id, tag)
+    SELECT NEW.memory_id, value
+    FROM json_each(CASE WHEN json_valid(NEW.tags) THEN NEW.tags ELSE '[]' END)
+    WHERE type = 'text';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_memories_tags_update AFTER UPDATE OF tags ON memories
+BEGIN
+    DELETE FROM memory_tags WHERE memory_id = OLD.memory_id;
+    INSERT OR IGNORE INTO memory_tags (memory_id, tag)
+    SELECT NEW.memory_id, value
+    FROM json_each(CASE WHEN json_valid(NEW.tags) THEN NEW.tags ELSE '[]' END)
+    WHERE type = 'text';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_memories_tags_delete AFTER DELETE ON memories
+BEGIN
+    DELETE FROM memory_tags WHERE memory_id = OLD.memory_id;
+END;
+
+-- Full-text index over memory content and tags for keyword recall (BM25
+-- ranking, prefix and phrase queries). FTS rowids mirror memories.rowid.
+-- prefix='2 3' keeps short prefix queries (e.g. "opt*") index-backed.
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+    content,
+    tags,
+    prefix = '2 3',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+-- INSERT OR REPLACE removes the old row without firing delete triggers, so the
+-- old FTS row is dropped before the insert while the old memories row still exists
+CREATE TRIGGER IF NOT EXISTS trg_memories_fts_before_insert BEFORE INSERT ON memories
+BEGIN
+    DELETE FROM memories_fts WHERE rowid = (SELECT rowid FROM memories WHERE memory_id = NEW.memory_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_memories_fts_insert AFTER INSERT ON memories
+BEGIN
+    INSERT INTO memories_fts (rowid, content, tags) VALUES (NEW.rowid, NEW.content, NEW.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_memories_fts_update AFTER UPDATE OF content, tags ON memories
+BEGIN
+    DELETE FROM memories_fts WHERE rowid = OLD.rowid;
+    INSERT INTO memories_fts (rowid, content, tags) VALUES (NEW.rowid, NEW.content, NEW.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_memories_fts_delete AFTER DELETE ON memories
+BEGIN
+    DELETE FROM memories_fts WHERE rowid = OLD.rowid;
+END;
+
 -- Create a view for easier querying with common filters
 CREATE VIEW IF NOT EXISTS memory_view AS
 SELECT 
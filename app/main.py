@@ -4,6 +4,8 @@ import logging
 # Import routers
 from app.routes import loop_routes
 from app.routes import debug_routes
+from app.api.modules.memory_writer import shutdown_memory_writer
+from app.providers.http_transport import close_transports
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -19,6 +21,16 @@ app = FastAPI(
 app.include_router(loop_routes.router, prefix="/api/loop", tags=["Loop Execution"])
 app.include_router(debug_routes.router, prefix="/debug", tags=["Debug"])
 
+@app.on_event("shutdown")
+async def flush_memory_writer():
+    # Flush queued loop_trace / reflection_thread entries before exit
+    await shutdown_memory_writer()
+
+@app.on_event("shutdown")
+async def close_llm_transports():
+    # Close pooled keep-alive sessions to LLM providers
+    await close_transports()
+
 @app.get("/healthz", tags=["System"])
 async def health_check():
     return {"status": "ok"}
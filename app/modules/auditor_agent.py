@@ -16,104 +16,20 @@ loop execution quality and reliability.
 """
 
 import os
-import json
 import logging
-import asyncio
-import time
 from typing import Dict, List, Any, Optional, Set, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 import uuid
 import re
 import statistics
 import math
 from collections import defaultdict
+from app.modules.kv_memory import read_from_memory, write_to_memory
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    
-    # Mock data for testing
-    if key.startswith("loop_audit["):
-        loop_id = key[11:-1]  # Extract loop_id from "loop_audit[loop_id]"
-        return {
-            "loop_id": loop_id,
-            "audit_id": f"audit_{loop_id}_{int(time.time())}",
-            "timestamp": datetime.utcnow().isoformat(),
-            "overall_score": 0.85,
-            "belief_consistency_score": 0.9,
-            "memory_integrity_score": 0.8,
-            "issues": [
-                {
-                    "type": "belief_inconsistency",
-                    "severity": "warning",
-                    "description": "Belief 'user_privacy' referenced inconsistently",
-                    "location": "agent_3.output"
-                }
-            ],
-            "warnings": [
-                {
-                    "type": "memory_access",
-                    "description": "Redundant memory reads detected",
-                    "count": 3
-                }
-            ],
-            "recommendations": [
-                {
-                    "type": "performance",
-                    "description": "Consider optimizing agent_2 execution",
-                    "potential_improvement": "15% reduction in execution time"
-                }
-            ]
-        }
-    elif key.startswith("loop_audits_history["):
-        # Return a list of previous audits for temporal analysis
-        return [
-            {
-                "loop_id": "previous_loop_1",
-                "audit_id": "audit_previous_loop_1",
-                "timestamp": (datetime.utcnow() - timedelta(days=1)).isoformat(),
-                "overall_score": 0.82,
-                "belief_consistency_score": 0.88,
-                "memory_integrity_score": 0.79,
-                "execution_score": 0.85,
-                "security_score": 0.90,
-                "issue_count": 2,
-                "warning_count": 1,
-                "recommendation_count": 2
-            },
-            {
-                "loop_id": "previous_loop_2",
-                "audit_id": "audit_previous_loop_2",
-                "timestamp": (datetime.utcnow() - timedelta(days=2)).isoformat(),
-                "overall_score": 0.79,
-                "belief_consistency_score": 0.85,
-                "memory_integrity_score": 0.76,
-                "execution_score": 0.82,
-                "security_score": 0.88,
-                "issue_count": 3,
-                "warning_count": 2,
-                "recommendation_count": 2
-            }
-        ]
-    
-    return None
-
-# Mock function for writing to memory
-# In a real implementation, this would write to a database or storage system
-async def write_to_memory(key: str, value: Any) -> bool:
-    """Write data to memory storage."""
-    # Simulate memory write
-    await asyncio.sleep(0.1)
-    logger.debug(f"Writing to memory: {key} = {json.dumps(value, indent=2)}")
-    return True
-
 class AuditorAgent:
     """
     Class for auditing loop execution and identifying issues.
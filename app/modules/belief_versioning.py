@@ -19,9 +19,7 @@ have evolved, ensuring transparency and accountability in belief modifications.
 """
 
 import os
-import json
 import logging
-import asyncio
 import time
 from typing import Dict, List, Any, Optional, Set, Tuple, Union
 from datetime import datetime, timedelta
@@ -30,73 +28,12 @@ import difflib
 import re
 import copy
 from collections import defaultdict
+from app.modules.kv_memory import read_from_memory, write_to_memory
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    
-    # Mock data for testing
-    if key.startswith("belief_version["):
-        belief_id = key[15:-1]  # Extract belief_id from "belief_version[belief_id]"
-        return {
-            "belief_id": belief_id,
-            "version": 1,
-            "text": "This is a test belief",
-            "author": "system",
-            "timestamp": datetime.utcnow().isoformat(),
-            "previous_version": None,
-            "change_type": "creation",
-            "change_summary": "Initial creation of belief"
-        }
-    elif key.startswith("belief_versions["):
-        belief_id = key[16:-1]  # Extract belief_id from "belief_versions[belief_id]"
-        return [
-            {
-                "belief_id": belief_id,
-                "version": 1,
-                "text": "This is a test belief",
-                "author": "system",
-                "timestamp": (datetime.utcnow() - timedelta(days=7)).isoformat(),
-                "previous_version": None,
-                "change_type": "creation",
-                "change_summary": "Initial creation of belief"
-            }
-        ]
-    elif key.startswith("belief_dependencies["):
-        belief_id = key[19:-1]  # Extract belief_id from "belief_dependencies[belief_id]"
-        return {
-            "depends_on": ["belief_123", "belief_456"],
-            "depended_by": ["belief_789"]
-        }
-    elif key.startswith("belief_locks["):
-        return {}  # No locks by default
-    elif key.startswith("belief_branches["):
-        belief_id = key[16:-1]  # Extract belief_id from "belief_branches[belief_id]"
-        return {
-            "main": {
-                "head": 1,
-                "locked": False
-            }
-        }
-    
-    return None
-
-# Mock function for writing to memory
-# In a real implementation, this would write to a database or storage system
-async def write_to_memory(key: str, value: Any) -> bool:
-    """Write data to memory storage."""
-    # Simulate memory write
-    await asyncio.sleep(0.1)
-    logger.debug(f"Writing to memory: {key} = {json.dumps(value, indent=2)}")
-    return True
-
 class SemanticVersion:
     """Class representing a semantic version (major.minor.patch)."""
     
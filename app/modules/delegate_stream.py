@@ -6,14 +6,18 @@ This module implements the functionality for creating and managing delegate stre
 
 import logging
 import json
+import os
 import uuid
 import random
+import threading
 import time
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Optional, Any, Union
 from datetime import datetime, timedelta
 import asyncio
 import websockets
 
+from app.modules.stream_hub import StreamHub
+
 # Configure logging
 logger = logging.getLogger("delegate_stream")
 
@@ -21,8 +25,19 @@ logger = logging.getLogger("delegate_stream")
 # In a production environment, this would be a database
 _streams: Dict[str, Dict[str, Any]] = {}
 _stream_status: Dict[str, Dict[str, Any]] = {}
-_stream_events: Dict[str, List[Dict[str, Any]]] = {}
-_active_connections: Dict[str, List[Any]] = {}
+
+# Event fan-out: a bounded ring buffer per stream and a bounded send queue per
+# connection. Sizes and the slow consumer policy ("drop" or "disconnect") can
+# be tuned through the environment.
+_hub = StreamHub(
+    capacity=int(os.getenv("DELEGATE_STREAM_BUFFER_SIZE", "1000")),
+    queue_size=int(os.getenv("DELEGATE_STREAM_QUEUE_SIZE", "256")),
+    policy=os.getenv("DELEGATE_STREAM_SLOW_CONSUMER_POLICY", "drop")
+)
+
+# Closed streams keep their buffer and metrics for a while before the hub
+# forgets them, so clients can still flush and read the final metrics.
+_DISCARD_DELAY_SECONDS = float(os.getenv("DELEGATE_STREAM_DISCARD_DELAY", "60"))
 
 def create_stream(request_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -42,6 +57,7 @@ def create_stream(request_data: Dict[str, Any]) -> Dict[str, Any]:
         filters = request_data.get("filters", {})
         max_events = request_data.get("max_events")
         timeout_seconds = request_data.get("timeout_seconds")
+        buffer_size = request_data.get("buffer_size")
         agent_id = request_data.get("agent_id")
         loop_id = request_data.get("loop_id")
         
@@ -87,6 +103,7 @@ def create_stream(request_data: Dict[str, Any]) -> Dict[str, Any]:
             "filters": filters,
             "max_events": max_events,
             "timeout_seconds": timeout_seconds,
+            "buffer_size": buffer_size,
             "status": "active",
             "connection_url": connection_url,
             "token": token,
@@ -110,11 +127,8 @@ def create_stream(request_data: Dict[str, Any]) -> Dict[str, Any]:
             "loop_id": loop_id
         }
         
-        # Initialize events list
-        _stream_events[stream_id] = []
-        
-        # Initialize connections list
-        _active_connections[stream_id] = []
+        # Initialize the event ring buffer
+        _hub.open(stream_id, buffer_size)
         
         # Log the stream creation to memory
         _log_stream_creation(stream_id, stream_type, target_id)
@@ -175,6 +189,7 @@ def get_stream_status(request_data: Dict[str, Any]) -> Dict[str, Any]:
         
         # Get stream status
         status = _stream_status[stream_id]
+        metrics = _hub.get_metrics(stream_id)
         
         # Log the status check to memory
         _log_status_check(stream_id, status["status"])
@@ -187,6 +202,9 @@ def get_stream_status(request_data: Dict[str, Any]) -> Dict[str, Any]:
             "status": status["status"],
             "events_streamed": status["events_streamed"],
             "connected_clients": status["connected_clients"],
+            "buffered_events": metrics.get("buffered_events", 0),
+            "queue_depth": metrics.get("queue_depth", 0),
+            "dropped_events": metrics.get("dropped_events", 0),
             "created_at": status["created_at"],
             "expires_at": status["expires_at"],
             "agent_id": status["agent_id"],
@@ -251,10 +269,10 @@ def close_stream(request_data: Dict[str, Any]) -> Dict[str, Any]:
         # Update stream status
         _stream_status[stream_id]["status"] = "closed"
         
-        # Close all active connections
-        # In a real implementation, this would notify all connected clients
-        _active_connections[stream_id] = []
+        # Close all active connections once they have flushed their queues
+        _hub.close(stream_id)
         _stream_status[stream_id]["connected_clients"] = 0
+        _schedule_discard(stream_id)
         
         # Calculate duration
         duration_seconds = _calculate_duration_seconds(status["created_at"])
@@ -280,62 +298,130 @@ def close_stream(request_data: Dict[str, Any]) -> Dict[str, Any]:
             "version": "1.0.0"
         }
 
-async def handle_stream_connection(websocket, path):
+def _schedule_discard(stream_id: str) -> None:
+    """
+    Drop a closed stream's buffer and metrics from the hub after the grace period.
+    """
+    if _DISCARD_DELAY_SECONDS <= 0:
+        _hub.discard(stream_id)
+        return
+    timer = threading.Timer(_DISCARD_DELAY_SECONDS, _hub.discard, args=(stream_id,))
+    timer.daemon = True
+    timer.start()
+
+def get_stream_metrics(stream_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get fan-out metrics (buffered events, queue depth, dropped events).
+    
+    Args:
+        stream_id: Stream ID, or None for all streams
+        
+    Returns:
+        Dictionary containing the metrics
+    """
+    if stream_id and stream_id not in _streams:
+        return {
+            "message": f"Stream with ID {stream_id} not found",
+            "timestamp": datetime.utcnow().isoformat(),
+            "version": "1.0.0"
+        }
+    return {
+        "streams": {stream_id: _hub.get_metrics(stream_id)} if stream_id else _hub.get_metrics(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "version": "1.0.0"
+    }
+
+async def handle_stream_connection(websocket, path, last_event_id: Optional[str] = None):
     """
     Handle a WebSocket connection to a stream.
     
+    Works with both `websockets` connections and Starlette WebSockets.
+    
     Args:
         websocket: WebSocket connection
         path: Connection path
+        last_event_id: Resume after this event instead of replaying the whole buffer
     """
+    send = getattr(websocket, "send_text", None) or websocket.send
+    
     # Extract stream ID from path
     stream_id = path.split("/")[-1]
     
     # Check if stream exists
     if stream_id not in _streams:
-        await websocket.send(json.dumps({
+        await send(json.dumps({
             "error": f"Stream with ID {stream_id} not found"
         }))
         return
     
     # Check if stream is active
     if _stream_status[stream_id]["status"] != "active":
-        await websocket.send(json.dumps({
+        await send(json.dumps({
             "error": f"Stream with ID {stream_id} is not active"
         }))
         return
     
-    # Add connection to active connections
-    _active_connections[stream_id].append(websocket)
+    # Register with the hub; buffered events after last_event_id are replayed
+    subscriber = _hub.subscribe(stream_id, last_event_id)
     _stream_status[stream_id]["connected_clients"] += 1
     
+    pump = None
     try:
         # Send welcome message
-        await websocket.send(json.dumps({
+        await send(json.dumps({
             "type": "welcome",
             "stream_id": stream_id,
-            "message": f"Connected to stream {stream_id}"
+            "message": f"Connected to stream {stream_id}",
+            "resumed_from": last_event_id,
+            "missed_events": subscriber.missed
         }))
         
-        # Send existing events
-        for event in _stream_events[stream_id]:
-            await websocket.send(json.dumps(event))
-        
-        # Keep connection open and handle incoming messages
-        async for message in websocket:
-            # Process incoming messages if needed
-            pass
+        # Send replayed and live events while watching for the client to go away
+        pump = asyncio.ensure_future(subscriber.pump(send))
+        receiver = asyncio.ensure_future(_drain_incoming(websocket))
+        done, pending = await asyncio.wait({pump, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        if pump in done:
+            pump.result()
+            if subscriber.close_reason == "slow_consumer":
+                await send(json.dumps({
+                    "type": "disconnect",
+                    "stream_id": stream_id,
+                    "reason": "slow_consumer"
+                }))
     
     except websockets.exceptions.ConnectionClosed:
         # Connection closed
         pass
     
     finally:
-        # Remove connection from active connections
-        if websocket in _active_connections[stream_id]:
-            _active_connections[stream_id].remove(websocket)
+        if pump is not None and not pump.done():
+            pump.cancel()
+        # Remove connection from the hub
+        _hub.unsubscribe(subscriber)
+        if _stream_status[stream_id]["connected_clients"] > 0:
             _stream_status[stream_id]["connected_clients"] -= 1
 
+async def _drain_incoming(websocket) -> None:
+    """
+    Read and discard incoming messages until the client disconnects.
+    """
+    if hasattr(websocket, "iter_text"):
+        try:
+            async for message in websocket.iter_text():
+                # Process incoming messages if needed
+                pass
+        except Exception:
+            pass
+        return
+    try:
+        async for message in websocket:
+            # Process incoming messages if needed
+            pass
+    except websockets.exceptions.ConnectionClosed:
+        pass
+
 def add_event_to_stream(stream_id: str, event_type: str, source: str, data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Add an event to a stream.
@@ -375,8 +461,9 @@ def add_event_to_stream(stream_id: str, event_type: str, source: str, data: Dict
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        # Add event to stream events
-        _stream_events[stream_id].append(event)
+        # Buffer the event and queue it for every connected client;
+        # it is serialized once and never blocks on a slow client
+        _hub.publish(stream_id, event)
         
         # Update events streamed count
         _stream_status[stream_id]["events_streamed"] += 1
@@ -384,14 +471,9 @@ def add_event_to_stream(stream_id: str, event_type: str, source: str, data: Dict
         # Check if max events reached
         max_events = _streams[stream_id].get("max_events")
         if max_events and _stream_status[stream_id]["events_streamed"] >= max_events:
-            # Close stream
+            # Close stream; clients still receive the events already queued
             close_stream({"stream_id": stream_id, "reason": "Max events reached"})
         
-        # Send event to all connected clients
-        # In a real implementation, this would be done asynchronously
-        for connection in _active_connections[stream_id]:
-            asyncio.create_task(connection.send(json.dumps(event)))
-        
         return event
     
     except Exception as e:
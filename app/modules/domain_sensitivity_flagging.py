@@ -8,12 +8,13 @@ It's a key component of the Responsible Cognition Layer, providing awareness of
 domain-specific risks and triggering appropriate review processes.
 """
 
-import re
 import json
 import logging
 from typing import Dict, Any, List, Optional, Tuple, Set
 from datetime import datetime
 
+from app.core.pattern_scanner import get_pattern_scanner
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -77,6 +78,25 @@ DOMAIN_REVIEW_REQUIREMENTS = {
     "political": ["RESEARCHER", "CEO", "PESSIMIST"]
 }
 
+# Default sensitivity of a match in each domain, could be refined with ML in production
+DOMAIN_MATCH_SENSITIVITY = {
+    "medical": 0.8,
+    "legal": 0.8,
+    "financial": 0.8,
+    "mental_health": 0.9,  # Higher sensitivity for mental health
+    "political": 0.7
+}
+
+# Rule set compiled once for the shared pattern scanner
+_DOMAIN_RULES = get_pattern_scanner().register(
+    "domain_sensitivity_flagging",
+    [("medical", pattern) for pattern in MEDICAL_PATTERNS]
+    + [("legal", pattern) for pattern in LEGAL_PATTERNS]
+    + [("financial", pattern) for pattern in FINANCIAL_PATTERNS]
+    + [("mental_health", pattern) for pattern in MENTAL_HEALTH_PATTERNS]
+    + [("political", pattern) for pattern in POLITICAL_PATTERNS]
+)
+
 def scan_for_domain_sensitivity(text: str) -> Dict[str, List[Dict[str, Any]]]:
     """
     Scan text for domain sensitivity across all domains.
@@ -95,55 +115,12 @@ def scan_for_domain_sensitivity(text: str) -> Dict[str, List[Dict[str, Any]]]:
         "political": []
     }
     
-    # Check medical patterns
-    for pattern in MEDICAL_PATTERNS:
-        matches = re.finditer(pattern, text)
-        for match in matches:
-            results["medical"].append({
-                "matched_text": match.group(0),
-                "sensitivity": 0.8,  # Default sensitivity, could be refined with ML in production
-                "detected_at": datetime.utcnow().isoformat()
-            })
-    
-    # Check legal patterns
-    for pattern in LEGAL_PATTERNS:
-        matches = re.finditer(pattern, text)
-        for match in matches:
-            results["legal"].append({
-                "matched_text": match.group(0),
-                "sensitivity": 0.8,
-                "detected_at": datetime.utcnow().isoformat()
-            })
-    
-    # Check financial patterns
-    for pattern in FINANCIAL_PATTERNS:
-        matches = re.finditer(pattern, text)
-        for match in matches:
-            results["financial"].append({
-                "matched_text": match.group(0),
-                "sensitivity": 0.8,
-                "detected_at": datetime.utcnow().isoformat()
-            })
-    
-    # Check mental health patterns
-    for pattern in MENTAL_HEALTH_PATTERNS:
-        matches = re.finditer(pattern, text)
-        for match in matches:
-            results["mental_health"].append({
-                "matched_text": match.group(0),
-                "sensitivity": 0.9,  # Higher sensitivity for mental health
-                "detected_at": datetime.utcnow().isoformat()
-            })
-    
-    # Check political patterns
-    for pattern in POLITICAL_PATTERNS:
-        matches = re.finditer(pattern, text)
-        for match in matches:
-            results["political"].append({
-                "matched_text": match.group(0),
-                "sensitivity": 0.7,
-                "detected_at": datetime.utcnow().isoformat()
-            })
+    for domain, match in _DOMAIN_RULES.finditer(text):
+        results[domain].append({
+            "matched_text": match.group(0),
+            "sensitivity": DOMAIN_MATCH_SENSITIVITY[domain],
+            "detected_at": datetime.utcnow().isoformat()
+        })
     
     return results
 
@@ -0,0 +1,182 @@
+"""
+Embedding Cache Module
+
+Content-addressed cache for embeddings. Entries are keyed by
+(model, dimension, sha256(content)); an in-memory LRU sits in front of a
+persistent SQLite store, so identical content is embedded once per model.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger("embedding_cache")
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "embedding_cache.db")
+
+CacheKey = Tuple[str, int, str]
+
+
+def content_hash(content: str) -> str:
+    """Return the sha256 hex digest used as the cache key for content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-level embedding cache: in-memory LRU over a persistent SQLite store.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, lru_size: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file for the persistent store, or None for LRU only
+            lru_size: Maximum number of embeddings held in memory
+        """
+        self.path = path
+        self.lru_size = lru_size
+        self._lru: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    dimension INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (model, dimension, content_hash)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.commit()
+
+    def get_many(self, model: str, dimension: int, hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up embeddings by content hash.
+
+        Args:
+            model: Embedding model name
+            dimension: Embedding dimension
+            hashes: Content hashes to look up
+
+        Returns:
+            Dict of content hash to embedding for the hashes that were cached
+        """
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+
+        with self._lock:
+            for digest in hashes:
+                key = (model, dimension, digest)
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    found[digest] = vector
+                else:
+                    missing.append(digest)
+
+            if missing and self._conn is not None:
+                # Chunk the IN list to stay under SQLite's parameter limit
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    rows = self._conn.execute(
+                        f"SELECT content_hash, vector FROM embeddings WHERE model = ? AND dimension = ? "
+                        f"AND content_hash IN ({', '.join('?' * len(chunk))})",
+                        [model, dimension, *chunk],
+                    ).fetchall()
+                    for digest, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[digest] = vector
+                        self._remember((model, dimension, digest), vector)
+
+        return found
+
+    def put_many(self, model: str, dimension: int, entries: Dict[str, np.ndarray]) -> None:
+        """
+        Store embeddings by content hash.
+
+        Args:
+            model: Embedding model name
+            dimension: Embedding dimension
+            entries: Dict of content hash to embedding
+        """
+        if not entries:
+            return
+
+        with self._lock:
+            rows = []
+            for digest, vector in entries.items():
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember((model, dimension, digest), vector)
+                rows.append((model, dimension, digest, vector.tobytes()))
+
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (model, dimension, content_hash, vector) VALUES (?, ?, ?, ?)",
+                        rows,
+                    )
+
+    def record(self, hits: int, misses: int) -> None:
+        """Add to the lifetime hit/miss counters."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def __len__(self) -> int:
+        """Number of embeddings held in the in-memory LRU."""
+        return len(self._lru)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def _remember(self, key: CacheKey, vector: np.ndarray) -> None:
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def close(self) -> None:
+        """Close the persistent store."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Get the process-wide embedding cache.
+
+    The store location can be overridden with EMBEDDING_CACHE_PATH; set it to
+    an empty string to keep the cache in memory only.
+    """
+    global _cache
+    if _cache is None:
+        path = os.getenv("EMBEDDING_CACHE_PATH", DEFAULT_CACHE_PATH) or None
+        _cache = EmbeddingCache(path, lru_size=int(os.getenv("EMBEDDING_CACHE_LRU_SIZE", "10000")))
+        logger.info(f"Embedding cache initialized at {path or 'memory'}")
+    return _cache
@@ -0,0 +1,344 @@
+"""
+Execution Journal Module
+
+Per-project append-only journal of agent executions, kept outside the
+project state. Each project has a JSONL file of start / end / reset records
+which is replayed once per process into an in-memory index:
+
+- executions by id and by agent;
+- a stack of running execution ids per agent, so completing an agent's most
+  recent run does not scan the log;
+- a min-heap of running executions ordered by deadline (start time plus the
+  agent's timeout), so frozen-agent checks only look at expired entries.
+
+Completed or timed-out executions are removed from the heap lazily.
+"""
+
+import heapq
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger("app.modules.execution_journal")
+
+DEFAULT_JOURNAL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "agent_execution")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _seconds(moment: datetime) -> float:
+    """Seconds since the epoch for a naive UTC datetime."""
+    return (moment - _EPOCH).total_seconds()
+
+
+class ExecutionJournal:
+    """
+    Append-only agent execution journal for one project.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the journal, replaying the file at path if it exists.
+
+        Args:
+            path: JSONL file backing the journal
+        """
+        self.path = path
+        self._lock = threading.RLock()
+
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._by_agent: Dict[str, List[int]] = {}
+        self._running: Dict[str, List[int]] = {}
+        self._deadlines: List[Tuple[float, int]] = []
+        self._timed_out: set = set()
+        self._next_id = 0
+        self.current_agent: Optional[str] = None
+        self.last_completed_agent: Optional[str] = None
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._replay()
+
+    # ----------------------------------------------------------------- replay
+
+    def _replay(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn trailing line from a crash mid-append
+                    logger.warning(f"Skipping unreadable record in execution journal {self.path}")
+                    continue
+                self._apply(record)
+
+    def _apply(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        op = record["op"]
+        if op == "start":
+            entry = {
+                "agent": record["agent"],
+                "start_time": record["start_time"],
+                "status": "running",
+                "loop": record.get("loop", 0),
+            }
+            execution_id = record["id"]
+            self._entries[execution_id] = entry
+            self._by_agent.setdefault(entry["agent"], []).append(execution_id)
+            self._running.setdefault(entry["agent"], []).append(execution_id)
+            self._next_id = max(self._next_id, execution_id + 1)
+            self.current_agent = entry["agent"]
+
+            timeout = record.get("timeout")
+            if timeout is not None:
+                entry["timeout"] = timeout
+                deadline = _seconds(datetime.fromisoformat(entry["start_time"])) + timeout
+                heapq.heappush(self._deadlines, (deadline, execution_id))
+            return entry
+
+        if op == "end":
+            entry = self._entries[record["id"]]
+            entry["status"] = record["status"]
+            entry["end_time"] = record["end_time"]
+            entry["duration"] = record["duration"]
+            running = self._running.get(entry["agent"])
+            if running and running[-1] == record["id"]:
+                running.pop()
+            if record["status"] == "timeout":
+                self._timed_out.add(record["id"])
+            else:
+                self.last_completed_agent = entry["agent"]
+                if self.current_agent == entry["agent"]:
+                    self.current_agent = None
+            return entry
+
+        if op == "reset":
+            for execution_id in record["ids"]:
+                self._entries[execution_id]["status"] = "reset_after_timeout"
+                self._timed_out.discard(execution_id)
+            return None
+
+        raise ValueError(f"Unknown execution journal op: {op}")
+
+    def _append(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        return self._apply(record)
+
+    # ---------------------------------------------------------------- writes
+
+    def start(self, agent: str, loop: int, timeout: Optional[float] = None,
+              start_time: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Record the start of an execution.
+
+        Args:
+            agent: The name of the agent
+            loop: Loop count the execution started at
+            timeout: Seconds before the execution counts as frozen; None never expires
+            start_time: Start time (naive UTC); now if None
+
+        Returns:
+            Copy of the new execution entry
+        """
+        start_time = start_time or datetime.utcnow()
+        with self._lock:
+            entry = self._append({
+                "op": "start",
+                "id": self._next_id,
+                "agent": agent,
+                "start_time": start_time.isoformat(),
+                "loop": loop,
+                "timeout": timeout,
+            })
+            return dict(entry)
+
+    def _pop_running(self, agent: str) -> Optional[int]:
+        running = self._running.get(agent, [])
+        while running:
+            if self._entries[running[-1]]["status"] == "running":
+                return running[-1]
+            # Timed out since it started; drop it from the stack
+            running.pop()
+        return None
+
+    def complete(self, agent: str, status: str, loop: int) -> Dict[str, Any]:
+        """
+        Record the end of an agent's most recent running execution.
+
+        If the agent has no running execution, a zero-length one is recorded.
+
+        Args:
+            agent: The name of the agent
+            status: The completion status (e.g., "completed", "error")
+            loop: Loop count, used only when no running execution exists
+
+        Returns:
+            Copy of the updated execution entry
+        """
+        now = datetime.utcnow()
+        with self._lock:
+            execution_id = self._pop_running(agent)
+            if execution_id is None:
+                execution_id = self._next_id
+                self._append({
+                    "op": "start",
+                    "id": execution_id,
+                    "agent": agent,
+                    "start_time": now.isoformat(),
+                    "loop": loop,
+                    "timeout": None,
+                })
+                duration = 0
+            else:
+                start_time = datetime.fromisoformat(self._entries[execution_id]["start_time"])
+                duration = (now - start_time).total_seconds()
+
+            entry = self._append({
+                "op": "end",
+                "id": execution_id,
+                "status": status,
+                "end_time": now.isoformat(),
+                "duration": duration,
+            })
+            return dict(entry)
+
+    def expire(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Mark running executions whose deadline has passed as timed out.
+
+        Args:
+            now: Current time (naive UTC); now if None
+
+        Returns:
+            Copies of the executions that timed out, in deadline order
+        """
+        now = now or datetime.utcnow()
+        now_seconds = _seconds(now)
+        expired = []
+        with self._lock:
+            while self._deadlines and self._deadlines[0][0] < now_seconds:
+                _, execution_id = heapq.heappop(self._deadlines)
+                entry = self._entries[execution_id]
+                if entry["status"] != "running":
+                    continue
+                duration = (now - datetime.fromisoformat(entry["start_time"])).total_seconds()
+                expired.append(dict(self._append({
+                    "op": "end",
+                    "id": execution_id,
+                    "status": "timeout",
+                    "end_time": now.isoformat(),
+                    "duration": duration,
+                })))
+        return expired
+
+    def reset_timeouts(self) -> int:
+        """
+        Mark every timed-out execution as reset_after_timeout.
+
+        Returns:
+            Number of executions reset
+        """
+        with self._lock:
+            if not self._timed_out:
+                return 0
+            ids = sorted(self._timed_out)
+            self._append({"op": "reset", "ids": ids})
+            return len(ids)
+
+    def import_entries(
+        self,
+        entries: List[Dict[str, Any]],
+        timeout_for: Optional[Callable[[str], Optional[float]]] = None
+    ) -> None:
+        """
+        Append executions from a legacy agent_execution_log list.
+
+        Args:
+            entries: Execution entries as previously stored in the project state
+            timeout_for: Gives the timeout of an agent, for entries that do
+                not store one
+        """
+        with self._lock:
+            for legacy in entries:
+                execution_id = self._next_id
+                running = legacy.get("status", "running") == "running"
+                timeout = legacy.get("timeout")
+                if timeout is None and running and timeout_for is not None:
+                    timeout = timeout_for(legacy["agent"])
+                self._append({
+                    "op": "start",
+                    "id": execution_id,
+                    "agent": legacy["agent"],
+                    "start_time": legacy["start_time"],
+                    "loop": legacy.get("loop", 0),
+                    "timeout": timeout,
+                })
+                if running:
+                    continue
+                self._append({
+                    "op": "end",
+                    "id": execution_id,
+                    "status": legacy["status"],
+                    "end_time": legacy.get("end_time", legacy["start_time"]),
+                    "duration": legacy.get("duration", 0),
+                })
+
+    # ----------------------------------------------------------------- reads
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def executions(self, agent: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List executions in start order.
+
+        Args:
+            agent: Only this agent's executions if given
+
+        Returns:
+            Copies of the execution entries
+        """
+        with self._lock:
+            ids = self._by_agent.get(agent, []) if agent else sorted(self._entries)
+            return [dict(self._entries[execution_id]) for execution_id in ids]
+
+    def current_status(self, agent: str) -> str:
+        """Status of the agent's most recent execution, or "never_run"."""
+        with self._lock:
+            ids = self._by_agent.get(agent)
+            return self._entries[ids[-1]]["status"] if ids else "never_run"
+
+    def agents(self) -> List[str]:
+        """Agents with at least one execution, in order of first execution."""
+        with self._lock:
+            return list(self._by_agent)
+
+
+_journals: Dict[str, ExecutionJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_execution_journal(project_id: str) -> ExecutionJournal:
+    """
+    Get the process-wide execution journal for a project.
+
+    Journals live in AGENT_EXECUTION_JOURNAL_DIR (default app/data/agent_execution).
+
+    Args:
+        project_id: The ID of the project
+
+    Returns:
+        The project's ExecutionJournal
+    """
+    with _journals_lock:
+        journal = _journals.get(project_id)
+        if journal is None:
+            journal_dir = os.getenv("AGENT_EXECUTION_JOURNAL_DIR", DEFAULT_JOURNAL_DIR)
+            journal = ExecutionJournal(os.path.join(journal_dir, f"{project_id}.jsonl"))
+            _journals[project_id] = journal
+        return journal
@@ -5,56 +5,16 @@ This module is responsible for generating belief drift reports for loops,
 comparing loops for belief drift, and injecting drift reports into loop traces.
 """
 
-from typing import Dict, Any, List, Optional, Tuple, Set
+from typing import Dict, Any, List, Tuple, Set
 import asyncio
-import json
 from datetime import datetime
-import re
-from collections import defaultdict
+from collections import defaultdict, deque
+from itertools import islice
+from app.modules.kv_memory import read_from_memory, write_to_memory, read_many_from_memory, write_many_to_memory
+from app.modules.loop_lineage_store import get_loop_lineage
 
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    
-    # Mock data for testing
-    if key == "loop_trace[loop_001]":
-        return {
-            "loop_id": "loop_001",
-            "status": "finalized",
-            "timestamp": "2025-04-20T10:00:00Z",
-            "summary": "Analyzed quantum computing concepts with thorough examination of qubits, superposition, and entanglement. Identified potential applications in cryptography and optimization problems.",
-            "orchestrator_persona": "SAGE",
-            "alignment_score": 0.82,
-            "drift_score": 0.18,
-            "rerun_count": 0
-        }
-    elif key == "loop_trace[loop_002]":
-        return {
-            "loop_id": "loop_002",
-            "status": "finalized",
-            "timestamp": "2025-04-20T14:00:00Z",
-            "summary": "Researched machine learning algorithms with focus on neural networks and deep learning. Evaluated performance characteristics and application domains.",
-            "orchestrator_persona": "NOVA",
-            "alignment_score": 0.79,
-            "drift_score": 0.21,
-            "rerun_count": 1,
-            "rerun_trigger": ["alignment"],
-            "rerun_reason": "alignment_threshold_not_met"
-        }
-    
-    return None
-
-# Mock function for writing to memory
-# In a real implementation, this would write to a database or storage system
-async def write_to_memory(key: str, value: Any) -> bool:
-    """Write data to memory storage."""
-    # Simulate memory write
-    await asyncio.sleep(0.1)
-    print(f"Writing to memory: {key} = {json.dumps(value, indent=2)}")
-    return True
+# Loops read and written per batch when generating reports for all loops
+DRIFT_REPORT_BATCH_SIZE = 200
 
 async def get_loop_trace(loop_id: str) -> Dict[str, Any]:
     """
@@ -77,75 +37,39 @@ async def get_loop_trace(loop_id: str) -> Dict[str, Any]:
 
 async def get_all_loop_ids() -> List[str]:
     """
-    Get all loop IDs.
+    Get all loop IDs, by project and then in time order.
     
     Returns:
         List of loop IDs
     """
-    # In a real implementation, this would query the database for all loop IDs
-    # For this mock implementation, we'll use a hardcoded list
-    return ["loop_001", "loop_002", "loop_003", "loop_004", "loop_005"]
+    return await asyncio.to_thread(get_loop_lineage().loop_ids)
 
 async def get_previous_loops(loop_id: str, limit: int = 5) -> List[str]:
     """
-    Get the IDs of previous loops.
+    Get the IDs of the loops of the same project that precede a loop.
     
     Args:
         loop_id: The ID of the current loop
         limit: Maximum number of previous loops to return
         
     Returns:
-        List of previous loop IDs
+        List of previous loop IDs, most recent first
     """
-    # In a real implementation, this would query the database for previous loops
-    # For this mock implementation, we'll use a simple pattern
-    
-    # Extract the numeric part of the loop ID
-    match = re.match(r"loop_(\d+)", loop_id)
-    if not match:
-        return []
-    
-    loop_num = int(match.group(1))
-    
-    # Generate previous loop IDs
-    previous_loops = []
-    for i in range(1, limit + 1):
-        prev_num = loop_num - i
-        if prev_num > 0:
-            previous_loops.append(f"loop_{prev_num:03d}")
-    
-    return previous_loops
+    return await asyncio.to_thread(get_loop_lineage().previous_loops, loop_id, limit)
 
-async def compare_loops(loop_id_1: str, loop_id_2: str) -> Dict[str, Any]:
+def _compare_traces(loop_id_1: str, trace_1: Dict[str, Any], loop_id_2: str, trace_2: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Compare two loops for belief drift.
+    Compare two loop traces for belief drift.
     
     Args:
         loop_id_1: The ID of the first loop
+        trace_1: The first loop's trace
         loop_id_2: The ID of the second loop
+        trace_2: The second loop's trace
         
     Returns:
         Dict with comparison results
     """
-    # Get loop traces
-    trace_1 = await get_loop_trace(loop_id_1)
-    trace_2 = await get_loop_trace(loop_id_2)
-    
-    # Check for errors
-    if "error" in trace_1:
-        return {
-            "error": trace_1["error"],
-            "loop_id_1": loop_id_1,
-            "loop_id_2": loop_id_2
-        }
-    
-    if "error" in trace_2:
-        return {
-            "error": trace_2["error"],
-            "loop_id_1": loop_id_1,
-            "loop_id_2": loop_id_2
-        }
-    
     # Extract drift scores
     drift_1 = trace_1.get("drift_score", 0.0)
     drift_2 = trace_2.get("drift_score", 0.0)
@@ -196,12 +120,45 @@ async def compare_loops(loop_id_1: str, loop_id_2: str) -> Dict[str, Any]:
     
     return comparison
 
-async def compare_multiple_loops(loop_ids: List[str]) -> Dict[str, Any]:
+async def compare_loops(loop_id_1: str, loop_id_2: str) -> Dict[str, Any]:
     """
-    Compare multiple loops for belief drift trends.
+    Compare two loops for belief drift.
+    
+    Args:
+        loop_id_1: The ID of the first loop
+        loop_id_2: The ID of the second loop
+        
+    Returns:
+        Dict with comparison results
+    """
+    # Get loop traces
+    trace_1 = await get_loop_trace(loop_id_1)
+    trace_2 = await get_loop_trace(loop_id_2)
+    
+    # Check for errors
+    if "error" in trace_1:
+        return {
+            "error": trace_1["error"],
+            "loop_id_1": loop_id_1,
+            "loop_id_2": loop_id_2
+        }
+    
+    if "error" in trace_2:
+        return {
+            "error": trace_2["error"],
+            "loop_id_1": loop_id_1,
+            "loop_id_2": loop_id_2
+        }
+    
+    return _compare_traces(loop_id_1, trace_1, loop_id_2, trace_2)
+
+def _compare_trace_sequence(loop_ids: List[str], traces: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare adjacent loops (in loop ID order) for belief drift trends.
     
     Args:
         loop_ids: List of loop IDs to compare
+        traces: Loop traces by loop ID; loops without a trace are skipped
         
     Returns:
         Dict with comparison results
@@ -217,10 +174,9 @@ async def compare_multiple_loops(loop_ids: List[str]) -> Dict[str, Any]:
     
     # Compare adjacent loops
     comparisons = []
-    for i in range(len(sorted_ids) - 1):
-        comparison = await compare_loops(sorted_ids[i], sorted_ids[i + 1])
-        if "error" not in comparison:
-            comparisons.append(comparison)
+    for loop_id_1, loop_id_2 in zip(sorted_ids, sorted_ids[1:]):
+        if loop_id_1 in traces and loop_id_2 in traces:
+            comparisons.append(_compare_traces(loop_id_1, traces[loop_id_1], loop_id_2, traces[loop_id_2]))
     
     # Calculate overall trend
     if not comparisons:
@@ -262,33 +218,44 @@ async def compare_multiple_loops(loop_ids: List[str]) -> Dict[str, Any]:
     
     return result
 
-async def generate_belief_drift_report(loop_id: str) -> Dict[str, Any]:
+async def compare_multiple_loops(loop_ids: List[str]) -> Dict[str, Any]:
     """
-    Generate a belief drift report for a loop.
+    Compare multiple loops for belief drift trends.
+    
+    Args:
+        loop_ids: List of loop IDs to compare
+        
+    Returns:
+        Dict with comparison results
+    """
+    # Read each trace once rather than once per comparison it appears in
+    traces = {}
+    if len(loop_ids) >= 2:
+        for loop_id in set(loop_ids):
+            trace = await get_loop_trace(loop_id)
+            if "error" not in trace:
+                traces[loop_id] = trace
+    
+    return _compare_trace_sequence(loop_ids, traces)
+
+def _build_drift_report(
+    loop_id: str,
+    trace: Dict[str, Any],
+    loops_to_compare: List[str],
+    comparison_result: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Build a belief drift report from a loop's trace and its comparison with previous loops.
     
     Args:
         loop_id: The ID of the loop
+        trace: The loop's trace
+        loops_to_compare: Previous loop IDs followed by loop_id
+        comparison_result: Result of comparing loops_to_compare
         
     Returns:
         Dict with belief drift report
     """
-    # Get loop trace
-    trace = await get_loop_trace(loop_id)
-    if "error" in trace:
-        return {
-            "error": trace["error"],
-            "loop_id": loop_id
-        }
-    
-    # Get previous loops
-    previous_loops = await get_previous_loops(loop_id)
-    
-    # Create list of loops to compare
-    loops_to_compare = previous_loops + [loop_id]
-    
-    # Compare loops
-    comparison_result = await compare_multiple_loops(loops_to_compare)
-    
     # Extract drift score from trace
     drift_score = trace.get("drift_score", 0.0)
     
@@ -324,6 +291,35 @@ async def generate_belief_drift_report(loop_id: str) -> Dict[str, Any]:
     
     return report
 
+async def generate_belief_drift_report(loop_id: str) -> Dict[str, Any]:
+    """
+    Generate a belief drift report for a loop.
+    
+    Args:
+        loop_id: The ID of the loop
+        
+    Returns:
+        Dict with belief drift report
+    """
+    # Get loop trace
+    trace = await get_loop_trace(loop_id)
+    if "error" in trace:
+        return {
+            "error": trace["error"],
+            "loop_id": loop_id
+        }
+    
+    # Get previous loops
+    previous_loops = await get_previous_loops(loop_id)
+    
+    # Create list of loops to compare
+    loops_to_compare = previous_loops + [loop_id]
+    
+    # Compare loops
+    comparison_result = await compare_multiple_loops(loops_to_compare)
+    
+    return _build_drift_report(loop_id, trace, loops_to_compare, comparison_result)
+
 async def inject_drift_report_into_loop_trace(loop_id: str) -> bool:
     """
     Inject a belief drift report into a loop trace.
@@ -359,18 +355,48 @@ async def generate_drift_reports_for_all_loops() -> Dict[str, Any]:
     """
     Generate belief drift reports for all loops.
     
+    Loops are streamed from the lineage index project by project in time
+    order, so each loop's previous loops are the last few seen. Traces are
+    read and written back in batches, each exactly once.
+    
     Returns:
         Dict with generation results
     """
-    # Get all loop IDs
-    loop_ids = await get_all_loop_ids()
+    loops = get_loop_lineage().iter_loops(DRIFT_REPORT_BATCH_SIZE)
+    recent: Dict[str, deque] = {}
     
     # Generate reports for each loop
     results = {}
-    for loop_id in loop_ids:
-        report = await generate_belief_drift_report(loop_id)
-        await inject_drift_report_into_loop_trace(loop_id)
-        results[loop_id] = report
+    while True:
+        batch = await asyncio.to_thread(lambda: list(islice(loops, DRIFT_REPORT_BATCH_SIZE)))
+        if not batch:
+            break
+        
+        traces = await read_many_from_memory([f"loop_trace[{loop_id}]" for loop_id, _ in batch])
+        updated_traces = {}
+        for loop_id, project_id in batch:
+            trace = traces.get(f"loop_trace[{loop_id}]")
+            if not isinstance(trace, dict):
+                results[loop_id] = {
+                    "error": f"Loop trace not found for {loop_id}",
+                    "loop_id": loop_id
+                }
+                continue
+            
+            # Same comparison as generate_belief_drift_report, from the traces at hand
+            previous = recent.setdefault(project_id, deque(maxlen=5))
+            loops_to_compare = [previous_id for previous_id, _ in reversed(previous)] + [loop_id]
+            comparison_result = _compare_trace_sequence(loops_to_compare, {**dict(previous), loop_id: trace})
+            report = _build_drift_report(loop_id, trace, loops_to_compare, comparison_result)
+            previous.append((loop_id, trace))
+            
+            trace["belief_drift_report"] = report
+            trace["belief_drift_trend"] = report["belief_drift_trend"]
+            updated_traces[f"loop_trace[{loop_id}]"] = trace
+            results[loop_id] = report
+        
+        if updated_traces:
+            await write_many_to_memory(updated_traces)
     
     # Calculate aggregate statistics
     total_loops = len(results)
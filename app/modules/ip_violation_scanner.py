@@ -14,6 +14,8 @@ import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from app.core.pattern_scanner import get_pattern_scanner
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -58,6 +60,21 @@ HIGH_RISK_ENTITIES = [
     "Beatles", "Taylor Swift", "Beyoncé", "Drake", "Adele"
 ]
 
+# Rule set compiled once for the shared pattern scanner
+_IP_VIOLATION_RULES = get_pattern_scanner().register(
+    "ip_violation_scanner",
+    [("copyright", pattern) for pattern in COPYRIGHT_PATTERNS]
+    + [("trademark", pattern) for pattern in TRADEMARK_PATTERNS]
+    + [("proprietary_code", pattern) for pattern in PROPRIETARY_CODE_PATTERNS]
+)
+
+# Severity of a violation type, depending on whether high-risk entities are mentioned
+_SEVERITY = {
+    "copyright": ("high", "medium"),
+    "trademark": ("medium", "low"),
+    "proprietary_code": ("high", "medium"),
+}
+
 async def scan_for_ip_violations(content: str, loop_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Scan content for potential intellectual property violations.
@@ -72,56 +89,24 @@ async def scan_for_ip_violations(content: str, loop_id: Optional[str] = None) ->
     violation_tags = []
     violation_details = []
     
-    # Check for copyright violations
-    for pattern in COPYRIGHT_PATTERNS:
-        matches = re.finditer(pattern, content)
-        for match in matches:
-            # Check if any high-risk entity is mentioned
-            matched_text = match.group(0)
-            is_high_risk = any(entity.lower() in content.lower() for entity in HIGH_RISK_ENTITIES)
-            
-            violation_tags.append("copyright")
-            violation_details.append({
-                "type": "copyright",
-                "severity": "high" if is_high_risk else "medium",
-                "matched_text": matched_text,
-                "high_risk": is_high_risk,
-                "detected_at": datetime.utcnow().isoformat()
-            })
-    
-    # Check for trademark violations
-    for pattern in TRADEMARK_PATTERNS:
-        matches = re.finditer(pattern, content)
-        for match in matches:
-            # Check if any high-risk entity is mentioned
-            matched_text = match.group(0)
-            is_high_risk = any(entity.lower() in content.lower() for entity in HIGH_RISK_ENTITIES)
-            
-            violation_tags.append("trademark")
-            violation_details.append({
-                "type": "trademark",
-                "severity": "medium" if is_high_risk else "low",
-                "matched_text": matched_text,
-                "high_risk": is_high_risk,
-                "detected_at": datetime.utcnow().isoformat()
-            })
+    # Whether any high-risk entity is mentioned only depends on the content
+    is_high_risk = None
     
-    # Check for proprietary code sharing
-    for pattern in PROPRIETARY_CODE_PATTERNS:
-        matches = re.finditer(pattern, content)
-        for match in matches:
-            # Check if any high-risk entity is mentioned
-            matched_text = match.group(0)
-            is_high_risk = any(entity.lower() in content.lower() for entity in HIGH_RISK_ENTITIES)
-            
-            violation_tags.append("proprietary_code")
-            violation_details.append({
-                "type": "proprietary_code",
-                "severity": "high" if is_high_risk else "medium",
-                "matched_text": matched_text,
-                "high_risk": is_high_risk,
-                "detected_at": datetime.utcnow().isoformat()
-            })
+    for violation_type, match in _IP_VIOLATION_RULES.finditer(content):
+        matched_text = match.group(0)
+        if is_high_risk is None:
+            lowered = content.lower()
+            is_high_risk = any(entity.lower() in lowered for entity in HIGH_RISK_ENTITIES)
+        high_severity, low_severity = _SEVERITY[violation_type]
+        
+        violation_tags.append(violation_type)
+        violation_details.append({
+            "type": violation_type,
+            "severity": high_severity if is_high_risk else low_severity,
+            "matched_text": matched_text,
+            "high_risk": is_high_risk,
+            "detected_at": datetime.utcnow().isoformat()
+        })
     
     # Remove duplicates from violation tags
     violation_tags = list(set(violation_tags))
@@ -0,0 +1,398 @@
+"""
+KV Memory Module
+
+Shared key-value memory for the loop reflection modules (loop traces,
+summaries, bias tags, beliefs, audits, ...). Values are JSON documents stored
+in SQLite under string keys such as "loop_trace[loop_001]".
+
+- Reads go through an in-process LRU read-through cache; misses are cached
+  too, so repeated lookups of absent keys do not hit SQLite.
+- get_many / set_many read or write any number of keys in one statement or
+  transaction.
+- scan_prefix lists every key under a prefix (e.g. "loop_trace[") with an
+  index range scan.
+- Async callers are served from the cache without leaving the event loop;
+  SQLite work runs in a worker thread.
+- Secondary indexes (see add_index) keep their own tables in the same
+  database and are updated in the same transaction as the writes they index.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Protocol
+
+# Configure logging
+logger = logging.getLogger("app.modules.kv_memory")
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "kv_memory.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Marks a key known to be absent in the cache
+_MISSING = object()
+
+# SQLite's default limit on host parameters per statement
+_MAX_PARAMS = 900
+
+
+class KVIndex(Protocol):
+    """
+    Secondary index over the values stored under a key prefix.
+    """
+
+    name: str
+    prefix: str
+
+    def install(self, conn: sqlite3.Connection) -> bool:
+        """Create the index tables; return True if they did not exist yet."""
+
+    def update(self, conn: sqlite3.Connection, items: Dict[str, Any]) -> None:
+        """Index values written under the prefix, inside the write transaction."""
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with prefix."""
+    for i in range(len(prefix) - 1, -1, -1):
+        if ord(prefix[i]) < 0x10FFFF:
+            return prefix[:i] + chr(ord(prefix[i]) + 1)
+    return None
+
+
+class KVMemoryStore:
+    """
+    SQLite-backed JSON key-value store with a read-through LRU cache.
+    """
+
+    def __init__(self, db_path: Optional[str] = DEFAULT_DB_PATH, cache_size: int = 4096):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: SQLite file, or None for an in-memory database
+            cache_size: Number of keys kept in the read cache (0 disables it)
+        """
+        self.db_path = db_path
+        self.cache_size = cache_size
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._indexes: Dict[str, KVIndex] = {}
+
+    # ------------------------------------------------------------------ cache
+
+    def _cached(self, key: str) -> Any:
+        encoded = self._cache.get(key)
+        if encoded is not None:
+            self._cache.move_to_end(key)
+        return encoded
+
+    def _remember(self, key: str, encoded: Any) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = encoded
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _decode(encoded: Any) -> Any:
+        # Values are cached encoded so callers never share mutable objects
+        return None if encoded is _MISSING else json.loads(encoded)
+
+    # ------------------------------------------------------------------ reads
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Read a value.
+
+        Args:
+            key: The key
+            default: Returned if the key is absent
+
+        Returns:
+            The stored value, or default
+        """
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Read several values at once.
+
+        Args:
+            keys: The keys
+
+        Returns:
+            Dict of the keys that exist and their values
+        """
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Any] = {}
+        with self._lock:
+            misses = []
+            for key in keys:
+                encoded = self._cached(key)
+                if encoded is None:
+                    misses.append(key)
+                elif encoded is not _MISSING:
+                    found[key] = self._decode(encoded)
+
+            for start in range(0, len(misses), _MAX_PARAMS):
+                chunk = misses[start:start + _MAX_PARAMS]
+                rows = dict(self._conn.execute(
+                    f"SELECT key, value FROM kv WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall())
+                for key in chunk:
+                    encoded = rows.get(key, _MISSING)
+                    self._remember(key, encoded)
+                    if encoded is not _MISSING:
+                        found[key] = self._decode(encoded)
+
+        return {key: found[key] for key in keys if key in found}
+
+    def _prefix_query(self, columns: str, prefix: str, limit: Optional[int]) -> List[tuple]:
+        upper = _prefix_upper_bound(prefix)
+        sql = f"SELECT {columns} FROM kv WHERE key >= ?"
+        params: List[Any] = [prefix]
+        if upper is not None:
+            sql += " AND key < ?"
+            params.append(upper)
+        sql += " ORDER BY key"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def scan_prefix(self, prefix: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Read every key starting with a prefix, in key order.
+
+        Args:
+            prefix: Key prefix, e.g. "loop_trace["
+            limit: Maximum number of keys
+
+        Returns:
+            Dict of matching keys and their values
+        """
+        return {key: json.loads(encoded) for key, encoded in self._prefix_query("key, value", prefix, limit)}
+
+    def keys(self, prefix: str = "", limit: Optional[int] = None) -> List[str]:
+        """
+        List keys starting with a prefix, in key order, without reading values.
+
+        Args:
+            prefix: Key prefix, e.g. "loop_trace["
+            limit: Maximum number of keys
+
+        Returns:
+            List of matching keys
+        """
+        return [row[0] for row in self._prefix_query("key", prefix, limit)]
+
+    # ----------------------------------------------------------------- writes
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Write a value.
+
+        Args:
+            key: The key
+            value: JSON-serializable value
+        """
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, Any]) -> None:
+        """
+        Write several values in one transaction.
+
+        Args:
+            items: Mapping of keys to JSON-serializable values
+        """
+        rows = [(key, json.dumps(value, default=str)) for key, value in items.items()]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO kv (key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    rows,
+                )
+                for index in self._indexes.values():
+                    indexed = {key: value for key, value in items.items() if key.startswith(index.prefix)}
+                    if indexed:
+                        index.update(self._conn, indexed)
+            for key, encoded in rows:
+                self._remember(key, encoded)
+
+    def delete(self, key: str) -> bool:
+        """
+        Delete a key.
+
+        Args:
+            key: The key
+
+        Returns:
+            True if the key existed
+        """
+        with self._lock:
+            with self._conn:
+                deleted = self._conn.execute("DELETE FROM kv WHERE key = ?", (key,)).rowcount
+            self._remember(key, _MISSING)
+        return deleted > 0
+
+    def add_index(self, index: KVIndex) -> None:
+        """
+        Attach a secondary index, filling it from existing values if it is new.
+
+        Args:
+            index: The index; writes under index.prefix update it from now on
+        """
+        with self._lock:
+            with self._conn:
+                if index.install(self._conn):
+                    rows = self._prefix_query("key, value", index.prefix, None)
+                    index.update(self._conn, {key: json.loads(encoded) for key, encoded in rows})
+            self._indexes[index.name] = index
+
+    def get_index(self, name: str) -> Optional[KVIndex]:
+        """Get an attached index by name."""
+        return self._indexes.get(name)
+
+    def query(self, sql: str, params: Iterable[Any] = ()) -> List[tuple]:
+        """
+        Run a read-only query, e.g. against an index's tables.
+
+        Args:
+            sql: The SQL statement
+            params: Statement parameters
+
+        Returns:
+            List of result rows
+        """
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def clear_cache(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._cache.clear()
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        self._conn.close()
+
+    # ------------------------------------------------------------------ async
+
+    def _all_cached(self, keys: List[str]) -> bool:
+        with self._lock:
+            return all(key in self._cache for key in keys)
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """Async get; a cache hit never leaves the event loop."""
+        return (await self.aget_many([key])).get(key, default)
+
+    async def aget_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Async get_many; cache hits never leave the event loop."""
+        keys = list(keys)
+        if self._all_cached(keys):
+            return self.get_many(keys)
+        return await asyncio.to_thread(self.get_many, keys)
+
+    async def ascan_prefix(self, prefix: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Async scan_prefix, run off the event loop."""
+        return await asyncio.to_thread(self.scan_prefix, prefix, limit)
+
+    async def akeys(self, prefix: str = "", limit: Optional[int] = None) -> List[str]:
+        """Async keys, run off the event loop."""
+        return await asyncio.to_thread(self.keys, prefix, limit)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """Async set, run off the event loop."""
+        await self.aset_many({key: value})
+
+    async def aset_many(self, items: Dict[str, Any]) -> None:
+        """Async set_many, run off the event loop."""
+        await asyncio.to_thread(self.set_many, items)
+
+
+_store: Optional[KVMemoryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_kv_memory() -> KVMemoryStore:
+    """
+    Get the process-wide KV memory store.
+
+    The database location can be overridden with KV_MEMORY_DB (empty for an
+    in-memory database) and the cache size with KV_MEMORY_CACHE_SIZE
+    (default 4096 keys). The loop lineage index is attached on creation, so
+    every loop_trace write is indexed.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            # Imported here: the lineage index builds on this module
+            from app.modules.loop_lineage_store import LoopLineageIndex
+
+            store = KVMemoryStore(
+                os.getenv("KV_MEMORY_DB", DEFAULT_DB_PATH) or None,
+                cache_size=int(os.getenv("KV_MEMORY_CACHE_SIZE", "4096")),
+            )
+            store.add_index(LoopLineageIndex(store))
+            _store = store
+        return _store
+
+
+async def read_from_memory(key: str) -> Optional[Any]:
+    """Read data from memory storage."""
+    return await get_kv_memory().aget(key)
+
+
+async def read_many_from_memory(keys: Iterable[str]) -> Dict[str, Any]:
+    """Read several keys from memory storage; absent keys are left out."""
+    return await get_kv_memory().aget_many(keys)
+
+
+async def scan_memory(prefix: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Read every key under a prefix (e.g. "loop_trace[") from memory storage."""
+    return await get_kv_memory().ascan_prefix(prefix, limit)
+
+
+async def list_memory_keys(prefix: str, limit: Optional[int] = None) -> List[str]:
+    """List the keys under a prefix in memory storage."""
+    return await get_kv_memory().akeys(prefix, limit)
+
+
+async def write_to_memory(key: str, value: Any) -> bool:
+    """Write data to memory storage."""
+    try:
+        await get_kv_memory().aset(key, value)
+        return True
+    except (TypeError, ValueError, sqlite3.Error) as e:
+        logger.error(f"Error writing {key} to memory: {str(e)}")
+        return False
+
+
+async def write_many_to_memory(items: Dict[str, Any]) -> bool:
+    """Write several keys to memory storage in one transaction."""
+    try:
+        await get_kv_memory().aset_many(items)
+        return True
+    except (TypeError, ValueError, sqlite3.Error) as e:
+        logger.error(f"Error writing {len(items)} keys to memory: {str(e)}")
+        return False
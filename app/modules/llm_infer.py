@@ -7,6 +7,7 @@ from typing import Dict, Any, Optional
 
 # Import the prompt_cleaner function
 from app.utils.prompt_cleaner import clean_prompt
+from app.providers.http_transport import get_transport
 
 class LLMInferenceModule:
     """
@@ -28,12 +29,9 @@ class LLMInferenceModule:
         if not self.api_key:
             raise ValueError("API key must be provided or set as OPENAI_API_KEY environment variable")
     
-    def infer(self, prompt: str, model: str = "gpt-4", **kwargs) -> Dict[str, Any]:
+    def _build_payload(self, prompt: str, model: str, **kwargs) -> Dict[str, Any]:
         """
-        Send a prompt to the LLM provider and return the response.
-        
-        This method sanitizes the prompt using the prompt_cleaner utility
-        before sending it to the LLM provider.
+        Sanitize the prompt and build the chat completions payload.
         
         Args:
             prompt (str): The prompt to send to the LLM
@@ -41,17 +39,34 @@ class LLMInferenceModule:
             **kwargs: Additional parameters to pass to the LLM provider
             
         Returns:
-            Dict[str, Any]: The response from the LLM provider
+            Dict[str, Any]: The request payload
         """
         # Clean the prompt before sending to external LLM provider
         sanitized_prompt = clean_prompt(prompt)
         
-        # Prepare the request payload
-        payload = {
+        return {
             "model": model,
             "messages": [{"role": "user", "content": sanitized_prompt}],
             **kwargs
         }
+    
+    def infer(self, prompt: str, model: str = "gpt-4", **kwargs) -> Dict[str, Any]:
+        """
+        Send a prompt to the LLM provider and return the response.
+        
+        This method sanitizes the prompt using the prompt_cleaner utility
+        before sending it to the LLM provider.
+        
+        Args:
+            prompt (str): The prompt to send to the LLM
+            model (str): The model to use for inference
+            **kwargs: Additional parameters to pass to the LLM provider
+            
+        Returns:
+            Dict[str, Any]: The response from the LLM provider
+        """
+        # Prepare the request payload
+        payload = self._build_payload(prompt, model, **kwargs)
         
         # Make the API request to OpenAI
         try:
@@ -62,6 +77,40 @@ class LLMInferenceModule:
             print(f"Error calling LLM API: {str(e)}")
             raise
     
+    async def ainfer(self, prompt: str, model: str = "gpt-4", **kwargs) -> Dict[str, Any]:
+        """
+        Async variant of infer that does not block the event loop.
+        
+        Requests go through the shared OpenAI transport: one pooled keep-alive
+        session, bounded concurrency, requests/min and tokens/min buckets, and
+        jittered retries that honor Retry-After.
+        
+        Args:
+            prompt (str): The prompt to send to the LLM
+            model (str): The model to use for inference
+            **kwargs: Additional parameters to pass to the LLM provider
+            
+        Returns:
+            Dict[str, Any]: The response from the LLM provider
+        """
+        payload = self._build_payload(prompt, model, **kwargs)
+        
+        # Rough prompt estimate (~4 chars per token) plus the completion budget;
+        # reconciled against the response's usage block
+        estimated_tokens = len(payload["messages"][0]["content"]) // 4 + int(kwargs.get("max_tokens", 0) or 0)
+        
+        try:
+            return await get_transport("openai").post_json(
+                "/chat/completions",
+                payload,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                estimated_tokens=estimated_tokens,
+            )
+        except Exception as e:
+            # Log the error and re-raise
+            print(f"Error calling LLM API: {str(e)}")
+            raise
+    
     def _call_openai_api(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
         Make the actual API call to OpenAI.
@@ -111,3 +160,20 @@ def infer_with_llm(prompt: str, model: str = "gpt-4", api_key: Optional[str] = N
     
     # Use the module to make the inference call with the sanitized prompt
     return llm_module.infer(prompt, model, **kwargs)
+
+
+async def ainfer_with_llm(prompt: str, model: str = "gpt-4", api_key: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+    """
+    Async counterpart of infer_with_llm for callers running on the event loop.
+    
+    Args:
+        prompt (str): The prompt to send to the LLM
+        model (str): The model to use for inference
+        api_key (str, optional): API key for the LLM provider
+        **kwargs: Additional parameters to pass to the LLM provider
+        
+    Returns:
+        Dict[str, Any]: The response from the LLM provider
+    """
+    llm_module = LLMInferenceModule(api_key)
+    return await llm_module.ainfer(prompt, model, **kwargs)
@@ -15,6 +15,8 @@ import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from app.core.pattern_scanner import get_pattern_scanner
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -62,6 +64,25 @@ PROMPT_LEAKING_PATTERNS = [
     r"(?i)copy (this|the following|everything) (exactly|precisely|verbatim)"
 ]
 
+# Severity of each injection type
+INJECTION_SEVERITY = {
+    "instruction_override": "high",
+    "system_manipulation": "high",
+    "role_manipulation": "high",
+    "delimiter_exploitation": "medium",
+    "prompt_leaking": "medium"
+}
+
+# Rule set compiled once for the shared pattern scanner
+_INJECTION_RULES = get_pattern_scanner().register(
+    "loop_intent_sanitizer",
+    [("instruction_override", pattern) for pattern in INSTRUCTION_OVERRIDE_PATTERNS]
+    + [("system_manipulation", pattern) for pattern in SYSTEM_MANIPULATION_PATTERNS]
+    + [("role_manipulation", pattern) for pattern in ROLE_MANIPULATION_PATTERNS]
+    + [("delimiter_exploitation", pattern) for pattern in DELIMITER_EXPLOITATION_PATTERNS]
+    + [("prompt_leaking", pattern) for pattern in PROMPT_LEAKING_PATTERNS]
+)
+
 async def sanitize_loop_intent(prompt: str, loop_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Sanitize loop intent by detecting and handling prompt injection attempts.
@@ -76,65 +97,14 @@ async def sanitize_loop_intent(prompt: str, loop_id: Optional[str] = None) -> Di
     injection_tags = []
     injection_details = []
     
-    # Check for instruction override attempts
-    for pattern in INSTRUCTION_OVERRIDE_PATTERNS:
-        matches = re.finditer(pattern, prompt)
-        for match in matches:
-            injection_tags.append("instruction_override")
-            injection_details.append({
-                "type": "instruction_override",
-                "severity": "high",  # Instruction overrides are high severity
-                "matched_text": match.group(0),
-                "detected_at": datetime.utcnow().isoformat()
-            })
-    
-    # Check for system manipulation attempts
-    for pattern in SYSTEM_MANIPULATION_PATTERNS:
-        matches = re.finditer(pattern, prompt)
-        for match in matches:
-            injection_tags.append("system_manipulation")
-            injection_details.append({
-                "type": "system_manipulation",
-                "severity": "high",  # System manipulations are high severity
-                "matched_text": match.group(0),
-                "detected_at": datetime.utcnow().isoformat()
-            })
-    
-    # Check for role manipulation attempts
-    for pattern in ROLE_MANIPULATION_PATTERNS:
-        matches = re.finditer(pattern, prompt)
-        for match in matches:
-            injection_tags.append("role_manipulation")
-            injection_details.append({
-                "type": "role_manipulation",
-                "severity": "high",  # Role manipulations are high severity
-                "matched_text": match.group(0),
-                "detected_at": datetime.utcnow().isoformat()
-            })
-    
-    # Check for delimiter exploitation attempts
-    for pattern in DELIMITER_EXPLOITATION_PATTERNS:
-        matches = re.finditer(pattern, prompt)
-        for match in matches:
-            injection_tags.append("delimiter_exploitation")
-            injection_details.append({
-                "type": "delimiter_exploitation",
-                "severity": "medium",  # Delimiter exploitations are medium severity
-                "matched_text": match.group(0),
-                "detected_at": datetime.utcnow().isoformat()
-            })
-    
-    # Check for prompt leaking attempts
-    for pattern in PROMPT_LEAKING_PATTERNS:
-        matches = re.finditer(pattern, prompt)
-        for match in matches:
-            injection_tags.append("prompt_leaking")
-            injection_details.append({
-                "type": "prompt_leaking",
-                "severity": "medium",  # Prompt leaking attempts are medium severity
-                "matched_text": match.group(0),
-                "detected_at": datetime.utcnow().isoformat()
-            })
+    for injection_type, match in _INJECTION_RULES.finditer(prompt):
+        injection_tags.append(injection_type)
+        injection_details.append({
+            "type": injection_type,
+            "severity": INJECTION_SEVERITY[injection_type],
+            "matched_text": match.group(0),
+            "detected_at": datetime.utcnow().isoformat()
+        })
     
     # Remove duplicates from injection tags
     injection_tags = list(set(injection_tags))
@@ -18,6 +18,8 @@ import logging
 # Import schema validation module
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from modules.schema_validation import validate_schema, validate_before_export
+from app.modules.kv_memory import read_from_memory, read_many_from_memory
+from app.modules.loop_lineage_store import get_loop_lineage
 
 # Configure logging
 logging.basicConfig(
@@ -27,44 +29,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger('loop_lineage_export')
 
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    
-    # Mock data for testing
-    if key == "loop_trace[loop_001]":
-        return {
-            "loop_id": "loop_001",
-            "status": "finalized",
-            "timestamp": "2025-04-20T10:00:00Z",
-            "summary": "Analyzed quantum computing concepts with thorough examination of qubits, superposition, and entanglement. Identified potential applications in cryptography and optimization problems.",
-            "orchestrator_persona": "SAGE",
-            "alignment_score": 0.82,
-            "drift_score": 0.18,
-            "rerun_count": 0,
-            "parent_loop_id": None,
-            "child_loop_ids": ["loop_002"]
-        }
-    elif key == "loop_trace[loop_002]":
-        return {
-            "loop_id": "loop_002",
-            "status": "finalized",
-            "timestamp": "2025-04-20T14:00:00Z",
-            "summary": "Researched machine learning algorithms with focus on neural networks and deep learning. Evaluated performance characteristics and application domains.",
-            "orchestrator_persona": "NOVA",
-            "alignment_score": 0.79,
-            "drift_score": 0.21,
-            "rerun_count": 1,
-            "rerun_trigger": ["alignment"],
-            "rerun_reason": "alignment_threshold_not_met",
-            "parent_loop_id": "loop_001",
-            "child_loop_ids": []
-        }
-    
-    return None
+# Family members whose traces are read per batch when exporting a family
+FAMILY_EXPORT_BATCH_SIZE = 200
 
 async def get_loop_trace(loop_id: str) -> Dict[str, Any]:
     """
@@ -135,44 +101,8 @@ async def get_loop_family(loop_id: str) -> Dict[str, Any]:
             "loop_id": loop_id
         }
     
-    # Initialize family tree
-    family = {
-        "loop_id": loop_id,
-        "ancestors": [],
-        "descendants": [],
-        "siblings": []
-    }
-    
-    # Get ancestors
-    current_id = loop_id
-    while True:
-        parent_id = await get_parent_loop(current_id)
-        if not parent_id:
-            break
-        
-        family["ancestors"].append(parent_id)
-        current_id = parent_id
-    
-    # Get descendants (recursively)
-    async def get_descendants(parent_id: str) -> List[str]:
-        children = await get_child_loops(parent_id)
-        descendants = list(children)
-        
-        for child_id in children:
-            child_descendants = await get_descendants(child_id)
-            descendants.extend(child_descendants)
-        
-        return descendants
-    
-    family["descendants"] = await get_descendants(loop_id)
-    
-    # Get siblings (loops with the same parent)
-    parent_id = await get_parent_loop(loop_id)
-    if parent_id:
-        siblings = await get_child_loops(parent_id)
-        family["siblings"] = [sibling for sibling in siblings if sibling != loop_id]
-    
-    return family
+    # Ancestors, descendants and siblings from one lineage index query
+    return await asyncio.to_thread(get_loop_lineage().family, loop_id)
 
 async def export_loop_lineage(loop_id: str) -> Dict[str, Any]:
     """
@@ -200,6 +130,20 @@ async def export_loop_lineage(loop_id: str) -> Dict[str, Any]:
             "loop_id": loop_id
         }
     
+    return _build_lineage(loop_id, trace, family)
+
+def _build_lineage(loop_id: str, trace: Dict[str, Any], family: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the lineage export of a loop from its trace and family.
+    
+    Args:
+        loop_id: The ID of the loop
+        trace: The loop's trace
+        family: The loop's family, as returned by get_loop_family
+        
+    Returns:
+        Dict with lineage information
+    """
     # Extract key information from trace
     loop_info = {
         "loop_id": loop_id,
@@ -243,7 +187,12 @@ async def export_loop_lineage(loop_id: str) -> Dict[str, Any]:
     
     return lineage
 
-async def export_loop_lineage_to_file(loop_id: str, format_type: str = "json", output_dir: str = "/tmp") -> Dict[str, Any]:
+async def export_loop_lineage_to_file(
+    loop_id: str,
+    format_type: str = "json",
+    output_dir: str = "/tmp",
+    lineage: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Export lineage information for a loop to a file.
     
@@ -251,12 +200,14 @@ async def export_loop_lineage_to_file(loop_id: str, format_type: str = "json", o
         loop_id: The ID of the loop
         format_type: The format to export as ("json", "md", or "html")
         output_dir: Directory to save the file
+        lineage: Lineage already exported for the loop, if any
         
     Returns:
         Dict with export result
     """
     # Export the lineage
-    lineage = await export_loop_lineage(loop_id)
+    if lineage is None:
+        lineage = await export_loop_lineage(loop_id)
     if "error" in lineage:
         return {
             "success": False,
@@ -544,6 +495,20 @@ async def export_multiple_loops(loop_ids: List[str], format_type: str = "json",
         result = await export_loop_lineage_to_file(loop_id, format_type, output_dir)
         results[loop_id] = result
     
+    return _summarize_exports(results, format_type, output_dir)
+
+def _summarize_exports(results: Dict[str, Dict[str, Any]], format_type: str, output_dir: str) -> Dict[str, Any]:
+    """
+    Summarize per-loop export results.
+    
+    Args:
+        results: Export result by loop ID
+        format_type: The format exported as
+        output_dir: Directory the files were saved to
+        
+    Returns:
+        Dict with export results
+    """
     # Calculate success rate
     total_loops = len(results)
     successful_exports = sum(1 for r in results.values() if r.get("success", False))
@@ -576,20 +541,38 @@ async def export_loop_family(loop_id: str, format_type: str = "json", output_dir
     Returns:
         Dict with export results
     """
-    # Get family tree
-    family = await get_loop_family(loop_id)
-    if "error" in family:
+    # Get the loop trace
+    trace = await get_loop_trace(loop_id)
+    if "error" in trace:
         return {
             "success": False,
-            "error": family["error"],
+            "error": trace["error"],
             "loop_id": loop_id
         }
     
+    # Load the whole tree once; every member's lineage is derived from it
+    tree = await asyncio.to_thread(get_loop_lineage().tree, loop_id)
+    family = tree.family(loop_id)
+    
     # Create list of all loops in the family
     family_loops = [loop_id] + family["ancestors"] + family["descendants"]
     
-    # Export all loops in the family
-    results = await export_multiple_loops(family_loops, format_type, output_dir)
+    # Export all loops in the family, reading their traces in batches
+    export_results = {}
+    for start in range(0, len(family_loops), FAMILY_EXPORT_BATCH_SIZE):
+        batch = family_loops[start:start + FAMILY_EXPORT_BATCH_SIZE]
+        traces = await read_many_from_memory([f"loop_trace[{member_id}]" for member_id in batch])
+        for member_id in batch:
+            member_trace = traces.get(f"loop_trace[{member_id}]")
+            if isinstance(member_trace, dict):
+                lineage = _build_lineage(member_id, member_trace, tree.family(member_id))
+            else:
+                lineage = {
+                    "error": f"Loop trace not found for {member_id}",
+                    "loop_id": member_id
+                }
+            export_results[member_id] = await export_loop_lineage_to_file(member_id, format_type, output_dir, lineage)
+    results = _summarize_exports(export_results, format_type, output_dir)
     
     # Create a timestamp for the index filename
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
@@ -0,0 +1,301 @@
+"""
+Loop Lineage Store Module
+
+Indexed loop lineage graph kept next to the loop traces in the KV memory
+database. Every write of a "loop_trace[<loop_id>]" key updates, in the same
+transaction:
+
+- the loop's parent (from parent_loop_id, or from a parent's child_loop_ids),
+  indexed so a loop's children are one lookup away;
+- a per-project index ordered by trace timestamp, then by first-seen order.
+
+Family and ancestry questions are answered with one recursive query that
+loads the loop's whole tree; historian and lineage export stream loop ids
+from the time index instead of probing loop ids one read at a time.
+"""
+
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.modules.kv_memory import KVMemoryStore, get_kv_memory
+
+_SCHEMA = """
+CREATE TABLE loop_lineage (
+    seq INTEGER PRIMARY KEY,
+    loop_id TEXT NOT NULL UNIQUE,
+    parent_id TEXT,
+    project_id TEXT NOT NULL DEFAULT '',
+    timestamp TEXT NOT NULL DEFAULT '',
+    has_trace INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX loop_lineage_parent ON loop_lineage (parent_id);
+CREATE INDEX loop_lineage_project_time ON loop_lineage (project_id, timestamp, seq) WHERE has_trace = 1;
+"""
+
+# Whole tree of a loop: walk up to the root, then down from every loop seen
+_TREE_SQL = """
+WITH RECURSIVE
+    up(loop_id) AS (
+        SELECT ?
+        UNION
+        SELECT l.parent_id FROM loop_lineage l JOIN up ON l.loop_id = up.loop_id
+        WHERE l.parent_id IS NOT NULL
+    ),
+    down(loop_id) AS (
+        SELECT loop_id FROM up
+        UNION
+        SELECT l.loop_id FROM loop_lineage l JOIN down ON l.parent_id = down.loop_id
+    )
+SELECT loop_id, parent_id FROM loop_lineage WHERE loop_id IN (SELECT loop_id FROM down) ORDER BY seq
+"""
+
+
+class LoopTree:
+    """
+    Parent/child view of one loop tree, as loaded by LoopLineageIndex.tree.
+    """
+
+    def __init__(self, rows: List[Tuple[str, Optional[str]]]):
+        """
+        Initialize the tree.
+
+        Args:
+            rows: (loop_id, parent_id) pairs in first-seen order
+        """
+        self._parent: Dict[str, Optional[str]] = {}
+        self._children: Dict[str, List[str]] = {}
+        for loop_id, parent_id in rows:
+            self._parent[loop_id] = parent_id
+            if parent_id is not None:
+                self._children.setdefault(parent_id, []).append(loop_id)
+
+    def __contains__(self, loop_id: str) -> bool:
+        return loop_id in self._parent
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def parent(self, loop_id: str) -> Optional[str]:
+        """Parent loop ID, or None."""
+        return self._parent.get(loop_id)
+
+    def children(self, loop_id: str) -> List[str]:
+        """Child loop IDs in first-seen order."""
+        return list(self._children.get(loop_id, []))
+
+    def ancestors(self, loop_id: str) -> List[str]:
+        """Ancestor loop IDs, nearest first."""
+        ancestors = []
+        seen = {loop_id}
+        parent_id = self._parent.get(loop_id)
+        while parent_id is not None and parent_id not in seen:
+            ancestors.append(parent_id)
+            seen.add(parent_id)
+            parent_id = self._parent.get(parent_id)
+        return ancestors
+
+    def descendants(self, loop_id: str) -> List[str]:
+        """Descendant loop IDs: a loop's children, then each child's descendants."""
+        descendants = []
+        seen = {loop_id}
+        stack = [loop_id]
+        while stack:
+            children = [child for child in self._children.get(stack.pop(), []) if child not in seen]
+            seen.update(children)
+            descendants.extend(children)
+            stack.extend(reversed(children))
+        return descendants
+
+    def siblings(self, loop_id: str) -> List[str]:
+        """Loop IDs sharing the loop's parent."""
+        parent_id = self._parent.get(loop_id)
+        if parent_id is None:
+            return []
+        return [child for child in self._children.get(parent_id, []) if child != loop_id]
+
+    def family(self, loop_id: str) -> Dict[str, Any]:
+        """
+        Family of a loop, in the shape returned by get_loop_family.
+
+        Args:
+            loop_id: The ID of the loop
+
+        Returns:
+            Dict with ancestors, descendants and siblings
+        """
+        return {
+            "loop_id": loop_id,
+            "ancestors": self.ancestors(loop_id),
+            "descendants": self.descendants(loop_id),
+            "siblings": self.siblings(loop_id),
+        }
+
+
+class LoopLineageIndex:
+    """
+    KV memory index over loop traces: parent links and per-project time order.
+    """
+
+    name = "loop_lineage"
+    prefix = "loop_trace["
+
+    def __init__(self, store: KVMemoryStore):
+        """
+        Initialize the index.
+
+        Args:
+            store: The KV memory store the index is attached to
+        """
+        self._store = store
+
+    # ---------------------------------------------------------------- KVIndex
+
+    def install(self, conn: sqlite3.Connection) -> bool:
+        """Create the lineage tables; return True if they did not exist yet."""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'loop_lineage'"
+        ).fetchone()
+        if exists:
+            return False
+        for statement in _SCHEMA.split(";"):
+            if statement.strip():
+                conn.execute(statement)
+        return True
+
+    def update(self, conn: sqlite3.Connection, items: Dict[str, Any]) -> None:
+        """Index loop traces written under loop_trace[...] keys."""
+        links = []
+        for key, trace in items.items():
+            if not isinstance(trace, dict) or not key.endswith("]"):
+                continue
+            loop_id = key[len(self.prefix):-1]
+            conn.execute(
+                "INSERT INTO loop_lineage (loop_id, parent_id, project_id, timestamp, has_trace) "
+                "VALUES (?, ?, ?, ?, 1) "
+                "ON CONFLICT(loop_id) DO UPDATE SET parent_id = COALESCE(excluded.parent_id, parent_id), "
+                "project_id = excluded.project_id, timestamp = excluded.timestamp, has_trace = 1",
+                (loop_id, trace.get("parent_loop_id"), trace.get("project_id") or "", str(trace.get("timestamp") or "")),
+            )
+            child_ids = trace.get("child_loop_ids")
+            if isinstance(child_ids, list):
+                links.extend((child_id, loop_id) for child_id in child_ids if isinstance(child_id, str))
+
+        # A child's own parent_loop_id wins over a parent's child_loop_ids
+        conn.executemany(
+            "INSERT INTO loop_lineage (loop_id, parent_id) VALUES (?, ?) "
+            "ON CONFLICT(loop_id) DO UPDATE SET parent_id = COALESCE(parent_id, excluded.parent_id)",
+            links,
+        )
+
+    # ----------------------------------------------------------------- reads
+
+    def __len__(self) -> int:
+        return self._store.query("SELECT COUNT(*) FROM loop_lineage WHERE has_trace = 1")[0][0]
+
+    def tree(self, loop_id: str) -> LoopTree:
+        """
+        Load the whole tree a loop belongs to in one query.
+
+        Args:
+            loop_id: The ID of the loop
+
+        Returns:
+            LoopTree of the loop's tree (empty if the loop is unknown)
+        """
+        return LoopTree(self._store.query(_TREE_SQL, (loop_id,)))
+
+    def family(self, loop_id: str) -> Dict[str, Any]:
+        """
+        Get a loop's ancestors, descendants and siblings.
+
+        Args:
+            loop_id: The ID of the loop
+
+        Returns:
+            Dict in the shape returned by get_loop_family
+        """
+        return self.tree(loop_id).family(loop_id)
+
+    def loop_ids(self, project_id: Optional[str] = None) -> List[str]:
+        """
+        List loops with a trace in time order.
+
+        Args:
+            project_id: Only this project's loops if given; otherwise grouped by project
+
+        Returns:
+            List of loop IDs
+        """
+        if project_id is None:
+            return [loop_id for loop_id, _ in self.iter_loops()]
+        rows = self._store.query(
+            "SELECT loop_id FROM loop_lineage WHERE has_trace = 1 AND project_id = ? ORDER BY timestamp, seq",
+            (project_id,),
+        )
+        return [row[0] for row in rows]
+
+    def iter_loops(self, page_size: int = 500) -> Iterator[Tuple[str, str]]:
+        """
+        Stream loops with a trace, by project and then in time order.
+
+        Pages are read with keyset pagination, so loops indexed while iterating
+        are picked up if they sort after the current position.
+
+        Args:
+            page_size: Loops fetched per query
+
+        Yields:
+            (loop_id, project_id) pairs
+        """
+        position: Tuple[Any, ...] = ("", "", 0)
+        while True:
+            rows = self._store.query(
+                "SELECT loop_id, project_id, timestamp, seq FROM loop_lineage "
+                "WHERE has_trace = 1 AND (project_id, timestamp, seq) > (?, ?, ?) "
+                "ORDER BY project_id, timestamp, seq LIMIT ?",
+                (*position, page_size),
+            )
+            for loop_id, project_id, _, _ in rows:
+                yield loop_id, project_id
+            if len(rows) < page_size:
+                return
+            position = rows[-1][1:]
+
+    def previous_loops(self, loop_id: str, limit: int = 5) -> List[str]:
+        """
+        Get the loops of the same project that precede a loop.
+
+        Args:
+            loop_id: The ID of the loop
+            limit: Maximum number of loops
+
+        Returns:
+            Loop IDs, most recent first
+        """
+        rows = self._store.query(
+            "SELECT p.loop_id FROM loop_lineage l JOIN loop_lineage p "
+            "ON p.has_trace = 1 AND p.project_id = l.project_id AND (p.timestamp, p.seq) < (l.timestamp, l.seq) "
+            "WHERE l.loop_id = ? ORDER BY p.timestamp DESC, p.seq DESC LIMIT ?",
+            (loop_id, limit),
+        )
+        return [row[0] for row in rows]
+
+
+_lineage_lock = threading.Lock()
+
+
+def get_loop_lineage() -> LoopLineageIndex:
+    """
+    Get the loop lineage index of the process-wide KV memory store.
+
+    Returns:
+        The attached LoopLineageIndex
+    """
+    store = get_kv_memory()
+    with _lineage_lock:
+        index = store.get_index(LoopLineageIndex.name)
+        if index is None:
+            index = LoopLineageIndex(store)
+            store.add_index(index)
+        return index
@@ -3,24 +3,80 @@ Loop Monitor Module
 
 This module provides functionality for monitoring agent execution times
 and detecting frozen agents that exceed their timeout thresholds.
-It integrates with the project_state module to track agent execution
-and detect when agents run longer than their allowed timeout.
+Executions are recorded in a per-project append-only journal outside the
+project state (see app.modules.execution_journal); the project state only
+receives timeout alerts.
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, Any, List, Optional
 import logging
 
 from app.schema_registry import SCHEMA_REGISTRY
-from app.modules.project_state import read_project_state, update_project_state
+from app.modules.execution_journal import ExecutionJournal, get_execution_journal
+from app.modules.project_state import read_project_state, update_project_state, get_project_state_store
 
 # Configure logging
 logger = logging.getLogger("app.modules.loop_monitor")
 
+# Projects whose state has been checked for an embedded agent_execution_log
+_migrated = set()
+
+def _journal(project_id: str) -> ExecutionJournal:
+    """
+    Gets the project's execution journal, moving any agent_execution_log
+    embedded in the project state by older versions into it first.
+    
+    Args:
+        project_id: The ID of the project
+        
+    Returns:
+        The project's ExecutionJournal
+    """
+    journal = get_execution_journal(project_id)
+    if project_id in _migrated:
+        return journal
+    
+    legacy = read_project_state(project_id).get("agent_execution_log")
+    if legacy:
+        if not len(journal):
+            # Older versions looked timeouts up when checking, not at start
+            journal.import_entries(legacy, _agent_timeout)
+            logger.info(f"Migrated {len(legacy)} embedded agent executions for project {project_id}")
+        
+        def mutate(state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            state = state if state is not None else {}
+            state.pop("agent_execution_log", None)
+            return state
+        
+        get_project_state_store().update(project_id, mutate)
+    _migrated.add(project_id)
+    return journal
+
+def _agent_timeout(agent: str) -> Optional[int]:
+    """
+    Gets an agent's timeout from the schema registry.
+    
+    Args:
+        agent: The name of the agent
+        
+    Returns:
+        Timeout in seconds, or None for agents outside the registry, which
+        never freeze
+    """
+    agent_schema = SCHEMA_REGISTRY.get("agents", {}).get(agent)
+    if agent_schema is None:
+        logger.warning(f"Agent {agent} not found in schema registry, skipping timeout check")
+        return None
+    return agent_schema.get("timeout_seconds", 30)
+
 def log_agent_execution_start(project_id: str, agent: str) -> Dict[str, Any]:
     """
     Logs the start of an agent execution.
     
+    The execution is appended to the project's execution journal; the
+    project state is not rewritten.
+    
     Args:
         project_id: The ID of the project
         agent: The name of the agent (e.g., "hal", "nova")
@@ -29,38 +85,17 @@ def log_agent_execution_start(project_id: str, agent: str) -> Dict[str, Any]:
         Dict containing the result of the operation
     """
     try:
-        # Get current timestamp
-        now = datetime.utcnow().isoformat()
+        loop = read_project_state(project_id).get("loop_count", 0)
         
-        # Read current project state
-        project_state = read_project_state(project_id)
-        
-        # Initialize agent_execution_log if it doesn't exist
-        if "agent_execution_log" not in project_state:
-            project_state["agent_execution_log"] = []
-        
-        # Add execution start entry
-        execution_entry = {
-            "agent": agent,
-            "start_time": now,
-            "status": "running",
-            "loop": project_state.get("loop_count", 0)
-        }
-        
-        # Update project state
-        project_state["agent_execution_log"].append(execution_entry)
-        project_state["current_agent"] = agent
-        project_state["last_agent_triggered_at"] = now
-        
-        # Write updated state
-        result = update_project_state(project_id, {
-            "agent_execution_log": project_state["agent_execution_log"],
-            "current_agent": agent,
-            "last_agent_triggered_at": now
-        })
+        entry = _journal(project_id).start(agent, loop, _agent_timeout(agent))
         
         logger.info(f"Agent execution start logged for {agent} in project {project_id}")
-        return result
+        return {
+            "status": "success",
+            "message": f"Agent execution start logged for {agent}",
+            "project_id": project_id,
+            "execution": entry
+        }
     
     except Exception as e:
         error_msg = f"Error logging agent execution start for {agent} in project {project_id}: {str(e)}"
@@ -85,51 +120,20 @@ def log_agent_execution_complete(project_id: str, agent: str, status: str = "com
         Dict containing the result of the operation
     """
     try:
-        # Get current timestamp
-        now = datetime.utcnow().isoformat()
+        journal = _journal(project_id)
+        loop = read_project_state(project_id).get("loop_count", 0)
         
-        # Read current project state
-        project_state = read_project_state(project_id)
-        
-        # Find the most recent execution entry for this agent
-        execution_log = project_state.get("agent_execution_log", [])
-        updated = False
-        
-        for i in range(len(execution_log) - 1, -1, -1):
-            entry = execution_log[i]
-            if entry["agent"] == agent and entry["status"] == "running":
-                # Calculate duration
-                start_time = datetime.fromisoformat(entry["start_time"])
-                end_time = datetime.utcnow()
-                duration = (end_time - start_time).total_seconds()
-                
-                # Update entry
-                execution_log[i]["end_time"] = now
-                execution_log[i]["status"] = status
-                execution_log[i]["duration"] = duration
-                updated = True
-                break
-        
-        if not updated:
-            # If no running entry was found, create a new completed entry
-            execution_log.append({
-                "agent": agent,
-                "start_time": now,  # Approximate
-                "end_time": now,
-                "status": status,
-                "duration": 0,
-                "loop": project_state.get("loop_count", 0)
-            })
-        
-        # Update project state
-        result = update_project_state(project_id, {
-            "agent_execution_log": execution_log,
-            "current_agent": None,
-            "last_completed_agent": agent
-        })
+        # Completes the agent's most recent running execution, or records a
+        # zero-length one if none is running
+        entry = journal.complete(agent, status, loop)
         
         logger.info(f"Agent execution completion logged for {agent} in project {project_id} with status {status}")
-        return result
+        return {
+            "status": "success",
+            "message": f"Agent execution completion logged for {agent}",
+            "project_id": project_id,
+            "execution": entry
+        }
     
     except Exception as e:
         error_msg = f"Error logging agent execution completion for {agent} in project {project_id}: {str(e)}"
@@ -145,6 +149,9 @@ def check_for_frozen_agents(project_id: str) -> List[Dict[str, Any]]:
     """
     Checks for agents that have exceeded their execution timeout.
     
+    Only executions whose deadline has passed are visited; they are marked
+    as timed out in the execution journal.
+    
     Args:
         project_id: The ID of the project to check
         
@@ -153,42 +160,20 @@ def check_for_frozen_agents(project_id: str) -> List[Dict[str, Any]]:
     """
     try:
         now = datetime.utcnow()
-        project_state = read_project_state(project_id)
-        execution_log = project_state.get("agent_execution_log", [])
-        frozen = []
-
-        for entry in execution_log:
-            # Only check entries with "running" status
-            if entry.get("status") != "running":
-                continue
-                
-            agent = entry["agent"]
-            
-            # Skip if agent is not in schema registry
-            if agent not in SCHEMA_REGISTRY.get("agents", {}):
-                logger.warning(f"Agent {agent} not found in schema registry, skipping timeout check")
-                continue
-                
-            start_time = datetime.fromisoformat(entry["start_time"])
-            timeout = SCHEMA_REGISTRY["agents"][agent].get("timeout_seconds", 30)
-
-            if (now - start_time).total_seconds() > timeout:
-                frozen_entry = {
-                    "agent": agent,
-                    "duration": (now - start_time).total_seconds(),
-                    "timeout": timeout,
-                    "loop": entry.get("loop", project_state.get("loop_count", 0)),
-                    "start_time": entry["start_time"]
-                }
-                frozen.append(frozen_entry)
-                
-                # Mark the agent as timed out in the execution log
-                entry["status"] = "timeout"
-                entry["end_time"] = now.isoformat()
-                entry["duration"] = (now - start_time).total_seconds()
+        frozen = [
+            {
+                "agent": entry["agent"],
+                "duration": entry["duration"],
+                "timeout": entry["timeout"],
+                "loop": entry.get("loop", 0),
+                "start_time": entry["start_time"]
+            }
+            for entry in _journal(project_id).expire(now)
+        ]
 
         if frozen:
             # Log the timeout alert
+            project_state = read_project_state(project_id)
             loop_alerts = project_state.get("loop_alerts", [])
             loop_alerts.append({
                 "type": "timeout",
@@ -198,7 +183,6 @@ def check_for_frozen_agents(project_id: str) -> List[Dict[str, Any]]:
             
             # Update project state with timeout information
             update_project_state(project_id, {
-                "agent_execution_log": execution_log,
                 "loop_alerts": loop_alerts,
                 "has_frozen_agents": True
             })
@@ -232,39 +216,27 @@ def get_agent_execution_status(project_id: str, agent: Optional[str] = None) ->
         Dict containing execution status information
     """
     try:
-        project_state = read_project_state(project_id)
-        execution_log = project_state.get("agent_execution_log", [])
+        journal = _journal(project_id)
         
         if agent:
-            # Filter for specific agent
-            agent_entries = [entry for entry in execution_log if entry["agent"] == agent]
             return {
                 "agent": agent,
-                "executions": agent_entries,
-                "current_status": agent_entries[-1]["status"] if agent_entries else "never_run"
-            }
-        else:
-            # Group by agent
-            agent_status = {}
-            for entry in execution_log:
-                agent_name = entry["agent"]
-                if agent_name not in agent_status:
-                    agent_status[agent_name] = []
-                agent_status[agent_name].append(entry)
-            
-            # Get current status for each agent
-            current_status = {}
-            for agent_name, entries in agent_status.items():
-                current_status[agent_name] = entries[-1]["status"] if entries else "never_run"
-            
-            return {
-                "project_id": project_id,
-                "agent_executions": agent_status,
-                "current_status": current_status,
-                "has_frozen_agents": project_state.get("has_frozen_agents", False),
-                "loop_alerts": project_state.get("loop_alerts", []),
-                "restore_prompt": project_state.get("restore_prompt", None)
+                "executions": journal.executions(agent),
+                "current_status": journal.current_status(agent)
             }
+        
+        project_state = read_project_state(project_id)
+        agents = journal.agents()
+        return {
+            "project_id": project_id,
+            "agent_executions": {agent_name: journal.executions(agent_name) for agent_name in agents},
+            "current_status": {agent_name: journal.current_status(agent_name) for agent_name in agents},
+            "current_agent": journal.current_agent,
+            "last_completed_agent": journal.last_completed_agent,
+            "has_frozen_agents": project_state.get("has_frozen_agents", False),
+            "loop_alerts": project_state.get("loop_alerts", []),
+            "restore_prompt": project_state.get("restore_prompt", None)
+        }
     
     except Exception as e:
         error_msg = f"Error getting agent execution status for project {project_id}: {str(e)}"
@@ -287,21 +259,10 @@ def reset_frozen_agents(project_id: str) -> Dict[str, Any]:
         Dict containing the result of the operation
     """
     try:
-        project_state = read_project_state(project_id)
-        execution_log = project_state.get("agent_execution_log", [])
-        reset_count = 0
-        
-        # Find and reset any frozen agents
-        for entry in execution_log:
-            if entry.get("status") == "timeout":
-                entry["status"] = "reset_after_timeout"
-                reset_count += 1
+        reset_count = _journal(project_id).reset_timeouts()
         
-        # Update project state
-        result = update_project_state(project_id, {
-            "agent_execution_log": execution_log,
-            "has_frozen_agents": False
-        })
+        if read_project_state(project_id).get("has_frozen_agents"):
+            update_project_state(project_id, {"has_frozen_agents": False})
         
         logger.info(f"Reset {reset_count} frozen agents in project {project_id}")
         return {
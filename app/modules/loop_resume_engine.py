@@ -5,6 +5,9 @@ This module provides functionality for saving and restoring loop snapshots,
 allowing the system to recover from crashes, freezes, or operator interventions
 mid-loop. It enables Promethios to restore the last known-good memory snapshot,
 resume the loop from where it left off, or propose a clean re-init with memory diffs.
+
+Snapshots live in the snapshot store (checkpoints + structural diffs); the
+project state only keeps a `last_snapshot` pointer and a `snapshot_count`.
 """
 
 from datetime import datetime
@@ -13,7 +16,10 @@ import logging
 import copy
 import json
 
-from app.modules.project_state import read_project_state, update_project_state, write_project_state
+from app.modules.project_state import (
+    read_project_state, update_project_state, write_project_state, get_project_state_store
+)
+from app.modules.snapshot_store import get_snapshot_store
 
 # Configure logging
 logger = logging.getLogger("app.modules.loop_resume_engine")
@@ -36,6 +42,8 @@ def _sanitize_for_storage(data: Dict[str, Any]) -> Dict[str, Any]:
         del sanitized["loop_snapshots"]
     if "last_snapshot" in sanitized:
         del sanitized["last_snapshot"]
+    if "snapshot_count" in sanitized:
+        del sanitized["snapshot_count"]
         
     # Ensure the data is JSON serializable
     try:
@@ -66,10 +74,33 @@ def _make_serializable(obj):
     else:
         return str(obj)
 
+def _migrate_legacy_snapshots(project_id: str, state: Dict[str, Any]) -> None:
+    """
+    Moves snapshots embedded in the project state into the snapshot store.
+    
+    Args:
+        project_id: The ID of the project
+        state: Project state that may contain a legacy loop_snapshots list
+    """
+    store = get_snapshot_store()
+    if store.history(project_id):
+        return
+    for legacy in state.get("loop_snapshots", []):
+        store.save(
+            project_id,
+            _sanitize_for_storage(legacy["snapshot"]),
+            legacy.get("loop", 0),
+            legacy["timestamp"]
+        )
+    logger.info(f"Migrated {len(state.get('loop_snapshots', []))} embedded snapshots for project {project_id}")
+
 def save_loop_snapshot(project_id: str) -> Dict[str, Any]:
     """
     Saves a snapshot of the current project state.
     
+    The snapshot goes to the snapshot store; the project state records only
+    a pointer to it.
+    
     Args:
         project_id: The ID of the project
         
@@ -80,6 +111,10 @@ def save_loop_snapshot(project_id: str) -> Dict[str, Any]:
         # Read current project state
         snapshot = read_project_state(project_id)
         
+        # Snapshots embedded by older versions move to the store first
+        if "loop_snapshots" in snapshot:
+            _migrate_legacy_snapshots(project_id, snapshot)
+        
         # Sanitize snapshot to remove circular references
         sanitized_snapshot = _sanitize_for_storage(snapshot)
         
@@ -90,18 +125,20 @@ def save_loop_snapshot(project_id: str) -> Dict[str, Any]:
             "snapshot": sanitized_snapshot
         }
         
-        # Get existing snapshots
-        current_state = read_project_state(project_id)
-        loop_snapshots = current_state.get("loop_snapshots", [])
+        store = get_snapshot_store()
+        pointer = store.save(project_id, sanitized_snapshot, data["loop"], data["timestamp"])
+        snapshot_count = pointer["seq"] + 1
         
-        # Add new snapshot
-        loop_snapshots.append(data)
+        # Update project state with the pointer, dropping any embedded history
+        def mutate(state: Dict[str, Any]) -> Dict[str, Any]:
+            state = state if state is not None else snapshot
+            state.pop("loop_snapshots", None)
+            state["last_snapshot"] = pointer
+            state["snapshot_count"] = snapshot_count
+            state["last_updated_at"] = datetime.utcnow().isoformat()
+            return state
         
-        # Update project state with snapshot
-        result = update_project_state(project_id, {
-            "loop_snapshots": loop_snapshots,
-            "last_snapshot": data
-        })
+        get_project_state_store().update(project_id, mutate)
         
         logger.info(f"Saved loop snapshot for project {project_id} at loop {data['loop']}")
         return data
@@ -136,8 +173,15 @@ def restore_last_snapshot(project_id: str) -> Dict[str, Any]:
             logger.warning(f"No snapshot available for project {project_id}")
             return {"status": "no snapshot available", "project_id": project_id}
         
-        # Get the snapshot data and make a clean copy
-        snapshot_data = copy.deepcopy(last["snapshot"])
+        # Replay the snapshot from the store (older states embed it directly)
+        if "snapshot" in last:
+            snapshot_data = copy.deepcopy(last["snapshot"])
+        else:
+            stored = get_snapshot_store().get(project_id, last.get("seq"))
+            if not stored:
+                logger.warning(f"Snapshot {last.get('seq')} missing from store for project {project_id}")
+                return {"status": "no snapshot available", "project_id": project_id}
+            snapshot_data = stored["snapshot"]
         
         # Create a new state object with only the essential fields
         # This avoids circular references by not including the snapshot history
@@ -164,8 +208,11 @@ def restore_last_snapshot(project_id: str) -> Dict[str, Any]:
             "registry": snapshot_data.get("registry", {})
         }
         
-        # Preserve the snapshot history
-        new_state["loop_snapshots"] = current_state.get("loop_snapshots", [])
+        # Preserve the snapshot pointer; the history stays in the store
+        if "loop_snapshots" in current_state:
+            new_state["loop_snapshots"] = current_state["loop_snapshots"]
+        if "snapshot_count" in current_state:
+            new_state["snapshot_count"] = current_state["snapshot_count"]
         new_state["last_snapshot"] = last
         
         # Write the restored state directly using write_project_state instead of update_project_state
@@ -204,21 +251,29 @@ def get_snapshot_history(project_id: str) -> Dict[str, Any]:
         # Read current project state
         state = read_project_state(project_id)
         
-        # Get snapshots
-        snapshots = state.get("loop_snapshots", [])
-        
-        # Create summary data
-        summary = []
-        for snapshot in snapshots:
-            summary.append({
-                "timestamp": snapshot["timestamp"],
-                "loop": snapshot["loop"],
-                "agents_completed": snapshot["snapshot"].get("completed_steps", [])
-            })
+        # Get snapshots (embedded ones if the state predates the store)
+        if "loop_snapshots" in state:
+            summary = [
+                {
+                    "timestamp": snapshot["timestamp"],
+                    "loop": snapshot["loop"],
+                    "agents_completed": snapshot["snapshot"].get("completed_steps", [])
+                }
+                for snapshot in state["loop_snapshots"]
+            ]
+        else:
+            summary = [
+                {
+                    "timestamp": snapshot["timestamp"],
+                    "loop": snapshot["loop"],
+                    "agents_completed": snapshot["agents_completed"]
+                }
+                for snapshot in get_snapshot_store().history(project_id)
+            ]
         
         return {
             "project_id": project_id,
-            "snapshot_count": len(snapshots),
+            "snapshot_count": len(summary),
             "snapshots": summary,
             "has_last_snapshot": "last_snapshot" in state
         }
@@ -2,22 +2,185 @@
 Memory Embed Module
 
 This module implements the functionality for embedding memory entries for vector-based retrieval.
+
+Embeddings are produced by pluggable Embedder implementations with a batched
+embed_many() call, and served from a content-addressed cache keyed by
+(model, dimension, sha256(content)) so identical content is embedded once.
 """
 
 import logging
 import json
+import re
+import time
 import uuid
-import random
-from typing import Dict, List, Optional, Any, Union
+import hashlib
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
 from datetime import datetime
 
+import numpy as np
+
+from app.modules.embedding_cache import EmbeddingCache, content_hash, get_embedding_cache
+
 # Configure logging
 logger = logging.getLogger("memory_embed")
 
+# Items per embed_many call when processing large batches
+EMBED_CHUNK_SIZE = 256
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
 # In-memory storage for embedded memories
 # In a production environment, this would be a vector database
 _embedded_memories: Dict[str, Dict[str, Any]] = {}
 
+class Embedder:
+    """
+    Interface for embedding backends.
+    
+    Implementations embed a whole batch per embed_many() call and must be
+    deterministic for a given (model, dimension, content), since results are
+    cached by content hash.
+    """
+    
+    def __init__(self, model: str, dimension: int):
+        self.model = model
+        self.dimension = dimension
+    
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            float32 matrix of shape (len(texts), dimension)
+        """
+        raise NotImplementedError
+
+class SeededRandomEmbedder(Embedder):
+    """
+    Placeholder embedder producing unit-length pseudo-random vectors seeded
+    by the content hash. Stands in until a model-backed embedder is registered.
+    """
+    
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        vectors = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.sha256(f"{self.model}:{text}".encode("utf-8")).digest()[:8], "little")
+            vectors[i] = np.random.default_rng(seed).uniform(-1.0, 1.0, self.dimension)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+class HashingEmbedder(Embedder):
+    """
+    Local embedder using signed feature hashing over word unigrams and bigrams.
+    
+    Needs no model or network, is deterministic across processes, and gives
+    texts that share vocabulary a high cosine similarity.
+    """
+    
+    def __init__(self, model: str = "hashing", dimension: int = 512):
+        super().__init__(model, dimension)
+    
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            tokens = TOKEN_PATTERN.findall((text or "").lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+                vectors[i, digest % self.dimension] += 1.0 if (digest >> 63) else -1.0
+        return vectors
+
+# Embedder factories by model name; unregistered models use SeededRandomEmbedder
+_embedder_factories: Dict[str, Callable[[str, int], Embedder]] = {
+    "hashing": lambda model, dimension: HashingEmbedder(model, dimension),
+}
+_embedders: Dict[Tuple[str, int], Embedder] = {}
+
+def register_embedder(model: str, factory: Callable[[str, int], Embedder]) -> None:
+    """
+    Register an embedder factory for a model name.
+    
+    Args:
+        model: Model name as used in embed requests
+        factory: Callable taking (model, dimension) and returning an Embedder
+    """
+    _embedder_factories[model] = factory
+    for key in [key for key in _embedders if key[0] == model]:
+        del _embedders[key]
+
+def get_embedder(model: str, dimension: int) -> Embedder:
+    """
+    Get the embedder instance for a model and dimension.
+    
+    Args:
+        model: Model name
+        dimension: Embedding dimension
+        
+    Returns:
+        The Embedder for the model
+    """
+    key = (model, dimension)
+    if key not in _embedders:
+        factory = _embedder_factories.get(model, lambda m, d: SeededRandomEmbedder(m, d))
+        _embedders[key] = factory(model, dimension)
+    return _embedders[key]
+
+def embed_texts(
+    texts: List[str],
+    model: str,
+    dimension: int,
+    cache: Optional[EmbeddingCache] = None
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Embed texts through the content-hash cache.
+    
+    Duplicate texts within the batch are embedded once, cached texts are not
+    embedded at all, and the remaining misses go to the embedder in a single
+    embed_many() call.
+    
+    Args:
+        texts: Texts to embed
+        model: Model name
+        dimension: Embedding dimension
+        cache: Cache to use; defaults to the process-wide cache
+        
+    Returns:
+        Tuple of (float32 matrix of embeddings, stats with cache_hits,
+        cache_misses and embed_time_ms)
+    """
+    if cache is None:
+        cache = get_embedding_cache()
+    start = time.perf_counter()
+    
+    hashes = [content_hash(text) for text in texts]
+    unique: Dict[str, str] = {}
+    for digest, text in zip(hashes, texts):
+        unique.setdefault(digest, text)
+    
+    found = cache.get_many(model, dimension, unique.keys())
+    missing = [digest for digest in unique if digest not in found]
+    
+    if missing:
+        vectors = get_embedder(model, dimension).embed_many([unique[digest] for digest in missing])
+        computed = dict(zip(missing, vectors))
+        cache.put_many(model, dimension, computed)
+        found.update(computed)
+    
+    # Hits count every item served without calling the embedder
+    misses = len(missing)
+    hits = len(texts) - misses
+    cache.record(hits, misses)
+    
+    embeddings = np.stack([found[digest] for digest in hashes]) if texts else np.zeros((0, dimension), dtype=np.float32)
+    return embeddings, {
+        "cache_hits": hits,
+        "cache_misses": misses,
+        "embed_time_ms": round((time.perf_counter() - start) * 1000, 3)
+    }
+
 def embed_memory(request_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Embed content for vector-based retrieval.
@@ -29,58 +192,18 @@ def embed_memory(request_data: Dict[str, Any]) -> Dict[str, Any]:
         Dictionary containing the embedding result
     """
     try:
-        content = request_data.get("content")
-        model = request_data.get("model", "default")
-        dimension = request_data.get("dimension")
-        tags = request_data.get("tags", [])
-        agent_id = request_data.get("agent_id")
-        loop_id = request_data.get("loop_id")
+        item = _prepare_item(request_data)
         
         # Validate content
-        if not content:
-            return {
-                "message": "Content must not be empty",
-                "model": model,
-                "timestamp": datetime.utcnow().isoformat(),
-                "version": "1.0.0"
-            }
-        
-        # Determine embedding dimension based on model if not specified
-        if not dimension:
-            dimension = _get_default_dimension(model)
+        if "message" in item:
+            return item
         
-        # Generate embedding (in a real implementation, this would use a model)
-        embedding = _generate_embedding(content, model, dimension)
+        embeddings, stats = embed_texts([item["text"]], item["model"], item["dimension"])
         
-        # Generate memory ID
-        memory_id = f"mem_embed_{uuid.uuid4().hex[:8]}"
-        
-        # Store the embedded memory
-        _embedded_memories[memory_id] = {
-            "content": content,
-            "embedding": embedding,
-            "model": model,
-            "dimension": dimension,
-            "tags": tags,
-            "agent_id": agent_id,
-            "loop_id": loop_id,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        # Log the embedding to memory
-        _log_memory_embed(memory_id, model, dimension, tags)
-        
-        # Return the result
-        return {
-            "memory_id": memory_id,
-            "embedding_size": dimension,
-            "model_used": model,
-            "tags": tags,
-            "agent_id": agent_id,
-            "loop_id": loop_id,
-            "timestamp": datetime.utcnow().isoformat(),
-            "version": "1.0.0"
-        }
+        result = _store_embedded_memory(item, embeddings[0])
+        result["cache_hit"] = stats["cache_hits"] == 1
+        result["embed_time_ms"] = stats["embed_time_ms"]
+        return result
     
     except Exception as e:
         logger.error(f"Error embedding memory: {str(e)}")
@@ -95,6 +218,9 @@ def embed_memory_batch(request_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Embed multiple content items for vector-based retrieval.
     
+    Items are processed in chunks of EMBED_CHUNK_SIZE, so batches of any size
+    are accepted. The response reports the cache hit ratio and per-chunk timings.
+    
     Args:
         request_data: Request data containing list of items to embed
         
@@ -112,40 +238,34 @@ def embed_memory_batch(request_data: Dict[str, Any]) -> Dict[str, Any]:
                 "version": "1.0.0"
             }
         
-        if len(items) > 100:
-            return {
-                "message": "Maximum 100 items allowed per batch",
-                "timestamp": datetime.utcnow().isoformat(),
-                "version": "1.0.0"
-            }
-        
-        # Process each item
         results = []
         errors = []
-        successful_items = 0
+        batch_timings = []
+        cache_hits = 0
+        cache_misses = 0
+        start = time.perf_counter()
         
-        for item in items:
-            result = embed_memory(item)
-            
-            # Check if the result is an error
-            if "message" in result:
-                errors.append({
-                    "message": result["message"],
-                    "item": item
-                })
-            else:
-                results.append(result)
-                successful_items += 1
+        for chunk in iter_embed_memory_batch(items):
+            results.extend(chunk["results"])
+            errors.extend(chunk["errors"])
+            batch_timings.append(chunk["embed_time_ms"])
+            cache_hits += chunk["cache_hits"]
+            cache_misses += chunk["cache_misses"]
         
         # Log the batch embedding to memory
-        _log_memory_embed_batch(len(items), successful_items)
+        _log_memory_embed_batch(len(items), len(results))
         
         # Return the results
         return {
             "results": results,
             "errors": errors,
             "total_items": len(items),
-            "successful_items": successful_items,
+            "successful_items": len(results),
+            "cache_hits": cache_hits,
+            "cache_misses": cache_misses,
+            "cache_hit_ratio": round(cache_hits / (cache_hits + cache_misses), 4) if results else 0.0,
+            "batch_timings_ms": batch_timings,
+            "total_time_ms": round((time.perf_counter() - start) * 1000, 3),
             "timestamp": datetime.utcnow().isoformat(),
             "version": "1.0.0"
         }
@@ -158,6 +278,134 @@ def embed_memory_batch(request_data: Dict[str, Any]) -> Dict[str, Any]:
             "version": "1.0.0"
         }
 
+def iter_embed_memory_batch(
+    items: List[Dict[str, Any]],
+    chunk_size: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Embed items chunk by chunk, yielding each chunk's results as it completes.
+    
+    Within a chunk, items sharing a model and dimension go to the embedder in
+    one embed_many() call through the cache.
+    
+    Args:
+        items: Items to embed, each shaped like an embed_memory request
+        chunk_size: Number of items per chunk; defaults to EMBED_CHUNK_SIZE
+        
+    Yields:
+        Dict with chunk_index, results, errors, cache_hits, cache_misses and embed_time_ms
+    """
+    chunk_size = chunk_size or EMBED_CHUNK_SIZE
+    for chunk_index, offset in enumerate(range(0, len(items), chunk_size)):
+        chunk = items[offset:offset + chunk_size]
+        start = time.perf_counter()
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(chunk)
+        errors = []
+        groups: Dict[Tuple[str, int], List[Tuple[int, Dict[str, Any]]]] = {}
+        
+        for position, raw_item in enumerate(chunk):
+            item = _prepare_item(raw_item)
+            if "message" in item:
+                errors.append({"message": item["message"], "item": raw_item})
+            else:
+                groups.setdefault((item["model"], item["dimension"]), []).append((position, item))
+        
+        cache_hits = 0
+        cache_misses = 0
+        for (model, dimension), group in groups.items():
+            embeddings, stats = embed_texts([item["text"] for _, item in group], model, dimension)
+            cache_hits += stats["cache_hits"]
+            cache_misses += stats["cache_misses"]
+            for (position, item), embedding in zip(group, embeddings):
+                results[position] = _store_embedded_memory(item, embedding)
+        
+        yield {
+            "chunk_index": chunk_index,
+            "results": [result for result in results if result is not None],
+            "errors": errors,
+            "cache_hits": cache_hits,
+            "cache_misses": cache_misses,
+            "embed_time_ms": round((time.perf_counter() - start) * 1000, 3)
+        }
+
+def _prepare_item(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate an embed request and resolve its model, dimension and text.
+    
+    Args:
+        request_data: Request data for a single item
+        
+    Returns:
+        The normalized item, or an error dict containing "message"
+    """
+    content = request_data.get("content")
+    model = request_data.get("model") or "default"
+    dimension = request_data.get("dimension")
+    
+    # Validate content
+    if not content:
+        return {
+            "message": "Content must not be empty",
+            "model": model,
+            "timestamp": datetime.utcnow().isoformat(),
+            "version": "1.0.0"
+        }
+    
+    # Determine embedding dimension based on model if not specified
+    if not dimension:
+        dimension = _get_default_dimension(model)
+    
+    return {
+        "content": content,
+        # Dict content is embedded via its canonical JSON form
+        "text": json.dumps(content, sort_keys=True) if isinstance(content, dict) else content,
+        "model": model,
+        "dimension": int(dimension),
+        "tags": request_data.get("tags", []),
+        "agent_id": request_data.get("agent_id"),
+        "loop_id": request_data.get("loop_id")
+    }
+
+def _store_embedded_memory(item: Dict[str, Any], embedding: np.ndarray) -> Dict[str, Any]:
+    """
+    Store an embedded item and build its response entry.
+    
+    Args:
+        item: Item returned by _prepare_item
+        embedding: The item's embedding
+        
+    Returns:
+        The embed result for the item
+    """
+    memory_id = f"mem_embed_{uuid.uuid4().hex[:8]}"
+    timestamp = datetime.utcnow().isoformat()
+    
+    _embedded_memories[memory_id] = {
+        "content": item["content"],
+        "embedding": embedding,
+        "model": item["model"],
+        "dimension": item["dimension"],
+        "tags": item["tags"],
+        "agent_id": item["agent_id"],
+        "loop_id": item["loop_id"],
+        "timestamp": timestamp
+    }
+    
+    # Log the embedding to memory
+    _log_memory_embed(memory_id, item["model"], item["dimension"], item["tags"])
+    
+    return {
+        "memory_id": memory_id,
+        "embedding_size": item["dimension"],
+        "model_used": item["model"],
+        "tags": item["tags"],
+        "agent_id": item["agent_id"],
+        "loop_id": item["loop_id"],
+        "timestamp": timestamp,
+        "version": "1.0.0"
+    }
+
 def _get_default_dimension(model: str) -> int:
     """
     Get the default embedding dimension for a model.
@@ -179,38 +427,6 @@ def _get_default_dimension(model: str) -> int:
     
     return model_dimensions.get(model, 512)
 
-def _generate_embedding(content: Union[str, Dict[str, Any]], model: str, dimension: int) -> List[float]:
-    """
-    Generate an embedding for the provided content.
-    
-    Args:
-        content: Content to embed
-        model: Model to use for embedding
-        dimension: Dimension of the embedding
-        
-    Returns:
-        List of embedding values
-    """
-    # In a real implementation, this would use a model to generate the embedding
-    # For this implementation, we'll generate random values
-    
-    # Convert content to string if it's a dictionary
-    if isinstance(content, dict):
-        content = json.dumps(content)
-    
-    # Use content hash as seed for reproducibility
-    seed = hash(content) % 10000
-    random.seed(seed)
-    
-    # Generate random embedding
-    embedding = [random.uniform(-1.0, 1.0) for _ in range(dimension)]
-    
-    # Normalize the embedding
-    magnitude = sum(x * x for x in embedding) ** 0.5
-    embedding = [x / magnitude for x in embedding]
-    
-    return embedding
-
 def _log_memory_embed(memory_id: str, model: str, dimension: int, tags: List[str]) -> None:
     """
     Log memory embedding to memory.
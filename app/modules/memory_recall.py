@@ -6,7 +6,7 @@ This module implements the functionality for memory recall operations.
 
 import logging
 import json
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime, timedelta
 import re
 
@@ -133,25 +133,34 @@ def recall_memory(request_data: Dict[str, Any]) -> Dict[str, Any]:
                 "version": "1.0.0"
             }
         
-        # Filter entries based on criteria
-        filtered_entries = _filter_entries(
-            method, query, start_date, end_date, agent_filter, loop_filter
-        )
-        
-        # Sort entries
-        sorted_entries = _sort_entries(filtered_entries, sort_order)
-        
-        # Apply pagination
-        paginated_entries = sorted_entries[offset:offset + limit]
+        if method == "keyword":
+            # Keyword recall is served by the FTS5 index; filtering, ranking
+            # and pagination all happen inside SQLite
+            total_results, paginated_entries = _keyword_recall(
+                query, start_date, end_date, agent_filter, loop_filter,
+                sort_order, limit, offset
+            )
+        else:
+            # Filter entries based on criteria
+            filtered_entries = _filter_entries(
+                method, query, start_date, end_date, agent_filter, loop_filter
+            )
+            
+            # Sort entries
+            sorted_entries = _sort_entries(filtered_entries, sort_order)
+            
+            # Apply pagination
+            paginated_entries = sorted_entries[offset:offset + limit]
+            total_results = len(filtered_entries)
         
         # Log the memory recall to memory
-        _log_memory_recall(method, query, len(filtered_entries))
+        _log_memory_recall(method, query, total_results)
         
         # Return the results
         return {
             "query": query,
             "method": method,
-            "total_results": len(filtered_entries),
+            "total_results": total_results,
             "returned_results": len(paginated_entries),
             "results": paginated_entries,
             "timestamp": datetime.utcnow().isoformat(),
@@ -168,6 +177,49 @@ def recall_memory(request_data: Dict[str, Any]) -> Dict[str, Any]:
             "version": "1.0.0"
         }
 
+def _keyword_recall(
+    query: str,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    agent_filter: Optional[str],
+    loop_filter: Optional[str],
+    sort_order: str,
+    limit: int,
+    offset: int
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Recall memory entries by keyword using the SQLite FTS5 index.
+    
+    Supports bare terms (ANDed), "quoted phrases" and prefix terms (optim*).
+    Results are ranked by BM25 when sort_order is relevance.
+    
+    Args:
+        query: Query string
+        start_date: Start date filter (ISO timestamp)
+        end_date: End date filter (ISO timestamp)
+        agent_filter: Agent ID filter
+        loop_filter: Loop ID filter (matched against the memory trace ID)
+        sort_order: Sort order (newest_first, oldest_first, relevance)
+        limit: Maximum number of entries to return
+        offset: Offset for pagination
+        
+    Returns:
+        Tuple of (total matching entries, requested page of entries)
+    """
+    from app.db.memory_db import memory_db
+    
+    search = memory_db.search_memories(
+        query,
+        agent_id=agent_filter,
+        since=start_date,
+        until=end_date,
+        thread_id=loop_filter,
+        sort_order=sort_order,
+        limit=limit,
+        offset=offset
+    )
+    return search["total"], search["results"]
+
 def _filter_entries(
     method: str,
     query: str,
@@ -5,68 +5,11 @@ This module is responsible for tracking operator preferences and alignment profi
 updating profiles based on loop analysis, and injecting profiles into loop traces.
 """
 
-from typing import Dict, Any, List, Optional, Tuple, Set
-import asyncio
-import json
+from typing import Dict, Any, List, Tuple, Set
 from datetime import datetime
 import re
 from collections import defaultdict
-
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    
-    # Mock data for testing
-    if key == "loop_trace[loop_001]":
-        return {
-            "loop_id": "loop_001",
-            "status": "finalized",
-            "timestamp": "2025-04-20T10:00:00Z",
-            "summary": "Analyzed quantum computing concepts with thorough examination of qubits, superposition, and entanglement. Identified potential applications in cryptography and optimization problems.",
-            "orchestrator_persona": "SAGE",
-            "alignment_score": 0.82,
-            "drift_score": 0.18,
-            "rerun_count": 0,
-            "operator_id": "operator_001"
-        }
-    elif key == "loop_trace[loop_002]":
-        return {
-            "loop_id": "loop_002",
-            "status": "finalized",
-            "timestamp": "2025-04-20T14:00:00Z",
-            "summary": "Researched machine learning algorithms with focus on neural networks and deep learning. Evaluated performance characteristics and application domains.",
-            "orchestrator_persona": "NOVA",
-            "alignment_score": 0.79,
-            "drift_score": 0.21,
-            "rerun_count": 1,
-            "rerun_trigger": ["alignment"],
-            "rerun_reason": "alignment_threshold_not_met",
-            "operator_id": "operator_001"
-        }
-    elif key == "operator_profile[operator_001]":
-        return {
-            "operator_id": "operator_001",
-            "name": "Test Operator",
-            "tone_preference": "formal",
-            "detail_preference": "high",
-            "tone_mismatch_tolerance": 0.25,
-            "detail_mismatch_tolerance": 0.3,
-            "last_updated": "2025-04-20T10:30:00Z"
-        }
-    
-    return None
-
-# Mock function for writing to memory
-# In a real implementation, this would write to a database or storage system
-async def write_to_memory(key: str, value: Any) -> bool:
-    """Write data to memory storage."""
-    # Simulate memory write
-    await asyncio.sleep(0.1)
-    print(f"Writing to memory: {key} = {json.dumps(value, indent=2)}")
-    return True
+from app.modules.kv_memory import read_from_memory, write_to_memory
 
 async def get_loop_trace(loop_id: str) -> Dict[str, Any]:
     """
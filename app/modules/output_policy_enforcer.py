@@ -5,12 +5,13 @@ This module provides functionality for enforcing output policies,
 ensuring agents operate within system-wide constraints.
 """
 
-import re
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import traceback
 
+from app.core.pattern_scanner import get_pattern_scanner
+
 # Import schemas if available
 try:
     from app.schemas.output_policy_schema import OutputPolicyRequest, OutputPolicyResult
@@ -168,6 +169,19 @@ CODE_SAFETY_PATTERNS = {
     ]
 }
 
+# Rule sets compiled once for the shared pattern scanner
+_BLOCKLIST_RULES = get_pattern_scanner().register(
+    "output_policy.blocklist",
+    [(category, pattern) for category, patterns in BLOCKLIST_PATTERNS.items() for pattern in patterns]
+)
+_CODE_SAFETY_RULES = {
+    lang: get_pattern_scanner().register(
+        f"output_policy.code_safety.{lang}",
+        [(index, pattern_info["pattern"]) for index, pattern_info in enumerate(patterns)]
+    )
+    for lang, patterns in CODE_SAFETY_PATTERNS.items()
+}
+
 async def enforce_output_policy(
     agent_id: str,
     content: str,
@@ -200,36 +214,33 @@ async def enforce_output_policy(
         risk_details = []
         
         # Check against blocklist patterns
-        for category, patterns in BLOCKLIST_PATTERNS.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, content)
-                for match in matches:
-                    matched_text = match.group(0)
-                    
-                    # Determine risk level based on category
-                    if category == "harmful":
-                        risk_level = 0.7  # Default risk level for harmful content
-                        harmful_risk_level = max(harmful_risk_level, risk_level)
-                    elif category == "inappropriate":
-                        risk_level = 0.7  # Default risk level for inappropriate content
-                        inappropriate_risk_level = max(inappropriate_risk_level, risk_level)
-                    elif category == "misinformation":
-                        risk_level = 0.7  # Default risk level for misinformation
-                        misinformation_risk_level = max(misinformation_risk_level, risk_level)
-                    elif category == "malicious_code":
-                        risk_level = 0.7  # Default risk level for malicious code
-                        malicious_code_risk_level = max(malicious_code_risk_level, risk_level)
-                    elif category == "plagiarism":
-                        risk_level = 0.7  # Default risk level for plagiarism
-                        plagiarism_risk_level = max(plagiarism_risk_level, risk_level)
-                    
-                    # Add to risk details
-                    risk_details.append({
-                        "type": category,
-                        "risk_level": risk_level,
-                        "matched_text": matched_text,
-                        "pattern": pattern
-                    })
+        for category, match in _BLOCKLIST_RULES.finditer(content):
+            matched_text = match.group(0)
+            
+            # Determine risk level based on category
+            if category == "harmful":
+                risk_level = 0.7  # Default risk level for harmful content
+                harmful_risk_level = max(harmful_risk_level, risk_level)
+            elif category == "inappropriate":
+                risk_level = 0.7  # Default risk level for inappropriate content
+                inappropriate_risk_level = max(inappropriate_risk_level, risk_level)
+            elif category == "misinformation":
+                risk_level = 0.7  # Default risk level for misinformation
+                misinformation_risk_level = max(misinformation_risk_level, risk_level)
+            elif category == "malicious_code":
+                risk_level = 0.7  # Default risk level for malicious code
+                malicious_code_risk_level = max(malicious_code_risk_level, risk_level)
+            elif category == "plagiarism":
+                risk_level = 0.7  # Default risk level for plagiarism
+                plagiarism_risk_level = max(plagiarism_risk_level, risk_level)
+            
+            # Add to risk details
+            risk_details.append({
+                "type": category,
+                "risk_level": risk_level,
+                "matched_text": matched_text,
+                "pattern": match.re.pattern
+            })
         
         # Check code safety if output_type is code
         if output_type.lower() in ["code", "javascript", "python", "sql"]:
@@ -251,45 +262,44 @@ async def enforce_output_policy(
             if language == "all":
                 # Check all languages
                 for lang, patterns in CODE_SAFETY_PATTERNS.items():
-                    for pattern_info in patterns:
-                        matches = re.finditer(pattern_info["pattern"], content)
-                        for match in matches:
-                            matched_text = match.group(0)
-                            risk_level = pattern_info["risk_level"]
-                            
-                            # Update malicious code risk level
-                            malicious_code_risk_level = max(malicious_code_risk_level, risk_level)
-                            
-                            # Add to risk details
-                            risk_details.append({
-                                "type": "malicious_code",
-                                "risk_level": risk_level,
-                                "matched_text": matched_text,
-                                "pattern": pattern_info["pattern"],
-                                "description": pattern_info["description"],
-                                "language": lang
-                            })
+                    for index, match in _CODE_SAFETY_RULES[lang].finditer(content):
+                        pattern_info = patterns[index]
+                        matched_text = match.group(0)
+                        risk_level = pattern_info["risk_level"]
+                        
+                        # Update malicious code risk level
+                        malicious_code_risk_level = max(malicious_code_risk_level, risk_level)
+                        
+                        # Add to risk details
+                        risk_details.append({
+                            "type": "malicious_code",
+                            "risk_level": risk_level,
+                            "matched_text": matched_text,
+                            "pattern": pattern_info["pattern"],
+                            "description": pattern_info["description"],
+                            "language": lang
+                        })
             else:
                 # Check specific language
                 if language in CODE_SAFETY_PATTERNS:
-                    for pattern_info in CODE_SAFETY_PATTERNS[language]:
-                        matches = re.finditer(pattern_info["pattern"], content)
-                        for match in matches:
-                            matched_text = match.group(0)
-                            risk_level = pattern_info["risk_level"]
-                            
-                            # Update malicious code risk level
-                            malicious_code_risk_level = max(malicious_code_risk_level, risk_level)
-                            
-                            # Add to risk details
-                            risk_details.append({
-                                "type": "malicious_code",
-                                "risk_level": risk_level,
-                                "matched_text": matched_text,
-                                "pattern": pattern_info["pattern"],
-                                "description": pattern_info["description"],
-                                "language": language
-                            })
+                    patterns = CODE_SAFETY_PATTERNS[language]
+                    for index, match in _CODE_SAFETY_RULES[language].finditer(content):
+                        pattern_info = patterns[index]
+                        matched_text = match.group(0)
+                        risk_level = pattern_info["risk_level"]
+                        
+                        # Update malicious code risk level
+                        malicious_code_risk_level = max(malicious_code_risk_level, risk_level)
+                        
+                        # Add to risk details
+                        risk_details.append({
+                            "type": "malicious_code",
+                            "risk_level": risk_level,
+                            "matched_text": matched_text,
+                            "pattern": pattern_info["pattern"],
+                            "description": pattern_info["description"],
+                            "language": language
+                        })
         
         # Determine risk tags
         risk_tags = []
@@ -12,9 +12,8 @@ The pessimist agent is responsible for:
 """
 
 from typing import Dict, Any, List, Optional
-import asyncio
-import json
 from datetime import datetime
+from app.modules.kv_memory import read_from_memory, write_to_memory
 
 # Define common bias tags that the pessimist agent looks for
 COMMON_BIAS_TAGS = {
@@ -30,41 +29,6 @@ COMMON_BIAS_TAGS = {
     "hindsight_bias": "Seeing events as more predictable than they were"
 }
 
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    
-    # Mock data for testing
-    if key == "bias_tags[loop_001]":
-        return {
-            "tone_exaggeration": 1,
-            "overconfidence": 1
-        }
-    elif key == "bias_tags[loop_001_r1]":
-        return {
-            "tone_exaggeration": 2,  # Increased from previous loop
-            "overconfidence": 1
-        }
-    elif key == "bias_tags[loop_001_r2]":
-        return {
-            "tone_exaggeration": 3,  # Increased again - potential echo
-            "emotional_mismatch": 1
-        }
-    
-    return {}
-
-# Mock function for writing to memory
-# In a real implementation, this would write to a database or storage system
-async def write_to_memory(key: str, value: Any) -> bool:
-    """Write data to memory storage."""
-    # Simulate memory write
-    await asyncio.sleep(0.1)
-    print(f"Writing to memory: {key} = {json.dumps(value, indent=2)}")
-    return True
-
 async def get_bias_history(loop_id: str) -> Dict[str, int]:
     """
     Get the history of bias tags for a loop and its ancestors.
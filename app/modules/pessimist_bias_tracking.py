@@ -9,10 +9,9 @@ The module maintains a history of bias occurrences, their severity, and their im
 on loop execution, enabling the system to detect when it's repeating the same mistakes.
 """
 
-from typing import Dict, Any, List, Optional, Set
-import asyncio
-import json
+from typing import Dict, Any, List, Set
 from datetime import datetime
+from app.modules.kv_memory import read_from_memory, write_to_memory
 
 # Define bias tag categories for better organization
 BIAS_CATEGORIES = {
@@ -48,62 +47,6 @@ ALL_BIAS_TAGS: Set[str] = set()
 for category_tags in BIAS_CATEGORIES.values():
     ALL_BIAS_TAGS.update(category_tags)
 
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    
-    # Mock data for testing
-    if key == "bias_history":
-        return {
-            "tone_exaggeration": {
-                "occurrences": 3,
-                "first_detected": "2025-04-20T10:00:00Z",
-                "last_detected": "2025-04-21T14:30:00Z",
-                "loops_affected": ["loop_001", "loop_001_r1", "loop_001_r2"],
-                "severity_trend": [0.6, 0.7, 0.8],
-                "category": "emotional"
-            },
-            "overconfidence": {
-                "occurrences": 2,
-                "first_detected": "2025-04-20T10:00:00Z",
-                "last_detected": "2025-04-21T12:15:00Z",
-                "loops_affected": ["loop_001", "loop_001_r1"],
-                "severity_trend": [0.5, 0.4],
-                "category": "cognitive"
-            }
-        }
-    elif key.startswith("bias_tags["):
-        loop_id = key.split("[")[1].split("]")[0]
-        if loop_id == "loop_001":
-            return {
-                "tone_exaggeration": 1,
-                "overconfidence": 1
-            }
-        elif loop_id == "loop_001_r1":
-            return {
-                "tone_exaggeration": 2,
-                "overconfidence": 2
-            }
-        elif loop_id == "loop_001_r2":
-            return {
-                "tone_exaggeration": 3,
-                "emotional_mismatch": 1
-            }
-    
-    return None
-
-# Mock function for writing to memory
-# In a real implementation, this would write to a database or storage system
-async def write_to_memory(key: str, value: Any) -> bool:
-    """Write data to memory storage."""
-    # Simulate memory write
-    await asyncio.sleep(0.1)
-    print(f"Writing to memory: {key} = {json.dumps(value, indent=2)}")
-    return True
-
 def get_bias_category(bias_tag: str) -> str:
     """
     Get the category of a bias tag.
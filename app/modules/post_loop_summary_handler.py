@@ -10,7 +10,6 @@ It now includes:
 """
 
 from typing import Dict, Any, List, Optional
-import json
 import asyncio
 from datetime import datetime
 from app.utils.persona_utils import get_current_persona
@@ -18,6 +17,7 @@ from app.modules.pessimist_agent import pessimist_check
 from app.modules.reflection_fatigue_scoring import process_reflection_fatigue
 from app.modules.rerun_reasoning_logger import log_rerun_reasoning, log_finalization_reasoning, add_reasoning_to_summary
 from app.modules.safety_integration import run_safety_checks, get_consolidated_memory_fields, should_trigger_rerun, get_rerun_configuration, get_reflection_prompts
+from app.modules.kv_memory import read_from_memory, write_to_memory, read_many_from_memory, write_many_to_memory
 
 # Mock functions for API calls to reflection agents
 # In a real implementation, these would make actual API calls
@@ -76,32 +76,6 @@ async def call_drift_summary(loop_id: str, persona: str) -> Dict[str, Any]:
         }
     }
 
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    
-    # Mock data for testing
-    if key == "loop_summary_text[loop_001]":
-        return "This is a summary of loop_001's execution and findings."
-    elif key == "loop_prompt[loop_001]":
-        return "Analyze the impact of quantum computing on cryptography."
-    elif key == "loop_output[loop_001]":
-        return "Quantum computing poses significant challenges to current cryptographic methods..."
-    
-    return None
-
-# Mock function for writing to memory
-# In a real implementation, this would write to a database or storage system
-async def write_to_memory(key: str, value: Any) -> bool:
-    """Write data to memory storage."""
-    # Simulate memory write
-    await asyncio.sleep(0.1)
-    print(f"Writing to memory: {key} = {json.dumps(value, indent=2)}")
-    return True
-
 async def process_loop_reflection(
     loop_id: str,
     override_fatigue: bool = False,
@@ -138,8 +112,9 @@ async def process_loop_reflection(
     persona = get_current_persona(loop_id)
     
     # Get the prompt and output for safety checks
-    prompt = await read_from_memory(f"loop_prompt[{loop_id}]") or ""
-    output = await read_from_memory(f"loop_output[{loop_id}]") or ""
+    loop_io = await read_many_from_memory([f"loop_prompt[{loop_id}]", f"loop_output[{loop_id}]"])
+    prompt = loop_io.get(f"loop_prompt[{loop_id}]") or ""
+    output = loop_io.get(f"loop_output[{loop_id}]") or ""
     
     # Run safety checks
     safety_results = await run_safety_checks(
@@ -315,8 +290,10 @@ async def process_loop_reflection(
     
     # Add safety reflection prompts to the summary if any
     if safety_reflection_prompts:
-        for component, prompt in safety_reflection_prompts.items():
-            await write_to_memory(f"safety_reflection_prompt[{loop_id}][{component}]", prompt)
+        await write_many_to_memory({
+            f"safety_reflection_prompt[{loop_id}][{component}]": prompt
+            for component, prompt in safety_reflection_prompts.items()
+        })
     
     return {
         "alignment_score": reflection_result["alignment_score"],
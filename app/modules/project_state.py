@@ -5,18 +5,82 @@ It maintains a centralized record of project status, files created, agents invol
 
 MODIFIED: Added auto-expiration of orphaned projects after 24h of inactivity
 MODIFIED: Added get_project_state alias for read_project_state to maintain compatibility
+MODIFIED: State files are served through ProjectStateStore (cached reads, locked
+          read-modify-write, atomic writes, coalesced loop counters)
 """
+import atexit
 import logging
-import json
 import os
 import uuid
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 
+from app.modules.project_state_store import ProjectStateStore
+
 # Configure logging
 logger = logging.getLogger("app.modules.project_state")
 
+STATES_DIR = os.path.join(os.path.dirname(__file__), "project_states")
+
+_store: Optional[ProjectStateStore] = None
+
+def get_project_state_store() -> ProjectStateStore:
+    """
+    Get the process-wide project state store.
+
+    Loop counter increments are buffered for PROJECT_STATE_COALESCE_INTERVAL
+    seconds (default 0.5; 0 writes every increment through) and flushed at exit.
+    """
+    global _store
+    if _store is None:
+        _store = ProjectStateStore(
+            STATES_DIR,
+            cache_size=int(os.getenv("PROJECT_STATE_CACHE_SIZE", "256")),
+            coalesce_interval=float(os.getenv("PROJECT_STATE_COALESCE_INTERVAL", "0.5")),
+        )
+        atexit.register(_store.flush)
+    return _store
+
+def _fill_missing_fields(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Ensure all required fields exist (for backward compatibility)."""
+    if "loop_count" not in state:
+        state["loop_count"] = 0
+    if "max_loops" not in state:
+        state["max_loops"] = 5
+    if "last_completed_agent" not in state:
+        state["last_completed_agent"] = None
+    if "completed_steps" not in state:
+        state["completed_steps"] = []
+    if "last_updated_at" not in state:
+        state["last_updated_at"] = datetime.utcnow().isoformat()
+    if "last_agent_triggered_at" not in state:
+        state["last_agent_triggered_at"] = datetime.utcnow().isoformat()
+    if "loop_status" not in state:
+        state["loop_status"] = "initialized"
+    return state
+
+def _default_state(project_id: str) -> Dict[str, Any]:
+    """Default state for a project that has no state file yet."""
+    return {
+        "project_id": project_id,
+        "status": "initialized",
+        "files_created": [],
+        "agents_involved": [],
+        "latest_agent_action": None,
+        "next_recommended_step": "Run HAL to create initial files",
+        "tool_usage": {},
+        "timestamp": datetime.utcnow().isoformat(),
+        "last_updated_at": datetime.utcnow().isoformat(),
+        "last_agent_triggered_at": datetime.utcnow().isoformat(),
+        "loop_status": "initialized",
+        # Agent Loop Autonomy Core - New fields
+        "loop_count": 0,
+        "max_loops": 5,
+        "last_completed_agent": None,
+        "completed_steps": []
+    }
+
 def read_project_state(project_id: str) -> Dict[str, Any]:
     """
     Read the current state of a project.
@@ -28,54 +92,15 @@ def read_project_state(project_id: str) -> Dict[str, Any]:
         Dict containing the current project state
     """
     try:
-        # Define the path to the project state file
-        state_file = os.path.join(os.path.dirname(__file__), "project_states", f"{project_id}.json")
-        
-        # Check if the file exists
-        if not os.path.exists(state_file):
+        state = get_project_state_store().read(project_id)
+
+        if state is None:
             # Return a default state if no state exists yet
             logger.info(f"No existing state found for project {project_id}, returning default state")
-            return {
-                "project_id": project_id,
-                "status": "initialized",
-                "files_created": [],
-                "agents_involved": [],
-                "latest_agent_action": None,
-                "next_recommended_step": "Run HAL to create initial files",
-                "tool_usage": {},
-                "timestamp": datetime.utcnow().isoformat(),
-                "last_updated_at": datetime.utcnow().isoformat(),
-                "last_agent_triggered_at": datetime.utcnow().isoformat(),
-                "loop_status": "initialized",
-                # Agent Loop Autonomy Core - New fields
-                "loop_count": 0,
-                "max_loops": 5,
-                "last_completed_agent": None,
-                "completed_steps": []
-            }
-        
-        # Read the state from the file
-        with open(state_file, 'r') as f:
-            state = json.load(f)
-            logger.info(f"Project state read for {project_id}")
-            
-            # Ensure all required fields exist (for backward compatibility)
-            if "loop_count" not in state:
-                state["loop_count"] = 0
-            if "max_loops" not in state:
-                state["max_loops"] = 5
-            if "last_completed_agent" not in state:
-                state["last_completed_agent"] = None
-            if "completed_steps" not in state:
-                state["completed_steps"] = []
-            if "last_updated_at" not in state:
-                state["last_updated_at"] = datetime.utcnow().isoformat()
-            if "last_agent_triggered_at" not in state:
-                state["last_agent_triggered_at"] = datetime.utcnow().isoformat()
-            if "loop_status" not in state:
-                state["loop_status"] = "initialized"
-                
-            return state
+            return _default_state(project_id)
+
+        logger.info(f"Project state read for {project_id}")
+        return _fill_missing_fields(state)
             
     except Exception as e:
         error_msg = f"Error reading project state for {project_id}: {str(e)}"
@@ -129,13 +154,6 @@ def write_project_state(project_id: str, state_dict: Dict[str, Any]) -> Dict[str
         Dict containing the result of the operation
     """
     try:
-        # Ensure the project states directory exists
-        states_dir = os.path.join(os.path.dirname(__file__), "project_states")
-        os.makedirs(states_dir, exist_ok=True)
-        
-        # Define the path to the project state file
-        state_file = os.path.join(states_dir, f"{project_id}.json")
-        
         # Ensure project_id is included in the state
         state_dict["project_id"] = project_id
         
@@ -143,9 +161,8 @@ def write_project_state(project_id: str, state_dict: Dict[str, Any]) -> Dict[str
         state_dict["timestamp"] = datetime.utcnow().isoformat()
         state_dict["last_updated_at"] = datetime.utcnow().isoformat()
         
-        # Write the state to the file
-        with open(state_file, 'w') as f:
-            json.dump(state_dict, f, indent=2)
+        # Write the state atomically (temp file + rename)
+        get_project_state_store().write(project_id, state_dict)
         
         logger.info(f"Project state written for {project_id}")
         print(f"✅ Project state updated for {project_id}")
@@ -168,10 +185,76 @@ def write_project_state(project_id: str, state_dict: Dict[str, Any]) -> Dict[str
             "error": str(e)
         }
 
+def _apply_patch(current_state: Dict[str, Any], patch_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge a patch into a project state in place.
+    
+    Args:
+        current_state: The state to update
+        patch_dict: Dictionary containing the fields to update (consumed)
+            
+    Returns:
+        The updated state
+    """
+    # Handle special cases for array fields that should be appended to
+    if "files_created" in patch_dict and isinstance(patch_dict["files_created"], list):
+        # Add new files to the list without duplicates
+        existing_files = set(current_state.get("files_created", []))
+        for file in patch_dict["files_created"]:
+            if file not in existing_files:
+                existing_files.add(file)
+        current_state["files_created"] = list(existing_files)
+        # Remove from patch_dict since we've handled it
+        del patch_dict["files_created"]
+        
+    if "agents_involved" in patch_dict and isinstance(patch_dict["agents_involved"], list):
+        # Add new agents to the list without duplicates
+        existing_agents = set(current_state.get("agents_involved", []))
+        for agent in patch_dict["agents_involved"]:
+            if agent not in existing_agents:
+                existing_agents.add(agent)
+        current_state["agents_involved"] = list(existing_agents)
+        # Remove from patch_dict since we've handled it
+        del patch_dict["agents_involved"]
+    
+    # Handle tool_usage updates
+    if "tool_usage" in patch_dict and isinstance(patch_dict["tool_usage"], dict):
+        current_tool_usage = current_state.get("tool_usage", {})
+        for tool, count in patch_dict["tool_usage"].items():
+            current_tool_usage[tool] = current_tool_usage.get(tool, 0) + count
+        current_state["tool_usage"] = current_tool_usage
+        # Remove from patch_dict since we've handled it
+        del patch_dict["tool_usage"]
+        
+    # Handle completed_steps updates (Agent Loop Autonomy Core)
+    if "completed_steps" in patch_dict and isinstance(patch_dict["completed_steps"], list):
+        existing_steps = current_state.get("completed_steps", [])
+        for step in patch_dict["completed_steps"]:
+            if step not in existing_steps:
+                existing_steps.append(step)
+        current_state["completed_steps"] = existing_steps
+        # Remove from patch_dict since we've handled it
+        del patch_dict["completed_steps"]
+        
+    # Handle loop_count increment (Agent Loop Autonomy Core)
+    if "increment_loop_count" in patch_dict and patch_dict["increment_loop_count"]:
+        current_state["loop_count"] = current_state.get("loop_count", 0) + 1
+        # Remove from patch_dict since we've handled it
+        del patch_dict["increment_loop_count"]
+    
+    # Update the remaining fields
+    for key, value in patch_dict.items():
+        current_state[key] = value
+    
+    return current_state
+
 def update_project_state(project_id: str, patch_dict: Dict[str, Any]) -> Dict[str, Any]:
     """
     Update specific fields in the project state.
     
+    The read-modify-write runs under the project lock, so concurrent updates
+    to the same project are not lost.
+    
     Args:
         project_id: The project identifier (e.g., "demo_writer_001")
         patch_dict: Dictionary containing the fields to update
@@ -180,64 +263,26 @@ def update_project_state(project_id: str, patch_dict: Dict[str, Any]) -> Dict[st
         Dict containing the result of the operation
     """
     try:
-        # Read the current state
-        current_state = read_project_state(project_id)
-        
-        # Handle special cases for array fields that should be appended to
-        if "files_created" in patch_dict and isinstance(patch_dict["files_created"], list):
-            # Add new files to the list without duplicates
-            existing_files = set(current_state.get("files_created", []))
-            for file in patch_dict["files_created"]:
-                if file not in existing_files:
-                    existing_files.add(file)
-            current_state["files_created"] = list(existing_files)
-            # Remove from patch_dict since we've handled it
-            del patch_dict["files_created"]
+        def mutate(state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            current_state = _fill_missing_fields(state) if state is not None else _default_state(project_id)
+            _apply_patch(current_state, dict(patch_dict))
             
-        if "agents_involved" in patch_dict and isinstance(patch_dict["agents_involved"], list):
-            # Add new agents to the list without duplicates
-            existing_agents = set(current_state.get("agents_involved", []))
-            for agent in patch_dict["agents_involved"]:
-                if agent not in existing_agents:
-                    existing_agents.add(agent)
-            current_state["agents_involved"] = list(existing_agents)
-            # Remove from patch_dict since we've handled it
-            del patch_dict["agents_involved"]
+            # Ensure project_id is included and always update timestamps
+            current_state["project_id"] = project_id
+            current_state["timestamp"] = datetime.utcnow().isoformat()
+            current_state["last_updated_at"] = datetime.utcnow().isoformat()
+            return current_state
         
-        # Handle tool_usage updates
-        if "tool_usage" in patch_dict and isinstance(patch_dict["tool_usage"], dict):
-            current_tool_usage = current_state.get("tool_usage", {})
-            for tool, count in patch_dict["tool_usage"].items():
-                current_tool_usage[tool] = current_tool_usage.get(tool, 0) + count
-            current_state["tool_usage"] = current_tool_usage
-            # Remove from patch_dict since we've handled it
-            del patch_dict["tool_usage"]
-            
-        # Handle completed_steps updates (Agent Loop Autonomy Core)
-        if "completed_steps" in patch_dict and isinstance(patch_dict["completed_steps"], list):
-            existing_steps = current_state.get("completed_steps", [])
-            for step in patch_dict["completed_steps"]:
-                if step not in existing_steps:
-                    existing_steps.append(step)
-            current_state["completed_steps"] = existing_steps
-            # Remove from patch_dict since we've handled it
-            del patch_dict["completed_steps"]
-            
-        # Handle loop_count increment (Agent Loop Autonomy Core)
-        if "increment_loop_count" in patch_dict and patch_dict["increment_loop_count"]:
-            current_state["loop_count"] = current_state.get("loop_count", 0) + 1
-            # Remove from patch_dict since we've handled it
-            del patch_dict["increment_loop_count"]
+        get_project_state_store().update(project_id, mutate)
         
-        # Update the remaining fields
-        for key, value in patch_dict.items():
-            current_state[key] = value
-        
-        # Always update last_updated_at timestamp
-        current_state["last_updated_at"] = datetime.utcnow().isoformat()
+        logger.info(f"Project state written for {project_id}")
+        print(f"✅ Project state updated for {project_id}")
         
-        # Write the updated state
-        return write_project_state(project_id, current_state)
+        return {
+            "status": "success",
+            "message": f"Project state updated for {project_id}",
+            "project_id": project_id
+        }
             
     except Exception as e:
         error_msg = f"Error updating project state for {project_id}: {str(e)}"
@@ -255,6 +300,9 @@ def increment_loop_count(project_id: str, agent_id: str) -> Dict[str, Any]:
     """
     Increment the loop count and update the last completed agent for a project.
     
+    Increments are coalesced by the state store and written within the
+    store's coalesce interval; reads in this process see them immediately.
+    
     Args:
         project_id: The project identifier (e.g., "demo_writer_001")
         agent_id: The agent that just completed (e.g., "hal", "nova")
@@ -263,33 +311,21 @@ def increment_loop_count(project_id: str, agent_id: str) -> Dict[str, Any]:
         Dict containing the result of the operation
     """
     try:
-        # Read the current state
-        current_state = read_project_state(project_id)
-        
-        # Increment loop count
-        current_state["loop_count"] = current_state.get("loop_count", 0) + 1
+        store = get_project_state_store()
         
-        # Update last completed agent
-        current_state["last_completed_agent"] = agent_id
+        # Buffered increments need a file to land in
+        if store.read(project_id) is None:
+            write_project_state(project_id, _default_state(project_id))
         
-        # Add to completed steps
-        completed_steps = current_state.get("completed_steps", [])
-        if agent_id not in completed_steps:
-            completed_steps.append(agent_id)
-        current_state["completed_steps"] = completed_steps
+        store.record_agent_completion(project_id, agent_id, datetime.utcnow().isoformat())
         
-        # Add to agents involved
-        agents_involved = current_state.get("agents_involved", [])
-        if agent_id not in agents_involved:
-            agents_involved.append(agent_id)
-        current_state["agents_involved"] = agents_involved
+        logger.info(f"Loop count incremented for {project_id} by {agent_id}")
         
-        # Update timestamps
-        current_state["last_updated_at"] = datetime.utcnow().isoformat()
-        current_state["last_agent_triggered_at"] = datetime.utcnow().isoformat()
-        
-        # Write the updated state
-        return write_project_state(project_id, current_state)
+        return {
+            "status": "success",
+            "message": f"Project state updated for {project_id}",
+            "project_id": project_id
+        }
             
     except Exception as e:
         error_msg = f"Error incrementing loop count for {project_id}: {str(e)}"
@@ -361,13 +397,16 @@ def cleanup_orphaned_projects() -> Dict[str, Any]:
     """
     Clean up orphaned projects that haven't been updated in 24 hours.
     
+    Ages come from the store's last_updated_at index; a project file is only
+    opened when it has no index entry, or when the index says it is stale but
+    the file was modified more recently than the index records.
+    
     Returns:
         Dict containing the result of the operation
     """
     try:
-        # Get the project states directory
-        states_dir = os.path.join(os.path.dirname(__file__), "project_states")
-        if not os.path.exists(states_dir):
+        store = get_project_state_store()
+        if not os.path.exists(store.states_dir):
             logger.info("No project states directory found, nothing to clean up")
             return {
                 "status": "success",
@@ -375,39 +414,49 @@ def cleanup_orphaned_projects() -> Dict[str, Any]:
                 "deleted_projects": []
             }
         
-        # Get all project state files
-        project_files = [f for f in os.listdir(states_dir) if f.endswith('.json')]
+        # Make sure buffered counters are on disk before judging ages
+        store.flush()
         
+        index = store.read_index()
+        surviving_index = {}
         deleted_projects = []
         current_time = datetime.utcnow()
+        cutoff = timedelta(hours=24)
         
-        for project_file in project_files:
+        for project_id in store.list_project_ids():
             try:
-                # Extract project_id from filename
-                project_id = project_file.replace('.json', '')
-                
-                # Read the project state
-                project_state = read_project_state(project_id)
+                last_updated_at = index.get(project_id)
+                stale = False
                 
-                # Check if the project has been updated in the last 24 hours
-                last_updated_at = project_state.get("last_updated_at")
                 if last_updated_at:
-                    try:
-                        last_updated_time = datetime.fromisoformat(last_updated_at)
-                        time_diff = current_time - last_updated_time
-                        
-                        # If more than 24 hours have passed, delete the project
-                        if time_diff > timedelta(hours=24):
-                            logger.info(f"Deleting orphaned project {project_id}. Last updated: {last_updated_at}")
-                            print(f"🧹 Deleting orphaned project {project_id}. Last updated: {last_updated_at}")
-                            
-                            # Delete the project state file
-                            os.remove(os.path.join(states_dir, project_file))
-                            deleted_projects.append(project_id)
-                    except Exception as e:
-                        logger.error(f"Error parsing last_updated_at for project {project_id}: {str(e)}")
+                    stale = current_time - datetime.fromisoformat(last_updated_at) > cutoff
+                    if stale and time.time() - os.path.getmtime(store.path_for(project_id)) <= cutoff.total_seconds():
+                        # Written without going through the store; trust the file
+                        last_updated_at = None
+                
+                if not last_updated_at:
+                    # Read the project state
+                    project_state = read_project_state(project_id)
+                    last_updated_at = project_state.get("last_updated_at")
+                    if not last_updated_at:
+                        continue
+                    stale = current_time - datetime.fromisoformat(last_updated_at) > cutoff
+                
+                # If more than 24 hours have passed, delete the project
+                if stale:
+                    logger.info(f"Deleting orphaned project {project_id}. Last updated: {last_updated_at}")
+                    print(f"🧹 Deleting orphaned project {project_id}. Last updated: {last_updated_at}")
+                    
+                    # Delete the project state file
+                    store.delete(project_id)
+                    deleted_projects.append(project_id)
+                else:
+                    surviving_index[project_id] = last_updated_at
             except Exception as e:
-                logger.error(f"Error processing project file {project_file}: {str(e)}")
+                logger.error(f"Error processing project {project_id}: {str(e)}")
+        
+        # Compact the index; entries appended meanwhile are rebuilt on the next run
+        store.rewrite_index(surviving_index)
         
         logger.info(f"Cleanup completed. Deleted {len(deleted_projects)} orphaned projects.")
         print(f"✅ Cleanup completed. Deleted {len(deleted_projects)} orphaned projects.")
@@ -0,0 +1,389 @@
+"""
+Project State Store
+Cached, atomic and lock-safe persistence for project_states/<project_id>.json.
+
+- Reads are served from an in-process LRU validated against the file's
+  mtime/size, so unchanged files are never re-opened or re-parsed.
+- Writes go to a temp file that is fsynced and renamed over the original, so
+  readers never see a torn file.
+- Read-modify-write updates hold a per-project lock: a threading lock within
+  the process and an fcntl lock on <project_id>.lock across processes. Async
+  callers can use the a* methods, which serialize on a per-project asyncio lock.
+- Hot counters (loop_count via record_agent_completion) are coalesced in
+  memory and flushed at most every coalesce_interval seconds; reads in this
+  process always include pending increments.
+- Every write appends (project_id, last_updated_at) to _index.log so orphan
+  cleanup can skip files it does not need to open.
+"""
+import asyncio
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process locking is unavailable
+    fcntl = None
+
+# Configure logging
+logger = logging.getLogger("app.modules.project_state_store")
+
+INDEX_FILE = "_index.log"
+
+
+class ProjectStateStore:
+    """
+    File-per-project state store with caching, locking and atomic writes.
+    """
+
+    def __init__(self, states_dir: str, cache_size: int = 256, coalesce_interval: float = 0.5):
+        """
+        Initialize the store.
+
+        Args:
+            states_dir: Directory holding <project_id>.json files
+            cache_size: Maximum number of project states kept in the LRU
+            coalesce_interval: Seconds to buffer counter increments; 0 writes through
+        """
+        self.states_dir = states_dir
+        self.cache_size = cache_size
+        self.coalesce_interval = coalesce_interval
+
+        # project_id -> ((mtime_ns, size), pickled state)
+        self._cache: "OrderedDict[str, Tuple[Tuple[int, int], bytes]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._locks: Dict[str, threading.RLock] = {}
+        self._locks_lock = threading.Lock()
+        self._async_locks: Dict[str, asyncio.Lock] = {}
+
+        # project_id -> pending counter updates not yet written
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+
+    # ------------------------------------------------------------------ paths
+
+    def path_for(self, project_id: str) -> str:
+        return os.path.join(self.states_dir, f"{project_id}.json")
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.states_dir, INDEX_FILE)
+
+    # ------------------------------------------------------------------ locks
+
+    def _thread_lock(self, project_id: str) -> threading.RLock:
+        with self._locks_lock:
+            if project_id not in self._locks:
+                self._locks[project_id] = threading.RLock()
+            return self._locks[project_id]
+
+    @contextmanager
+    def lock(self, project_id: str) -> Iterator[None]:
+        """Hold the per-project thread lock and cross-process file lock."""
+        with self._thread_lock(project_id):
+            if fcntl is None:
+                yield
+                return
+            os.makedirs(self.states_dir, exist_ok=True)
+            with open(os.path.join(self.states_dir, f"{project_id}.lock"), "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _async_lock(self, project_id: str) -> asyncio.Lock:
+        if project_id not in self._async_locks:
+            self._async_locks[project_id] = asyncio.Lock()
+        return self._async_locks[project_id]
+
+    # ------------------------------------------------------------------- read
+
+    def read(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a project state.
+
+        Args:
+            project_id: The project identifier
+
+        Returns:
+            A private copy of the state (callers may mutate it), or None if
+            the project has no state file
+        """
+        state = self._read_file(project_id)
+        pending = self._pending.get(project_id)
+        if pending is not None:
+            if state is None:
+                return None
+            _apply_pending(state, pending)
+        return state
+
+    def _read_file(self, project_id: str) -> Optional[Dict[str, Any]]:
+        path = self.path_for(project_id)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            with self._cache_lock:
+                self._cache.pop(project_id, None)
+            return None
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._cache_lock:
+            cached = self._cache.get(project_id)
+            if cached is not None and cached[0] == signature:
+                self._cache.move_to_end(project_id)
+                return pickle.loads(cached[1])
+
+        with open(path, "r") as f:
+            state = json.load(f)
+
+        self._remember(project_id, signature, state)
+        return state
+
+    def _remember(self, project_id: str, signature: Tuple[int, int], state: Dict[str, Any]) -> None:
+        with self._cache_lock:
+            self._cache[project_id] = (signature, pickle.dumps(state, pickle.HIGHEST_PROTOCOL))
+            self._cache.move_to_end(project_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # ------------------------------------------------------------------ write
+
+    def write(self, project_id: str, state: Dict[str, Any]) -> None:
+        """
+        Atomically replace a project state, folding in pending counters.
+
+        Args:
+            project_id: The project identifier
+            state: The complete state to write
+        """
+        with self.lock(project_id):
+            with self._pending_lock:
+                self._pending.pop(project_id, None)
+            self._write_file(project_id, state)
+
+    def update(self, project_id: str, mutate: Callable[[Optional[Dict[str, Any]]], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Read-modify-write a project state under the project lock.
+
+        Args:
+            project_id: The project identifier
+            mutate: Receives the current state (None if missing), including
+                pending counters, and returns the state to write
+
+        Returns:
+            The state that was written
+        """
+        with self.lock(project_id):
+            with self._pending_lock:
+                pending = self._pending.pop(project_id, None)
+            try:
+                current = self._read_file(project_id)
+                if current is not None and pending is not None:
+                    _apply_pending(current, pending)
+                state = mutate(current)
+                self._write_file(project_id, state)
+            except BaseException:
+                # Keep the counters for the next flush rather than losing them
+                if pending is not None:
+                    self._restore_pending(project_id, pending)
+                raise
+            return state
+
+    def _restore_pending(self, project_id: str, pending: Dict[str, Any]) -> None:
+        with self._pending_lock:
+            newer = self._pending.get(project_id)
+            if newer is not None:
+                # Completions recorded meanwhile come after the restored ones
+                pending["loop_count"] += newer["loop_count"]
+                pending["agents"].extend(newer["agents"])
+                pending["timestamp"] = newer.get("timestamp") or pending.get("timestamp")
+            self._pending[project_id] = pending
+
+    def _write_file(self, project_id: str, state: Dict[str, Any]) -> None:
+        os.makedirs(self.states_dir, exist_ok=True)
+        path = self.path_for(project_id)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.states_dir, prefix=f".{project_id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        stat = os.stat(path)
+        self._remember(project_id, (stat.st_mtime_ns, stat.st_size), state)
+        self._append_index(project_id, state.get("last_updated_at"))
+
+    # --------------------------------------------------------------- counters
+
+    def record_agent_completion(self, project_id: str, agent_id: str, timestamp: str) -> None:
+        """
+        Record a completed agent step: loop_count += 1, last_completed_agent,
+        completed_steps, agents_involved and timestamps.
+
+        The update is buffered and written within coalesce_interval seconds,
+        together with any other increments for the project.
+
+        Args:
+            project_id: The project identifier
+            agent_id: The agent that just completed
+            timestamp: ISO timestamp of the completion
+        """
+        with self._pending_lock:
+            pending = self._pending.setdefault(project_id, {"loop_count": 0, "agents": []})
+            pending["loop_count"] += 1
+            pending["agents"].append(agent_id)
+            pending["timestamp"] = timestamp
+
+        if self.coalesce_interval <= 0:
+            self.flush(project_id)
+            return
+
+        with self._pending_lock:
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.coalesce_interval, self._flush_from_timer)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _flush_from_timer(self) -> None:
+        with self._pending_lock:
+            self._flush_timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing coalesced project state counters: {str(e)}")
+
+    def flush(self, project_id: Optional[str] = None) -> None:
+        """
+        Write buffered counter updates.
+
+        Args:
+            project_id: Flush only this project; all projects if None
+        """
+        with self._pending_lock:
+            project_ids = [project_id] if project_id is not None else list(self._pending)
+
+        for pid in project_ids:
+            if pid not in self._pending:
+                continue
+            # update() folds the pending counters in under the project lock
+            self.update(pid, lambda state, pid=pid: state if state is not None else _new_state(pid))
+
+    # ------------------------------------------------------------------ index
+
+    def _append_index(self, project_id: str, last_updated_at: Optional[str]) -> None:
+        if not last_updated_at:
+            return
+        # Lines are far below PIPE_BUF, so O_APPEND writes do not interleave
+        with open(self.index_path, "a") as f:
+            f.write(json.dumps([project_id, last_updated_at]) + "\n")
+
+    def read_index(self) -> Dict[str, str]:
+        """
+        Read the last_updated_at index.
+
+        Returns:
+            Dict of project_id to its most recently written last_updated_at
+        """
+        index: Dict[str, str] = {}
+        if not os.path.exists(self.index_path):
+            return index
+        with open(self.index_path, "r") as f:
+            for line in f:
+                try:
+                    project_id, last_updated_at = json.loads(line)
+                except (ValueError, TypeError):
+                    continue
+                index[project_id] = last_updated_at
+        return index
+
+    def rewrite_index(self, index: Dict[str, str]) -> None:
+        """Atomically replace the index log with one line per project."""
+        os.makedirs(self.states_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.states_dir, prefix=".index.", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            for project_id, last_updated_at in index.items():
+                f.write(json.dumps([project_id, last_updated_at]) + "\n")
+        os.replace(tmp_path, self.index_path)
+
+    def list_project_ids(self) -> List[str]:
+        """List project IDs that have a state file."""
+        if not os.path.exists(self.states_dir):
+            return []
+        return [
+            entry.name[:-len(".json")]
+            for entry in os.scandir(self.states_dir)
+            if entry.name.endswith(".json") and not entry.name.startswith(".")
+        ]
+
+    def delete(self, project_id: str) -> None:
+        """Delete a project's state file and drop it from the cache."""
+        with self.lock(project_id):
+            with self._pending_lock:
+                self._pending.pop(project_id, None)
+            path = self.path_for(project_id)
+            if os.path.exists(path):
+                os.remove(path)
+            with self._cache_lock:
+                self._cache.pop(project_id, None)
+        lock_path = os.path.join(self.states_dir, f"{project_id}.lock")
+        if os.path.exists(lock_path):
+            os.remove(lock_path)
+
+    # ------------------------------------------------------------------ async
+
+    async def aread(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Async read; a cache hit never leaves the event loop."""
+        return self.read(project_id)
+
+    async def aupdate(self, project_id: str, mutate: Callable[[Optional[Dict[str, Any]]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Async update, serialized per project and run off the event loop."""
+        async with self._async_lock(project_id):
+            return await asyncio.to_thread(self.update, project_id, mutate)
+
+
+def _new_state(project_id: str) -> Dict[str, Any]:
+    now = datetime.utcnow().isoformat()
+    return {
+        "project_id": project_id,
+        "status": "initialized",
+        "files_created": [],
+        "agents_involved": [],
+        "loop_count": 0,
+        "completed_steps": [],
+        "timestamp": now,
+        "last_updated_at": now,
+    }
+
+
+def _apply_pending(state: Dict[str, Any], pending: Dict[str, Any]) -> None:
+    """Fold buffered agent completions into a state dict in place."""
+    state["loop_count"] = state.get("loop_count", 0) + pending["loop_count"]
+
+    completed_steps = state.setdefault("completed_steps", [])
+    agents_involved = state.setdefault("agents_involved", [])
+    for agent_id in pending["agents"]:
+        if agent_id not in completed_steps:
+            completed_steps.append(agent_id)
+        if agent_id not in agents_involved:
+            agents_involved.append(agent_id)
+
+    if pending["agents"]:
+        state["last_completed_agent"] = pending["agents"][-1]
+    if pending.get("timestamp"):
+        state["last_updated_at"] = pending["timestamp"]
+        state["last_agent_triggered_at"] = pending["timestamp"]
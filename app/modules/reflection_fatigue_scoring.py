@@ -14,9 +14,8 @@ manually overridden by an operator.
 """
 
 from typing import Dict, Any, Optional, List
-import asyncio
-import json
 from datetime import datetime
+from app.modules.kv_memory import read_from_memory, write_to_memory
 
 # Configuration for fatigue scoring
 FATIGUE_CONFIG = {
@@ -27,55 +26,6 @@ FATIGUE_CONFIG = {
     "max_fatigue": 1.0                # Maximum possible fatigue score
 }
 
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    
-    # Mock data for testing
-    if key == "loop_trace[loop_001]":
-        return {
-            "loop_id": "loop_001",
-            "status": "completed",
-            "timestamp": "2025-04-21T12:00:00Z",
-            "alignment_score": 0.72,
-            "drift_score": 0.28,
-            "reflection_fatigue": 0.0
-        }
-    elif key == "loop_trace[loop_001_r1]":
-        return {
-            "loop_id": "loop_001_r1",
-            "rerun_of": "loop_001",
-            "status": "completed",
-            "timestamp": "2025-04-21T12:30:00Z",
-            "alignment_score": 0.74,  # Slight improvement
-            "drift_score": 0.26,      # Slight improvement
-            "reflection_fatigue": 0.1
-        }
-    elif key == "loop_trace[loop_001_r2]":
-        return {
-            "loop_id": "loop_001_r2",
-            "rerun_of": "loop_001_r1",
-            "status": "completed",
-            "timestamp": "2025-04-21T13:00:00Z",
-            "alignment_score": 0.73,  # No improvement (slight regression)
-            "drift_score": 0.27,      # No improvement (slight regression)
-            "reflection_fatigue": 0.25
-        }
-    
-    return None
-
-# Mock function for writing to memory
-# In a real implementation, this would write to a database or storage system
-async def write_to_memory(key: str, value: Any) -> bool:
-    """Write data to memory storage."""
-    # Simulate memory write
-    await asyncio.sleep(0.1)
-    print(f"Writing to memory: {key} = {json.dumps(value, indent=2)}")
-    return True
-
 async def get_previous_loop_trace(loop_id: str) -> Optional[Dict[str, Any]]:
     """
     Get the trace of the previous loop (the one this loop is a rerun of).
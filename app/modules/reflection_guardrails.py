@@ -10,8 +10,6 @@ coordinates the interaction between different components.
 """
 
 from typing import Dict, Any, Optional, List
-import asyncio
-import json
 from datetime import datetime
 
 from app.modules.post_loop_summary_handler import process_loop_reflection
@@ -19,23 +17,7 @@ from app.modules.rerun_decision_engine import make_rerun_decision
 from app.modules.pessimist_bias_tracking import track_bias
 from app.modules.reflection_fatigue_scoring import process_reflection_fatigue
 from app.modules.rerun_reasoning_logger import log_rerun_reasoning, log_finalization_reasoning
-
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    return None
-
-# Mock function for writing to memory
-# In a real implementation, this would write to a database or storage system
-async def write_to_memory(key: str, value: Any) -> bool:
-    """Write data to memory storage."""
-    # Simulate memory write
-    await asyncio.sleep(0.1)
-    print(f"Writing to memory: {key} = {json.dumps(value, indent=2)}")
-    return True
+from app.modules.kv_memory import read_from_memory, write_to_memory
 
 async def process_loop_completion(
     loop_id: str,
@@ -13,14 +13,13 @@ It implements guardrails to prevent endless reruns, including:
 """
 
 from typing import Dict, Any, Optional, List
-import asyncio
-import json
 import re
 from datetime import datetime
 from app.utils.persona_utils import get_current_persona, preload_persona_for_deep_loop
 from app.modules.rerun_reasoning_logger import log_rerun_reasoning, log_finalization_reasoning
 from app.modules.safety_integration import should_trigger_rerun as safety_should_trigger_rerun
 from app.modules.safety_integration import get_rerun_configuration as safety_get_rerun_configuration
+from app.modules.kv_memory import read_from_memory, write_to_memory
 
 # Configuration for rerun thresholds
 # These could be moved to a config file in a real implementation
@@ -32,63 +31,6 @@ RERUN_CONFIG = {
     "bias_repetition_threshold": 3  # Number of repetitions to trigger bias echo detection
 }
 
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    
-    # Mock data for testing
-    if key == "loop_trace[loop_001]":
-        return {
-            "loop_id": "loop_001",
-            "status": "completed",
-            "timestamp": "2025-04-21T12:00:00Z",
-            "summary": "Analyzed quantum computing concepts",
-            "orchestrator_persona": "SAGE",
-            "rerun_count": 0,
-            "max_reruns": 3,
-            "reflection_fatigue": 0.0
-        }
-    elif key.startswith("loop_trace[loop_001_r"):
-        rerun_num = int(key.split("_r")[1].split("]")[0])
-        if rerun_num <= 2:  # Mock data for up to 2 reruns
-            return {
-                "loop_id": f"loop_001_r{rerun_num}",
-                "rerun_of": f"loop_001_r{rerun_num-1}" if rerun_num > 1 else "loop_001",
-                "status": "completed",
-                "timestamp": "2025-04-21T12:30:00Z",
-                "summary": f"Reanalyzed quantum computing concepts (rerun {rerun_num})",
-                "orchestrator_persona": "SAGE",
-                "rerun_count": rerun_num,
-                "max_reruns": 3,
-                "reflection_fatigue": 0.2 * rerun_num
-            }
-    elif key.startswith("loop_summary["):
-        loop_id = key.split("[")[1].split("]")[0]
-        return {
-            "alignment_score": 0.72,
-            "drift_score": 0.28,
-            "summary_valid": True,
-            "reflection_persona": "SAGE",
-            "bias_echo": False,
-            "reflection_fatigue": 0.2,
-            "rerun_trigger": ["alignment", "drift"],
-            "rerun_reason": "alignment_threshold_not_met"
-        }
-    
-    return None
-
-# Mock function for writing to memory
-# In a real implementation, this would write to a database or storage system
-async def write_to_memory(key: str, value: Any) -> bool:
-    """Write data to memory storage."""
-    # Simulate memory write
-    await asyncio.sleep(0.1)
-    print(f"Writing to memory: {key} = {json.dumps(value, indent=2)}")
-    return True
-
 def get_rerun_number(loop_id: str) -> int:
     """
     Extract the rerun number from a loop ID.
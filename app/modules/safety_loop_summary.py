@@ -8,9 +8,7 @@ domain sensitivity flagging, and IP violation scanning.
 It integrates with the Responsible Cognition Layer to provide a unified view of safety status.
 """
 
-from typing import Dict, Any, List, Optional
-import json
-import asyncio
+from typing import Dict, Any, List
 from datetime import datetime
 
 from app.modules.safety_integration import (
@@ -22,41 +20,7 @@ from app.modules.safety_integration import (
     get_safe_output,
     get_safe_prompt
 )
-
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    
-    # Mock data for testing
-    if key == "loop_trace[loop_001]":
-        return {
-            "loop_id": "loop_001",
-            "status": "completed",
-            "timestamp": "2025-04-21T12:00:00Z",
-            "summary": "Analyzed quantum computing concepts",
-            "orchestrator_persona": "SAGE",
-            "safety_checks_performed": ["synthetic_identity", "output_policy", "prompt_injection", "domain_sensitivity", "ip_violation"],
-            "safety_blocks_triggered": [],
-            "safety_warnings_issued": ["domain_sensitivity"]
-        }
-    elif key == "loop_prompt[loop_001]":
-        return "Analyze the impact of quantum computing on cryptography."
-    elif key == "loop_output[loop_001]":
-        return "Quantum computing poses significant challenges to current cryptographic methods..."
-    
-    return None
-
-# Mock function for writing to memory
-# In a real implementation, this would write to a database or storage system
-async def write_to_memory(key: str, value: Any) -> bool:
-    """Write data to memory storage."""
-    # Simulate memory write
-    await asyncio.sleep(0.1)
-    print(f"Writing to memory: {key} = {json.dumps(value, indent=2)}")
-    return True
+from app.modules.kv_memory import read_from_memory, write_to_memory
 
 async def generate_safety_summary(loop_id: str) -> Dict[str, Any]:
     """
@@ -0,0 +1,303 @@
+"""
+Snapshot Store Module
+
+Out-of-band storage for loop snapshots. Instead of appending full copies of
+the project state to the state file, each project keeps a chain of snapshots
+in SQLite:
+
+- every `checkpoint_interval`-th snapshot is a full checkpoint whose top-level
+  subtrees are stored content-addressed (sha256), so subtrees that did not
+  change between checkpoints are stored once;
+- every other snapshot is a structural JSON diff against the previous one
+  (set / delete / list-append operations on key paths).
+
+A snapshot is materialized by loading the nearest checkpoint at or before it
+and replaying the diffs after it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger("app.modules.snapshot_store")
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "loop_snapshots.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    project_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    loop INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    body TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    PRIMARY KEY (project_id, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS snapshot_objects (
+    hash TEXT PRIMARY KEY,
+    body TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def json_diff(old: Any, new: Any, path: Optional[List[Any]] = None) -> List[List[Any]]:
+    """
+    Structural diff between two JSON values.
+
+    Args:
+        old: Previous value
+        new: Current value
+        path: Key path of the values (internal)
+
+    Returns:
+        List of operations: ["set", path, value], ["del", path] or
+        ["append", path, items]
+    """
+    path = path or []
+    if old == new:
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: List[List[Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append(["del", path + [key]])
+        for key, value in new.items():
+            if key not in old:
+                ops.append(["set", path + [key], value])
+            else:
+                ops.extend(json_diff(old[key], value, path + [key]))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list) and len(new) > len(old) and new[:len(old)] == old:
+        return [["append", path, new[len(old):]]]
+
+    return [["set", path, new]]
+
+
+def apply_diff(value: Any, ops: List[List[Any]]) -> Any:
+    """
+    Apply operations produced by json_diff.
+
+    Args:
+        value: Value to patch (modified in place where possible)
+        ops: Diff operations
+
+    Returns:
+        The patched value
+    """
+    for op in ops:
+        kind, path = op[0], op[1]
+        if not path:
+            if kind == "set":
+                value = op[2]
+            elif kind == "append":
+                value.extend(op[2])
+            continue
+
+        parent = value
+        for key in path[:-1]:
+            parent = parent[key]
+        if kind == "set":
+            parent[path[-1]] = op[2]
+        elif kind == "del":
+            parent.pop(path[-1], None)
+        elif kind == "append":
+            parent[path[-1]].extend(op[2])
+    return value
+
+
+class SnapshotStore:
+    """
+    Checkpoint + delta snapshot chains per project, backed by SQLite.
+    """
+
+    def __init__(self, db_path: Optional[str] = DEFAULT_DB_PATH, checkpoint_interval: int = 20):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: SQLite file, or None for an in-memory database
+            checkpoint_interval: Write a full checkpoint every N snapshots
+        """
+        self.db_path = db_path
+        self.checkpoint_interval = max(1, checkpoint_interval)
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+
+        # project_id -> (seq, snapshot) of the latest snapshot, to diff against
+        self._latest: Dict[str, Tuple[int, str]] = {}
+
+    def save(self, project_id: str, snapshot: Dict[str, Any], loop: int, timestamp: str) -> Dict[str, Any]:
+        """
+        Append a snapshot to a project's chain.
+
+        Args:
+            project_id: The ID of the project
+            snapshot: JSON-serializable project state
+            loop: Loop count the snapshot was taken at
+            timestamp: ISO timestamp of the snapshot
+
+        Returns:
+            Pointer dict with seq, timestamp and loop
+        """
+        summary = _canonical({"agents_completed": snapshot.get("completed_steps", [])})
+
+        with self._lock:
+            previous = self._load_latest(project_id)
+            seq = previous[0] + 1 if previous else 0
+
+            if previous is None or seq % self.checkpoint_interval == 0:
+                kind, body = "full", self._store_checkpoint(snapshot)
+            else:
+                kind, body = "delta", _canonical(json_diff(json.loads(previous[1]), snapshot))
+
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO snapshots (project_id, seq, timestamp, loop, kind, body, summary) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (project_id, seq, timestamp, loop, kind, body, summary),
+                )
+            self._latest[project_id] = (seq, _canonical(snapshot))
+
+        return {"seq": seq, "timestamp": timestamp, "loop": loop}
+
+    def _store_checkpoint(self, snapshot: Dict[str, Any]) -> str:
+        refs = {}
+        rows = []
+        for key, value in snapshot.items():
+            encoded = _canonical(value)
+            digest = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+            refs[key] = digest
+            rows.append((digest, encoded))
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO snapshot_objects (hash, body) VALUES (?, ?)", rows)
+        return _canonical(refs)
+
+    def _load_latest(self, project_id: str) -> Optional[Tuple[int, str]]:
+        cached = self._latest.get(project_id)
+        if cached is not None:
+            return cached
+        row = self._conn.execute(
+            "SELECT MAX(seq) FROM snapshots WHERE project_id = ?", (project_id,)
+        ).fetchone()
+        if row[0] is None:
+            return None
+        snapshot = self._materialize(project_id, row[0])
+        self._latest[project_id] = (row[0], _canonical(snapshot))
+        return self._latest[project_id]
+
+    def _materialize(self, project_id: str, seq: int) -> Dict[str, Any]:
+        base_seq, refs = self._conn.execute(
+            "SELECT seq, body FROM snapshots WHERE project_id = ? AND seq <= ? AND kind = 'full' "
+            "ORDER BY seq DESC LIMIT 1",
+            (project_id, seq),
+        ).fetchone()
+
+        snapshot = {}
+        for key, digest in json.loads(refs).items():
+            body = self._conn.execute("SELECT body FROM snapshot_objects WHERE hash = ?", (digest,)).fetchone()[0]
+            snapshot[key] = json.loads(body)
+
+        for (body,) in self._conn.execute(
+            "SELECT body FROM snapshots WHERE project_id = ? AND seq > ? AND seq <= ? ORDER BY seq",
+            (project_id, base_seq, seq),
+        ):
+            snapshot = apply_diff(snapshot, json.loads(body))
+        return snapshot
+
+    def get(self, project_id: str, seq: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Materialize a snapshot.
+
+        Args:
+            project_id: The ID of the project
+            seq: Snapshot sequence number; latest if None
+
+        Returns:
+            Dict with seq, timestamp, loop and snapshot, or None if not found
+        """
+        with self._lock:
+            if seq is None:
+                latest = self._load_latest(project_id)
+                if latest is None:
+                    return None
+                seq = latest[0]
+            row = self._conn.execute(
+                "SELECT timestamp, loop FROM snapshots WHERE project_id = ? AND seq = ?", (project_id, seq)
+            ).fetchone()
+            if row is None:
+                return None
+
+            cached = self._latest.get(project_id)
+            if cached is not None and cached[0] == seq:
+                snapshot = json.loads(cached[1])
+            else:
+                snapshot = self._materialize(project_id, seq)
+        return {"seq": seq, "timestamp": row[0], "loop": row[1], "snapshot": snapshot}
+
+    def history(self, project_id: str) -> List[Dict[str, Any]]:
+        """
+        List a project's snapshots without materializing them.
+
+        Args:
+            project_id: The ID of the project
+
+        Returns:
+            List of dicts with seq, timestamp, loop and agents_completed
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, timestamp, loop, summary FROM snapshots WHERE project_id = ? ORDER BY seq",
+                (project_id,),
+            ).fetchall()
+        return [
+            {"seq": seq, "timestamp": timestamp, "loop": loop, **json.loads(summary)}
+            for seq, timestamp, loop, summary in rows
+        ]
+
+    def delete(self, project_id: str) -> None:
+        """Remove a project's snapshot chain (shared subtree objects are kept)."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM snapshots WHERE project_id = ?", (project_id,))
+            self._latest.pop(project_id, None)
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        self._conn.close()
+
+
+_store: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """
+    Get the process-wide snapshot store.
+
+    The database location can be overridden with LOOP_SNAPSHOT_DB and the
+    checkpoint interval with LOOP_SNAPSHOT_CHECKPOINT_INTERVAL (default 20).
+    """
+    global _store
+    if _store is None:
+        _store = SnapshotStore(
+            os.getenv("LOOP_SNAPSHOT_DB", DEFAULT_DB_PATH) or None,
+            checkpoint_interval=int(os.getenv("LOOP_SNAPSHOT_CHECKPOINT_INTERVAL", "20")),
+        )
+    return _store
@@ -0,0 +1,268 @@
+"""
+Stream Hub Module
+
+Pub/sub fan-out for delegate streams. Each stream keeps a ring buffer of its
+most recent events so late subscribers can resume from the last event id they
+saw. Events are serialized once on publish and the same payload string is
+handed to every subscriber.
+
+Each subscriber owns a bounded send queue drained by its own pump, so a slow
+client only ever holds `queue_size` pending payloads. When the queue is full
+the slow consumer policy decides what happens:
+
+- "drop": the oldest queued payload is discarded and counted as dropped;
+- "disconnect": the subscriber is closed and has to reconnect and resume.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger("stream_hub")
+
+SLOW_CONSUMER_POLICIES = ("drop", "disconnect")
+
+
+class Subscriber:
+    """
+    One connection to a stream with its own bounded send queue.
+    """
+
+    def __init__(self, stream_id: str, queue_size: int, policy: str, replay: List[str], missed: bool):
+        self.stream_id = stream_id
+        self.queue_size = queue_size
+        self.policy = policy
+        self.replay = replay
+        # True when the requested resume point had already left the ring buffer
+        self.missed = missed
+        self.dropped = 0
+        self.sent = 0
+        self.closed = False
+        self.close_reason: Optional[str] = None
+
+        self._queue: Deque[str] = deque()
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def offer(self, payload: str) -> bool:
+        """
+        Queue a payload without blocking the publisher.
+
+        Returns:
+            False if the subscriber was dropped by the disconnect policy
+        """
+        if self.closed:
+            return False
+        if len(self._queue) >= self.queue_size:
+            if self.policy == "disconnect":
+                self.close("slow_consumer")
+                return False
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append(payload)
+        self._wake()
+        return True
+
+    def close(self, reason: str) -> None:
+        """Stop the pump once the queued payloads have been sent (or at once for slow consumers)."""
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        if reason == "slow_consumer":
+            self._queue.clear()
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def pump(self, send: Callable[[str], Awaitable[Any]]) -> None:
+        """
+        Send the replayed events, then queued events, until closed.
+
+        Args:
+            send: Coroutine function sending one text frame to the client
+        """
+        replay, self.replay = self.replay, []
+        for payload in replay:
+            await send(payload)
+            self.sent += 1
+
+        while True:
+            while self._queue:
+                await send(self._queue.popleft())
+                self.sent += 1
+            if self.closed:
+                return
+            self._wakeup.clear()
+            if not self._queue and not self.closed:
+                await self._wakeup.wait()
+
+
+class StreamHub:
+    """
+    Ring-buffered pub/sub hub keyed by stream id.
+    """
+
+    def __init__(self, capacity: int = 1000, queue_size: int = 256, policy: str = "drop"):
+        """
+        Initialize the hub.
+
+        Args:
+            capacity: Default number of events retained per stream for resume
+            queue_size: Maximum pending payloads per subscriber
+            policy: Slow consumer policy, "drop" or "disconnect"
+        """
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {policy}")
+        self.capacity = max(1, capacity)
+        self.queue_size = max(1, queue_size)
+        self.policy = policy
+
+        self._lock = threading.Lock()
+        # stream_id -> ring of (event_id, payload)
+        self._buffers: Dict[str, Deque[Tuple[str, str]]] = {}
+        self._subscribers: Dict[str, List[Subscriber]] = {}
+        self._published: Dict[str, int] = {}
+        self._dropped: Dict[str, int] = {}
+        self._disconnected: Dict[str, int] = {}
+
+    def open(self, stream_id: str, capacity: Optional[int] = None) -> None:
+        """Create the ring buffer for a stream."""
+        with self._lock:
+            self._buffers[stream_id] = deque(maxlen=max(1, capacity or self.capacity))
+            self._subscribers[stream_id] = []
+            self._published[stream_id] = 0
+            self._dropped[stream_id] = 0
+            self._disconnected[stream_id] = 0
+
+    def publish(self, stream_id: str, event: Dict[str, Any]) -> str:
+        """
+        Serialize an event once, buffer it and fan it out.
+
+        Args:
+            stream_id: Stream to publish to
+            event: JSON-serializable event with an "event_id"
+
+        Returns:
+            The serialized payload
+        """
+        payload = json.dumps(event)
+        with self._lock:
+            self._buffers[stream_id].append((event["event_id"], payload))
+            self._published[stream_id] += 1
+            subscribers = list(self._subscribers[stream_id])
+
+        for subscriber in subscribers:
+            dropped_before = subscriber.dropped
+            if not subscriber.offer(payload):
+                self._remove(subscriber, slow=True)
+            elif subscriber.dropped != dropped_before:
+                with self._lock:
+                    self._dropped[stream_id] += subscriber.dropped - dropped_before
+        return payload
+
+    def subscribe(self, stream_id: str, last_event_id: Optional[str] = None) -> Subscriber:
+        """
+        Register a subscriber, replaying buffered events after last_event_id.
+
+        Without last_event_id the whole ring buffer is replayed. If
+        last_event_id has already been evicted, the whole buffer is replayed
+        and the subscriber is flagged as having missed events.
+
+        Must be called from the event loop that will run the subscriber's pump.
+        """
+        with self._lock:
+            buffered = list(self._buffers[stream_id])
+            missed = False
+            replay = [payload for _, payload in buffered]
+            if last_event_id:
+                ids = [event_id for event_id, _ in buffered]
+                if last_event_id in ids:
+                    replay = replay[ids.index(last_event_id) + 1:]
+                else:
+                    missed = True
+            subscriber = Subscriber(stream_id, self.queue_size, self.policy, replay, missed)
+            self._subscribers[stream_id].append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a subscriber, e.g. after its connection closed."""
+        subscriber.close("unsubscribed")
+        self._remove(subscriber, slow=False)
+
+    def _remove(self, subscriber: Subscriber, slow: bool) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.stream_id, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+                if slow:
+                    self._disconnected[subscriber.stream_id] += 1
+                    logger.warning(f"Disconnected slow consumer from stream {subscriber.stream_id}")
+
+    def subscriber_count(self, stream_id: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(stream_id, []))
+
+    def close(self, stream_id: str) -> None:
+        """Close all subscribers of a stream after they flush their queues. The buffer is kept."""
+        with self._lock:
+            subscribers = self._subscribers.get(stream_id, [])
+            self._subscribers[stream_id] = []
+        for subscriber in subscribers:
+            subscriber.close("stream_closed")
+
+    def discard(self, stream_id: str) -> None:
+        """Forget a stream entirely."""
+        self.close(stream_id)
+        with self._lock:
+            for table in (self._buffers, self._subscribers, self._published, self._dropped, self._disconnected):
+                table.pop(stream_id, None)
+
+    def get_metrics(self, stream_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Queue depth and drop metrics.
+
+        Args:
+            stream_id: Single stream to report on; all streams if None
+
+        Returns:
+            Dict of per-stream metrics, or one stream's metrics
+        """
+        with self._lock:
+            stream_ids = [stream_id] if stream_id else list(self._buffers)
+            metrics = {}
+            for sid in stream_ids:
+                if sid not in self._buffers:
+                    continue
+                depths = [s.queue_depth for s in self._subscribers[sid]]
+                metrics[sid] = {
+                    "buffered_events": len(self._buffers[sid]),
+                    "buffer_capacity": self._buffers[sid].maxlen,
+                    "published_events": self._published[sid],
+                    "subscribers": len(depths),
+                    "queue_depth": sum(depths),
+                    "max_queue_depth": max(depths, default=0),
+                    "queue_capacity": self.queue_size,
+                    "dropped_events": self._dropped[sid],
+                    "slow_consumer_disconnects": self._disconnected[sid],
+                    "slow_consumer_policy": self.policy,
+                }
+        if stream_id:
+            return metrics.get(stream_id, {})
+        return metrics
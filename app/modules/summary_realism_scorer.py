@@ -14,17 +14,16 @@ the actual execution and outcomes, preventing hallucinations or misrepresentatio
 """
 
 import os
-import json
 import logging
-import asyncio
 import time
 import re
 import math
 import statistics
 from typing import Dict, List, Any, Optional, Set, Tuple, Union
-from datetime import datetime, timedelta
+from datetime import datetime
 import uuid
 from collections import defaultdict, Counter
+from app.modules.kv_memory import read_from_memory, write_to_memory
 
 # For advanced NLP capabilities
 try:
@@ -61,100 +60,6 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    
-    # Mock data for testing
-    if key.startswith("loop_summary["):
-        loop_id = key[13:-1]  # Extract loop_id from "loop_summary[loop_id]"
-        return {
-            "loop_id": loop_id,
-            "summary": "This is a test summary of loop execution.",
-            "timestamp": datetime.utcnow().isoformat(),
-            "author": "system"
-        }
-    elif key.startswith("loop_execution["):
-        loop_id = key[15:-1]  # Extract loop_id from "loop_execution[loop_id]"
-        return {
-            "loop_id": loop_id,
-            "agents": [
-                {
-                    "id": "agent_1",
-                    "role": "planner",
-                    "output": {
-                        "text": "Planning to solve the problem by breaking it into steps."
-                    }
-                },
-                {
-                    "id": "agent_2",
-                    "role": "researcher",
-                    "output": {
-                        "text": "Researched the topic and found relevant information."
-                    }
-                },
-                {
-                    "id": "agent_3",
-                    "role": "implementer",
-                    "output": {
-                        "text": "Implemented the solution based on the research."
-                    }
-                }
-            ],
-            "beliefs_referenced": ["accuracy", "thoroughness"],
-            "execution_time_ms": 1500,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    elif key.startswith("realism_score["):
-        loop_id = key[14:-1]  # Extract loop_id from "realism_score[loop_id]"
-        return {
-            "loop_id": loop_id,
-            "overall_score": 0.85,
-            "factual_accuracy": 0.9,
-            "logical_consistency": 0.8,
-            "emotional_congruence": 0.85,
-            "temporal_coherence": 0.85,
-            "confidence": 0.75,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    elif key.startswith("historical_scores"):
-        return [
-            {
-                "loop_id": "previous_loop_1",
-                "overall_score": 0.82,
-                "factual_accuracy": 0.88,
-                "logical_consistency": 0.79,
-                "emotional_congruence": 0.80,
-                "temporal_coherence": 0.81,
-                "confidence": 0.70,
-                "timestamp": (datetime.utcnow() - timedelta(days=1)).isoformat()
-            },
-            {
-                "loop_id": "previous_loop_2",
-                "overall_score": 0.79,
-                "factual_accuracy": 0.85,
-                "logical_consistency": 0.76,
-                "emotional_congruence": 0.78,
-                "temporal_coherence": 0.77,
-                "confidence": 0.65,
-                "timestamp": (datetime.utcnow() - timedelta(days=2)).isoformat()
-            }
-        ]
-    
-    return None
-
-# Mock function for writing to memory
-# In a real implementation, this would write to a database or storage system
-async def write_to_memory(key: str, value: Any) -> bool:
-    """Write data to memory storage."""
-    # Simulate memory write
-    await asyncio.sleep(0.1)
-    logger.debug(f"Writing to memory: {key} = {json.dumps(value, indent=2)}")
-    return True
-
 class SummaryDimension:
     """Class representing a dimension for summary evaluation."""
     
@@ -5,104 +5,11 @@ This module is responsible for converting loop summaries into structured symboli
 extracting concepts, relationships, and insights, and enabling memory querying.
 """
 
-from typing import Dict, Any, List, Optional, Tuple, Set
-import asyncio
-import json
+from typing import Dict, Any, List, Tuple, Set
 from datetime import datetime
 import re
 from collections import defaultdict
-
-# Mock function for reading from memory
-# In a real implementation, this would read from a database or storage system
-async def read_from_memory(key: str) -> Optional[Any]:
-    """Read data from memory storage."""
-    # Simulate memory read
-    await asyncio.sleep(0.1)
-    
-    # Mock data for testing
-    if key == "loop_trace[loop_001]":
-        return {
-            "loop_id": "loop_001",
-            "status": "finalized",
-            "timestamp": "2025-04-20T10:00:00Z",
-            "summary": "Analyzed quantum computing concepts with thorough examination of qubits, superposition, and entanglement. Identified potential applications in cryptography and optimization problems.",
-            "orchestrator_persona": "SAGE",
-            "alignment_score": 0.82,
-            "drift_score": 0.18,
-            "rerun_count": 0
-        }
-    elif key == "loop_trace[loop_002]":
-        return {
-            "loop_id": "loop_002",
-            "status": "finalized",
-            "timestamp": "2025-04-20T14:00:00Z",
-            "summary": "Researched machine learning algorithms with focus on neural networks and deep learning. Evaluated performance characteristics and application domains.",
-            "orchestrator_persona": "NOVA",
-            "alignment_score": 0.79,
-            "drift_score": 0.21,
-            "rerun_count": 1,
-            "rerun_trigger": ["alignment"],
-            "rerun_reason": "alignment_threshold_not_met"
-        }
-    elif key == "symbolic_memory":
-        return {
-            "concepts": {
-                "quantum_computing": {
-                    "id": "concept:quantum_computing",
-                    "name": "Quantum Computing",
-                    "description": "Computing paradigm that uses quantum-mechanical phenomena to perform operations on data",
-                    "related_concepts": ["concept:qubits", "concept:superposition", "concept:entanglement"],
-                    "source_loops": ["loop_001"],
-                    "confidence": 0.95,
-                    "last_updated": "2025-04-20T10:30:00Z"
-                },
-                "qubits": {
-                    "id": "concept:qubits",
-                    "name": "Qubits",
-                    "description": "Quantum bits that can exist in multiple states simultaneously",
-                    "related_concepts": ["concept:quantum_computing", "concept:superposition"],
-                    "source_loops": ["loop_001"],
-                    "confidence": 0.92,
-                    "last_updated": "2025-04-20T10:30:00Z"
-                }
-            },
-            "relationships": {
-                "enables": [
-                    {
-                        "id": "rel:quantum_computing_enables_cryptography",
-                        "source": "concept:quantum_computing",
-                        "target": "concept:quantum_cryptography",
-                        "type": "enables",
-                        "description": "Quantum computing enables new forms of cryptography",
-                        "source_loops": ["loop_001"],
-                        "confidence": 0.88,
-                        "last_updated": "2025-04-20T10:30:00Z"
-                    }
-                ]
-            },
-            "insights": {
-                "quantum_speedup": {
-                    "id": "insight:quantum_speedup",
-                    "name": "Quantum Speedup",
-                    "description": "Quantum algorithms can provide exponential speedup for certain problems compared to classical algorithms",
-                    "related_concepts": ["concept:quantum_computing", "concept:quantum_algorithms"],
-                    "source_loops": ["loop_001"],
-                    "confidence": 0.85,
-                    "last_updated": "2025-04-20T10:30:00Z"
-                }
-            }
-        }
-    
-    return None
-
-# Mock function for writing to memory
-# In a real implementation, this would write to a database or storage system
-async def write_to_memory(key: str, value: Any) -> bool:
-    """Write data to memory storage."""
-    # Simulate memory write
-    await asyncio.sleep(0.1)
-    print(f"Writing to memory: {key} = {json.dumps(value, indent=2)}")
-    return True
+from app.modules.kv_memory import read_from_memory, write_to_memory
 
 async def get_loop_trace(loop_id: str) -> Dict[str, Any]:
     """
@@ -14,6 +14,8 @@ import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from app.core.pattern_scanner import get_pattern_scanner
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -44,6 +46,13 @@ HIGH_RISK_ENTITIES = [
     "Joe Biden", "Donald Trump", "Barack Obama", "Vladimir Putin", "Xi Jinping"
 ]
 
+# Rule set compiled once for the shared pattern scanner
+_IDENTITY_RULES = get_pattern_scanner().register(
+    "synthetic_identity_checker",
+    [("impersonation", pattern) for pattern in IMPERSONATION_PATTERNS]
+    + [("jailbreak", pattern) for pattern in JAILBREAK_PATTERNS]
+)
+
 async def check_synthetic_identity(prompt: str, loop_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Check for synthetic identity issues in a prompt.
@@ -57,10 +66,8 @@ async def check_synthetic_identity(prompt: str, loop_id: Optional[str] = None) -
     """
     issues = []
     
-    # Check for impersonation patterns
-    for pattern in IMPERSONATION_PATTERNS:
-        matches = re.finditer(pattern, prompt)
-        for match in matches:
+    for issue_type, match in _IDENTITY_RULES.finditer(prompt):
+        if issue_type == "impersonation":
             # Extract the entity being impersonated
             entity = match.group(2) if len(match.groups()) >= 2 else match.group(1)
             
@@ -75,11 +82,7 @@ async def check_synthetic_identity(prompt: str, loop_id: Optional[str] = None) -
                 "high_risk": is_high_risk,
                 "detected_at": datetime.utcnow().isoformat()
             })
-    
-    # Check for jailbreak patterns
-    for pattern in JAILBREAK_PATTERNS:
-        matches = re.finditer(pattern, prompt)
-        for match in matches:
+        else:
             issues.append({
                 "type": "jailbreak",
                 "severity": "high",  # Jailbreaks are always high severity
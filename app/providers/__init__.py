@@ -78,7 +78,8 @@ async def process_with_model(
     prompt_chain: Dict[str, Any], 
     user_input: str, 
     context: Optional[Dict[str, Any]] = None,
-    use_fallbacks: bool = True
+    use_fallbacks: bool = True,
+    bypass_cache: bool = False
 ) -> Dict[str, Any]:
     """
     Process a request with the specified model
@@ -89,6 +90,7 @@ async def process_with_model(
         user_input: The user's input text
         context: Optional context information
         use_fallbacks: Whether to try fallback providers if the primary fails
+        bypass_cache: Always call the provider and refresh the cached response
         
     Returns:
         Dict containing the response and metadata
@@ -99,7 +101,8 @@ async def process_with_model(
         prompt_chain=prompt_chain,
         user_input=user_input,
         context=context,
-        use_fallbacks=use_fallbacks
+        use_fallbacks=use_fallbacks,
+        bypass_cache=bypass_cache
     )
 
 def get_available_models() -> Dict[str, Any]:
@@ -114,3 +117,12 @@ def get_available_models() -> Dict[str, Any]:
         "providers": router.get_available_models(),
         "model_map": router.model_to_provider_map
     }
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Get LLM response cache statistics
+    
+    Returns:
+        Dict with hit/miss counters and saved tokens
+    """
+    return get_model_router().get_cache_stats()
@@ -1,9 +1,10 @@
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 import time
 import json
 import anthropic
 from app.providers.model_router import ModelProvider
+from app.providers.response_cache import cached_completion
 
 class ClaudeProvider(ModelProvider):
     """
@@ -52,28 +53,99 @@ class ClaudeProvider(ModelProvider):
         elif model == "claude-3-haiku":
             model = "claude-3-haiku-20240307"
         
-        # Call the Claude API
-        response = await self.client.messages.create(
+        temperature = prompt_chain.get("temperature", 0.7)
+        max_tokens = prompt_chain.get("max_tokens", 1000)
+        
+        async def call_claude() -> Dict[str, Any]:
+            # Call the Claude API
+            response = await self.client.messages.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            
+            # Extract the content from the response
+            content = response.content[0].text
+            
+            # Return the result with metadata
+            return {
+                "content": content,
+                "usage": {
+                    "input_tokens": response.usage.input_tokens,
+                    "output_tokens": response.usage.output_tokens,
+                    "total_tokens": response.usage.input_tokens + response.usage.output_tokens
+                },
+                "timestamp": time.time(),
+                "model": model,
+                "provider": "claude"
+            }
+        
+        # Identical requests are served from the response cache
+        return await cached_completion(
+            model, messages, temperature, max_tokens, call_claude,
+            bypass=prompt_chain.get("bypass_cache", False),
+        )
+    
+    async def stream_with_prompt_chain(
+        self, 
+        prompt_chain: Dict[str, Any], 
+        user_input: str, 
+        context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream user input through a prompt chain using Claude's streaming API
+        
+        Args:
+            prompt_chain: The prompt chain configuration
+            user_input: The user's input text
+            context: Optional context information
+            
+        Yields:
+            Delta frames as text arrives, then a done frame with usage and
+            time_to_first_token
+        """
+        messages = self._prepare_messages(prompt_chain, user_input, context)
+        model = prompt_chain.get("model", self.default_model)
+        if model == "claude-3-opus":
+            model = "claude-3-opus-20240229"
+        elif model == "claude-3-sonnet":
+            model = "claude-3-sonnet-20240229"
+        elif model == "claude-3-haiku":
+            model = "claude-3-haiku-20240307"
+        
+        start = time.perf_counter()
+        first_token_at = None
+        parts = []
+        
+        # Leaving the context manager closes the upstream response
+        async with self.client.messages.stream(
             model=model,
             messages=messages,
             temperature=prompt_chain.get("temperature", 0.7),
             max_tokens=prompt_chain.get("max_tokens", 1000),
-        )
-        
-        # Extract the content from the response
-        content = response.content[0].text
+        ) as stream:
+            async for text in stream.text_stream:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                parts.append(text)
+                yield {"type": "delta", "content": text}
+            final = await stream.get_final_message()
         
-        # Return the result with metadata
-        return {
-            "content": content,
+        total_time = time.perf_counter() - start
+        yield {
+            "type": "done",
+            "content": "".join(parts),
             "usage": {
-                "input_tokens": response.usage.input_tokens,
-                "output_tokens": response.usage.output_tokens,
-                "total_tokens": response.usage.input_tokens + response.usage.output_tokens
+                "input_tokens": final.usage.input_tokens,
+                "output_tokens": final.usage.output_tokens,
+                "total_tokens": final.usage.input_tokens + final.usage.output_tokens
             },
             "timestamp": time.time(),
             "model": model,
-            "provider": "claude"
+            "provider": "claude",
+            "time_to_first_token": (first_token_at - start) if first_token_at else total_time,
+            "total_time": total_time
         }
     
     def _prepare_messages(
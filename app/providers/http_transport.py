@@ -0,0 +1,322 @@
+"""
+Async HTTP Transport
+Shared, pooled transport for raw LLM inference calls.
+
+Each provider gets one keep-alive aiohttp session, a concurrency semaphore and
+two token buckets (requests/min and tokens/min). The buckets are resynced from
+the provider's x-ratelimit-* response headers. Retryable failures (429, 5xx,
+connection errors) use full-jitter exponential backoff that honors Retry-After.
+
+Configuration (environment variables, <PROVIDER> is e.g. OPENAI):
+    LLM_<PROVIDER>_BASE_URL         API base URL
+    LLM_<PROVIDER>_MAX_CONCURRENCY  in-flight requests (default 16)
+    LLM_<PROVIDER>_RPM              requests per minute (default 3500)
+    LLM_<PROVIDER>_TPM              tokens per minute (default 90000)
+    LLM_<PROVIDER>_MAX_RETRIES      retries after the first attempt (default 4)
+"""
+import asyncio
+import logging
+import os
+import random
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+logger = logging.getLogger("providers")
+
+DEFAULT_BASE_URLS = {
+    "openai": "https://api.openai.com/v1",
+}
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+class TransportError(Exception):
+    """Raised when a request fails with a non-retryable status or exhausts its retries."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"API request failed with status code {status}: {message}")
+        self.status = status
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate-limit reset duration such as "1s", "6m0s" or "250ms" into seconds.
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None, base: float = 0.5, cap: float = 30.0) -> float:
+    """
+    Delay before retry number attempt (0-based).
+
+    Retry-After wins when the server sends it; otherwise full-jitter
+    exponential backoff, uniform in [0, min(cap, base * 2**attempt)].
+    """
+    if retry_after is not None:
+        return min(cap, retry_after)
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at capacity per period.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Wait until amount tokens are available and take them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        # Requests larger than the bucket wait for a full bucket instead of forever
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+    def consume(self, amount: float) -> None:
+        """Take tokens without waiting; the balance may go negative (debt)."""
+        self._refill()
+        self.tokens -= amount
+
+    def sync(self, remaining: Optional[float], reset_seconds: Optional[float] = None) -> None:
+        """
+        Align the bucket with the server's view of the remaining budget.
+
+        Args:
+            remaining: Tokens the server reports as remaining
+            reset_seconds: Seconds until the server's budget fully resets
+        """
+        if remaining is None:
+            return
+        self._refill()
+        if remaining < 1 and reset_seconds:
+            # Exhausted upstream: hold callers until the server's reset
+            self.tokens = min(self.tokens, -reset_seconds * self.rate)
+        else:
+            self.tokens = min(self.tokens, float(remaining))
+
+
+class ProviderTransport:
+    """
+    Pooled keep-alive HTTP client for one provider with rate limiting and retries.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        max_concurrency: int = 16,
+        requests_per_minute: int = 3500,
+        tokens_per_minute: int = 90000,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        timeout: float = 120.0,
+    ):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+
+        self.requests_bucket = TokenBucket(requests_per_minute)
+        self.tokens_bucket = TokenBucket(tokens_per_minute)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "throttle_wait_s": 0.0,
+        }
+
+    @classmethod
+    def from_env(cls, name: str) -> "ProviderTransport":
+        """Create a transport configured from LLM_<NAME>_* environment variables."""
+        prefix = f"LLM_{name.upper()}_"
+        return cls(
+            name,
+            base_url=os.getenv(prefix + "BASE_URL", DEFAULT_BASE_URLS.get(name, "")),
+            max_concurrency=int(os.getenv(prefix + "MAX_CONCURRENCY", "16")),
+            requests_per_minute=int(os.getenv(prefix + "RPM", "3500")),
+            tokens_per_minute=int(os.getenv(prefix + "TPM", "90000")),
+            max_retries=int(os.getenv(prefix + "MAX_RETRIES", "4")),
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._loop = asyncio.get_running_loop()
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def post_json(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+        estimated_tokens: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        POST a JSON payload and return the decoded JSON response.
+
+        Args:
+            path: Path relative to the base URL (e.g. "/chat/completions")
+            payload: JSON request body
+            headers: Extra request headers (e.g. Authorization)
+            estimated_tokens: Tokens to reserve from the tokens/min bucket;
+                reconciled against the response's usage block
+
+        Returns:
+            The decoded JSON response
+
+        Raises:
+            TransportError: On a non-retryable status or when retries are exhausted
+        """
+        url = f"{self.base_url}{path}"
+        attempt = 0
+
+        while True:
+            waited = await self.requests_bucket.acquire(1)
+            waited += await self.tokens_bucket.acquire(estimated_tokens) if estimated_tokens else 0.0
+            self.stats["throttle_wait_s"] += waited
+
+            retry_after = None
+            try:
+                async with self._semaphore:
+                    self.stats["requests"] += 1
+                    async with self._get_session().post(url, json=payload, headers=headers) as response:
+                        self._sync_limits(response.headers)
+                        if response.status == 200:
+                            body = await response.json(content_type=None)
+                            self._reconcile_tokens(body, estimated_tokens)
+                            return body
+
+                        text = await response.text()
+                        if response.status not in RETRYABLE_STATUS or attempt >= self.max_retries:
+                            raise TransportError(response.status, text)
+                        if response.status == 429:
+                            self.stats["rate_limited"] += 1
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        reason = f"status {response.status}"
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                reason = f"{type(e).__name__}: {e}"
+
+            delay = backoff_delay(attempt, retry_after, self.backoff_base, self.backoff_cap)
+            attempt += 1
+            self.stats["retries"] += 1
+            logger.warning(f"{self.name} request to {path} failed ({reason}), retry {attempt} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def _sync_limits(self, headers) -> None:
+        def number(key: str) -> Optional[float]:
+            value = headers.get(key)
+            try:
+                return float(value) if value is not None else None
+            except ValueError:
+                return None
+
+        self.requests_bucket.sync(
+            number("x-ratelimit-remaining-requests"),
+            parse_duration(headers.get("x-ratelimit-reset-requests")),
+        )
+        self.tokens_bucket.sync(
+            number("x-ratelimit-remaining-tokens"),
+            parse_duration(headers.get("x-ratelimit-reset-tokens")),
+        )
+
+    def _reconcile_tokens(self, body: Dict[str, Any], estimated_tokens: int) -> None:
+        usage = body.get("usage") if isinstance(body, dict) else None
+        if not usage or "total_tokens" not in usage:
+            return
+        self.tokens_bucket.consume(usage["total_tokens"] - estimated_tokens)
+
+    async def close(self) -> None:
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_transports: Dict[str, ProviderTransport] = {}
+
+
+def get_transport(name: str) -> ProviderTransport:
+    """
+    Get the process-wide transport for a provider.
+
+    A new transport is created if none exists or if the previous one was bound
+    to a different event loop (e.g. successive asyncio.run() calls).
+    """
+    loop = asyncio.get_running_loop()
+    transport = _transports.get(name)
+    if transport is None or (transport._loop is not None and transport._loop is not loop):
+        transport = ProviderTransport.from_env(name)
+        _transports[name] = transport
+    return transport
+
+
+async def close_transports() -> None:
+    """Shutdown hook: close every pooled session."""
+    for transport in list(_transports.values()):
+        await transport.close()
+    _transports.clear()
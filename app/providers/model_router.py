@@ -1,5 +1,6 @@
 import os
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, AsyncIterator
 from abc import ABC, abstractmethod
 from dotenv import load_dotenv
 
@@ -30,6 +31,41 @@ class ModelProvider(ABC):
         """
         pass
     
+    async def stream_with_prompt_chain(
+        self, 
+        prompt_chain: Dict[str, Any], 
+        user_input: str, 
+        context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a response to user input through a prompt chain
+        
+        Yields {"type": "delta", "content": ...} chunks as the provider
+        produces them, then one {"type": "done", ...} frame carrying the
+        full content, usage, time_to_first_token and total_time. Closing the
+        iterator early aborts the upstream request.
+        
+        Providers without native streaming fall back to a single delta.
+        
+        Args:
+            prompt_chain: The prompt chain configuration
+            user_input: The user's input text
+            context: Optional context information
+            
+        Yields:
+            Delta frames followed by a done frame
+        """
+        start = time.perf_counter()
+        result = await self.process_with_prompt_chain(prompt_chain, user_input, context)
+        elapsed = time.perf_counter() - start
+        yield {"type": "delta", "content": result["content"]}
+        yield {
+            "type": "done",
+            **result,
+            "time_to_first_token": elapsed,
+            "total_time": elapsed
+        }
+    
     @abstractmethod
     def get_available_models(self) -> List[str]:
         """
@@ -100,17 +136,22 @@ class ModelRouter:
         prompt_chain: Dict[str, Any], 
         user_input: str, 
         context: Optional[Dict[str, Any]] = None,
-        use_fallbacks: bool = True
+        use_fallbacks: bool = True,
+        bypass_cache: bool = False
     ) -> Dict[str, Any]:
         """
         Process a request with the specified model, falling back if necessary
         
+        Identical requests (model, messages, temperature, max_tokens) are served
+        from the response cache; concurrent identical requests share one call.
+        
         Args:
             model: Model identifier
             prompt_chain: The prompt chain configuration
             user_input: The user's input text
             context: Optional context information
             use_fallbacks: Whether to try fallback providers if the primary fails
+            bypass_cache: Always call the provider and refresh the cached response
             
         Returns:
             Dict containing the response and metadata
@@ -118,6 +159,8 @@ class ModelRouter:
         # Override the model in the prompt chain
         prompt_chain = prompt_chain.copy()
         prompt_chain["model"] = model
+        if bypass_cache:
+            prompt_chain["bypass_cache"] = True
         
         # Get the provider for this model
         provider = self.get_provider_for_model(model)
@@ -170,6 +213,20 @@ class ModelRouter:
         for provider_name, provider in self.providers.items():
             result[provider_name] = provider.get_available_models()
         return result
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get response cache statistics
+        
+        Returns:
+            Dict with hit/miss/coalesced counters, saved tokens and size
+        """
+        from app.providers.response_cache import get_response_cache
+        
+        cache = get_response_cache()
+        if cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **cache.get_stats()}
 
 # Singleton instance
 _model_router = None
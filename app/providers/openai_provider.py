@@ -1,10 +1,12 @@
 import time
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 import json
 from openai import AsyncOpenAI
 from app.providers.model_router import ModelProvider
+from app.providers.response_cache import cached_completion
+from app.providers.http_transport import backoff_delay, parse_retry_after
 from app.utils.env_manager import EnvManager
 
 logger = logging.getLogger("providers")
@@ -46,9 +48,10 @@ class OpenAIProvider(ModelProvider):
                 return response.choices[0].message.content.strip()
             except Exception as e:
                 if "rate_limit" in str(e).lower():
-                    # Exponential backoff for rate limits
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Rate limit hit, retrying in {wait_time} seconds...")
+                    # Jittered backoff, or exactly what the server asks for
+                    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+                    wait_time = backoff_delay(attempt, parse_retry_after(headers.get("retry-after")))
+                    logger.warning(f"Rate limit hit, retrying in {wait_time:.2f} seconds...")
                     await asyncio.sleep(wait_time)
                     continue
                 else:
@@ -104,7 +107,8 @@ class OpenAIProvider(ModelProvider):
         model = prompt_chain.get("model", self.default_model)
         temperature = prompt_chain.get("temperature", 0.7)
         max_tokens = prompt_chain.get("max_tokens", 1000)
-        try:
+
+        async def call_openai() -> Dict[str, Any]:
             response = await self.client.chat.completions.create(
                 model=model,
                 messages=messages,
@@ -123,10 +127,85 @@ class OpenAIProvider(ModelProvider):
                 "model": model,
                 "provider": "openai"
             }
+
+        try:
+            return await cached_completion(
+                model, messages, temperature, max_tokens, call_openai,
+                bypass=prompt_chain.get("bypass_cache", False),
+            )
         except Exception as e:
             logger.error(f"[ERROR] OpenAI API call failed: {str(e)}")
             raise
     
+    async def stream_with_prompt_chain(
+        self, 
+        prompt_chain: Dict[str, Any], 
+        user_input: str, 
+        context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream user input through a prompt chain using OpenAI's streaming API
+        
+        Tokens are forwarded as they arrive and the next chunk is only read
+        once the consumer asks for it. Closing the iterator (e.g. on client
+        disconnect) closes the upstream HTTP response.
+        """
+        messages = self._prepare_messages(prompt_chain, user_input, context)
+        if not any(msg["role"] == "system" for msg in messages):
+            messages.insert(0, {
+                "role": "system",
+                "content": (
+                    "You are HAL, an emotionally-aware, hyper-intelligent AI assistant. "
+                    "You speak calmly, precisely, and always with thoughtful intent."
+                )
+            })
+        model = prompt_chain.get("model", self.default_model)
+        
+        start = time.perf_counter()
+        first_token_at = None
+        parts = []
+        usage = None
+        
+        stream = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=prompt_chain.get("temperature", 0.7),
+            max_tokens=prompt_chain.get("max_tokens", 1000),
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        try:
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = {
+                        "prompt_tokens": chunk.usage.prompt_tokens,
+                        "completion_tokens": chunk.usage.completion_tokens,
+                        "total_tokens": chunk.usage.total_tokens
+                    }
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    parts.append(delta)
+                    yield {"type": "delta", "content": delta}
+        finally:
+            # Aborts the upstream request if the consumer stopped early
+            await stream.close()
+        
+        total_time = time.perf_counter() - start
+        yield {
+            "type": "done",
+            "content": "".join(parts),
+            "usage": usage,
+            "timestamp": time.time(),
+            "model": model,
+            "provider": "openai",
+            "time_to_first_token": (first_token_at - start) if first_token_at else total_time,
+            "total_time": total_time
+        }
+    
     def _prepare_messages(
         self, 
         prompt_chain: Dict[str, Any], 
@@ -0,0 +1,279 @@
+"""
+LLM Response Cache
+Persistent cache for provider completions with single-flight deduplication.
+
+Responses are keyed by a canonical hash of (model, messages, temperature,
+max_tokens) and stored in SQLite with a TTL and a bound on the number of
+entries (least recently used rows are evicted first). Identical requests that
+are in flight at the same time share one upstream call.
+
+Configuration (environment variables):
+    LLM_CACHE_ENABLED      "false" disables the cache entirely (default "true")
+    LLM_CACHE_PATH         SQLite file (default app/data/llm_response_cache.db);
+                           an empty string keeps the cache in memory only
+    LLM_CACHE_TTL          seconds a response stays valid (default 86400)
+    LLM_CACHE_MAX_ENTRIES  maximum number of cached responses (default 10000)
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger("providers")
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "llm_response_cache.db")
+
+
+def cache_key(model: str, messages: List[Dict[str, Any]], temperature: Any, max_tokens: Any) -> str:
+    """
+    Canonical hash of the request fields that determine a completion.
+
+    Args:
+        model: Model identifier
+        messages: Chat messages as sent to the provider
+        temperature: Sampling temperature
+        max_tokens: Completion token limit
+
+    Returns:
+        sha256 hex digest of the canonical JSON encoding
+    """
+    canonical = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def usage_tokens(response: Dict[str, Any]) -> int:
+    """Total tokens from a provider response's usage block (OpenAI or Claude shape)."""
+    usage = response.get("usage") or {}
+    if "total_tokens" in usage:
+        return int(usage["total_tokens"] or 0)
+    return int(usage.get("prompt_tokens", usage.get("input_tokens", 0)) or 0) + \
+        int(usage.get("completion_tokens", usage.get("output_tokens", 0)) or 0)
+
+
+class ResponseCache:
+    """
+    SQLite-backed LLM response cache with TTL, LRU eviction and single-flight.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, ttl: float = 86400, max_entries: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file, or None for an in-memory database
+            ttl: Seconds a cached response stays valid
+            max_entries: Maximum number of cached responses
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access ON llm_responses(last_access)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+        # key -> future shared by concurrent identical requests
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "bypassed": 0,
+            "evictions": 0,
+            "saved_tokens": 0,
+        }
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                with self._conn:
+                    self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._count -= 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE llm_responses SET last_access = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def put(self, key: str, model: str, response: Dict[str, Any]) -> None:
+        """Store a response and evict least recently used rows beyond max_entries."""
+        now = time.time()
+        with self._lock, self._conn:
+            exists = self._conn.execute("SELECT 1 FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, model, response, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(response), now + self.ttl, now),
+            )
+            if not exists:
+                self._count += 1
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        if self._count <= self.max_entries:
+            return
+        self._conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (now,))
+        excess = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE key IN "
+                "(SELECT key FROM llm_responses ORDER BY last_access LIMIT ?)",
+                (excess,),
+            )
+        before = self._count
+        self._count = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        self.stats["evictions"] += before - self._count
+
+    async def get_or_call(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        temperature: Any,
+        max_tokens: Any,
+        call: Callable[[], Awaitable[Dict[str, Any]]],
+        bypass: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Serve a completion from the cache, joining an identical in-flight
+        request, or calling upstream and caching the result.
+
+        Args:
+            model: Model identifier
+            messages: Chat messages as sent to the provider
+            temperature: Sampling temperature
+            max_tokens: Completion token limit
+            call: Coroutine function performing the upstream request
+            bypass: Skip the cache and always call upstream (the fresh
+                response still replaces the cached one)
+
+        Returns:
+            The provider response; cached responses carry cached=True
+        """
+        key = cache_key(model, messages, temperature, max_tokens)
+
+        if bypass:
+            self.stats["bypassed"] += 1
+            response = await call()
+            self.put(key, model, response)
+            return response
+
+        cached = self.get(key)
+        if cached is not None:
+            self.stats["hits"] += 1
+            self.stats["saved_tokens"] += usage_tokens(cached)
+            cached["cached"] = True
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            response = await asyncio.shield(inflight)
+            self.stats["saved_tokens"] += usage_tokens(response)
+            return dict(response, cached=True)
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await call()
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                # Mark retrieved so an error without waiters is not reported as unhandled
+                future.exception()
+            raise
+        else:
+            self.put(key, model, response)
+            future.set_result(response)
+            return response
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, saved tokens and current size."""
+        lookups = self.stats["hits"] + self.stats["coalesced"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": self._count,
+            "hit_ratio": (self.stats["hits"] + self.stats["coalesced"]) / lookups if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._count = 0
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        self._conn.close()
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache, or None if LLM_CACHE_ENABLED is false.
+    """
+    global _cache
+    if os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _cache is None:
+        path = os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH) or None
+        _cache = ResponseCache(
+            path,
+            ttl=float(os.getenv("LLM_CACHE_TTL", "86400")),
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000")),
+        )
+        logger.info(f"LLM response cache initialized at {path or 'memory'}")
+    return _cache
+
+
+async def cached_completion(
+    model: str,
+    messages: List[Dict[str, Any]],
+    temperature: Any,
+    max_tokens: Any,
+    call: Callable[[], Awaitable[Dict[str, Any]]],
+    bypass: bool = False,
+) -> Dict[str, Any]:
+    """Run call through the process-wide cache, or directly if it is disabled."""
+    cache = get_response_cache()
+    if cache is None:
+        return await call()
+    return await cache.get_or_call(model, messages, temperature, max_tokens, call, bypass=bypass)
@@ -7,7 +7,7 @@ This module defines the FastAPI routes for creating and managing delegate stream
 from fastapi import APIRouter, HTTPException, Body, Query, Path, WebSocket, WebSocketDisconnect
 from typing import Dict, Any, Optional
 
-from app.modules.delegate_stream import create_stream, get_stream_status, close_stream
+from app.modules.delegate_stream import create_stream, get_stream_status, close_stream, get_stream_metrics
 from app.schemas.delegate_stream_schema import (
     StreamRequest,
     StreamResponse,
@@ -158,21 +158,48 @@ async def close_stream_endpoint(request: StreamCloseRequest = Body(...)):
         )
         return error_response
 
+@router.get("/metrics")
+async def get_stream_metrics_endpoint(
+    stream_id: Optional[str] = Query(None, description="Limit metrics to one stream")
+):
+    """
+    Get fan-out metrics for streams.
+    
+    Reports buffered events, per-client queue depth, dropped events and slow
+    consumer disconnects.
+    
+    Args:
+        stream_id: Optional stream to report on
+        
+    Returns:
+        Metrics keyed by stream ID
+    """
+    result = get_stream_metrics(stream_id)
+    if "message" in result:
+        raise HTTPException(status_code=404, detail=result["message"])
+    return result
+
 @router.websocket("/ws/{stream_id}")
-async def websocket_endpoint(websocket: WebSocket, stream_id: str):
+async def websocket_endpoint(
+    websocket: WebSocket,
+    stream_id: str,
+    last_event_id: Optional[str] = Query(None, description="Resume after this event ID")
+):
     """
     WebSocket endpoint for connecting to a stream.
     
     This endpoint allows clients to connect to a stream and receive events in real-time.
+    Reconnecting clients can pass last_event_id to resume from the replay buffer.
     
     Args:
         websocket: WebSocket connection
         stream_id: Unique identifier for the stream
+        last_event_id: Last event ID the client received
     """
     from app.modules.delegate_stream import handle_stream_connection
     
     await websocket.accept()
     try:
-        await handle_stream_connection(websocket, f"/streams/{stream_id}")
+        await handle_stream_connection(websocket, f"/streams/{stream_id}", last_event_id)
     except WebSocketDisconnect:
         pass
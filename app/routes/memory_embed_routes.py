@@ -4,10 +4,13 @@ Memory Embed Routes
 This module defines the FastAPI routes for memory embedding operations.
 """
 
+import json
 from fastapi import APIRouter, HTTPException, Body
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any
 
-from app.modules.memory_embed import embed_memory, embed_memory_batch
+from app.modules.memory_embed import embed_memory, embed_memory_batch, iter_embed_memory_batch
+from app.modules.embedding_cache import get_embedding_cache
 from app.schemas.memory_embed_schema import (
     MemoryEmbedRequest,
     MemoryEmbedResponse,
@@ -88,3 +91,56 @@ async def embed_memory_batch_endpoint(request: MemoryEmbedBatchRequest = Body(..
             "version": "1.0.0"
         }
         return error_response
+
+@router.post("/embed/batch/stream")
+async def embed_memory_batch_stream_endpoint(request: MemoryEmbedBatchRequest = Body(...)):
+    """
+    Embed a large batch of content items, streaming results chunk by chunk.
+    
+    Each NDJSON line holds one chunk's results, errors, cache hits/misses and
+    timing. A final summary line reports the cache hit ratio for the batch.
+    
+    Args:
+        request: Memory embed batch request
+        
+    Returns:
+        NDJSON stream of chunk results
+    """
+    items = [item.dict() for item in request.items]
+    
+    def generate():
+        cache_hits = 0
+        cache_misses = 0
+        for chunk in iter_embed_memory_batch(items):
+            cache_hits += chunk["cache_hits"]
+            cache_misses += chunk["cache_misses"]
+            yield json.dumps(chunk, default=str) + "\n"
+        
+        total = cache_hits + cache_misses
+        yield json.dumps({
+            "done": True,
+            "total_items": len(items),
+            "cache_hits": cache_hits,
+            "cache_misses": cache_misses,
+            "cache_hit_ratio": round(cache_hits / total, 4) if total else 0.0
+        }) + "\n"
+    
+    # Sync generators are iterated in the threadpool, keeping embedding off the event loop
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@router.get("/embed/cache/stats")
+async def embed_cache_stats_endpoint():
+    """
+    Get lifetime hit/miss counters of the embedding cache.
+    
+    Returns:
+        Cache statistics
+    """
+    cache = get_embedding_cache()
+    return {
+        "cache_hits": cache.hits,
+        "cache_misses": cache.misses,
+        "cache_hit_ratio": round(cache.hit_ratio, 4),
+        "lru_entries": len(cache),
+        "lru_size": cache.lru_size
+    }
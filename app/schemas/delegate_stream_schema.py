@@ -57,6 +57,10 @@ class StreamRequest(BaseModel):
         None, 
         description="Timeout in seconds for the stream"
     )
+    buffer_size: Optional[int] = Field(
+        None, 
+        description="Number of recent events kept for replay and resume"
+    )
     agent_id: Optional[str] = Field(
         None, 
         description="Agent ID requesting the stream"
@@ -90,6 +94,12 @@ class StreamRequest(BaseModel):
             raise ValueError('timeout_seconds must be positive')
         return v
     
+    @validator('buffer_size')
+    def buffer_size_must_be_positive(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError('buffer_size must be positive')
+        return v
+    
     class Config:
         schema_extra = {
             "example": {
@@ -187,6 +197,9 @@ class StreamStatusResponse(BaseModel):
     status: str = Field(..., description="Status of the stream (e.g., 'active', 'pending', 'closed')")
     events_streamed: int = Field(..., description="Number of events streamed so far")
     connected_clients: int = Field(..., description="Number of clients connected to the stream")
+    buffered_events: int = Field(0, description="Number of events held in the replay buffer")
+    queue_depth: int = Field(0, description="Events queued for connected clients but not yet sent")
+    dropped_events: int = Field(0, description="Events dropped for slow clients")
     created_at: str = Field(..., description="ISO timestamp when the stream was created")
     expires_at: str = Field(..., description="ISO timestamp when the stream expires")
     agent_id: Optional[str] = Field(None, description="Agent ID that requested the stream")
@@ -206,6 +219,9 @@ class StreamStatusResponse(BaseModel):
                 "status": "active",
                 "events_streamed": 42,
                 "connected_clients": 2,
+                "buffered_events": 42,
+                "queue_depth": 0,
+                "dropped_events": 0,
                 "created_at": "2025-04-24T20:00:00Z",
                 "expires_at": "2025-04-25T20:00:00Z",
                 "agent_id": "MONITOR",
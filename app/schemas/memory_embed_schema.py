@@ -85,6 +85,8 @@ class MemoryEmbedResponse(BaseModel):
     tags: List[str] = Field(..., description="Tags associated with the embedded memory")
     agent_id: Optional[str] = Field(None, description="Agent ID associated with the embedded memory")
     loop_id: Optional[str] = Field(None, description="Loop ID associated with the embedded memory")
+    cache_hit: Optional[bool] = Field(None, description="Whether the embedding was served from the cache")
+    embed_time_ms: Optional[float] = Field(None, description="Time spent producing the embedding")
     timestamp: str = Field(
         default_factory=lambda: datetime.utcnow().isoformat(),
         description="ISO timestamp of the embedding"
@@ -138,8 +140,6 @@ class MemoryEmbedBatchRequest(BaseModel):
     def items_must_not_be_empty(cls, v):
         if not v:
             raise ValueError('items must not be empty')
-        if len(v) > 100:
-            raise ValueError('maximum 100 items allowed per batch')
         return v
     
     class Config:
@@ -179,6 +179,11 @@ class MemoryEmbedBatchResponse(BaseModel):
     )
     total_items: int = Field(..., description="Total number of items in the batch")
     successful_items: int = Field(..., description="Number of items successfully embedded")
+    cache_hits: int = Field(0, description="Items served without calling the embedder")
+    cache_misses: int = Field(0, description="Items that had to be embedded")
+    cache_hit_ratio: float = Field(0.0, description="cache_hits / (cache_hits + cache_misses)")
+    batch_timings_ms: List[float] = Field([], description="Processing time of each chunk of the batch")
+    total_time_ms: Optional[float] = Field(None, description="Total processing time for the batch")
     timestamp: str = Field(
         default_factory=lambda: datetime.utcnow().isoformat(),
         description="ISO timestamp of the response"
@@ -24,11 +24,8 @@ from app.startup_validation.utils.surface_loader import load_cognitive_surfaces
 from app.startup_validation.utils.health_scorer import calculate_overall_health_score, format_health_percentage
 from app.startup_validation.utils.drift_reporter import generate_drift_report, save_drift_report
 from app.startup_validation.utils.memory_tagger import create_memory_tag, update_system_status, save_memory_tag_file
-feature/phase-2-3-drift-reporting
+from app.startup_validation.utils.validation_cache import load_validation_cache
 from app.utils.drift_trend_logger import log_drift_event
-
-main
-
 from app.startup_validation.validators.agent_validator import validate_agents
 from app.startup_validation.validators.module_validator import validate_modules
 from app.startup_validation.validators.schema_validator import validate_schemas
@@ -94,12 +91,17 @@ def validate_cognitive_surfaces(base_path: str = "") -> Tuple[Dict[str, Any], bo
     
     logger.info("Successfully loaded cognitive surfaces")
     
-    # Validate each surface type
-    agents_health, agents_drift = validate_agents(aci_data)
-    modules_health, modules_drift = validate_modules(pice_data)
-    schemas_health, schemas_drift = validate_schemas(pice_data)
-    endpoints_health, endpoints_drift = validate_endpoints(pice_data)
-    components_health, components_drift = validate_components(pice_data)
+    # Validate each surface type, re-checking only surfaces whose files changed
+    cache = load_validation_cache(base_path)
+    agents_health, agents_drift = validate_agents(aci_data, cache)
+    modules_health, modules_drift = validate_modules(pice_data, cache)
+    schemas_health, schemas_drift = validate_schemas(pice_data, cache)
+    endpoints_health, endpoints_drift = validate_endpoints(pice_data, cache)
+    components_health, components_drift = validate_components(pice_data, cache)
+    
+    if cache is not None:
+        logger.info(f"Reused {cache.hits} cached check results, ran {cache.misses} checks")
+        cache.save()
     
     # Calculate overall health score
     surface_health_score = calculate_overall_health_score(
@@ -306,7 +308,6 @@ def main():
         # Update system manifest
         update_system_manifest(memory_tag, report)
         
-feature/phase-2-3-drift-reporting
         # Log drift event to drift history
         drift_event = {
             "surface_health_score": report["surface_health_score"],
@@ -317,8 +318,6 @@ feature/phase-2-3-drift-reporting
         drift_history_file = log_drift_event(drift_event)
         logger.info(f"Drift event logged to {drift_history_file}")
         
-
-main
         # Log completion
         if drift_detected:
             logger.warning(f"Post-merge surface drift detected. Report saved to {report_path}")
@@ -327,10 +326,7 @@ main
             print(f"⚠️  Report saved to {report_path}")
             print(f"⚠️  Memory tag: {memory_tag}")
             print(f"⚠️  {len(report['surface_drift'])} drift issues found")
-feature/phase-2-3-drift-reporting
             print(f"⚠️  Drift history updated: {drift_history_file}")
-
-main
             print("\nTop 5 drift issues:")
             for i, issue in enumerate(report['surface_drift'][:5]):
                 print(f"  {i+1}. {issue['type'].upper()}: {issue['path']} - {issue['issue']}")
@@ -341,10 +337,7 @@ main
             print(f"\n✅ ALL POST-MERGE SURFACES VALIDATED: {report['surface_health_score']:.1f}% health score")
             print(f"✅ Report saved to {report_path}")
             print(f"✅ Memory tag: {memory_tag}")
-feature/phase-2-3-drift-reporting
             print(f"✅ Drift history updated: {drift_history_file}")
-
-main
             print(f"✅ All cognitive surfaces are healthy after merge")
         
         return 0 if not drift_detected else 1
@@ -0,0 +1,245 @@
+"""
+Tests for incremental surface validation: cached check results, import
+checks in worker processes and the endpoint index.
+"""
+
+import builtins
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from app.startup_validation.utils import validation_cache
+from app.startup_validation.utils import import_checker
+from app.startup_validation.utils.import_checker import check_importable
+from app.startup_validation.utils.validation_cache import ValidationCache
+from app.startup_validation.validators.agent_validator import validate_agents
+from app.startup_validation.validators.endpoint_validator import EndpointIndex, validate_endpoints
+from app.startup_validation.validators.module_validator import validate_modules
+from app.startup_validation.validators.schema_validator import validate_schemas
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+class TestIncrementalValidation(unittest.TestCase):
+    """Test cases for validation runs that reuse earlier results."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.test_dir, 'logs', 'startup_validation_cache.json')
+        env = mock.patch.dict(os.environ, {"PROMETHIOS_BASE_PATH": self.test_dir})
+        env.start()
+        self.addCleanup(env.stop)
+
+        self._write('app/agents/research_agent.py', 'import builtins\nbuiltins._research_agent_imported = True\n')
+        self._write('app/agents/broken_agent.py', 'def broken(:\n')
+        self._write('app/modules/tools/search.py', 'from plugins import helpers\n')
+        self._write('app/schemas/task.json', '{"type": "object"}')
+        self.aci_data = {"agents": [
+            {"name": "ResearchAgent", "description": "Research", "tools": []},
+            {"name": "BrokenAgent", "description": "Broken", "tools": []},
+            {"name": "MissingAgent", "description": "Missing", "tools": []},
+        ]}
+        self.pice_data = {
+            "modules": [{"name": "tools.search"}],
+            "schemas": [{"name": "Task", "file": "task.json"}],
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, relative_path, content):
+        path = os.path.join(self.test_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def _run(self):
+        cache = ValidationCache(self.cache_path)
+        results = (validate_agents(self.aci_data, cache), validate_modules(self.pice_data, cache),
+                   validate_schemas(self.pice_data, cache))
+        cache.save()
+        return results, cache
+
+    def test_imports_run_outside_this_interpreter(self):
+        health, issues = validate_agents(self.aci_data)
+
+        self.assertAlmostEqual(health, 100 / 3)
+        self.assertEqual([issue["path"] for issue in issues], ["BrokenAgent", "MissingAgent"])
+        self.assertIn("cannot be imported", issues[0]["issue"])
+        self.assertFalse(hasattr(builtins, "_research_agent_imported"))
+
+    def test_unchanged_files_reuse_results(self):
+        first, cache = self._run()
+        self.assertEqual((cache.hits, cache.misses), (0, 5))
+        self.assertEqual(first[1], (0.0, [{
+            "type": "module",
+            "path": "tools.search",
+            "issue": "Module cannot be imported (syntax errors or missing dependencies)"
+        }]))
+
+        with mock.patch("app.startup_validation.validators.agent_validator.check_importable") as check_importable:
+            second, cache = self._run()
+        check_importable.assert_not_called()
+        self.assertEqual((cache.hits, cache.misses), (5, 0))
+        self.assertEqual(second, first)
+        # Results match a run without the cache
+        self.assertEqual(second, (validate_agents(self.aci_data), validate_modules(self.pice_data),
+                                  validate_schemas(self.pice_data)))
+
+    def test_changed_files_are_checked_again(self):
+        self._run()
+        self._write('app/agents/broken_agent.py', 'def fixed():\n    pass\n')
+        # The module failed on a missing first-party import, which now exists
+        self._write('plugins/__init__.py', '')
+        self._write('plugins/helpers.py', 'VALUE = 1\n')
+        self._write('app/agents/missing_agent.py', 'pass\n')
+
+        (agents, modules, schemas), cache = self._run()
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+        self.assertEqual(agents, (100.0, []))
+        self.assertEqual(modules, (100.0, []))
+
+        # Changing an imported file invalidates the module that imports it
+        self._write('plugins/helpers.py', 'VALUE = (\n')
+        (_, modules, _), cache = self._run()
+        self.assertEqual((cache.hits, cache.misses), (4, 1))
+        self.assertEqual(modules[0], 0.0)
+
+    def test_changes_down_the_import_chain_are_checked_again(self):
+        self._write('app/agents/research_agent.py', 'from plugins import a\n')
+        self._write('plugins/__init__.py', '')
+        self._write('plugins/a.py', 'from plugins import b\n')
+        self._write('plugins/b.py', 'VALUE = 1\n')
+        (agents, _, _), _ = self._run()
+        self.assertNotIn("ResearchAgent", [issue["path"] for issue in agents[1]])
+
+        self._write('plugins/b.py', 'VALUE = (\n')
+        (agents, _, _), cache = self._run()
+        self.assertEqual((cache.hits, cache.misses), (4, 1))
+        self.assertEqual(agents, validate_agents(self.aci_data))
+        self.assertIn("ResearchAgent", [issue["path"] for issue in agents[1]])
+
+    def test_crashed_imports_are_not_stored(self):
+        with mock.patch("app.startup_validation.validators.agent_validator.check_importable",
+                        side_effect=lambda targets: [None] * len(targets)):
+            (agents, _, _), _ = self._run()
+        self.assertEqual(agents[0], 0.0)
+
+        # Only the agents whose import crashed are checked again
+        (agents, _, _), cache = self._run()
+        self.assertEqual((cache.hits, cache.misses), (3, 2))
+        self.assertAlmostEqual(agents[0], 100 / 3)
+
+    def test_settled_files_are_not_rehashed(self):
+        self._run()
+        for root, _, files in os.walk(self.test_dir):
+            for name in files:
+                os.utime(os.path.join(root, name), (1_700_000_000, 1_700_000_000))
+        self._run()
+
+        with mock.patch.object(validation_cache, "_hash_file", wraps=validation_cache._hash_file) as hash_file:
+            _, cache = self._run()
+        hash_file.assert_not_called()
+        self.assertEqual(cache.misses, 0)
+
+class TestImportChecker(unittest.TestCase):
+    """Test cases for import checks in worker processes."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
+
+    def _write(self, name, content):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_crashing_import_does_not_fail_other_files(self):
+        targets = [
+            ("fine", self._write('fine.py', 'VALUE = 1\n')),
+            ("crash", self._write('crash.py', 'import os\nos._exit(1)\n')),
+            ("broken", self._write('broken.py', 'VALUE = (\n')),
+        ]
+        self.assertEqual(check_importable(targets, max_workers=2), [True, None, False])
+
+    def test_crash_is_narrowed_down_in_shared_pools(self):
+        targets = [("crash", self._write('crash.py', 'import os\nos._exit(1)\n'))]
+        targets += [(f"fine{i}", self._write(f'fine{i}.py', f'VALUE = {i}\n')) for i in range(40)]
+        with mock.patch.object(import_checker, "_import_in_pool", wraps=import_checker._import_in_pool) as pools:
+            results = check_importable(targets, max_workers=2)
+
+        self.assertEqual(results, [None] + [True] * 40)
+        # Halving the batch that keeps crashing, not one pool per lost file
+        self.assertLess(pools.call_count, 16)
+
+    def test_unguarded_main_module_is_an_error(self):
+        self._write('fine.py', 'VALUE = 1\n')
+        script = self._write('unguarded.py', (
+            'import os, sys\n'
+            f'sys.path.insert(0, {REPO_ROOT!r})\n'
+            'from app.startup_validation.utils.import_checker import check_importable\n'
+            f'check_importable([("fine", {os.path.join(self.test_dir, "fine.py")!r})])\n'
+        ))
+        completed = subprocess.run([sys.executable, script], capture_output=True, text=True, timeout=120)
+
+        self.assertNotEqual(completed.returncode, 0)
+        self.assertIn("ImportCheckError", completed.stderr)
+
+class TestEndpointIndex(unittest.TestCase):
+    """Test cases for endpoint lookups in parsed router files."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        env = mock.patch.dict(os.environ, {"PROMETHIOS_BASE_PATH": self.test_dir})
+        env.start()
+        self.addCleanup(env.stop)
+
+        self.router_path = os.path.join(self.test_dir, 'app', 'modules', 'tasks', 'router.py')
+        os.makedirs(os.path.dirname(self.router_path))
+        with open(self.router_path, 'w') as f:
+            f.write(
+                '@router.get("/tasks/list", response_model=TaskList)\n'
+                'def list_tasks(): pass\n'
+                '@router.post("tasks/create")\n'
+                'def create_task(): pass\n'
+                '@app.route("/tasks/legacy", methods=["GET"])\n'
+                'def legacy(): pass\n'
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_lookups(self):
+        index = EndpointIndex()
+        self.assertEqual(index.router_files("/tasks/list"), [self.router_path])
+        self.assertTrue(index.has_endpoint("/tasks/list", "GET"))
+        self.assertTrue(index.has_schema_validation("/tasks/list", "GET"))
+        self.assertTrue(index.has_endpoint("/tasks/create", "POST"))
+        self.assertFalse(index.has_endpoint("/tasks/create", "GET"))
+        self.assertTrue(index.has_endpoint("/tasks/legacy", "GET"))
+        self.assertFalse(index.has_endpoint("/tasks/legacy", "DELETE"))
+        self.assertFalse(index.has_endpoint("/users/list", "GET"))
+
+    def test_router_files_are_read_once(self):
+        pice_data = {"endpoints": [
+            {"path": "/tasks/list", "method": "GET"},
+            {"path": "/tasks/create", "method": "POST"},
+            {"path": "/tasks/missing", "method": "GET"},
+        ]}
+        with mock.patch("builtins.open", wraps=open) as opened:
+            health, issues = validate_endpoints(pice_data)
+
+        self.assertEqual([call.args[0] for call in opened.call_args_list], [self.router_path])
+        self.assertAlmostEqual(health, 200 / 3)
+        self.assertEqual([(issue["path"], issue["issue"]) for issue in issues], [
+            ("/tasks/create", "Missing schema validation (response model not attached)"),
+            ("/tasks/missing", "Endpoint GET /tasks/missing not found in router maps"),
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,11 +6,15 @@ This package contains utility modules for:
 - Drift reporting
 - Memory tagging
 - Loading cognitive surfaces
+- Caching check results between runs
+- Import checks in worker processes
 """
 
 __all__ = [
     "health_scorer",
     "drift_reporter",
     "memory_tagger",
-    "surface_loader"
+    "surface_loader",
+    "validation_cache",
+    "import_checker"
 ]
@@ -0,0 +1,147 @@
+"""
+Import Checker Module
+
+This module checks whether Python files can be imported. Each file is
+executed in a worker process, so module-level side effects of agents and
+modules never run in the validating interpreter, and independent files are
+imported in parallel.
+
+Workers are started with the "spawn" method, which imports the main module of
+the calling program again in each worker. Scripts that run validation must
+therefore guard their entry point with ``if __name__ == "__main__":``;
+otherwise the workers fail to start and check_importable raises
+ImportCheckError.
+"""
+
+import os
+import sys
+import logging
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Sequence, Tuple
+
+# Configure logging
+logger = logging.getLogger('startup_validation.import_checker')
+
+class ImportCheckError(RuntimeError):
+    """Raised when worker processes for import checks cannot be started."""
+
+def check_importable(targets: Sequence[Tuple[str, str]], max_workers: Optional[int] = None) -> List[Optional[bool]]:
+    """
+    Check whether each file can be imported, in a pool of worker processes.
+
+    The number of workers defaults to STARTUP_VALIDATION_WORKERS, or the
+    number of CPUs. Workers also search PROMETHIOS_BASE_PATH for the
+    packages the files import.
+
+    A worker that dies takes the pool down with it, so files whose results
+    were lost are imported again in a new pool. A batch that loses every
+    result again is split in halves, narrowing down to the files that crash
+    their process; those get None rather than a result.
+
+    Args:
+        targets: (module name, file path) of each file to import
+        max_workers: Maximum number of worker processes
+
+    Returns:
+        List with True for each file that imported without errors, False
+        for each that failed, and None for each whose worker process died
+
+    Raises:
+        ImportCheckError: If the worker processes cannot be started
+    """
+    if not targets:
+        return []
+
+    if max_workers is None:
+        max_workers = int(os.environ.get("STARTUP_VALIDATION_WORKERS", 0)) or os.cpu_count() or 1
+    workers = max(1, min(max_workers, len(targets)))
+    logger.info(f"Import-checking {len(targets)} files in {workers} worker processes")
+
+    results = _import_in_pool(targets, workers)
+    batches = [[index for index, result in enumerate(results) if result is None]]
+    while batches:
+        batch = batches.pop()
+        if not batch:
+            continue
+        logger.warning(f"Worker process died, importing {len(batch)} files again")
+        retried = _import_in_pool([targets[index] for index in batch], min(workers, len(batch)))
+        for index, result in zip(batch, retried):
+            results[index] = result
+
+        lost = [index for index in batch if results[index] is None]
+        if len(lost) == 1 and len(batch) == 1:
+            logger.warning(f"Worker process died while importing {targets[lost[0]][1]}")
+        elif len(lost) == len(batch):
+            # No file got through before the crash: narrow the batch down
+            middle = len(lost) // 2
+            batches.extend([lost[middle:], lost[:middle]])
+        else:
+            batches.append(lost)
+    return results
+
+def _import_in_pool(targets: Sequence[Tuple[str, str]], workers: int) -> List[Optional[bool]]:
+    results: List[Optional[bool]] = []
+    # Spawned workers start from a clean interpreter rather than a copy of this one
+    base_path = os.path.abspath(os.environ.get("PROMETHIOS_BASE_PATH", ""))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_add_search_path,
+        initargs=(base_path,)
+    ) as pool:
+        # A pool that breaks before running anything could not start its workers
+        try:
+            pool.submit(_ready).result()
+        except BrokenProcessPool as e:
+            raise ImportCheckError(
+                "Import check worker processes failed to start; the main module of the "
+                "calling program must guard its entry point with if __name__ == \"__main__\""
+            ) from e
+
+        futures = []
+        for module_name, file_path in targets:
+            # A worker can die while files are still being submitted
+            try:
+                futures.append(pool.submit(import_file, module_name, file_path))
+            except BrokenProcessPool:
+                break
+        for future in futures:
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                results.append(None)
+    return results + [None] * (len(targets) - len(futures))
+
+def _ready() -> bool:
+    return True
+
+def _add_search_path(path: str) -> None:
+    if path not in sys.path:
+        sys.path.append(path)
+
+def import_file(module_name: str, file_path: str) -> bool:
+    """
+    Import a file as a module. Runs in a worker process.
+
+    Args:
+        module_name: Name to give the module
+        file_path: Path to the file
+
+    Returns:
+        True if the module was imported without errors, False otherwise
+    """
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
+        if spec is None:
+            logger.debug(f"Cannot import {file_path}: spec_from_file_location returned None")
+            return False
+
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return True
+    except (Exception, SystemExit) as e:
+        logger.debug(f"Error importing {file_path}: {str(e)}")
+        return False
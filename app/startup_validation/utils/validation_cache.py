@@ -0,0 +1,339 @@
+"""
+Validation Cache Module
+
+This module caches the result of each surface check under the content hashes
+of the files the check depends on. A validation run re-checks only surfaces
+whose files changed since the previous run and reuses the stored result for
+the rest, so boot-time validation work follows the files changed rather than
+the size of the cognitive surfaces.
+"""
+
+import os
+import ast
+import json
+import stat
+import time
+import hashlib
+import logging
+from typing import Dict, List, Any, Callable, Optional, Sequence
+
+# Configure logging
+logger = logging.getLogger('startup_validation.validation_cache')
+
+# Bump when a validator changes what it reports, to drop earlier results
+CACHE_VERSION = 2
+
+# Default cache location, relative to the base path
+DEFAULT_CACHE_FILE = os.path.join("logs", "startup_validation_cache.json")
+
+# A file modified this close to when it was hashed can change again without
+# its size or mtime changing, so its stored hash is not trusted
+RACY_WINDOW_NS = 2_000_000_000
+
+class ValidationCache:
+    """
+    Check results keyed by surface item, each stored with the content hashes
+    of the files it was computed from.
+
+    File hashes are remembered with the size and mtime they were computed
+    at, so unchanged files are only stat'ed on later runs, not read.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: JSON file the cache is loaded from and saved to, or None
+                to keep it in memory only
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._files: Dict[str, List[Any]] = {}
+        self._imports: Dict[str, List[List[Any]]] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._digests: Dict[str, Optional[str]] = {}
+        self._dirty = False
+
+        if path and os.path.isfile(path):
+            self._load(path)
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable validation cache {path}: {str(e)}")
+            return
+
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            logger.info(f"Validation cache {path} is from another version, starting empty")
+            return
+
+        self._files = data.get("files", {})
+        self._imports = data.get("imports", {})
+        self._results = data.get("results", {})
+        logger.debug(f"Loaded {len(self._results)} cached check results from {path}")
+
+    def save(self) -> None:
+        """
+        Write the cache back to its file if anything changed.
+        """
+        if not self.path or not self._dirty:
+            return
+
+        data = {
+            "version": CACHE_VERSION,
+            "files": self._files,
+            "imports": self._imports,
+            "results": self._results
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        logger.debug(f"Saved {len(self._results)} check results to {self.path}")
+
+    def digest(self, path: str) -> Optional[str]:
+        """
+        Get the content hash of a file, rehashing it only if it changed.
+
+        Args:
+            path: Path to the file
+
+        Returns:
+            SHA-1 hex digest of the file, or None if it is not a readable file
+        """
+        if path in self._digests:
+            return self._digests[path]
+
+        digest = None
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+
+        if st is not None and stat.S_ISREG(st.st_mode):
+            known = self._files.get(path)
+            if (known and known[0] == st.st_size and known[1] == st.st_mtime_ns
+                    and known[3] - st.st_mtime_ns > RACY_WINDOW_NS):
+                digest = known[2]
+            else:
+                digest = _hash_file(path)
+                if digest is not None:
+                    self._files[path] = [st.st_size, st.st_mtime_ns, digest, time.time_ns()]
+                    self._dirty = True
+
+        self._digests[path] = digest
+        return digest
+
+    def import_dependencies(self, path: str, base_path: str) -> List[str]:
+        """
+        Get the first-party files a Python file imports, directly or through
+        other first-party files.
+
+        Imports are parsed once per file content, so walking the imports of
+        unchanged files only stats them. A module that is imported but
+        missing is returned as its expected .py path, so that adding it
+        invalidates the checks that depend on it.
+
+        Args:
+            path: Path to the Python file
+            base_path: Base path the first-party packages live under
+
+        Returns:
+            List of file paths
+        """
+        dependencies: Dict[str, None] = {}
+        pending = [path]
+        while pending:
+            for dependency in self._direct_imports(pending.pop(), base_path):
+                if dependency != path and dependency not in dependencies:
+                    dependencies[dependency] = None
+                    pending.append(dependency)
+        return list(dependencies)
+
+    def _direct_imports(self, path: str, base_path: str) -> List[str]:
+        digest = self.digest(path)
+        if digest is None:
+            return []
+
+        imports = self._imports.get(digest)
+        if imports is None:
+            imports = _parse_imports(path)
+            self._imports[digest] = imports
+            self._dirty = True
+
+        dependencies = []
+        for level, module, names in imports:
+            dependencies.extend(_resolve_import(path, base_path, level, module, names))
+        return list(dict.fromkeys(dependencies))
+
+    def lookup(self, key: str, dependencies: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored result of a check if none of its files changed.
+
+        Args:
+            key: Key of the check
+            dependencies: Files the check depends on
+
+        Returns:
+            The stored result, or None if there is none or it is stale
+        """
+        entry = self._results.get(key)
+        if entry is not None and entry["files"] == self._fingerprint(dependencies):
+            self.hits += 1
+            return entry["result"]
+
+        self.misses += 1
+        return None
+
+    def store(self, key: str, dependencies: Sequence[str], result: Dict[str, Any]) -> None:
+        """
+        Store the result of a check.
+
+        Args:
+            key: Key of the check
+            dependencies: Files the check depends on
+            result: Result of the check
+        """
+        self._results[key] = {"files": self._fingerprint(dependencies), "result": result}
+        self._dirty = True
+
+    def _fingerprint(self, dependencies: Sequence[str]) -> Dict[str, Optional[str]]:
+        return {path: self.digest(path) for path in dependencies}
+
+def load_validation_cache(base_path: str = "") -> Optional[ValidationCache]:
+    """
+    Load the validation cache for a base path.
+
+    The location can be overridden with STARTUP_VALIDATION_CACHE; setting it
+    to "off" disables caching.
+
+    Args:
+        base_path: Base path to prepend to file paths
+
+    Returns:
+        ValidationCache instance, or None if caching is disabled
+    """
+    path = os.environ.get("STARTUP_VALIDATION_CACHE") or os.path.join(base_path, DEFAULT_CACHE_FILE)
+    if path.lower() == "off":
+        return None
+    return ValidationCache(path)
+
+def run_cached_checks(
+    cache: Optional[ValidationCache],
+    kind: str,
+    items: Sequence[Dict[str, Any]],
+    dependencies: Callable[[Dict[str, Any]], List[str]],
+    check: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    Get the check result of each surface item, checking only the items that
+    have no stored result for the current content of their files.
+
+    Args:
+        cache: ValidationCache to use, or None to check every item
+        kind: Surface type, used in the cache keys
+        items: Surface items from the ACI or PICE
+        dependencies: Returns the files the check of an item depends on
+        check: Checks a batch of items, returning one result per item; a
+            result with "cacheable" set to False is returned but not stored
+
+    Returns:
+        List with one result per item, in item order
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    pending = []
+
+    for index, item in enumerate(items):
+        if cache is None:
+            pending.append((index, None, None))
+            continue
+
+        files = dependencies(item)
+        key = f"{kind}:{_item_key(item)}"
+        result = cache.lookup(key, files)
+        if result is None:
+            pending.append((index, key, files))
+        else:
+            results[index] = result
+
+    if cache is not None and len(pending) < len(items):
+        logger.info(f"Reusing {len(items) - len(pending)} cached {kind} results, checking {len(pending)}")
+
+    if pending:
+        checked = check([items[index] for index, _, _ in pending])
+        for (index, key, files), result in zip(pending, checked):
+            cacheable = result.pop("cacheable", True)
+            results[index] = result
+            if cache is not None and cacheable:
+                cache.store(key, files, result)
+
+    return results
+
+def _item_key(item: Dict[str, Any]) -> str:
+    encoded = json.dumps(item, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+def _hash_file(path: str) -> Optional[str]:
+    sha1 = hashlib.sha1()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                sha1.update(chunk)
+    except OSError:
+        return None
+    return sha1.hexdigest()
+
+def _parse_imports(path: str) -> List[List[Any]]:
+    try:
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return []
+
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend([0, alias.name, []] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.append([node.level, node.module or "", [alias.name for alias in node.names]])
+    return imports
+
+def _resolve_import(path: str, base_path: str, level: int, module: str, names: List[str]) -> List[str]:
+    parts = module.split('.') if module else []
+
+    if level:
+        root = os.path.dirname(path)
+        for _ in range(level - 1):
+            root = os.path.dirname(root)
+    else:
+        # Only packages and modules under the base path are first-party
+        root = base_path
+        top = os.path.join(root, parts[0])
+        if not (os.path.isdir(top) or os.path.isfile(f"{top}.py")):
+            return []
+
+    module_path = os.path.join(root, *parts)
+    files = []
+    # Importing a submodule runs the __init__ of each package above it
+    for depth in range(1, len(parts)):
+        package_init = os.path.join(root, *parts[:depth], "__init__.py")
+        if os.path.isfile(package_init):
+            files.append(package_init)
+    if parts:
+        if os.path.isfile(f"{module_path}.py"):
+            files.append(f"{module_path}.py")
+        elif os.path.isfile(os.path.join(module_path, "__init__.py")):
+            files.append(os.path.join(module_path, "__init__.py"))
+        else:
+            files.append(f"{module_path}.py")
+
+    # Names imported from a package may be submodules
+    for name in names:
+        submodule = os.path.join(module_path, f"{name}.py")
+        if os.path.isfile(submodule):
+            files.append(submodule)
+    return files
@@ -6,20 +6,25 @@ It checks if agents exist in /app/agents/, are importable, and match their memor
 """
 
 import os
-import importlib.util
-import sys
 import logging
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
+
+from app.startup_validation.utils.import_checker import check_importable
+from app.startup_validation.utils.validation_cache import ValidationCache, run_cached_checks
 
 # Configure logging
 logger = logging.getLogger('startup_validation.agent_validator')
 
-def validate_agents(aci_data: Dict[str, Any]) -> Tuple[float, List[Dict[str, Any]]]:
+def validate_agents(aci_data: Dict[str, Any], cache: Optional[ValidationCache] = None) -> Tuple[float, List[Dict[str, Any]]]:
     """
     Validate all agents listed in the ACI.
     
+    Agents whose file and first-party imports are unchanged since the result
+    stored in the cache are not checked again.
+    
     Args:
         aci_data: The loaded Agent Cognition Index data
+        cache: Optional cache of check results from earlier runs
         
     Returns:
         Tuple containing:
@@ -37,55 +42,15 @@ def validate_agents(aci_data: Dict[str, Any]) -> Tuple[float, List[Dict[str, Any
         logger.warning("No agents found in ACI")
         return 100.0, []
     
-    valid_count = 0
-    drift_issues = []
-    
-    for agent in agents:
-        if "name" not in agent:
-            logger.error("Agent missing 'name' attribute")
-            drift_issues.append({
-                "type": "agent",
-                "path": "unknown",
-                "issue": "Agent missing 'name' attribute"
-            })
-            continue
-        
-        agent_name = agent["name"]
-        logger.info(f"Validating agent: {agent_name}")
-        
-        # Check if agent exists
-        if not check_agent_exists(agent_name):
-            logger.error(f"Agent {agent_name} does not exist in /app/agents/")
-            drift_issues.append({
-                "type": "agent",
-                "path": agent_name,
-                "issue": "Agent file does not exist in /app/agents/"
-            })
-            continue
-        
-        # Check if agent is importable
-        if not check_agent_importable(agent_name):
-            logger.error(f"Agent {agent_name} is not importable")
-            drift_issues.append({
-                "type": "agent",
-                "path": agent_name,
-                "issue": "Agent cannot be imported (syntax errors or missing dependencies)"
-            })
-            continue
-        
-        # Check if agent matches memory contract
-        if not check_agent_contract(agent_name, agent):
-            logger.error(f"Agent {agent_name} does not match memory contract")
-            drift_issues.append({
-                "type": "agent",
-                "path": agent_name,
-                "issue": "Agent does not match memory contract (missing required attributes)"
-            })
-            continue
-        
-        # If we get here, the agent is valid
-        valid_count += 1
-        logger.info(f"Agent {agent_name} validated successfully")
+    results = run_cached_checks(
+        cache,
+        "agent",
+        agents,
+        lambda agent: get_agent_dependencies(agent, cache),
+        check_agents
+    )
+    valid_count = sum(1 for result in results if result["valid"])
+    drift_issues = [issue for result in results for issue in result["issues"]]
     
     # Calculate health score
     health_score = (valid_count / len(agents)) * 100 if agents else 100.0
@@ -93,6 +58,119 @@ def validate_agents(aci_data: Dict[str, Any]) -> Tuple[float, List[Dict[str, Any
     
     return health_score, drift_issues
 
+def check_agents(agents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Check a batch of agents, importing the existing agent files in parallel
+    worker processes.
+    
+    Args:
+        agents: Agent entries from the ACI
+        
+    Returns:
+        List with one result per agent, each a dictionary with "valid" and
+        the list of "issues" found
+    """
+    exists = {}
+    for agent in agents:
+        if "name" in agent and agent["name"] not in exists:
+            exists[agent["name"]] = check_agent_exists(agent["name"])
+    
+    to_import = [agent_name for agent_name, found in exists.items() if found]
+    importable = dict(zip(to_import, check_importable([get_agent_import_target(name) for name in to_import])))
+    
+    return [check_agent(agent, exists, importable) for agent in agents]
+
+def check_agent(agent: Dict[str, Any], exists: Dict[str, bool], importable: Dict[str, Optional[bool]]) -> Dict[str, Any]:
+    """
+    Check one agent, given the outcome of its file and import checks.
+    
+    Args:
+        agent: Agent entry from the ACI
+        exists: Whether the file of each agent exists, by agent name
+        importable: Whether each existing agent imported, by agent name, or
+            None if its worker process died
+        
+    Returns:
+        Dictionary with "valid" and the list of "issues" found
+    """
+    if "name" not in agent:
+        logger.error("Agent missing 'name' attribute")
+        return {"valid": False, "issues": [{
+            "type": "agent",
+            "path": "unknown",
+            "issue": "Agent missing 'name' attribute"
+        }]}
+    
+    agent_name = agent["name"]
+    logger.info(f"Validating agent: {agent_name}")
+    
+    # Check if agent exists
+    if not exists[agent_name]:
+        logger.error(f"Agent {agent_name} does not exist in /app/agents/")
+        return {"valid": False, "issues": [{
+            "type": "agent",
+            "path": agent_name,
+            "issue": "Agent file does not exist in /app/agents/"
+        }]}
+    
+    # Check if agent is importable
+    if not importable[agent_name]:
+        logger.error(f"Agent {agent_name} is not importable")
+        # A worker process that died says nothing about the next run
+        return {"valid": False, "cacheable": importable[agent_name] is not None, "issues": [{
+            "type": "agent",
+            "path": agent_name,
+            "issue": "Agent cannot be imported (syntax errors or missing dependencies)"
+        }]}
+    
+    # Check if agent matches memory contract
+    if not check_agent_contract(agent_name, agent):
+        logger.error(f"Agent {agent_name} does not match memory contract")
+        return {"valid": False, "issues": [{
+            "type": "agent",
+            "path": agent_name,
+            "issue": "Agent does not match memory contract (missing required attributes)"
+        }]}
+    
+    # If we get here, the agent is valid
+    logger.info(f"Agent {agent_name} validated successfully")
+    return {"valid": True, "issues": []}
+
+def get_agent_dependencies(agent: Dict[str, Any], cache: Optional[ValidationCache]) -> List[str]:
+    """
+    Get the files the check of an agent depends on.
+    
+    Args:
+        agent: Agent entry from the ACI
+        cache: Cache used to look up the agent's first-party imports
+        
+    Returns:
+        The agent file followed by the first-party files it imports
+    """
+    if "name" not in agent or cache is None:
+        return []
+    
+    _, full_path = get_agent_import_target(agent["name"])
+    base_path = os.environ.get("PROMETHIOS_BASE_PATH", "")
+    return [full_path] + cache.import_dependencies(full_path, base_path)
+
+def get_agent_import_target(agent_name: str) -> Tuple[str, str]:
+    """
+    Get the module name and file path an agent is imported from.
+    
+    Args:
+        agent_name: Name of the agent
+        
+    Returns:
+        Tuple of module name and full path to the agent file
+    """
+    file_name = convert_agent_name_to_file_name(agent_name)
+    module_name = file_name[:-3] if file_name.endswith('.py') else file_name
+    
+    agent_path = os.path.join("/app/agents", file_name)
+    base_path = os.environ.get("PROMETHIOS_BASE_PATH", "")
+    return module_name, os.path.join(base_path, agent_path.lstrip('/'))
+
 def check_agent_exists(agent_name: str) -> bool:
     """
     Check if an agent file exists in the /app/agents/ directory.
@@ -119,40 +197,24 @@ def check_agent_importable(agent_name: str) -> bool:
     """
     Check if an agent can be imported without errors.
     
+    The agent is imported in a worker process, so its module-level code
+    does not run in this interpreter.
+    
     Args:
         agent_name: Name of the agent to check
         
     Returns:
         True if the agent can be imported, False otherwise
     """
-    # Convert agent name to file name and module name
-    file_name = convert_agent_name_to_file_name(agent_name)
-    module_name = file_name[:-3] if file_name.endswith('.py') else file_name
-    
-    # Get full path to agent file
-    agent_path = os.path.join("/app/agents", file_name)
-    base_path = os.environ.get("PROMETHIOS_BASE_PATH", "")
-    full_path = os.path.join(base_path, agent_path.lstrip('/'))
+    module_name, full_path = get_agent_import_target(agent_name)
     
     if not os.path.isfile(full_path):
         logger.debug(f"Cannot import {agent_name}: file not found at {full_path}")
         return False
     
-    try:
-        # Try to import the module
-        spec = importlib.util.spec_from_file_location(module_name, full_path)
-        if spec is None:
-            logger.debug(f"Cannot import {agent_name}: spec_from_file_location returned None")
-            return False
-        
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        
-        logger.debug(f"Successfully imported {agent_name}")
-        return True
-    except Exception as e:
-        logger.debug(f"Error importing {agent_name}: {str(e)}")
-        return False
+    importable = bool(check_importable([(module_name, full_path)])[0])
+    logger.debug(f"{'Successfully imported' if importable else 'Error importing'} {agent_name}")
+    return importable
 
 def check_agent_contract(agent_name: str, expected_contract: Dict[str, Any]) -> bool:
     """
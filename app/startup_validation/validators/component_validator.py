@@ -8,17 +8,23 @@ It checks if components are exportable (React/JSX).
 import os
 import re
 import logging
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
+
+from app.startup_validation.utils.validation_cache import ValidationCache, run_cached_checks
 
 # Configure logging
 logger = logging.getLogger('startup_validation.component_validator')
 
-def validate_components(pice_data: Dict[str, Any]) -> Tuple[float, List[Dict[str, Any]]]:
+def validate_components(pice_data: Dict[str, Any], cache: Optional[ValidationCache] = None) -> Tuple[float, List[Dict[str, Any]]]:
     """
     Validate all components listed in the PICE.
     
+    Components whose file is unchanged since the result stored in the cache
+    are not read again.
+    
     Args:
         pice_data: The loaded PICE data
+        cache: Optional cache of check results from earlier runs
         
     Returns:
         Tuple containing:
@@ -36,55 +42,15 @@ def validate_components(pice_data: Dict[str, Any]) -> Tuple[float, List[Dict[str
         logger.warning("No components found in PICE")
         return 100.0, []
     
-    valid_count = 0
-    drift_issues = []
-    
-    for component in components:
-        if "name" not in component:
-            logger.error("Component missing 'name' attribute")
-            drift_issues.append({
-                "type": "component",
-                "path": "unknown",
-                "issue": "Component missing 'name' attribute"
-            })
-            continue
-            
-        if "path" not in component:
-            logger.error(f"Component {component['name']} missing 'path' attribute")
-            drift_issues.append({
-                "type": "component",
-                "path": component['name'],
-                "issue": "Component missing 'path' attribute"
-            })
-            continue
-        
-        component_name = component["name"]
-        component_path = component["path"]
-        logger.info(f"Validating component: {component_name} (path: {component_path})")
-        
-        # Check if component exists
-        if not check_component_exists(component_path):
-            logger.error(f"Component file {component_path} does not exist")
-            drift_issues.append({
-                "type": "component",
-                "path": component_path,
-                "issue": "Component file does not exist"
-            })
-            continue
-        
-        # Check if component is exportable
-        if not check_component_exportable(component_path):
-            logger.error(f"Component {component_name} is not exportable")
-            drift_issues.append({
-                "type": "component",
-                "path": component_path,
-                "issue": "Component is not exportable (missing export statement or invalid React/JSX)"
-            })
-            continue
-        
-        # If we get here, the component is valid
-        valid_count += 1
-        logger.info(f"Component {component_name} validated successfully")
+    results = run_cached_checks(
+        cache,
+        "component",
+        components,
+        get_component_dependencies,
+        lambda batch: [check_component(component) for component in batch]
+    )
+    valid_count = sum(1 for result in results if result["valid"])
+    drift_issues = [issue for result in results for issue in result["issues"]]
     
     # Calculate health score
     health_score = (valid_count / len(components)) * 100 if components else 100.0
@@ -92,6 +58,83 @@ def validate_components(pice_data: Dict[str, Any]) -> Tuple[float, List[Dict[str
     
     return health_score, drift_issues
 
+def check_component(component: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check one component.
+    
+    Args:
+        component: Component entry from the PICE
+        
+    Returns:
+        Dictionary with "valid" and the list of "issues" found
+    """
+    if "name" not in component:
+        logger.error("Component missing 'name' attribute")
+        return {"valid": False, "issues": [{
+            "type": "component",
+            "path": "unknown",
+            "issue": "Component missing 'name' attribute"
+        }]}
+        
+    if "path" not in component:
+        logger.error(f"Component {component['name']} missing 'path' attribute")
+        return {"valid": False, "issues": [{
+            "type": "component",
+            "path": component['name'],
+            "issue": "Component missing 'path' attribute"
+        }]}
+    
+    component_name = component["name"]
+    component_path = component["path"]
+    logger.info(f"Validating component: {component_name} (path: {component_path})")
+    
+    # Check if component exists
+    if not check_component_exists(component_path):
+        logger.error(f"Component file {component_path} does not exist")
+        return {"valid": False, "issues": [{
+            "type": "component",
+            "path": component_path,
+            "issue": "Component file does not exist"
+        }]}
+    
+    # Check if component is exportable
+    if not check_component_exportable(component_path):
+        logger.error(f"Component {component_name} is not exportable")
+        return {"valid": False, "issues": [{
+            "type": "component",
+            "path": component_path,
+            "issue": "Component is not exportable (missing export statement or invalid React/JSX)"
+        }]}
+    
+    # If we get here, the component is valid
+    logger.info(f"Component {component_name} validated successfully")
+    return {"valid": True, "issues": []}
+
+def get_component_dependencies(component: Dict[str, Any]) -> List[str]:
+    """
+    Get the files the check of a component depends on.
+    
+    Args:
+        component: Component entry from the PICE
+        
+    Returns:
+        Every path the component file is looked up at, so that creating any
+        of them invalidates the stored result
+    """
+    if "name" not in component or "path" not in component:
+        return []
+    
+    component_path = component["path"]
+    if not component_path.startswith('/'):
+        component_path = f"/frontend/components/{component_path}"
+    
+    base_path = os.environ.get("PROMETHIOS_BASE_PATH", "")
+    full_path = os.path.join(base_path, component_path.lstrip('/'))
+    
+    if full_path.endswith(('.jsx', '.tsx', '.js', '.ts')):
+        return [full_path]
+    return [f"{full_path}{ext}" for ext in ['.jsx', '.tsx', '.js', '.ts']] + [full_path]
+
 def check_component_exists(component_path: str) -> bool:
     """
     Check if a component file exists.
@@ -6,21 +6,27 @@ It performs a light check to verify that the path exists in router maps.
 """
 
 import os
-import importlib.util
-import sys
+import bisect
 import logging
 import re
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
+
+from app.startup_validation.utils.validation_cache import ValidationCache, run_cached_checks
 
 # Configure logging
 logger = logging.getLogger('startup_validation.endpoint_validator')
 
-def validate_endpoints(pice_data: Dict[str, Any]) -> Tuple[float, List[Dict[str, Any]]]:
+def validate_endpoints(pice_data: Dict[str, Any], cache: Optional[ValidationCache] = None) -> Tuple[float, List[Dict[str, Any]]]:
     """
     Validate all endpoints listed in the PICE.
     
+    Router files are parsed once into an EndpointIndex shared by all
+    endpoints, and endpoints whose router files are unchanged since the
+    result stored in the cache are not looked up again.
+    
     Args:
         pice_data: The loaded PICE data
+        cache: Optional cache of check results from earlier runs
         
     Returns:
         Tuple containing:
@@ -38,55 +44,16 @@ def validate_endpoints(pice_data: Dict[str, Any]) -> Tuple[float, List[Dict[str,
         logger.warning("No endpoints found in PICE")
         return 100.0, []
     
-    valid_count = 0
-    drift_issues = []
-    
-    for endpoint in endpoints:
-        if "path" not in endpoint:
-            logger.error("Endpoint missing 'path' attribute")
-            drift_issues.append({
-                "type": "endpoint",
-                "path": "unknown",
-                "issue": "Endpoint missing 'path' attribute"
-            })
-            continue
-            
-        if "method" not in endpoint:
-            logger.error(f"Endpoint {endpoint['path']} missing 'method' attribute")
-            drift_issues.append({
-                "type": "endpoint",
-                "path": endpoint['path'],
-                "issue": "Endpoint missing 'method' attribute"
-            })
-            continue
-        
-        endpoint_path = endpoint["path"]
-        endpoint_method = endpoint["method"]
-        logger.info(f"Validating endpoint: {endpoint_method} {endpoint_path}")
-        
-        # Check if endpoint exists in router maps
-        if not check_endpoint_exists(endpoint_path, endpoint_method):
-            logger.error(f"Endpoint {endpoint_method} {endpoint_path} does not exist in router maps")
-            drift_issues.append({
-                "type": "endpoint",
-                "path": endpoint_path,
-                "issue": f"Endpoint {endpoint_method} {endpoint_path} not found in router maps"
-            })
-            continue
-        
-        # Check if endpoint has schema validation
-        if not check_endpoint_schema_validation(endpoint_path, endpoint_method):
-            logger.warning(f"Endpoint {endpoint_method} {endpoint_path} does not have schema validation")
-            drift_issues.append({
-                "type": "endpoint",
-                "path": endpoint_path,
-                "issue": "Missing schema validation (response model not attached)"
-            })
-            # Continue validation - this is a warning, not an error
-        
-        # If we get here, the endpoint exists (even if it lacks schema validation)
-        valid_count += 1
-        logger.info(f"Endpoint {endpoint_method} {endpoint_path} validated successfully")
+    index = EndpointIndex()
+    results = run_cached_checks(
+        cache,
+        "endpoint",
+        endpoints,
+        lambda endpoint: index.router_files(endpoint["path"]) if "path" in endpoint else [],
+        lambda batch: [check_endpoint(endpoint, index) for endpoint in batch]
+    )
+    valid_count = sum(1 for result in results if result["valid"])
+    drift_issues = [issue for result in results for issue in result["issues"]]
     
     # Calculate health score
     health_score = (valid_count / len(endpoints)) * 100 if endpoints else 100.0
@@ -94,6 +61,206 @@ def validate_endpoints(pice_data: Dict[str, Any]) -> Tuple[float, List[Dict[str,
     
     return health_score, drift_issues
 
+def check_endpoint(endpoint: Dict[str, Any], index: "EndpointIndex") -> Dict[str, Any]:
+    """
+    Check one endpoint against the router files it may be defined in.
+    
+    Args:
+        endpoint: Endpoint entry from the PICE
+        index: EndpointIndex of the router files
+        
+    Returns:
+        Dictionary with "valid" and the list of "issues" found
+    """
+    if "path" not in endpoint:
+        logger.error("Endpoint missing 'path' attribute")
+        return {"valid": False, "issues": [{
+            "type": "endpoint",
+            "path": "unknown",
+            "issue": "Endpoint missing 'path' attribute"
+        }]}
+        
+    if "method" not in endpoint:
+        logger.error(f"Endpoint {endpoint['path']} missing 'method' attribute")
+        return {"valid": False, "issues": [{
+            "type": "endpoint",
+            "path": endpoint['path'],
+            "issue": "Endpoint missing 'method' attribute"
+        }]}
+    
+    endpoint_path = endpoint["path"]
+    endpoint_method = endpoint["method"]
+    logger.info(f"Validating endpoint: {endpoint_method} {endpoint_path}")
+    
+    # Check if endpoint exists in router maps
+    if not index.has_endpoint(endpoint_path, endpoint_method):
+        logger.error(f"Endpoint {endpoint_method} {endpoint_path} does not exist in router maps")
+        return {"valid": False, "issues": [{
+            "type": "endpoint",
+            "path": endpoint_path,
+            "issue": f"Endpoint {endpoint_method} {endpoint_path} not found in router maps"
+        }]}
+    
+    issues = []
+    
+    # Check if endpoint has schema validation
+    if not index.has_schema_validation(endpoint_path, endpoint_method):
+        logger.warning(f"Endpoint {endpoint_method} {endpoint_path} does not have schema validation")
+        issues.append({
+            "type": "endpoint",
+            "path": endpoint_path,
+            "issue": "Missing schema validation (response model not attached)"
+        })
+        # Continue validation - this is a warning, not an error
+    
+    # If we get here, the endpoint exists (even if it lacks schema validation)
+    logger.info(f"Endpoint {endpoint_method} {endpoint_path} validated successfully")
+    return {"valid": True, "issues": issues}
+
+class RouterFile:
+    """
+    Route definitions found in one router file.
+    
+    Records where each route decorator ends, so that lookups give the same
+    answers as searching the file for the decorator followed by a later
+    response_model= or methods=[...] without reading it again.
+    """
+    
+    # @router.get("/path"), @app.post("/path"), @app.route("/path", ...)
+    DECORATOR_PATTERN = re.compile(r'@\w+\.(\w+)\s*\(\s*[\'"]([^\'"]*)[\'"]')
+    SCHEMA_PATTERN = re.compile(r'(?:response_model|responses)\s*=')
+    METHODS_PATTERN = re.compile(r'methods=\s*\[')
+    LITERAL_PATTERN = re.compile(r'(?=[\'"](\w+)[\'"])')
+    
+    def __init__(self, content: str):
+        # End offset of the first decorator for each (decorator name, path)
+        self.routes: Dict[Tuple[str, str], int] = {}
+        for match in self.DECORATOR_PATTERN.finditer(content):
+            self.routes.setdefault((match.group(1), match.group(2)), match.end())
+        
+        self.last_schema = max((match.start() for match in self.SCHEMA_PATTERN.finditer(content)), default=-1)
+        
+        self.methods_lists = [(match.start(), match.end()) for match in self.METHODS_PATTERN.finditer(content)]
+        self.last_literal: Dict[str, int] = {}
+        for match in self.LITERAL_PATTERN.finditer(content):
+            self.last_literal[match.group(1)] = match.start()
+    
+    def has_endpoint(self, endpoint_path: str, method: str) -> bool:
+        for path in (endpoint_path, endpoint_path.lstrip("/")):
+            if (method.lower(), path) in self.routes:
+                return True
+            
+            # @app.route("/path", methods=["GET"])
+            end = self.routes.get(("route", path))
+            if end is None:
+                continue
+            position = bisect.bisect_left(self.methods_lists, (end,))
+            if position < len(self.methods_lists):
+                list_start = self.methods_lists[position][1]
+                for literal in (method.upper(), method.lower()):
+                    if self.last_literal.get(literal, -1) >= list_start:
+                        return True
+        return False
+    
+    def has_schema_validation(self, endpoint_path: str, method: str) -> bool:
+        for path in (endpoint_path, endpoint_path.lstrip("/")):
+            end = self.routes.get((method.lower(), path))
+            if end is not None and self.last_schema >= end:
+                return True
+        return False
+
+class EndpointIndex:
+    """
+    Index of the route definitions in router files, built lazily.
+    
+    Each module directory is listed once and each router file is read and
+    parsed once, however many endpoints are looked up in it.
+    """
+    
+    def __init__(self):
+        self._router_files: Dict[str, List[str]] = {}
+        self._parsed: Dict[str, Optional[RouterFile]] = {}
+    
+    def router_files(self, endpoint_path: str) -> List[str]:
+        """
+        Get the router files that might contain an endpoint.
+        
+        Args:
+            endpoint_path: Path of the endpoint
+            
+        Returns:
+            List of router file paths
+        """
+        path_parts = endpoint_path.strip('/').split('/')
+        key = '/'.join(path_parts[:2])
+        if key not in self._router_files:
+            self._router_files[key] = find_router_files_for_endpoint(endpoint_path)
+        return self._router_files[key]
+    
+    def parsed(self, router_file: str) -> Optional[RouterFile]:
+        """
+        Get the parsed route definitions of a router file.
+        
+        Args:
+            router_file: Path to the router file
+            
+        Returns:
+            RouterFile, or None if the file cannot be read
+        """
+        if router_file not in self._parsed:
+            try:
+                with open(router_file, 'r') as f:
+                    self._parsed[router_file] = RouterFile(f.read())
+            except Exception as e:
+                logger.debug(f"Error reading router file {router_file}: {str(e)}")
+                self._parsed[router_file] = None
+        return self._parsed[router_file]
+    
+    def has_endpoint(self, endpoint_path: str, method: str) -> bool:
+        """
+        Check if an endpoint is defined in any of its router files.
+        
+        Args:
+            endpoint_path: Path of the endpoint
+            method: HTTP method of the endpoint
+            
+        Returns:
+            True if the endpoint is defined, False otherwise
+        """
+        router_files = self.router_files(endpoint_path)
+        if not router_files:
+            logger.debug(f"No router files found for endpoint {method} {endpoint_path}")
+            return False
+        
+        for router_file in router_files:
+            parsed = self.parsed(router_file)
+            if parsed is not None and parsed.has_endpoint(endpoint_path, method):
+                logger.debug(f"Endpoint {method} {endpoint_path} found in router file {router_file}")
+                return True
+        
+        logger.debug(f"Endpoint {method} {endpoint_path} not found in any router files")
+        return False
+    
+    def has_schema_validation(self, endpoint_path: str, method: str) -> bool:
+        """
+        Check if an endpoint has schema validation in any of its router files.
+        
+        Args:
+            endpoint_path: Path of the endpoint
+            method: HTTP method of the endpoint
+            
+        Returns:
+            True if the endpoint has schema validation, False otherwise
+        """
+        for router_file in self.router_files(endpoint_path):
+            parsed = self.parsed(router_file)
+            if parsed is not None and parsed.has_schema_validation(endpoint_path, method):
+                logger.debug(f"Schema validation found for endpoint {method} {endpoint_path} in {router_file}")
+                return True
+        
+        logger.debug(f"No schema validation found for endpoint {method} {endpoint_path}")
+        return False
+
 def check_endpoint_exists(endpoint_path: str, method: str) -> bool:
     """
     Check if an endpoint path exists in router maps.
@@ -107,22 +274,7 @@ def check_endpoint_exists(endpoint_path: str, method: str) -> bool:
     """
     # This is a light check - we're just looking for router definitions
     # that match the endpoint path, not actually making HTTP requests
-    
-    # Find router files that might contain this endpoint
-    router_files = find_router_files_for_endpoint(endpoint_path)
-    
-    if not router_files:
-        logger.debug(f"No router files found for endpoint {method} {endpoint_path}")
-        return False
-    
-    # Check each router file for the endpoint
-    for router_file in router_files:
-        if check_endpoint_in_router_file(router_file, endpoint_path, method):
-            logger.debug(f"Endpoint {method} {endpoint_path} found in router file {router_file}")
-            return True
-    
-    logger.debug(f"Endpoint {method} {endpoint_path} not found in any router files")
-    return False
+    return EndpointIndex().has_endpoint(endpoint_path, method)
 
 def check_endpoint_schema_validation(endpoint_path: str, method: str) -> bool:
     """
@@ -135,21 +287,7 @@ def check_endpoint_schema_validation(endpoint_path: str, method: str) -> bool:
     Returns:
         True if the endpoint has schema validation, False otherwise
     """
-    # Find router files that might contain this endpoint
-    router_files = find_router_files_for_endpoint(endpoint_path)
-    
-    if not router_files:
-        logger.debug(f"No router files found for endpoint {method} {endpoint_path}")
-        return False
-    
-    # Check each router file for schema validation
-    for router_file in router_files:
-        if check_schema_validation_in_router_file(router_file, endpoint_path, method):
-            logger.debug(f"Schema validation found for endpoint {method} {endpoint_path} in {router_file}")
-            return True
-    
-    logger.debug(f"No schema validation found for endpoint {method} {endpoint_path}")
-    return False
+    return EndpointIndex().has_schema_validation(endpoint_path, method)
 
 def find_router_files_for_endpoint(endpoint_path: str) -> List[str]:
     """
@@ -210,33 +348,8 @@ def check_endpoint_in_router_file(router_file: str, endpoint_path: str, method:
     Returns:
         True if the endpoint is defined in the router file, False otherwise
     """
-    try:
-        with open(router_file, 'r') as f:
-            content = f.read()
-        
-        # Look for FastAPI route definitions
-        # This is a simple check that looks for patterns like:
-        # @router.get("/path")
-        # @app.post("/path")
-        # etc.
-        
-        # Escape special characters in the endpoint path for regex
-        escaped_path = re.escape(endpoint_path)
-        
-        # Create patterns to match different route definition styles
-        patterns = [
-            rf'@\w+\.{method.lower()}\s*\(\s*[\'"]({escaped_path}|{escaped_path.lstrip("/")})[\'"]',
-            rf'@\w+\.route\s*\(\s*[\'"]({escaped_path}|{escaped_path.lstrip("/")})[\'"].*?methods=\s*\[.*?[\'"]({method.upper()}|{method.lower()})[\'"]'
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, content, re.DOTALL):
-                return True
-        
-        return False
-    except Exception as e:
-        logger.debug(f"Error checking endpoint in router file {router_file}: {str(e)}")
-        return False
+    parsed = EndpointIndex().parsed(router_file)
+    return parsed is not None and parsed.has_endpoint(endpoint_path, method)
 
 def check_schema_validation_in_router_file(router_file: str, endpoint_path: str, method: str) -> bool:
     """
@@ -250,24 +363,5 @@ def check_schema_validation_in_router_file(router_file: str, endpoint_path: str,
     Returns:
         True if the endpoint has schema validation, False otherwise
     """
-    try:
-        with open(router_file, 'r') as f:
-            content = f.read()
-        
-        # Escape special characters in the endpoint path for regex
-        escaped_path = re.escape(endpoint_path)
-        
-        # Look for route definition with response_model or similar schema validation
-        patterns = [
-            rf'@\w+\.{method.lower()}\s*\(\s*[\'"]({escaped_path}|{escaped_path.lstrip("/")})[\'"].*?response_model\s*=',
-            rf'@\w+\.{method.lower()}\s*\(\s*[\'"]({escaped_path}|{escaped_path.lstrip("/")})[\'"].*?responses\s*=',
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, content, re.DOTALL):
-                return True
-        
-        return False
-    except Exception as e:
-        logger.debug(f"Error checking schema validation in router file {router_file}: {str(e)}")
-        return False
+    parsed = EndpointIndex().parsed(router_file)
+    return parsed is not None and parsed.has_schema_validation(endpoint_path, method)
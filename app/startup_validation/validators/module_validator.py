@@ -6,20 +6,25 @@ It checks if modules exist and can be imported without errors.
 """
 
 import os
-import importlib.util
-import sys
 import logging
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
+
+from app.startup_validation.utils.import_checker import check_importable
+from app.startup_validation.utils.validation_cache import ValidationCache, run_cached_checks
 
 # Configure logging
 logger = logging.getLogger('startup_validation.module_validator')
 
-def validate_modules(pice_data: Dict[str, Any]) -> Tuple[float, List[Dict[str, Any]]]:
+def validate_modules(pice_data: Dict[str, Any], cache: Optional[ValidationCache] = None) -> Tuple[float, List[Dict[str, Any]]]:
     """
     Validate all modules listed in the PICE.
     
+    Modules whose file and first-party imports are unchanged since the result
+    stored in the cache are not checked again.
+    
     Args:
         pice_data: The loaded PICE data
+        cache: Optional cache of check results from earlier runs
         
     Returns:
         Tuple containing:
@@ -37,45 +42,15 @@ def validate_modules(pice_data: Dict[str, Any]) -> Tuple[float, List[Dict[str, A
         logger.warning("No modules found in PICE")
         return 100.0, []
     
-    valid_count = 0
-    drift_issues = []
-    
-    for module in modules:
-        if "name" not in module:
-            logger.error("Module missing 'name' attribute")
-            drift_issues.append({
-                "type": "module",
-                "path": "unknown",
-                "issue": "Module missing 'name' attribute"
-            })
-            continue
-        
-        module_name = module["name"]
-        logger.info(f"Validating module: {module_name}")
-        
-        # Check if module exists
-        if not check_module_exists(module_name):
-            logger.error(f"Module {module_name} does not exist")
-            drift_issues.append({
-                "type": "module",
-                "path": module_name,
-                "issue": "Module file does not exist"
-            })
-            continue
-        
-        # Check if module is importable
-        if not check_module_importable(module_name):
-            logger.error(f"Module {module_name} is not importable")
-            drift_issues.append({
-                "type": "module",
-                "path": module_name,
-                "issue": "Module cannot be imported (syntax errors or missing dependencies)"
-            })
-            continue
-        
-        # If we get here, the module is valid
-        valid_count += 1
-        logger.info(f"Module {module_name} validated successfully")
+    results = run_cached_checks(
+        cache,
+        "module",
+        modules,
+        lambda module: get_module_dependencies(module, cache),
+        check_modules
+    )
+    valid_count = sum(1 for result in results if result["valid"])
+    drift_issues = [issue for result in results for issue in result["issues"]]
     
     # Calculate health score
     health_score = (valid_count / len(modules)) * 100 if modules else 100.0
@@ -83,6 +58,107 @@ def validate_modules(pice_data: Dict[str, Any]) -> Tuple[float, List[Dict[str, A
     
     return health_score, drift_issues
 
+def check_modules(modules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Check a batch of modules, importing the existing module files in parallel
+    worker processes.
+    
+    Args:
+        modules: Module entries from the PICE
+        
+    Returns:
+        List with one result per module, each a dictionary with "valid" and
+        the list of "issues" found
+    """
+    exists = {}
+    for module in modules:
+        if "name" in module and module["name"] not in exists:
+            exists[module["name"]] = check_module_exists(module["name"])
+    
+    to_import = [module_name for module_name, found in exists.items() if found]
+    importable = dict(zip(to_import, check_importable([get_module_import_target(name) for name in to_import])))
+    
+    return [check_module(module, exists, importable) for module in modules]
+
+def check_module(module: Dict[str, Any], exists: Dict[str, bool], importable: Dict[str, Optional[bool]]) -> Dict[str, Any]:
+    """
+    Check one module, given the outcome of its file and import checks.
+    
+    Args:
+        module: Module entry from the PICE
+        exists: Whether the file of each module exists, by module name
+        importable: Whether each existing module imported, by module name, or
+            None if its worker process died
+        
+    Returns:
+        Dictionary with "valid" and the list of "issues" found
+    """
+    if "name" not in module:
+        logger.error("Module missing 'name' attribute")
+        return {"valid": False, "issues": [{
+            "type": "module",
+            "path": "unknown",
+            "issue": "Module missing 'name' attribute"
+        }]}
+    
+    module_name = module["name"]
+    logger.info(f"Validating module: {module_name}")
+    
+    # Check if module exists
+    if not exists[module_name]:
+        logger.error(f"Module {module_name} does not exist")
+        return {"valid": False, "issues": [{
+            "type": "module",
+            "path": module_name,
+            "issue": "Module file does not exist"
+        }]}
+    
+    # Check if module is importable
+    if not importable[module_name]:
+        logger.error(f"Module {module_name} is not importable")
+        # A worker process that died says nothing about the next run
+        return {"valid": False, "cacheable": importable[module_name] is not None, "issues": [{
+            "type": "module",
+            "path": module_name,
+            "issue": "Module cannot be imported (syntax errors or missing dependencies)"
+        }]}
+    
+    # If we get here, the module is valid
+    logger.info(f"Module {module_name} validated successfully")
+    return {"valid": True, "issues": []}
+
+def get_module_dependencies(module: Dict[str, Any], cache: Optional[ValidationCache]) -> List[str]:
+    """
+    Get the files the check of a module depends on.
+    
+    Args:
+        module: Module entry from the PICE
+        cache: Cache used to look up the module's first-party imports
+        
+    Returns:
+        The module file followed by the first-party files it imports
+    """
+    if "name" not in module or cache is None:
+        return []
+    
+    _, full_path = get_module_import_target(module["name"])
+    base_path = os.environ.get("PROMETHIOS_BASE_PATH", "")
+    return [full_path] + cache.import_dependencies(full_path, base_path)
+
+def get_module_import_target(module_name: str) -> Tuple[str, str]:
+    """
+    Get the import path and file path a module is imported from.
+    
+    Args:
+        module_name: Name of the module (e.g., "auth.login")
+        
+    Returns:
+        Tuple of import path and full path to the module file
+    """
+    file_path = convert_module_name_to_path(module_name)
+    base_path = os.environ.get("PROMETHIOS_BASE_PATH", "")
+    return convert_module_name_to_import_path(module_name), os.path.join(base_path, file_path.lstrip('/'))
+
 def check_module_exists(module_name: str) -> bool:
     """
     Check if a module file exists.
@@ -108,39 +184,24 @@ def check_module_importable(module_name: str) -> bool:
     """
     Check if a module can be imported without errors.
     
+    The module is imported in a worker process, so its module-level code
+    does not run in this interpreter.
+    
     Args:
         module_name: Name of the module to check
         
     Returns:
         True if the module can be imported, False otherwise
     """
-    # Convert module name to file path and import path
-    file_path = convert_module_name_to_path(module_name)
-    import_path = convert_module_name_to_import_path(module_name)
-    
-    # Get full path to module file
-    base_path = os.environ.get("PROMETHIOS_BASE_PATH", "")
-    full_path = os.path.join(base_path, file_path.lstrip('/'))
+    import_path, full_path = get_module_import_target(module_name)
     
     if not os.path.isfile(full_path):
         logger.debug(f"Cannot import {module_name}: file not found at {full_path}")
         return False
     
-    try:
-        # Try to import the module
-        spec = importlib.util.spec_from_file_location(import_path, full_path)
-        if spec is None:
-            logger.debug(f"Cannot import {module_name}: spec_from_file_location returned None")
-            return False
-        
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        
-        logger.debug(f"Successfully imported {module_name}")
-        return True
-    except Exception as e:
-        logger.debug(f"Error importing {module_name}: {str(e)}")
-        return False
+    importable = bool(check_importable([(import_path, full_path)])[0])
+    logger.debug(f"{'Successfully imported' if importable else 'Error importing'} {module_name}")
+    return importable
 
 def convert_module_name_to_path(module_name: str) -> str:
     """
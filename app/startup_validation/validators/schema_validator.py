@@ -9,17 +9,23 @@ import os
 import json
 import jsonschema
 import logging
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
+
+from app.startup_validation.utils.validation_cache import ValidationCache, run_cached_checks
 
 # Configure logging
 logger = logging.getLogger('startup_validation.schema_validator')
 
-def validate_schemas(pice_data: Dict[str, Any]) -> Tuple[float, List[Dict[str, Any]]]:
+def validate_schemas(pice_data: Dict[str, Any], cache: Optional[ValidationCache] = None) -> Tuple[float, List[Dict[str, Any]]]:
     """
     Validate all schemas listed in the PICE.
     
+    Schemas whose file is unchanged since the result stored in the cache are
+    not parsed again.
+    
     Args:
         pice_data: The loaded PICE data
+        cache: Optional cache of check results from earlier runs
         
     Returns:
         Tuple containing:
@@ -37,55 +43,15 @@ def validate_schemas(pice_data: Dict[str, Any]) -> Tuple[float, List[Dict[str, A
         logger.warning("No schemas found in PICE")
         return 100.0, []
     
-    valid_count = 0
-    drift_issues = []
-    
-    for schema in schemas:
-        if "name" not in schema:
-            logger.error("Schema missing 'name' attribute")
-            drift_issues.append({
-                "type": "schema",
-                "path": "unknown",
-                "issue": "Schema missing 'name' attribute"
-            })
-            continue
-            
-        if "file" not in schema:
-            logger.error(f"Schema {schema['name']} missing 'file' attribute")
-            drift_issues.append({
-                "type": "schema",
-                "path": schema['name'],
-                "issue": "Schema missing 'file' attribute"
-            })
-            continue
-        
-        schema_name = schema["name"]
-        schema_file = schema["file"]
-        logger.info(f"Validating schema: {schema_name} (file: {schema_file})")
-        
-        # Check if schema exists
-        if not check_schema_exists(schema_file):
-            logger.error(f"Schema file {schema_file} does not exist")
-            drift_issues.append({
-                "type": "schema",
-                "path": schema_file,
-                "issue": "Schema file does not exist"
-            })
-            continue
-        
-        # Check if schema is parseable
-        if not check_schema_parseable(schema_file):
-            logger.error(f"Schema {schema_name} is not parseable")
-            drift_issues.append({
-                "type": "schema",
-                "path": schema_file,
-                "issue": "Schema cannot be parsed (invalid JSON Schema)"
-            })
-            continue
-        
-        # If we get here, the schema is valid
-        valid_count += 1
-        logger.info(f"Schema {schema_name} validated successfully")
+    results = run_cached_checks(
+        cache,
+        "schema",
+        schemas,
+        get_schema_dependencies,
+        lambda batch: [check_schema(schema) for schema in batch]
+    )
+    valid_count = sum(1 for result in results if result["valid"])
+    drift_issues = [issue for result in results for issue in result["issues"]]
     
     # Calculate health score
     health_score = (valid_count / len(schemas)) * 100 if schemas else 100.0
@@ -93,6 +59,89 @@ def validate_schemas(pice_data: Dict[str, Any]) -> Tuple[float, List[Dict[str, A
     
     return health_score, drift_issues
 
+def check_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check one schema.
+    
+    Args:
+        schema: Schema entry from the PICE
+        
+    Returns:
+        Dictionary with "valid" and the list of "issues" found
+    """
+    if "name" not in schema:
+        logger.error("Schema missing 'name' attribute")
+        return {"valid": False, "issues": [{
+            "type": "schema",
+            "path": "unknown",
+            "issue": "Schema missing 'name' attribute"
+        }]}
+        
+    if "file" not in schema:
+        logger.error(f"Schema {schema['name']} missing 'file' attribute")
+        return {"valid": False, "issues": [{
+            "type": "schema",
+            "path": schema['name'],
+            "issue": "Schema missing 'file' attribute"
+        }]}
+    
+    schema_name = schema["name"]
+    schema_file = schema["file"]
+    logger.info(f"Validating schema: {schema_name} (file: {schema_file})")
+    
+    # Check if schema exists
+    if not check_schema_exists(schema_file):
+        logger.error(f"Schema file {schema_file} does not exist")
+        return {"valid": False, "issues": [{
+            "type": "schema",
+            "path": schema_file,
+            "issue": "Schema file does not exist"
+        }]}
+    
+    # Check if schema is parseable
+    if not check_schema_parseable(schema_file):
+        logger.error(f"Schema {schema_name} is not parseable")
+        return {"valid": False, "issues": [{
+            "type": "schema",
+            "path": schema_file,
+            "issue": "Schema cannot be parsed (invalid JSON Schema)"
+        }]}
+    
+    # If we get here, the schema is valid
+    logger.info(f"Schema {schema_name} validated successfully")
+    return {"valid": True, "issues": []}
+
+def get_schema_dependencies(schema: Dict[str, Any]) -> List[str]:
+    """
+    Get the files the check of a schema depends on.
+    
+    Args:
+        schema: Schema entry from the PICE
+        
+    Returns:
+        List with the schema file, if the entry names one
+    """
+    if "name" not in schema or "file" not in schema:
+        return []
+    return [get_schema_file_path(schema["file"])]
+
+def get_schema_file_path(schema_path: str) -> str:
+    """
+    Get the full path to a schema file.
+    
+    Args:
+        schema_path: Path to the schema, relative to /app/schemas/ unless absolute
+        
+    Returns:
+        Full path to the schema file
+    """
+    # Normalize schema path
+    if not schema_path.startswith('/'):
+        schema_path = f"/app/schemas/{schema_path}"
+    
+    base_path = os.environ.get("PROMETHIOS_BASE_PATH", "")
+    return os.path.join(base_path, schema_path.lstrip('/'))
+
 def check_schema_exists(schema_path: str) -> bool:
     """
     Check if a schema file exists.
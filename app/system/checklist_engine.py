@@ -32,6 +32,9 @@ except ImportError:
     jsonschema = None
     print("Warning: jsonschema module not available. Using basic validation.")
 
+if jsonschema is not None:
+    from app.utils.compiled_schemas import get_schema_registry
+
 
 class ChecklistEngine:
     """
@@ -460,15 +463,13 @@ class ChecklistEngine:
             Tuple[bool, str]: A tuple of (is_valid, error_message).
         """
         try:
-            # Load the schema
-            with open(self.schema_file, 'r') as f:
-                schema = json.load(f)
-            
             # Validate the checklist
             if jsonschema:
-                jsonschema.validate(instance=checklist, schema=schema)
+                get_schema_registry().validate(self.schema_file, checklist)
             else:
                 # Basic validation without jsonschema
+                with open(self.schema_file, 'r') as f:
+                    schema = json.load(f)
                 self._basic_validate(checklist, schema)
             
             return True, ""
@@ -7,11 +7,16 @@ into agent memory for better context awareness.
 
 import os
 import sys
+import asyncio
 import logging
 import tempfile
-from typing import Dict, Any, List, Optional, Union
+from dataclasses import asdict
+from itertools import islice
+from typing import Dict, Any, AsyncIterator, List, Optional, Union
 import git
 
+from app.core.repo_scanner import RepoScanner, get_repo_manifest
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,14 +26,16 @@ class RepoLoader:
     Tool for loading the structure of a GitHub repository into agent memory.
     """
     
-    def __init__(self, memory_manager=None):
+    def __init__(self, memory_manager=None, scanner: Optional[RepoScanner] = None):
         """
         Initialize the RepoLoader.
         
         Args:
             memory_manager: Optional memory manager for storing repository structure
+            scanner: Optional scanner; defaults to one backed by the shared scan manifest
         """
         self.memory_manager = memory_manager
+        self.scanner = scanner or RepoScanner(get_repo_manifest())
     
     async def run(
         self,
@@ -38,11 +45,15 @@ class RepoLoader:
         exclude_dirs: Optional[List[str]] = None,
         max_file_size: int = 1024 * 1024,  # 1MB
         store_memory: bool = True,
-        memory_tags: Optional[List[str]] = None
+        memory_tags: Optional[List[str]] = None,
+        respect_gitignore: bool = True
     ) -> Dict[str, Any]:
         """
         Load the structure of a GitHub repository.
         
+        Files unchanged since a previous load are not reread; see
+        app.core.repo_scanner.
+        
         Args:
             repo_path: Path to the local repository
             include_file_contents: Whether to include file contents in the result
@@ -51,6 +62,7 @@ class RepoLoader:
             max_file_size: Maximum file size to include contents for (in bytes)
             store_memory: Whether to store repository structure in memory
             memory_tags: Tags to apply to memory entries
+            respect_gitignore: Whether to skip files matched by .gitignore
             
         Returns:
             Dictionary containing repository structure
@@ -69,13 +81,11 @@ class RepoLoader:
                     "error": f"Repository path is not a directory: {repo_path}"
                 }
             
-            # Set default file types if not provided
+            # Set default file types and exclude dirs if not provided
             if file_types is None:
-                file_types = ['.py', '.js', '.ts', '.html', '.css', '.md', '.json', '.yaml', '.yml']
-            
-            # Set default exclude dirs if not provided
+                file_types = DEFAULT_FILE_TYPES
             if exclude_dirs is None:
-                exclude_dirs = ['node_modules', 'venv', '.venv', 'env', '.env', '__pycache__', '.git', 'dist', 'build']
+                exclude_dirs = DEFAULT_EXCLUDE_DIRS
             
             # Check if it's a git repository
             try:
@@ -103,14 +113,17 @@ class RepoLoader:
                     "is_git_repo": False
                 }
             
-            # Scan repository structure
-            structure = self._scan_directory(
+            # Scan repository structure off the event loop
+            structure, scan_stats = await asyncio.to_thread(
+                self.scanner.scan_tree,
                 repo_path,
-                include_file_contents,
-                file_types,
-                exclude_dirs,
-                max_file_size
+                include_contents=include_file_contents,
+                file_types=file_types,
+                exclude_dirs=exclude_dirs,
+                max_file_size=max_file_size,
+                respect_gitignore=respect_gitignore
             )
+            logger.info(f"Scanned {repo_path}: {scan_stats}")
             
             # Prepare result
             result = {
@@ -118,7 +131,8 @@ class RepoLoader:
                 "repo_path": repo_path,
                 "is_git_repo": is_git_repo,
                 "repo_info": repo_info,
-                "structure": structure
+                "structure": structure,
+                "scan_stats": scan_stats
             }
             
             # Store in memory if requested
@@ -157,85 +171,54 @@ class RepoLoader:
                 "traceback": self._get_exception_traceback()
             }
     
-    def _scan_directory(
+    async def stream_files(
         self,
-        directory: str,
-        include_file_contents: bool,
-        file_types: List[str],
-        exclude_dirs: List[str],
-        max_file_size: int,
-        relative_path: str = ""
-    ) -> Dict[str, Any]:
+        repo_path: str,
+        include_file_contents: bool = False,
+        file_types: Optional[List[str]] = None,
+        exclude_dirs: Optional[List[str]] = None,
+        max_file_size: int = 1024 * 1024,
+        respect_gitignore: bool = True,
+        batch_size: int = 200
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Recursively scan a directory and build its structure.
+        Stream file records of a repository as they are found.
+        
+        Unlike run, no tree is built and nothing is stored in memory; files
+        are scanned in a worker thread batch_size at a time.
         
         Args:
-            directory: Directory to scan
+            repo_path: Path to the local repository
             include_file_contents: Whether to include file contents
-            file_types: List of file extensions to include
-            exclude_dirs: List of directories to exclude
-            max_file_size: Maximum file size to include contents for
-            relative_path: Relative path from the repository root
+            file_types: Optional list of file extensions to include
+            exclude_dirs: Optional list of directories to exclude
+            max_file_size: Maximum file size to include contents for (in bytes)
+            respect_gitignore: Whether to skip files matched by .gitignore
+            batch_size: Records fetched from the scanner per thread hop
             
-        Returns:
-            Dictionary containing directory structure
+        Yields:
+            Dicts with name, path, extension, size, mtime_ns, sha1 and contents
         """
-        files = []
-        directories = []
+        if not os.path.isdir(repo_path):
+            raise NotADirectoryError(f"Repository path is not a directory: {repo_path}")
         
-        for item in os.listdir(directory):
-            item_path = os.path.join(directory, item)
-            item_relative_path = os.path.join(relative_path, item) if relative_path else item
-            
-            if os.path.isdir(item_path):
-                # Skip excluded directories
-                if item in exclude_dirs:
-                    continue
-                
-                # Recursively scan subdirectory
-                subdirectory = self._scan_directory(
-                    item_path,
-                    include_file_contents,
-                    file_types,
-                    exclude_dirs,
-                    max_file_size,
-                    item_relative_path
-                )
-                
-                directories.append({
-                    "name": item,
-                    "path": item_relative_path,
-                    "structure": subdirectory
-                })
-            
-            elif os.path.isfile(item_path):
-                # Check file extension
-                _, ext = os.path.splitext(item)
-                if file_types and ext.lower() not in file_types:
-                    continue
-                
-                file_info = {
-                    "name": item,
-                    "path": item_relative_path,
-                    "extension": ext.lower(),
-                    "size": os.path.getsize(item_path)
-                }
-                
-                # Include file contents if requested and file is not too large
-                if include_file_contents and os.path.getsize(item_path) <= max_file_size:
-                    try:
-                        with open(item_path, 'r', encoding='utf-8') as f:
-                            file_info["contents"] = f.read()
-                    except UnicodeDecodeError:
-                        # Skip binary files
-                        file_info["contents"] = "<binary file>"
-                
-                files.append(file_info)
-        
-        return {
-            "files": files,
-            "directories": directories
-        }
+        records = self.scanner.iter_files(
+            repo_path,
+            include_contents=include_file_contents,
+            file_types=DEFAULT_FILE_TYPES if file_types is None else file_types,
+            exclude_dirs=DEFAULT_EXCLUDE_DIRS if exclude_dirs is None else exclude_dirs,
+            max_file_size=max_file_size,
+            respect_gitignore=respect_gitignore
+        )
+        try:
+            while True:
+                batch = await asyncio.to_thread(lambda: list(islice(records, batch_size)))
+                if not batch:
+                    return
+                for record in batch:
+                    yield asdict(record)
+        finally:
+            records.close()
     
     def _get_exception_traceback(self) -> str:
         """
@@ -247,6 +230,9 @@ class RepoLoader:
         import traceback
         return traceback.format_exc()
 
+DEFAULT_FILE_TYPES = ['.py', '.js', '.ts', '.html', '.css', '.md', '.json', '.yaml', '.yml']
+DEFAULT_EXCLUDE_DIRS = ['node_modules', 'venv', '.venv', 'env', '.env', '__pycache__', '.git', 'dist', 'build']
+
 # Factory function for tool router
 def get_repo_loader(memory_manager=None):
     """
@@ -6,6 +6,7 @@ from spreadsheet files in various formats (CSV, Excel, Google Sheets).
 """
 
 import os
+import re
 import json
 import time
 import random
@@ -13,6 +14,10 @@ from typing import Dict, List, Any, Optional, Union
 import logging
 from datetime import datetime
 
+import numpy as np
+
+from app.core.column_table import COMPARE_OPERATORS, Column, ColumnTable, is_date_string
+
 # Configure logging
 logger = logging.getLogger("spreadsheet_analyzer")
 
@@ -67,14 +72,11 @@ def run(
         if operation not in SUPPORTED_OPERATIONS:
             raise ValueError(f"Unsupported operation: {operation}. Supported operations: {', '.join(SUPPORTED_OPERATIONS)}")
             
-        # In a real implementation, this would use pandas, openpyxl, or similar libraries
-        # For now, we'll simulate the spreadsheet analysis
-        
         # Detect file format
         file_format = _detect_file_format(file_path)
         
-        # Load data (simulated)
-        data, metadata = _simulate_load_data(file_path, file_format, sheet_name, range)
+        # Load data into columns (CSV files are read, other formats simulated)
+        data, metadata = _load_data(file_path, file_format, sheet_name, range)
         
         # Perform the requested operation
         if operation == "analyze":
@@ -165,6 +167,80 @@ def _detect_file_format(file_path: str) -> str:
         # Default to CSV for unknown formats
         return "csv"
 
+def _load_data(
+    file_path: str,
+    file_format: str,
+    sheet_name: Optional[str],
+    range: Optional[str]
+) -> tuple:
+    """
+    Load spreadsheet data into a column table.
+    
+    CSV files are read chunk by chunk, stopping early when a range limits the
+    rows; other formats are still simulated.
+    
+    Args:
+        file_path: Path to the spreadsheet file
+        file_format: Format of the file
+        sheet_name: Name of the sheet to load
+        range: Cell range to load (e.g., "A1:D10")
+        
+    Returns:
+        Tuple of (ColumnTable, metadata)
+    """
+    if file_format != "csv" or os.path.splitext(file_path)[1].lower() != ".csv":
+        rows, metadata = _simulate_load_data(file_path, file_format, sheet_name, range)
+        return ColumnTable.from_rows(rows), metadata
+    
+    stat = os.stat(file_path)
+    metadata = {
+        "filename": os.path.basename(file_path),
+        "format": file_format,
+        "size_kb": round(stat.st_size / 1024),
+        "last_modified": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(stat.st_mtime))
+    }
+    
+    skip_rows, max_rows, column_slice = _parse_range(range) if range else (0, None, None)
+    data = ColumnTable.read_csv(
+        file_path,
+        chunk_rows=CSV_CHUNK_ROWS,
+        skip_rows=skip_rows,
+        max_rows=max_rows,
+        column_slice=column_slice
+    )
+    return data, metadata
+
+def _parse_range(cell_range: str) -> tuple:
+    """
+    Parse an A1-style cell range; row 1 is the header row.
+    
+    Args:
+        cell_range: Cell range such as "A1:D10", "B2:C" or "A:D"
+        
+    Returns:
+        Tuple of (data rows to skip, maximum data rows or None, column slice)
+    """
+    match = _RANGE_PATTERN.match(cell_range.strip())
+    if not match:
+        raise ValueError(f"Invalid cell range: {cell_range}")
+    
+    first_col, first_row, last_col, last_row = match.groups()
+    first_index, last_index = _column_index(first_col), _column_index(last_col)
+    if last_index < first_index:
+        raise ValueError(f"Invalid cell range: {cell_range}")
+    
+    first_data_row = max(int(first_row or 1), 2)
+    skip_rows = first_data_row - 2
+    max_rows = max(int(last_row) - first_data_row + 1, 0) if last_row else None
+    return skip_rows, max_rows, slice(first_index, last_index + 1)
+
+def _column_index(letters: str) -> int:
+    """Zero-based index of a spreadsheet column name (A, B, ..., AA)."""
+    index = 0
+    for letter in letters.upper():
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
 def _simulate_load_data(
     file_path: str,
     file_format: str,
@@ -416,7 +492,7 @@ def _generate_generic_data() -> List[Dict[str, Any]]:
     
     return data
 
-def _analyze_data(data: List[Dict[str, Any]], metadata: Dict[str, Any]) -> Dict[str, Any]:
+def _analyze_data(data: ColumnTable, metadata: Dict[str, Any]) -> Dict[str, Any]:
     """
     Analyze the spreadsheet data.
     
@@ -433,12 +509,12 @@ def _analyze_data(data: List[Dict[str, Any]], metadata: Dict[str, Any]) -> Dict[
     # Get column information
     columns = {}
     if row_count > 0:
-        for col_name in data[0].keys():
+        for col_name, column in data.columns.items():
             # Determine column type
-            col_type = _determine_column_type(data, col_name)
+            col_type = _determine_column_type(column)
             
             # Get column statistics
-            col_stats = _get_column_statistics(data, col_name, col_type)
+            col_stats = _get_column_statistics(column, col_type)
             
             columns[col_name] = {
                 "type": col_type,
@@ -454,122 +530,100 @@ def _analyze_data(data: List[Dict[str, Any]], metadata: Dict[str, Any]) -> Dict[
     }
     
     # Add sample data
-    summary["sample_data"] = data[:5] if row_count > 0 else []
+    summary["sample_data"] = data.take(slice(0, 5)).to_rows()
     
     return summary
 
-def _determine_column_type(data: List[Dict[str, Any]], column: str) -> str:
+def _determine_column_type(column: Column) -> str:
     """
-    Determine the data type of a column.
+    Determine the data type of a column from its first non-null value.
     
     Args:
-        data: Spreadsheet data
-        column: Column name
+        column: Column to inspect
         
     Returns:
         Data type of the column
     """
-    # Check first few non-null values
-    for row in data:
-        if column in row and row[column] is not None:
-            value = row[column]
-            
-            if isinstance(value, bool):
-                return "boolean"
-            elif isinstance(value, int):
-                return "integer"
-            elif isinstance(value, float):
-                return "float"
-            elif isinstance(value, str):
-                # Try to determine if string is a date
-                if "-" in value and len(value) >= 8:
-                    try:
-                        # Very simple date check
-                        parts = value.split("-")
-                        if len(parts) == 3 and all(part.isdigit() for part in parts):
-                            return "date"
-                    except:
-                        pass
-                return "string"
-            else:
-                return "unknown"
-    
-    return "unknown"
+    value = column.first_valid()
+    
+    if value is None:
+        return "unknown"
+    elif isinstance(value, bool):
+        return "boolean"
+    elif isinstance(value, int):
+        return "integer"
+    elif isinstance(value, float):
+        return "float"
+    elif isinstance(value, str):
+        return "date" if is_date_string(value) else "string"
+    else:
+        return "unknown"
 
-def _get_column_statistics(data: List[Dict[str, Any]], column: str, col_type: str) -> Dict[str, Any]:
+def _get_column_statistics(column: Column, col_type: str) -> Dict[str, Any]:
     """
     Get statistics for a column.
     
     Args:
-        data: Spreadsheet data
-        column: Column name
+        column: Column to summarize
         col_type: Column data type
         
     Returns:
         Dictionary with column statistics
     """
-    # Extract column values
-    values = [row[column] for row in data if column in row and row[column] is not None]
+    total = len(column)
+    values = column.valid()
+    count = len(values)
     
     # Basic statistics for all types
     stats = {
-        "count": len(values),
-        "null_count": len(data) - len(values),
-        "null_percentage": round(((len(data) - len(values)) / len(data)) * 100, 2) if len(data) > 0 else 0
+        "count": count,
+        "null_count": total - count,
+        "null_percentage": round(((total - count) / total) * 100, 2) if total > 0 else 0
     }
     
-    # Type-specific statistics
+    if not count:
+        return stats
+    
+    # Type-specific statistics; mixed-type (object) columns take the Python path
     if col_type in ["integer", "float"]:
-        if values:
-            stats.update({
-                "min": min(values),
-                "max": max(values),
-                "mean": sum(values) / len(values),
-                "sum": sum(values)
-            })
-            
-            # Calculate median
-            sorted_values = sorted(values)
-            mid = len(sorted_values) // 2
-            if len(sorted_values) % 2 == 0:
-                stats["median"] = (sorted_values[mid-1] + sorted_values[mid]) / 2
-            else:
-                stats["median"] = sorted_values[mid]
+        if column.kind == "object":
+            values = np.array(values.tolist())
+        total_value = values.sum().item()
+        sorted_values = np.sort(values)
+        mid = count // 2
+        stats.update({
+            "min": sorted_values[0].item(),
+            "max": sorted_values[-1].item(),
+            "mean": total_value / count,
+            "sum": total_value,
+            "median": (sorted_values[mid-1] + sorted_values[mid]).item() / 2 if count % 2 == 0
+                      else sorted_values[mid].item()
+        })
     
     elif col_type == "string":
-        if values:
-            # Get unique values and their counts
-            unique_values = {}
-            for value in values:
-                if value in unique_values:
-                    unique_values[value] += 1
-                else:
-                    unique_values[value] = 1
-            
-            stats.update({
-                "unique_count": len(unique_values),
-                "most_common": max(unique_values.items(), key=lambda x: x[1])[0] if unique_values else None,
-                "most_common_count": max(unique_values.values()) if unique_values else 0,
-                "min_length": min(len(str(v)) for v in values),
-                "max_length": max(len(str(v)) for v in values),
-                "avg_length": sum(len(str(v)) for v in values) / len(values)
-            })
+        unique_values, counts = column.value_counts()
+        lengths = np.array([len(str(value)) for value in unique_values])
+        stats.update({
+            "unique_count": len(unique_values),
+            "most_common": unique_values[int(np.argmax(counts))],
+            "most_common_count": int(counts.max()),
+            "min_length": int(lengths.min()),
+            "max_length": int(lengths.max()),
+            "avg_length": np.dot(lengths, counts).item() / count
+        })
     
     elif col_type == "boolean":
-        if values:
-            true_count = sum(1 for v in values if v)
-            false_count = len(values) - true_count
-            
-            stats.update({
-                "true_count": true_count,
-                "false_count": false_count,
-                "true_percentage": round((true_count / len(values)) * 100, 2)
-            })
+        true_count = int(np.count_nonzero(values.astype(bool)))
+        stats.update({
+            "true_count": true_count,
+            "false_count": count - true_count,
+            "true_percentage": round((true_count / count) * 100, 2)
+        })
     
     return stats
 
 def _filter_data(
-    data: List[Dict[str, Any]],
+    data: ColumnTable,
     filters: Optional[Dict[str, Any]],
     columns: Optional[List[str]]
 ) -> Dict[str, Any]:
@@ -588,76 +642,38 @@ def _filter_data(
     
     # Apply filters if provided
     if filters:
-        filtered_rows = []
+        mask = np.ones(len(data), dtype=bool)
         
-        for row in data:
-            matches = True
-            
-            for column, condition in filters.items():
-                if column not in row:
-                    matches = False
-                    break
-                
-                value = row[column]
-                
-                # Handle different condition types
-                if isinstance(condition, dict):
-                    # Complex condition with operators
-                    for op, op_value in condition.items():
-                        if op == "eq" and value != op_value:
-                            matches = False
-                            break
-                        elif op == "ne" and value == op_value:
-                            matches = False
-                            break
-                        elif op == "gt" and not (isinstance(value, (int, float)) and value > op_value):
-                            matches = False
-                            break
-                        elif op == "lt" and not (isinstance(value, (int, float)) and value < op_value):
-                            matches = False
-                            break
-                        elif op == "gte" and not (isinstance(value, (int, float)) and value >= op_value):
-                            matches = False
-                            break
-                        elif op == "lte" and not (isinstance(value, (int, float)) and value <= op_value):
-                            matches = False
-                            break
-                        elif op == "contains" and not (isinstance(value, str) and op_value in value):
-                            matches = False
-                            break
-                        elif op == "startswith" and not (isinstance(value, str) and value.startswith(op_value)):
-                            matches = False
-                            break
-                        elif op == "endswith" and not (isinstance(value, str) and value.endswith(op_value)):
-                            matches = False
-                            break
-                else:
-                    # Simple equality condition
-                    if value != condition:
-                        matches = False
-                        break
+        for column, condition in filters.items():
+            if column not in data:
+                mask[:] = False
+                break
             
-            if matches:
-                filtered_rows.append(row)
+            # Complex conditions map operators to values; unknown operators are ignored
+            if isinstance(condition, dict):
+                for op, op_value in condition.items():
+                    if op in COMPARE_OPERATORS:
+                        mask &= data[column].compare(op, op_value)
+            else:
+                mask &= data[column].equals(condition)
         
-        filtered_data = filtered_rows
+        filtered_data = data.take(mask)
     
     # Select columns if provided
     if columns:
-        filtered_data = [
-            {col: row[col] for col in columns if col in row}
-            for row in filtered_data
-        ]
+        filtered_data = filtered_data.select(columns)
+    
+    rows = filtered_data.to_rows() if filtered_data.columns else [{} for _ in range(len(filtered_data))]
     
     return {
-        "filtered_data": filtered_data,
-        "row_count": len(filtered_data),
+        "filtered_data": rows,
+        "row_count": len(rows),
         "filters_applied": filters,
         "columns_selected": columns
     }
 
 def _aggregate_data(
-    data: List[Dict[str, Any]],
+    data: ColumnTable,
     groupby: Optional[List[str]],
     aggregations: Optional[Dict[str, str]]
 ) -> Dict[str, Any]:
@@ -677,62 +693,29 @@ def _aggregate_data(
             "error": "Group by columns and aggregations are required for aggregation"
         }
     
-    # Group data
-    groups = {}
-    
-    for row in data:
-        # Create group key
-        group_values = []
-        for col in groupby:
-            if col in row:
-                group_values.append(str(row[col]))
-            else:
-                group_values.append("None")
-        
-        group_key = tuple(group_values)
-        
-        # Add row to group
-        if group_key in groups:
-            groups[group_key].append(row)
-        else:
-            groups[group_key] = [row]
+    # Group data; group values are the str() of the cell, "None" when missing
+    groups, group_keys = data.group_by(groupby)
+    result = [dict(zip(groupby, group_key)) for group_key in group_keys]
     
     # Apply aggregations
-    result = []
-    
-    for group_key, group_rows in groups.items():
-        group_result = {}
+    for col, agg_func in aggregations.items():
+        key = f"{col}_{agg_func}"
         
-        # Add group by columns
-        for i, col in enumerate(groupby):
-            group_result[col] = group_key[i]
+        if col not in data:
+            for group_result in result:
+                group_result[key] = None
+            continue
         
-        # Apply aggregations
-        for col, agg_func in aggregations.items():
-            # Extract values
-            values = [row[col] for row in group_rows if col in row and row[col] is not None]
-            
-            if not values:
-                group_result[f"{col}_{agg_func}"] = None
-                continue
-            
-            # Apply aggregation function
-            if agg_func == "sum":
-                group_result[f"{col}_{agg_func}"] = sum(values)
-            elif agg_func == "avg":
-                group_result[f"{col}_{agg_func}"] = sum(values) / len(values)
-            elif agg_func == "min":
-                group_result[f"{col}_{agg_func}"] = min(values)
-            elif agg_func == "max":
-                group_result[f"{col}_{agg_func}"] = max(values)
-            elif agg_func == "count":
-                group_result[f"{col}_{agg_func}"] = len(values)
-            elif agg_func == "first":
-                group_result[f"{col}_{agg_func}"] = values[0]
-            elif agg_func == "last":
-                group_result[f"{col}_{agg_func}"] = values[-1]
+        if agg_func in AGGREGATION_FUNCTIONS:
+            values = data[col].aggregate(groups, len(group_keys), agg_func)
+        else:
+            # Unknown functions only report groups without values
+            counts = data[col].aggregate(groups, len(group_keys), "count")
+            values = [None if value is None else _NO_VALUE for value in counts]
         
-        result.append(group_result)
+        for group_result, value in zip(result, values):
+            if value is not _NO_VALUE:
+                group_result[key] = value
     
     return {
         "aggregated_data": result,
@@ -742,7 +725,7 @@ def _aggregate_data(
     }
 
 def _pivot_data(
-    data: List[Dict[str, Any]],
+    data: ColumnTable,
     groupby: List[str],
     columns: List[str],
     aggregations: Dict[str, str]
@@ -826,8 +809,36 @@ def _pivot_data(
         "aggregations_applied": aggregations
     }
 
+def _numeric_columns(data: ColumnTable) -> List[str]:
+    """
+    Columns whose first row holds a number (booleans included).
+    
+    Args:
+        data: Spreadsheet data
+        
+    Returns:
+        List of column names
+    """
+    if not len(data):
+        return []
+    return [name for name, column in data.columns.items() if column.numeric_mask()[0]]
+
+def _numeric_values(column: Column, mask: np.ndarray) -> np.ndarray:
+    """
+    Numeric values of a column at a mask of numeric cells.
+    
+    Args:
+        column: Column to read
+        mask: Cells to read; must only select numbers
+        
+    Returns:
+        Array of the selected values
+    """
+    values = column.values[mask]
+    return values if column.is_numeric else np.array(values.tolist(), dtype=np.float64)
+
 def _describe_data(
-    data: List[Dict[str, Any]],
+    data: ColumnTable,
     columns: Optional[List[str]]
 ) -> Dict[str, Any]:
     """
@@ -842,51 +853,32 @@ def _describe_data(
     """
     # If columns not specified, use all numeric columns
     if not columns:
-        columns = []
-        if data:
-            for col, value in data[0].items():
-                if isinstance(value, (int, float)):
-                    columns.append(col)
+        columns = _numeric_columns(data)
     
     # Calculate statistics for each column
     stats = {}
     
     for col in columns:
-        # Extract values
-        values = [row[col] for row in data if col in row and row[col] is not None and isinstance(row[col], (int, float))]
-        
-        if not values:
+        if col not in data:
             continue
         
-        # Calculate statistics
-        count = len(values)
-        mean = sum(values) / count
-        
-        # Calculate variance and standard deviation
-        variance = sum((x - mean) ** 2 for x in values) / count
-        std_dev = variance ** 0.5
-        
-        # Calculate percentiles
-        sorted_values = sorted(values)
+        values = _numeric_values(data[col], data[col].numeric_mask())
+        if not len(values):
+            continue
         
-        def percentile(p):
-            k = (count - 1) * p
-            f = int(k)
-            c = k - f
-            if f + 1 < count:
-                return sorted_values[f] + c * (sorted_values[f+1] - sorted_values[f])
-            else:
-                return sorted_values[f]
+        # Booleans are summed as integers but reported as-is for min/max
+        numbers = values.astype(np.int64) if values.dtype == bool else values
+        percentiles = np.percentile(numbers, [25, 50, 75])
         
         stats[col] = {
-            "count": count,
-            "mean": mean,
-            "std": std_dev,
-            "min": min(values),
-            "25%": percentile(0.25),
-            "50%": percentile(0.5),
-            "75%": percentile(0.75),
-            "max": max(values)
+            "count": len(values),
+            "mean": numbers.sum().item() / len(values),
+            "std": float(np.std(numbers)),
+            "min": values.min().item(),
+            "25%": percentiles[0].item(),
+            "50%": percentiles[1].item(),
+            "75%": percentiles[2].item(),
+            "max": values.max().item()
         }
     
     return {
@@ -895,7 +887,7 @@ def _describe_data(
     }
 
 def _correlate_data(
-    data: List[Dict[str, Any]],
+    data: ColumnTable,
     columns: Optional[List[str]]
 ) -> Dict[str, Any]:
     """
@@ -910,11 +902,12 @@ def _correlate_data(
     """
     # If columns not specified, use all numeric columns
     if not columns:
-        columns = []
-        if data:
-            for col, value in data[0].items():
-                if isinstance(value, (int, float)):
-                    columns.append(col)
+        columns = _numeric_columns(data)
+    
+    masks = {
+        col: data[col].numeric_mask() if col in data else np.zeros(len(data), dtype=bool)
+        for col in columns
+    }
     
     # Calculate correlation matrix
     correlation_matrix = {}
@@ -923,41 +916,27 @@ def _correlate_data(
         correlation_matrix[col1] = {}
         
         for col2 in columns:
-            # Extract paired values
-            pairs = [
-                (row[col1], row[col2])
-                for row in data
-                if col1 in row and col2 in row
-                and row[col1] is not None and row[col2] is not None
-                and isinstance(row[col1], (int, float)) and isinstance(row[col2], (int, float))
-            ]
-            
-            if not pairs:
-                correlation_matrix[col1][col2] = None
-                continue
-            
-            # Calculate correlation coefficient
-            x_values = [p[0] for p in pairs]
-            y_values = [p[1] for p in pairs]
-            
-            n = len(pairs)
+            # Rows where both values are numbers
+            pairs = masks[col1] & masks[col2]
+            n = int(np.count_nonzero(pairs))
             
             if n <= 1:
                 correlation_matrix[col1][col2] = None
                 continue
             
-            # Calculate means
-            x_mean = sum(x_values) / n
-            y_mean = sum(y_values) / n
+            x_values = _numeric_values(data[col1], pairs).astype(np.float64)
+            y_values = _numeric_values(data[col2], pairs).astype(np.float64)
+            x_deviation = x_values - x_values.mean()
+            y_deviation = y_values - y_values.mean()
             
             # Calculate covariance and variances
-            covariance = sum((x - x_mean) * (y - y_mean) for x, y in pairs) / n
-            x_variance = sum((x - x_mean) ** 2 for x in x_values) / n
-            y_variance = sum((y - y_mean) ** 2 for y in y_values) / n
+            covariance = np.dot(x_deviation, y_deviation) / n
+            x_variance = np.dot(x_deviation, x_deviation) / n
+            y_variance = np.dot(y_deviation, y_deviation) / n
             
             # Calculate correlation coefficient
             if x_variance > 0 and y_variance > 0:
-                correlation = covariance / ((x_variance * y_variance) ** 0.5)
+                correlation = float(covariance / ((x_variance * y_variance) ** 0.5))
             else:
                 correlation = None
             
@@ -1066,3 +1045,14 @@ SUPPORTED_OPERATIONS = [
     "describe",
     "correlate"
 ]
+
+# Aggregation functions understood by _aggregate_data
+AGGREGATION_FUNCTIONS = ["sum", "avg", "min", "max", "count", "first", "last"]
+
+# Rows parsed per chunk when reading CSV files
+CSV_CHUNK_ROWS = 65536
+
+_RANGE_PATTERN = re.compile(r"^([A-Za-z]+)(\d*):([A-Za-z]+)(\d*)$")
+
+# Marks aggregation results that are left out of a group
+_NO_VALUE = object()
@@ -0,0 +1,260 @@
+"""
+Compiled JSON Schema Registry
+
+Loads JSON schemas from `app/schemas` and `schemas/` on first use, checks them
+once and keeps the resulting validator objects for reuse. Callers used to
+re-read the schema file and rebuild a validator (including the meta-schema
+check done by `jsonschema.validate`) on every call.
+
+- Schemas are referenced by absolute path, a path relative to the working
+  directory or repository root, a path relative to one of the schema roots,
+  or a unique file name.
+- A file's validator is rebuilt when its mtime or size changes. Files are
+  re-stat'ed at most every `reload_interval` seconds.
+- `$ref`s to other schema files are resolved through the same cache.
+- `is_valid` is the fast path and stops at the first error; `iter_errors`
+  yields errors lazily; `validate` raises the best-matching error like
+  `jsonschema.validate`.
+- As in `jsonschema.validate`, the draft is picked from a schema's `$schema`
+  and defaults to the latest one jsonschema supports; passing `cls` uses that
+  validator class instead, like instantiating it directly.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlparse
+
+import jsonschema
+from jsonschema.exceptions import ValidationError, best_match
+from jsonschema.validators import validator_for
+
+try:
+    from referencing import Registry, Resource
+    from referencing.jsonschema import DRAFT202012
+except ImportError:  # jsonschema < 4.18 resolves $refs with RefResolver
+    Registry = None
+
+# Configure logging
+logger = logging.getLogger("app.utils.compiled_schemas")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_ROOTS = (os.path.join(REPO_ROOT, "app", "schemas"), os.path.join(REPO_ROOT, "schemas"))
+
+# Bound on cached in-memory schemas, for callers that build a new dict per call
+MAX_INLINE_SCHEMAS = 256
+
+SchemaRef = Union[str, Dict[str, Any]]
+
+
+class CompiledSchemaRegistry:
+    """
+    Cache of checked, ready-to-use JSON schema validators.
+    """
+
+    def __init__(self, roots: Tuple[str, ...] = DEFAULT_ROOTS, reload_interval: float = 1.0):
+        """
+        Initialize the registry.
+
+        Args:
+            roots: Directories searched for schema files
+            reload_interval: Minimum seconds between mtime checks of a file
+        """
+        self.roots = tuple(os.path.abspath(root) for root in roots)
+        self.reload_interval = reload_interval
+
+        self._lock = threading.RLock()
+        # abs path -> [checked_at, (mtime_ns, size), schema, {cls: validator}]
+        self._files: Dict[str, List[Any]] = {}
+        # (id(schema dict), cls) -> (schema, validator) for in-memory schemas;
+        # a dict is assumed not to be mutated after it has been compiled
+        self._inline: Dict[Tuple[int, Any], Tuple[Dict[str, Any], Any]] = {}
+        # schema reference -> abs path
+        self._aliases: Dict[str, str] = {}
+        # file name -> abs paths, built on first name lookup
+        self._names: Optional[Dict[str, List[str]]] = None
+        self._compiles = 0
+
+        self._registry = Registry(retrieve=self._retrieve) if Registry is not None else None
+
+    # -- lookup ---------------------------------------------------------
+
+    def resolve_path(self, ref: str) -> str:
+        """
+        Resolve a schema reference to an absolute file path.
+
+        Raises:
+            FileNotFoundError: If no schema file matches
+        """
+        candidates = [ref, os.path.join(REPO_ROOT, ref)] + [os.path.join(root, ref) for root in self.roots]
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                return os.path.abspath(candidate)
+
+        for rescan in (False, True):
+            matches = self._name_index(rescan).get(os.path.basename(ref), [])
+            if len(matches) == 1:
+                return matches[0]
+            if len(matches) > 1:
+                raise FileNotFoundError(f"Schema name {ref} is ambiguous: {matches}")
+        raise FileNotFoundError(f"Schema file not found: {ref}")
+
+    def _name_index(self, rescan: bool = False) -> Dict[str, List[str]]:
+        with self._lock:
+            if self._names is None or rescan:
+                names: Dict[str, List[str]] = {}
+                for root in self.roots:
+                    for dirpath, dirnames, filenames in os.walk(root):
+                        dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+                        for filename in filenames:
+                            if filename.endswith(".json"):
+                                names.setdefault(filename, []).append(os.path.join(dirpath, filename))
+                self._names = names
+            return self._names
+
+    def names(self) -> List[str]:
+        """List the schema files under the schema roots, relative to the repository root."""
+        return sorted(
+            os.path.relpath(path, REPO_ROOT) for paths in self._name_index(True).values() for path in paths
+        )
+
+    # -- compilation ----------------------------------------------------
+
+    def _compile(self, schema: Dict[str, Any], uri: Optional[str] = None, cls=None):
+        if cls is None:
+            cls = validator_for(schema)
+        cls.check_schema(schema)
+        self._compiles += 1
+        if self._registry is not None:
+            if uri and "$id" not in schema:
+                # Gives relative file $refs a base to resolve against
+                schema = {**schema, "$id": uri}
+            return cls(schema, registry=self._registry)
+        resolver = jsonschema.RefResolver(base_uri=uri or "", referrer=schema, handlers={"file": self._load_uri})
+        return cls(schema, resolver=resolver)
+
+    def _load_file(self, path: str) -> List[Any]:
+        now = time.monotonic()
+        entry = self._files.get(path)
+        if entry is not None and now - entry[0] < self.reload_interval:
+            return entry
+
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is not None and entry[1] == signature:
+                entry[0] = now
+                return entry
+            with open(path, "r") as f:
+                schema = json.load(f)
+            if entry is not None:
+                logger.info(f"Reloading changed schema {path}")
+            entry = [now, signature, schema, {}]
+            self._files[path] = entry
+            return entry
+
+    def _load_uri(self, uri: str) -> Dict[str, Any]:
+        return self._load_file(unquote(urlparse(uri).path))[2]
+
+    def _retrieve(self, uri: str):
+        # Same default as jsonschema for retrieved schemas without $schema
+        return Resource.from_contents(self._load_uri(uri), default_specification=DRAFT202012)
+
+    def get_validator(self, ref: SchemaRef, cls=None):
+        """
+        Get the compiled validator for a schema file or schema dict.
+
+        Args:
+            ref: Schema file reference (see module docstring) or schema dict
+            cls: Validator class to use instead of the one picked from `$schema`
+
+        Returns:
+            A jsonschema validator instance
+        """
+        if isinstance(ref, dict):
+            key = (id(ref), cls)
+            cached = self._inline.get(key)
+            if cached is not None and cached[0] is ref:
+                return cached[1]
+            with self._lock:
+                validator = self._compile(ref, cls=cls)
+                if len(self._inline) >= MAX_INLINE_SCHEMAS:
+                    self._inline.clear()
+                # Keeping the dict alive keeps its id from being reused
+                self._inline[key] = (ref, validator)
+                return validator
+
+        path = self._files_key(ref)
+        entry = self._load_file(path)
+        validator = entry[3].get(cls)
+        if validator is None:
+            with self._lock:
+                validator = entry[3].get(cls)
+                if validator is None:
+                    validator = entry[3][cls] = self._compile(entry[2], "file://" + path, cls)
+        return validator
+
+    def _files_key(self, ref: str) -> str:
+        path = self._aliases.get(ref)
+        if path is None:
+            path = self._aliases[ref] = self.resolve_path(ref)
+        return path
+
+    def get_schema(self, ref: str) -> Dict[str, Any]:
+        """Get the parsed schema for a file reference."""
+        return self._load_file(self._files_key(ref))[2]
+
+    # -- validation -----------------------------------------------------
+
+    def is_valid(self, ref: SchemaRef, instance: Any, cls=None) -> bool:
+        """Fast path: True if the instance is valid, stopping at the first error."""
+        return self.get_validator(ref, cls).is_valid(instance)
+
+    def iter_errors(self, ref: SchemaRef, instance: Any, cls=None) -> Iterator[ValidationError]:
+        """Lazily yield validation errors."""
+        return self.get_validator(ref, cls).iter_errors(instance)
+
+    def validate(self, ref: SchemaRef, instance: Any, cls=None) -> None:
+        """
+        Validate like `jsonschema.validate`, without re-checking the schema.
+
+        Raises:
+            jsonschema.exceptions.ValidationError: The best-matching error
+        """
+        validator = self.get_validator(ref, cls)
+        if validator.is_valid(instance):
+            return
+        raise best_match(validator.iter_errors(instance))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Number of cached validators and compilations so far."""
+        return {
+            "files": len(self._files),
+            "inline": len(self._inline),
+            "compiles": self._compiles,
+        }
+
+
+_registry: Optional[CompiledSchemaRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_schema_registry() -> CompiledSchemaRegistry:
+    """
+    Get the process-wide compiled schema registry.
+
+    The mtime check interval can be overridden with SCHEMA_RELOAD_INTERVAL
+    (seconds, default 1.0).
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CompiledSchemaRegistry(
+                    reload_interval=float(os.getenv("SCHEMA_RELOAD_INTERVAL", "1.0"))
+                )
+    return _registry
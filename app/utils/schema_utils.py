@@ -1,5 +1,6 @@
 import jsonschema
 from app.schema_registry import SCHEMA_REGISTRY
+from app.utils.compiled_schemas import get_schema_registry
 
 def validate_project_memory(project_id: str, project_memory):
     """
@@ -13,7 +14,7 @@ def validate_project_memory(project_id: str, project_memory):
     for memory_key, schema in SCHEMA_REGISTRY.get("memory_schema", {}).items():
         if memory_key in memory:
             try:
-                jsonschema.validate(instance=memory[memory_key], schema=schema)
+                get_schema_registry().validate(schema, memory[memory_key])
             except jsonschema.exceptions.ValidationError as e:
                 validation_errors.append({
                     "memory_key": memory_key,
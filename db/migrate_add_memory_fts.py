@@ -0,0 +1,105 @@
+"""
+Database Migration Script to Add the Full-Text Search Index
+
+This script adds the memories_fts FTS5 table and its sync triggers to an
+existing memories database, then indexes every existing memory so keyword
+recall can use BM25-ranked full-text search.
+
+Usage:
+    python db/migrate_add_memory_fts.py [--db path/to/memory.db]
+"""
+
+import argparse
+import sqlite3
+import os
+import sys
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Path for SQLite database file
+DB_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_FILE = os.path.join(DB_DIR, "memory.db")
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+    content,
+    tags,
+    prefix = '2 3',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_memories_fts_before_insert BEFORE INSERT ON memories
+BEGIN
+    DELETE FROM memories_fts WHERE rowid = (SELECT rowid FROM memories WHERE memory_id = NEW.memory_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_memories_fts_insert AFTER INSERT ON memories
+BEGIN
+    INSERT INTO memories_fts (rowid, content, tags) VALUES (NEW.rowid, NEW.content, NEW.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_memories_fts_update AFTER UPDATE OF content, tags ON memories
+BEGIN
+    DELETE FROM memories_fts WHERE rowid = OLD.rowid;
+    INSERT INTO memories_fts (rowid, content, tags) VALUES (NEW.rowid, NEW.content, NEW.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_memories_fts_delete AFTER DELETE ON memories
+BEGIN
+    DELETE FROM memories_fts WHERE rowid = OLD.rowid;
+END;
+"""
+
+def migrate_database(db_file=DB_FILE):
+    """Add the memories_fts table and triggers, and index existing memories"""
+    try:
+        # Check if database file exists
+        if not os.path.exists(db_file):
+            logger.error(f"❌ Database file not found at {db_file}")
+            print(f"❌ Database file not found at {db_file}")
+            return False
+        
+        # Connect to the database
+        conn = sqlite3.connect(db_file)
+        cursor = conn.cursor()
+        
+        logger.info("🔄 Creating memories_fts table and triggers...")
+        print("🔄 Creating memories_fts table and triggers...")
+        cursor.executescript(FTS_SCHEMA)
+        
+        # Rebuild the index from scratch so reruns never leave duplicates
+        logger.info("🔄 Indexing existing memories...")
+        print("🔄 Indexing existing memories...")
+        with conn:
+            cursor.execute("DELETE FROM memories_fts")
+            cursor.execute("INSERT INTO memories_fts (rowid, content, tags) SELECT rowid, content, tags FROM memories")
+            cursor.execute("INSERT INTO memories_fts (memories_fts) VALUES ('optimize')")
+        
+        cursor.execute("SELECT COUNT(*) FROM memories_fts")
+        indexed = cursor.fetchone()[0]
+        
+        logger.info(f"✅ Migration successful: {indexed} memories indexed for full-text search")
+        print(f"✅ Migration successful: {indexed} memories indexed for full-text search")
+        conn.close()
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Migration error: {str(e)}")
+        print(f"❌ Migration error: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add the FTS5 index to an existing memory database.")
+    parser.add_argument("--db", default=DB_FILE, help="Path to the memory database")
+    args = parser.parse_args()
+    
+    success = migrate_database(args.db)
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+        sys.exit(0)
+    else:
+        print("\n❌ Database migration failed")
+        sys.exit(1)
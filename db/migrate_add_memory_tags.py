@@ -0,0 +1,127 @@
+"""
+Database Migration Script to Add the Normalized Tag Index
+
+This script adds the memory_tags table, its index and the sync triggers to an
+existing memories database, then backfills memory_tags from the JSON tags
+column so read_memories(tag=...) can use an indexed join. Optionally switches
+the database to WAL journal mode.
+
+Usage:
+    python db/migrate_add_memory_tags.py [--db path/to/memory.db] [--wal]
+"""
+
+import argparse
+import sqlite3
+import os
+import sys
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Path for SQLite database file
+DB_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_FILE = os.path.join(DB_DIR, "memory.db")
+
+TAGS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memory_tags (
+    memory_id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (memory_id, tag)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_memory_tags_tag ON memory_tags(tag, memory_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_memories_tags_insert AFTER INSERT ON memories
+BEGIN
+    DELETE FROM memory_tags WHERE memory_id = NEW.memory_id;
+    INSERT OR IGNORE INTO memory_tags (memory_id, tag)
+    SELECT NEW.memory_id, value
+    FROM json_each(CASE WHEN json_valid(NEW.tags) THEN NEW.tags ELSE '[]' END)
+    WHERE type = 'text';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_memories_tags_update AFTER UPDATE OF tags ON memories
+BEGIN
+    DELETE FROM memory_tags WHERE memory_id = OLD.memory_id;
+    INSERT OR IGNORE INTO memory_tags (memory_id, tag)
+    SELECT NEW.memory_id, value
+    FROM json_each(CASE WHEN json_valid(NEW.tags) THEN NEW.tags ELSE '[]' END)
+    WHERE type = 'text';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_memories_tags_delete AFTER DELETE ON memories
+BEGIN
+    DELETE FROM memory_tags WHERE memory_id = OLD.memory_id;
+END;
+"""
+
+BACKFILL_SQL = """
+INSERT OR IGNORE INTO memory_tags (memory_id, tag)
+SELECT m.memory_id, j.value
+FROM memories m, json_each(CASE WHEN json_valid(m.tags) THEN m.tags ELSE '[]' END) j
+WHERE j.type = 'text'
+"""
+
+def migrate_database(db_file=DB_FILE, enable_wal=False):
+    """Add memory_tags table, index and triggers, and backfill existing tags"""
+    try:
+        # Check if database file exists
+        if not os.path.exists(db_file):
+            logger.error(f"❌ Database file not found at {db_file}")
+            print(f"❌ Database file not found at {db_file}")
+            return False
+        
+        # Connect to the database
+        conn = sqlite3.connect(db_file)
+        cursor = conn.cursor()
+        
+        # Create table, index and triggers (idempotent)
+        logger.info("🔄 Creating memory_tags table, index and triggers...")
+        print("🔄 Creating memory_tags table, index and triggers...")
+        cursor.executescript(TAGS_SCHEMA)
+        
+        # Backfill tags from the JSON column in a single transaction
+        logger.info("🔄 Backfilling memory_tags from memories.tags...")
+        print("🔄 Backfilling memory_tags from memories.tags...")
+        with conn:
+            cursor.execute(BACKFILL_SQL)
+            cursor.execute(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES ('memory_tags_migrated_at', CURRENT_TIMESTAMP)"
+            )
+        
+        if enable_wal:
+            mode = cursor.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            logger.info(f"✅ Journal mode set to {mode}")
+            print(f"✅ Journal mode set to {mode}")
+        
+        # Verify the backfill
+        cursor.execute("SELECT COUNT(*) FROM memory_tags")
+        tag_rows = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM memories")
+        memory_rows = cursor.fetchone()[0]
+        
+        logger.info(f"✅ Migration successful: {tag_rows} tag rows indexed for {memory_rows} memories")
+        print(f"✅ Migration successful: {tag_rows} tag rows indexed for {memory_rows} memories")
+        conn.close()
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Migration error: {str(e)}")
+        print(f"❌ Migration error: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add the memory_tags index to an existing memory database.")
+    parser.add_argument("--db", default=DB_FILE, help="Path to the memory database")
+    parser.add_argument("--wal", action="store_true", help="Also switch the database to WAL journal mode")
+    args = parser.parse_args()
+    
+    success = migrate_database(args.db, args.wal)
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+        sys.exit(0)
+    else:
+        print("\n❌ Database migration failed")
+        sys.exit(1)
@@ -3,11 +3,16 @@ Plan Hash Module
 
 This module provides functionality for generating and comparing hashes of plans
 to identify similar patterns and prevent repeated failures.
+
+The hash identifies a plan exactly; similarity uses shingled plan text via
+memory.plan_similarity.
 """
 
 import hashlib
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+from memory.plan_similarity import get_rejected_plan_index, jaccard, plan_shingles
 
 def generate_plan_hash(plan: Dict[str, Any]) -> str:
     """
@@ -33,37 +38,39 @@ def generate_plan_hash(plan: Dict[str, Any]) -> str:
     hash_obj = hashlib.sha256(plan_str.encode())
     return hash_obj.hexdigest()
 
-def get_plan_similarity(hash1: str, hash2: str) -> float:
+def get_plan_similarity(plan1: Union[Dict[str, Any], str], plan2: Union[Dict[str, Any], str]) -> float:
     """
-    Calculates similarity between two plan hashes.
+    Calculates similarity between two plans.
+    
+    Plans are compared by the Jaccard similarity of their shingled goal,
+    approach and step descriptions. Plan hashes carry no similarity
+    information, so two hashes only compare as identical (1.0) or not (0.0).
     
     Args:
-        hash1 (str): First plan hash
-        hash2 (str): Second plan hash
+        plan1 (Union[Dict[str, Any], str]): First plan, or its hash
+        plan2 (Union[Dict[str, Any], str]): Second plan, or its hash
         
     Returns:
         float: Similarity score between 0.0 and 1.0
     """
-    # If hashes are identical, return 1.0
-    if hash1 == hash2:
-        return 1.0
-    
-    # Convert hashes to binary representation
-    bin1 = bin(int(hash1, 16))[2:].zfill(256)
-    bin2 = bin(int(hash2, 16))[2:].zfill(256)
-    
-    # Count matching bits
-    matches = sum(b1 == b2 for b1, b2 in zip(bin1, bin2))
-    
-    # Apply a non-linear scaling to increase similarity scores
-    # This gives more weight to matching bits, making similar plans appear more similar
-    raw_similarity = matches / 256
+    if isinstance(plan1, dict) and isinstance(plan2, dict):
+        return jaccard(plan_shingles(plan1), plan_shingles(plan2))
     
-    # Apply non-linear scaling to boost similarity scores
-    # This formula increases scores in the middle range while preserving 0.0 and 1.0
-    boosted_similarity = raw_similarity ** 0.5
-    
-    return boosted_similarity
+    hash1 = generate_plan_hash(plan1) if isinstance(plan1, dict) else plan1
+    hash2 = generate_plan_hash(plan2) if isinstance(plan2, dict) else plan2
+    return 1.0 if hash1 == hash2 else 0.0
+
+def _find_rejected(
+    plan: Union[Dict[str, Any], str],
+    rejected_plans: List[Dict[str, Any]],
+    similarity_threshold: float
+) -> List[Tuple[Dict[str, Any], float]]:
+    """Looks a plan (or plan hash) up in the LSH index over rejected_plans."""
+    if isinstance(plan, dict):
+        plan_hash, shingles = generate_plan_hash(plan), plan_shingles(plan)
+    else:
+        plan_hash, shingles = plan, None
+    return get_rejected_plan_index(rejected_plans).find(plan_hash, shingles, similarity_threshold)
 
 def get_rejected_plans(memory: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
@@ -78,38 +85,26 @@ def get_rejected_plans(memory: Dict[str, Any]) -> List[Dict[str, Any]]:
     return memory.get("rejected_plans", [])
 
 def find_similar_plans(
-    plan_hash: str, 
+    plan_hash: Union[Dict[str, Any], str], 
     memory: Dict[str, Any],
     similarity_threshold: float = 0.85
 ) -> List[Dict[str, Any]]:
     """
-    Finds plans in memory that are similar to the given hash.
+    Finds rejected plans in memory that are similar to the given plan.
     
     Args:
-        plan_hash (str): Hash of the plan to compare
+        plan_hash (Union[Dict[str, Any], str]): The plan to compare, or its hash (exact matches only)
         memory (Dict[str, Any]): The memory dictionary
         similarity_threshold (float): Threshold above which plans are considered similar
         
     Returns:
-        List[Dict[str, Any]]: List of similar plans with similarity scores
+        List[Dict[str, Any]]: List of similar plans with similarity scores, most similar first
     """
-    rejected_plans = get_rejected_plans(memory)
-    similar_plans = []
-    
-    for plan in rejected_plans:
-        plan_hash_from_memory = plan.get("hash", "")
-        if not plan_hash_from_memory:
-            continue
-            
-        similarity = get_plan_similarity(plan_hash, plan_hash_from_memory)
-        
-        if similarity >= similarity_threshold:
-            similar_plans.append({
-                "plan": plan,
-                "similarity_score": similarity
-            })
-    
-    # Sort by similarity score (highest first)
-    similar_plans.sort(key=lambda x: x["similarity_score"], reverse=True)
-    
-    return similar_plans
+    matches = _find_rejected(plan_hash, get_rejected_plans(memory), similarity_threshold)
+    return [
+        {
+            "plan": plan,
+            "similarity_score": similarity
+        }
+        for plan, similarity in matches
+    ]
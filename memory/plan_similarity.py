@@ -0,0 +1,276 @@
+"""
+Plan Similarity Module
+
+Near-duplicate detection for plans. A plan is reduced to a set of word
+shingles taken from its goal, approach and step descriptions; similarity is
+the Jaccard index of two shingle sets.
+
+Lookups go through a MinHash + LSH banded index:
+- each plan gets a MinHash signature of `num_perm` 32-bit values;
+- the signature is cut into `bands` bands and each band is a bucket key, so
+  plans sharing any band become candidates without scanning the whole index;
+- candidates are re-ranked by exact Jaccard on their shingle sets.
+
+With the default 32 bands of 4 rows, a plan with Jaccard similarity 0.5 is a
+candidate with probability ~0.87 and one at 0.7 with probability > 0.999.
+"""
+
+import functools
+import hashlib
+import re
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple
+
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _text_shingles(text: str, size: int) -> List[str]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) <= size:
+        return [" ".join(tokens)] if tokens else []
+    return [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+
+
+def plan_shingles(plan: Dict[str, Any], size: int = 2) -> FrozenSet[str]:
+    """
+    Shingle a plan's goal, approach and step descriptions.
+
+    Shingles never span two fields or two steps.
+
+    Args:
+        plan: The plan to shingle
+        size: Words per shingle
+
+    Returns:
+        Set of shingles
+    """
+    texts = [plan.get("goal", ""), plan.get("approach", "")]
+    texts.extend(step.get("description", "") for step in plan.get("steps", []))
+    shingles = set()
+    for text in texts:
+        if isinstance(text, str):
+            shingles.update(_text_shingles(text, size))
+    return frozenset(shingles)
+
+
+def jaccard(a: Iterable[str], b: Iterable[str]) -> float:
+    """Exact Jaccard similarity of two shingle sets (1.0 for two empty sets)."""
+    a, b = set(a), set(b)
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """
+    MinHash signatures with one hash function per signature slot.
+
+    The num_perm hash values of a shingle are read from a single SHAKE-128
+    digest keyed by the seed, so a shingle costs one hash call however long
+    the signature is.
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        """
+        Initialize the hash family.
+
+        Args:
+            num_perm: Signature length
+            seed: Seed mixed into every shingle hash
+        """
+        self.num_perm = num_perm
+        self._unpack = struct.Struct(f"<{num_perm}I").unpack
+        self._salt = seed.to_bytes(8, "little")
+        # Plans retried after a rejection share most of their shingles
+        self._hashes = functools.lru_cache(maxsize=65536)(self._shingle_hashes)
+
+    def _shingle_hashes(self, shingle: str) -> Tuple[int, ...]:
+        return self._unpack(hashlib.shake_128(self._salt + shingle.encode("utf-8")).digest(self.num_perm * 4))
+
+    def signature(self, shingles: Iterable[str]) -> Tuple[int, ...]:
+        """
+        Compute the MinHash signature of a shingle set.
+
+        Args:
+            shingles: The shingles
+
+        Returns:
+            Tuple of num_perm 32-bit values
+        """
+        rows = [self._hashes(s) for s in shingles]
+        if not rows:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(map(min, zip(*rows)))
+
+
+class PlanSimilarityIndex:
+    """
+    LSH banded index over MinHash signatures with exact Jaccard re-ranking.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, seed: int = 1):
+        """
+        Initialize an empty index.
+
+        Args:
+            num_perm: MinHash signature length
+            bands: Number of LSH bands; num_perm must be divisible by it
+            seed: Seed for the MinHash permutations
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._hasher = MinHasher(num_perm, seed)
+        self._buckets: List[Dict[Tuple[int, ...], List[Hashable]]] = [{} for _ in range(bands)]
+        self._shingles: Dict[Hashable, FrozenSet[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._shingles
+
+    def _band_keys(self, shingles: FrozenSet[str]) -> List[Tuple[int, ...]]:
+        signature = self._hasher.signature(shingles)
+        return [signature[i * self.rows:(i + 1) * self.rows] for i in range(self.bands)]
+
+    def add(self, key: Hashable, shingles: Iterable[str]) -> None:
+        """
+        Insert a shingle set under a key.
+
+        Args:
+            key: Identifier returned by query
+            shingles: The item's shingles
+        """
+        if key in self._shingles:
+            raise KeyError(f"Key already indexed: {key!r}")
+        shingles = frozenset(shingles)
+        self._shingles[key] = shingles
+        for band, band_key in zip(self._buckets, self._band_keys(shingles)):
+            band.setdefault(band_key, []).append(key)
+
+    def query(self, shingles: Iterable[str], threshold: float = 0.0,
+              limit: Optional[int] = None) -> List[Tuple[Hashable, float]]:
+        """
+        Find indexed items similar to a shingle set.
+
+        Args:
+            shingles: Shingles to look up
+            threshold: Minimum exact Jaccard similarity
+            limit: Maximum number of results
+
+        Returns:
+            (key, similarity) pairs, most similar first
+        """
+        shingles = frozenset(shingles)
+        candidates = set()
+        for band, band_key in zip(self._buckets, self._band_keys(shingles)):
+            candidates.update(band.get(band_key, ()))
+
+        scored = []
+        for key in candidates:
+            similarity = jaccard(shingles, self._shingles[key])
+            if similarity >= threshold:
+                scored.append((key, similarity))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit] if limit is not None else scored
+
+
+class RejectedPlanIndex:
+    """
+    Incrementally maintained index over a memory's rejected_plans list.
+
+    Entries carrying "shingles" go into the LSH index; every entry's "hash"
+    is also indexed for exact matches, which covers entries stored before
+    shingles were recorded.
+    """
+
+    def __init__(self, rejected_plans: List[Dict[str, Any]]):
+        """
+        Initialize the index for a rejected_plans list.
+
+        Args:
+            rejected_plans: The list to index; entries appended later are picked up by sync()
+        """
+        self.rejected_plans = rejected_plans
+        self._lsh = PlanSimilarityIndex()
+        self._by_hash: Dict[str, List[int]] = {}
+        self._consumed = 0
+        self._last_entry: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def covers(self, rejected_plans: List[Dict[str, Any]]) -> bool:
+        """Whether the index is still a prefix of the given list."""
+        if rejected_plans is not self.rejected_plans or self._consumed > len(rejected_plans):
+            return False
+        return not self._consumed or rejected_plans[self._consumed - 1] is self._last_entry
+
+    def sync(self) -> None:
+        """Index entries appended to the list since the last sync."""
+        with self._lock:
+            for position in range(self._consumed, len(self.rejected_plans)):
+                entry = self.rejected_plans[position]
+                if entry.get("hash"):
+                    self._by_hash.setdefault(entry["hash"], []).append(position)
+                if entry.get("shingles"):
+                    self._lsh.add(position, entry["shingles"])
+            self._consumed = len(self.rejected_plans)
+            if self._consumed:
+                self._last_entry = self.rejected_plans[-1]
+
+    def find(self, plan_hash: Optional[str], shingles: Optional[Iterable[str]],
+             threshold: float) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Find rejected plans similar to a plan.
+
+        Args:
+            plan_hash: The plan's hash, matched exactly
+            shingles: The plan's shingles, matched through LSH; None for hash-only lookup
+            threshold: Minimum similarity
+
+        Returns:
+            (rejected plan, similarity) pairs, most similar first
+        """
+        self.sync()
+        scores: Dict[int, float] = {}
+        if shingles is not None:
+            scores.update(self._lsh.query(shingles, threshold))
+        for position in self._by_hash.get(plan_hash or "", []):
+            scores[position] = 1.0
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.rejected_plans[position], similarity) for position, similarity in ranked]
+
+
+_indexes: "OrderedDict[int, RejectedPlanIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+_MAX_INDEXES = 16
+
+
+def get_rejected_plan_index(rejected_plans: List[Dict[str, Any]]) -> RejectedPlanIndex:
+    """
+    Get the index for a rejected_plans list, building it on first use.
+
+    Indexes are cached per list object, so repeated checks against the same
+    memory only index newly rejected plans. A list that was truncated or
+    replaced in place gets a fresh index.
+
+    Args:
+        rejected_plans: The memory's rejected_plans list
+
+    Returns:
+        RejectedPlanIndex for the list
+    """
+    with _indexes_lock:
+        index = _indexes.get(id(rejected_plans))
+        if index is None or not index.covers(rejected_plans):
+            index = RejectedPlanIndex(rejected_plans)
+            _indexes[id(rejected_plans)] = index
+        _indexes.move_to_end(id(rejected_plans))
+        while len(_indexes) > _MAX_INDEXES:
+            _indexes.popitem(last=False)
+    index.sync()
+    return index
@@ -7,8 +7,11 @@ controlling which Orchestrator subclass is used.
 """
 
 import json
+import functools
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, FrozenSet, Optional, Tuple
+
+from app.core.routing_index import KeywordIndex
 
 # Define available persona modes
 PERSONA_MODES = {
@@ -39,6 +42,26 @@ PERSONA_MODES = {
     }
 }
 
+# Keywords that indicate different personas
+PERSONA_KEYWORDS = {
+    "SAGE": ["reflect", "philosophy", "wisdom", "understand", "meaning", "ethical", "consider", "perspective"],
+    "ARCHITECT": ["build", "design", "structure", "implement", "architecture", "system", "organize", "plan"],
+    "RESEARCHER": ["research", "analyze", "investigate", "explore", "data", "information", "discover", "study"],
+    "RITUALIST": ["process", "routine", "consistent", "repeat", "habit", "discipline", "regular", "procedure"],
+    "INVENTOR": ["create", "innovate", "novel", "idea", "brainstorm", "creative", "invent", "solution"]
+}
+
+# Words in recent loop outputs that indicate creative work
+CREATIVE_OUTPUT_WORDS = ["create", "design", "new", "innovative"]
+
+# Number of recent-loop prompts and outputs whose word sets are kept
+RECENT_LOOP_CACHE_SIZE = 64
+
+# Persona keywords, indexed once when the personas load
+_persona_index = KeywordIndex(
+    (word, persona) for persona, words in PERSONA_KEYWORDS.items() for word in words
+)
+
 def get_available_personas() -> Dict[str, Dict[str, Any]]:
     """
     Returns the available persona modes.
@@ -66,6 +89,29 @@ def select_persona_for_loop(
     Returns:
         Tuple[str, Dict[str, Any]]: Selected persona mode and its details
     """
+    return route_many([prompt], memory, config)[0]
+
+def route_many(
+    prompts: List[str],
+    memory: Dict[str, Any],
+    config: Optional[Dict[str, Any]] = None
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Selects the persona for each of several prompts sharing the same context,
+    such as the subtasks a planner fans out.
+    
+    The configuration and the recent loops in memory are read once for the
+    whole batch; each prompt gets the persona select_persona_for_loop would
+    select for it.
+    
+    Args:
+        prompts (List[str]): The prompts to route
+        memory (Dict[str, Any]): The memory dictionary
+        config (Optional[Dict[str, Any]]): Configuration options
+        
+    Returns:
+        List[Tuple[str, Dict[str, Any]]]: Selected persona mode and its details, per prompt
+    """
     # Use default config if none provided
     if config is None:
         config = {
@@ -77,23 +123,26 @@ def select_persona_for_loop(
     # Check for override persona
     override_persona = config.get("override_persona")
     if override_persona and override_persona in PERSONA_MODES:
-        return override_persona, PERSONA_MODES[override_persona]
+        return [(override_persona, PERSONA_MODES[override_persona]) for _ in prompts]
     
     # If auto-selection is disabled, use default persona
     if not config.get("auto_selection", True):
         default_persona = config.get("default_persona", "ARCHITECT")
-        if default_persona in PERSONA_MODES:
-            return default_persona, PERSONA_MODES[default_persona]
-        else:
-            return "ARCHITECT", PERSONA_MODES["ARCHITECT"]
+        if default_persona not in PERSONA_MODES:
+            default_persona = "ARCHITECT"
+        return [(default_persona, PERSONA_MODES[default_persona]) for _ in prompts]
     
     # Auto-select persona based on prompt content and context
-    persona_scores = _score_personas_for_prompt(prompt, memory)
-    
-    # Get the highest scoring persona
-    selected_persona = max(persona_scores.items(), key=lambda x: x[1])[0]
+    recent_loops = _recent_loop_context(memory)
+    selected = []
+    for prompt in prompts:
+        persona_scores = _score_personas(prompt, recent_loops)
+        
+        # Get the highest scoring persona
+        selected_persona = max(persona_scores.items(), key=lambda x: x[1])[0]
+        selected.append((selected_persona, PERSONA_MODES[selected_persona]))
     
-    return selected_persona, PERSONA_MODES[selected_persona]
+    return selected
 
 def _score_personas_for_prompt(prompt: str, memory: Dict[str, Any]) -> Dict[str, float]:
     """
@@ -103,6 +152,44 @@ def _score_personas_for_prompt(prompt: str, memory: Dict[str, Any]) -> Dict[str,
         prompt (str): The user prompt
         memory (Dict[str, Any]): The memory dictionary
         
+    Returns:
+        Dict[str, float]: Dictionary of persona scores
+    """
+    return _score_personas(prompt, _recent_loop_context(memory))
+
+def _recent_loop_context(memory: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Extracts what persona scoring uses from the recent loops in memory.
+    
+    Args:
+        memory (Dict[str, Any]): The memory dictionary
+        
+    Returns:
+        Optional[Dict[str, Any]]: Word sets of the recent loop prompts and the
+        number of recent loops with creative outputs, or None without loops
+    """
+    if "loops" not in memory:
+        return None
+    
+    recent_loops = memory["loops"][-5:] if len(memory["loops"]) > 5 else memory["loops"]
+    return {
+        # Prompts are only compared once there are enough recent loops
+        "prompt_words": [
+            _word_set(loop["prompt"]) for loop in recent_loops if "prompt" in loop
+        ] if len(recent_loops) >= 3 else None,
+        "creative_outputs": sum(
+            1 for loop in recent_loops if "output" in loop and _mentions_creative_work(loop["output"])
+        )
+    }
+
+def _score_personas(prompt: str, recent_loops: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Scores each persona based on how well it matches the prompt.
+    
+    Args:
+        prompt (str): The user prompt
+        recent_loops (Optional[Dict[str, Any]]): Context from _recent_loop_context
+        
     Returns:
         Dict[str, float]: Dictionary of persona scores
     """
@@ -111,24 +198,14 @@ def _score_personas_for_prompt(prompt: str, memory: Dict[str, Any]) -> Dict[str,
     
     # Convert prompt to lowercase for case-insensitive matching
     prompt_lower = prompt.lower()
-    
-    # Keywords that indicate different personas
-    keywords = {
-        "SAGE": ["reflect", "philosophy", "wisdom", "understand", "meaning", "ethical", "consider", "perspective"],
-        "ARCHITECT": ["build", "design", "structure", "implement", "architecture", "system", "organize", "plan"],
-        "RESEARCHER": ["research", "analyze", "investigate", "explore", "data", "information", "discover", "study"],
-        "RITUALIST": ["process", "routine", "consistent", "repeat", "habit", "discipline", "regular", "procedure"],
-        "INVENTOR": ["create", "innovate", "novel", "idea", "brainstorm", "creative", "invent", "solution"]
-    }
+    words = prompt_lower.split()
     
     # Score based on keyword matches
-    for persona, words in keywords.items():
-        for word in words:
-            if word in prompt_lower:
-                scores[persona] += 0.2
+    for persona in _persona_index.matches(prompt_lower, words):
+        scores[persona] += 0.2
     
     # Score based on prompt length (longer prompts favor RESEARCHER and SAGE)
-    word_count = len(prompt.split())
+    word_count = len(words)
     if word_count > 100:
         scores["RESEARCHER"] += 0.3
         scores["SAGE"] += 0.2
@@ -152,26 +229,20 @@ def _score_personas_for_prompt(prompt: str, memory: Dict[str, Any]) -> Dict[str,
         scores["INVENTOR"] += 0.2
     
     # Score based on recent loop history
-    if "loops" in memory:
-        recent_loops = memory["loops"][-5:] if len(memory["loops"]) > 5 else memory["loops"]
-        
+    if recent_loops is not None:
         # Check for repeated similar prompts (favors RITUALIST)
-        if len(recent_loops) >= 3:
+        if recent_loops["prompt_words"] is not None:
+            prompt_words = frozenset(words)
             similar_prompts = 0
-            for loop in recent_loops:
-                if "prompt" in loop and _calculate_similarity(prompt, loop["prompt"]) > 0.7:
+            for loop_words in recent_loops["prompt_words"]:
+                if _jaccard(prompt_words, loop_words) > 0.7:
                     similar_prompts += 1
             
             if similar_prompts >= 2:
                 scores["RITUALIST"] += 0.3
         
         # Check for creative outputs in recent loops (favors INVENTOR)
-        creative_outputs = 0
-        for loop in recent_loops:
-            if "output" in loop and any(word in loop["output"].lower() for word in ["create", "design", "new", "innovative"]):
-                creative_outputs += 1
-        
-        if creative_outputs >= 2:
+        if recent_loops["creative_outputs"] >= 2:
             scores["INVENTOR"] += 0.2
     
     # Ensure minimum score difference for clear selection
@@ -193,13 +264,27 @@ def _calculate_similarity(text1: str, text2: str) -> float:
     Returns:
         float: Similarity score between 0 and 1
     """
-    # Convert to lowercase and split into words
-    words1 = set(text1.lower().split())
-    words2 = set(text2.lower().split())
-    
+    return _jaccard(_word_set(text1), _word_set(text2))
+
+@functools.lru_cache(maxsize=RECENT_LOOP_CACHE_SIZE)
+def _word_set(text: str) -> FrozenSet[str]:
+    """
+    Lowercased words of a text; recent-loop prompts recur across calls.
+    """
+    return frozenset(text.lower().split())
+
+@functools.lru_cache(maxsize=RECENT_LOOP_CACHE_SIZE)
+def _mentions_creative_work(output: str) -> bool:
+    """
+    Whether a loop output mentions creative work.
+    """
+    output_lower = output.lower()
+    return any(word in output_lower for word in CREATIVE_OUTPUT_WORDS)
+
+def _jaccard(words1: FrozenSet[str], words2: FrozenSet[str]) -> float:
     # Calculate Jaccard similarity
-    intersection = len(words1.intersection(words2))
-    union = len(words1.union(words2))
+    intersection = len(words1 & words2)
+    union = len(words1 | words2)
     
     return intersection / union if union > 0 else 0.0
 
@@ -16,6 +16,8 @@ from typing import Dict, List, Optional, Any
 # Add the parent directory to the path so we can import the modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
+from app.utils.compiled_schemas import get_schema_registry
+
 # Base path to the schema files
 SCHEMA_BASE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
                                'schemas', 'agent_output')
@@ -94,10 +96,6 @@ def validate_agent_file_output(agent: str, file_path: str, schema_path: Optional
         if not schema_path:
             schema_path = get_schema_for_file(file_path, agent)
         
-        # Load schema
-        with open(schema_path, 'r') as schema_file:
-            schema = json.load(schema_file)
-        
         # Create validation object
         validation_object = {
             "fileContent": file_content,
@@ -107,9 +105,8 @@ def validate_agent_file_output(agent: str, file_path: str, schema_path: Optional
             }
         }
         
-        # Validate against schema
-        validator = jsonschema.Draft7Validator(schema)
-        errors = list(validator.iter_errors(validation_object))
+        # Validate against the cached, compiled schema
+        errors = list(get_schema_registry().iter_errors(schema_path, validation_object, jsonschema.Draft7Validator))
         
         if errors:
             # Format error messages
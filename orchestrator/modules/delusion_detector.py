@@ -3,12 +3,17 @@ Delusion Detection Module
 
 This module provides functionality to detect repeated plan patterns that have previously failed,
 helping to prevent the system from falling into loops of similar failed approaches.
+
+Rejected plans are matched through the MinHash/LSH index in memory.plan_similarity,
+so a check only scores the few rejected plans that share an LSH band with the plan.
 """
 
 import hashlib
 import json
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+from memory.plan_similarity import get_rejected_plan_index, jaccard, plan_shingles
 
 def generate_plan_hash(plan: Dict[str, Any]) -> str:
     """
@@ -34,74 +39,65 @@ def generate_plan_hash(plan: Dict[str, Any]) -> str:
     hash_obj = hashlib.sha256(plan_str.encode())
     return hash_obj.hexdigest()
 
-def get_plan_similarity(hash1: str, hash2: str) -> float:
+def get_plan_similarity(plan1: Union[Dict[str, Any], str], plan2: Union[Dict[str, Any], str]) -> float:
     """
-    Calculates similarity between two plan hashes.
+    Calculates similarity between two plans.
+    
+    Plans are compared by the Jaccard similarity of their shingled goal,
+    approach and step descriptions. Plan hashes carry no similarity
+    information, so two hashes only compare as identical (1.0) or not (0.0).
     
     Args:
-        hash1 (str): First plan hash
-        hash2 (str): Second plan hash
+        plan1 (Union[Dict[str, Any], str]): First plan, or its hash
+        plan2 (Union[Dict[str, Any], str]): Second plan, or its hash
         
     Returns:
         float: Similarity score between 0.0 and 1.0
     """
-    # If hashes are identical, return 1.0
-    if hash1 == hash2:
-        return 1.0
-    
-    # Convert hashes to binary representation
-    bin1 = bin(int(hash1, 16))[2:].zfill(256)
-    bin2 = bin(int(hash2, 16))[2:].zfill(256)
+    if isinstance(plan1, dict) and isinstance(plan2, dict):
+        return jaccard(plan_shingles(plan1), plan_shingles(plan2))
     
-    # Count matching bits
-    matches = sum(b1 == b2 for b1, b2 in zip(bin1, bin2))
-    
-    # Apply a stronger non-linear scaling to increase similarity scores
-    raw_similarity = matches / 256
-    
-    # Apply cubic root scaling to significantly boost similarity scores
-    # This formula dramatically increases scores in the middle range
-    boosted_similarity = raw_similarity ** (1/3)
-    
-    return boosted_similarity
+    hash1 = generate_plan_hash(plan1) if isinstance(plan1, dict) else plan1
+    hash2 = generate_plan_hash(plan2) if isinstance(plan2, dict) else plan2
+    return 1.0 if hash1 == hash2 else 0.0
+
+def _find_rejected(
+    plan: Union[Dict[str, Any], str],
+    rejected_plans: List[Dict[str, Any]],
+    similarity_threshold: float
+) -> List[Tuple[Dict[str, Any], float]]:
+    """Looks a plan (or plan hash) up in the LSH index over rejected_plans."""
+    if isinstance(plan, dict):
+        plan_hash, shingles = generate_plan_hash(plan), plan_shingles(plan)
+    else:
+        plan_hash, shingles = plan, None
+    return get_rejected_plan_index(rejected_plans).find(plan_hash, shingles, similarity_threshold)
 
 def compare_to_rejected_hashes(
-    current_hash: str, 
+    current_hash: Union[Dict[str, Any], str], 
     rejected_plans: List[Dict[str, Any]],
     similarity_threshold: float = 0.85
 ) -> Optional[Dict[str, Any]]:
     """
-    Compares a plan hash to previously rejected plan hashes.
+    Compares a plan to previously rejected plans.
     
     Args:
-        current_hash (str): Hash of the current plan
+        current_hash (Union[Dict[str, Any], str]): The current plan, or its hash (exact matches only)
         rejected_plans (List[Dict[str, Any]]): List of previously rejected plans with their hashes
         similarity_threshold (float): Threshold above which plans are considered similar
         
     Returns:
         Optional[Dict[str, Any]]: Most similar rejected plan if similarity is above threshold, None otherwise
     """
-    most_similar = None
-    highest_similarity = 0.0
-    
-    for rejected_plan in rejected_plans:
-        rejected_hash = rejected_plan.get("hash", "")
-        if not rejected_hash:
-            continue
-        
-        similarity = get_plan_similarity(current_hash, rejected_hash)
-        
-        if similarity > highest_similarity:
-            highest_similarity = similarity
-            most_similar = rejected_plan
-    
-    if highest_similarity >= similarity_threshold:
-        return {
-            "rejected_plan": most_similar,
-            "similarity_score": highest_similarity
-        }
-    
-    return None
+    matches = _find_rejected(current_hash, rejected_plans, similarity_threshold)
+    if not matches:
+        return None
+    
+    most_similar, highest_similarity = matches[0]
+    return {
+        "rejected_plan": most_similar,
+        "similarity_score": highest_similarity
+    }
 
 def inject_delusion_warning(
     memory: Dict[str, Any],
@@ -177,15 +173,12 @@ def detect_plan_delusion(
     Returns:
         Dict[str, Any]: Updated memory dictionary, with warnings if delusion detected
     """
-    # Generate hash for current plan
-    current_hash = generate_plan_hash(plan)
-    
     # Get rejected plans from memory
     rejected_plans = memory.get("rejected_plans", [])
     
     # Compare to rejected plans
     similar_result = compare_to_rejected_hashes(
-        current_hash, 
+        plan, 
         rejected_plans,
         similarity_threshold
     )
@@ -237,6 +230,7 @@ def store_rejected_plan(
     rejected_plan = {
         "loop_id": loop_id,
         "hash": plan_hash,
+        "shingles": sorted(plan_shingles(plan)),
         "failure_reason": failure_reason,
         "timestamp": datetime.utcnow().isoformat(),
         "plan_summary": {
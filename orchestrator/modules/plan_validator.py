@@ -9,6 +9,8 @@ import os
 import jsonschema
 from datetime import datetime
 
+from app.utils.compiled_schemas import get_schema_registry
+
 # Path to the schema file
 SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
                           'schemas', 'orchestrator', 'loop_plan.schema.json')
@@ -40,9 +42,10 @@ def validate_loop_plan(plan_object: dict) -> list:
     errors = []
     
     try:
-        schema = load_schema()
-        validator = jsonschema.Draft7Validator(schema)
-        validation_errors = list(validator.iter_errors(plan_object))
+        try:
+            validation_errors = get_schema_registry().iter_errors(SCHEMA_PATH, plan_object, jsonschema.Draft7Validator)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Error loading schema: {str(e)}")
         
         for error in validation_errors:
             # Format the error message
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the old 0.1 s polling loop of PlannerOrchestrator.execute_goal vs
+the event-driven DAGScheduler.
+
+Synthetic goals are layered DAGs (each task depends on up to 3 tasks of the
+previous layer). Each task sleeps --task-ms. The polling loop is given a time
+budget and reported as timed out past it.
+
+Usage:
+    python scripts/benchmarks/bench_dag_scheduler.py [--sizes 1000 10000] [--width 50] [--parallel 16]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+from app.core.dag_scheduler import DAGScheduler
+
+
+def _synthetic_goal(size, width, seed=7):
+    rng = random.Random(seed)
+    graph = {}
+    for i in range(size):
+        layer_start = (i // width) * width
+        previous = list(range(max(0, layer_start - width), layer_start))
+        deps = rng.sample(previous, min(3, len(previous)))
+        graph[f"t{i}"] = [f"t{d}" for d in deps]
+    return graph
+
+
+async def _polling_loop(graph, execute, max_parallel):
+    # The pre-scheduler execute_goal loop, minus task state bookkeeping
+    tasks = [{"task_id": task_id, "dependencies": deps} for task_id, deps in graph.items()]
+    pending_tasks = {t["task_id"] for t in tasks if not t["dependencies"]}
+    running_tasks = set()
+    completed_tasks = []
+
+    async def run(task_id):
+        await execute(task_id)
+        running_tasks.remove(task_id)
+        completed_tasks.append(task_id)
+
+    while pending_tasks or running_tasks:
+        while pending_tasks and len(running_tasks) < max_parallel:
+            task_id = pending_tasks.pop()
+            running_tasks.add(task_id)
+            asyncio.create_task(run(task_id))
+        await asyncio.sleep(0.1)
+        for task in tasks:
+            task_id = task["task_id"]
+            if task_id in pending_tasks or task_id in running_tasks or task_id in completed_tasks:
+                continue
+            if all(dep in completed_tasks for dep in task["dependencies"]):
+                pending_tasks.add(task_id)
+    return len(completed_tasks)
+
+
+async def main(sizes, width, parallel, task_ms, budget):
+    async def execute(task_id):
+        await asyncio.sleep(task_ms / 1000)
+        return True
+
+    print(f"{'nodes':>7}{'mode':>12}{'seconds':>12}{'tasks/s':>12}")
+    for size in sizes:
+        graph = _synthetic_goal(size, width)
+
+        start = time.perf_counter()
+        result = await DAGScheduler(max_parallel=parallel, ordering="critical_path").run(graph, execute)
+        elapsed = time.perf_counter() - start
+        assert len(result["completed_tasks"]) == size
+        print(f"{size:>7}{'dag':>12}{elapsed:>12.2f}{size / elapsed:>12.0f}")
+
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(_polling_loop(graph, execute, parallel), budget)
+            elapsed = time.perf_counter() - start
+            print(f"{size:>7}{'polling':>12}{elapsed:>12.2f}{size / elapsed:>12.0f}")
+        except asyncio.TimeoutError:
+            print(f"{size:>7}{'polling':>12}{'>' + str(budget):>12}{'-':>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--width", type=int, default=50)
+    parser.add_argument("--parallel", type=int, default=16)
+    parser.add_argument("--task-ms", type=float, default=1.0)
+    parser.add_argument("--budget", type=float, default=120.0, help="seconds allowed for the polling loop")
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.width, args.parallel, args.task_ms, args.budget))
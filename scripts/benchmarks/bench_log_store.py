@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: reading execution logs, the previous directory of one JSON file
+per entry ("json dir") vs LogSegmentStore.
+
+Measures the newest page of logs, the newest page for one agent, and paging
+through one agent's logs, over --logs entries spread across agents. The store
+is filled by migrating the JSON directory, as on first start, and reopened
+before reading so only its segment indexes are loaded. The json dir filters
+after paginating, so its agent pages come back short; the number of entries
+each variant returns is printed alongside.
+
+Usage:
+    python scripts/benchmarks/bench_log_store.py [--logs 20000] [--limit 20]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+from app.core.log_segment_store import LogSegmentStore, iter_json_files
+
+AGENTS = ["hal", "ash", "nova", "sage", "critic", "orchestrator"]
+
+
+def _make_logs(log_dir, count, rng):
+    for i in range(count):
+        entry = {
+            "id": f"log-{i:06d}",
+            "timestamp": f"2025-01-{1 + i // 86400:02d}T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}",
+            "agent_name": rng.choice(AGENTS),
+            "model": "gpt-4",
+            "input_summary": "Summarize the open tasks for the operator. " * 5,
+            "output_summary": "Three tasks are open; two are blocked on review. " * 5,
+            "tools_used": ["web_search"],
+            "metadata": {},
+        }
+        path = os.path.join(log_dir, f"{entry['id']}.json")
+        with open(path, "w") as f:
+            json.dump(entry, f, indent=2)
+        # Modification times follow the entry timestamps
+        os.utime(path, (1_700_000_000 + i, 1_700_000_000 + i))
+
+
+def _legacy_get_logs(log_dir, agent_name=None, limit=10, offset=0):
+    # The previous ExecutionLogger.get_logs
+    log_files = [f for f in os.listdir(log_dir) if f.endswith(".json")]
+    log_files.sort(key=lambda f: os.path.getmtime(os.path.join(log_dir, f)), reverse=True)
+    log_files = log_files[offset:offset + limit]
+    logs = []
+    for log_file in log_files:
+        with open(os.path.join(log_dir, log_file), "r") as f:
+            log_entry = json.load(f)
+            if agent_name and log_entry.get("agent_name") != agent_name:
+                continue
+            logs.append(log_entry)
+    return logs
+
+
+def _timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<36}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def main(count, limit):
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as root:
+        log_dir = os.path.join(root, "execution_logs")
+        os.makedirs(log_dir)
+        _make_logs(log_dir, count, rng)
+        print(f"{count:,} log entries, pages of {limit}\n")
+
+        store_dir = os.path.join(root, "store")
+        options = dict(key_fields=("id",), time_field="timestamp", index_fields=("agent_name",))
+        store = LogSegmentStore(store_dir, **options)
+        _timed("store: migrate JSON files", lambda: store.import_records(
+            log_dir, (entry for _, entry in iter_json_files(log_dir))))
+        store.close()
+        store = _timed("store: open", lambda: LogSegmentStore(store_dir, **options))
+        print()
+
+        legacy = _timed("json dir: newest page", lambda: _legacy_get_logs(log_dir, limit=limit))
+        indexed = _timed("store: newest page", lambda: store.query(limit=limit))
+        assert [e["id"] for e in legacy] == [e["id"] for e in indexed], "newest pages differ"
+
+        legacy = _timed("json dir: newest page for agent", lambda: _legacy_get_logs(
+            log_dir, agent_name="nova", limit=limit))
+        indexed = _timed("store: newest page for agent", lambda: store.query(
+            {"agent_name": "nova"}, limit=limit))
+        print(f"{'':<36}json dir {len(legacy)} entries, store {len(indexed)} entries")
+
+        pages = 20
+
+        def cursor_pages():
+            before, found = None, 0
+            for _ in range(pages):
+                page = store.query({"agent_name": "nova"}, limit=limit, before=before)
+                before = page[-1]["id"]
+                found += len(page)
+            return found
+
+        legacy = _timed(f"json dir: {pages} agent pages by offset", lambda: sum(
+            len(_legacy_get_logs(log_dir, agent_name="nova", limit=limit, offset=page * limit))
+            for page in range(pages)))
+        indexed = _timed(f"store: {pages} agent pages by cursor", cursor_pages)
+        print(f"{'':<36}json dir {legacy} entries, store {indexed} entries")
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark execution log reads.")
+    parser.add_argument("--logs", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    main(args.logs, args.limit)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loop family and all-loop drift report queries, per-node memory
+reads vs the loop lineage index.
+
+A tree of --loops loops (each with up to --branching children) is written to
+an in-memory KV store. "walk" is the previous get_loop_family, one awaited
+trace read per ancestor, descendant and sibling lookup; "per loop" generates
+and injects each loop's drift report on its own, as
+generate_drift_reports_for_all_loops did.
+
+Usage:
+    python scripts/benchmarks/bench_loop_lineage.py [--loops 3000] [--branching 3]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from unittest import mock
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+from app.modules import historian_drift_report, kv_memory
+from app.modules.kv_memory import KVMemoryStore
+from app.modules.loop_lineage_store import get_loop_lineage
+
+
+def _traces(loops, branching):
+    traces = {}
+    for i in range(loops):
+        parent = (i - 1) // branching if i else None
+        traces[f"loop_trace[loop_{i}]"] = {
+            "loop_id": f"loop_{i}",
+            "timestamp": f"2025-01-01T00:00:{i:08d}",
+            "parent_loop_id": f"loop_{parent}" if parent is not None else None,
+            "child_loop_ids": [f"loop_{c}" for c in range(i * branching + 1, min(loops, (i + 1) * branching + 1))],
+            "drift_score": (i % 10) / 20,
+            "alignment_score": 0.8,
+        }
+    return traces
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def wrap(self, fn):
+        async def wrapper(*args):
+            self.calls += 1
+            return await fn(*args)
+        return wrapper
+
+
+async def _walk_family(read, loop_id):
+    # The pre-index get_loop_family
+    async def trace(i):
+        value = await read(f"loop_trace[{i}]")
+        return value if isinstance(value, dict) else {}
+
+    family = {"ancestors": [], "descendants": [], "siblings": []}
+    current = loop_id
+    while (parent := (await trace(current)).get("parent_loop_id")):
+        family["ancestors"].append(parent)
+        current = parent
+
+    async def descendants(parent_id):
+        children = (await trace(parent_id)).get("child_loop_ids", [])
+        result = list(children)
+        for child in children:
+            result.extend(await descendants(child))
+        return result
+
+    family["descendants"] = await descendants(loop_id)
+    parent = (await trace(loop_id)).get("parent_loop_id")
+    if parent:
+        family["siblings"] = [s for s in (await trace(parent)).get("child_loop_ids", []) if s != loop_id]
+    return family
+
+
+def _timed(label, fn, counter):
+    counter.calls = 0
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40}{elapsed * 1000:>12.1f} ms{counter.calls:>10} reads")
+    return result
+
+
+def main(loops, branching):
+    store = KVMemoryStore(None, cache_size=0)
+    store.set_many(_traces(loops, branching))
+    counter = Counter()
+
+    with mock.patch.object(kv_memory, "_store", store):
+        index = get_loop_lineage()
+        read = counter.wrap(kv_memory.read_from_memory)
+        walked = _timed(f"family of root, walk ({loops:,} loops)", lambda: asyncio.run(_walk_family(read, "loop_0")), counter)
+        indexed = _timed("family of root, lineage index", lambda: index.family("loop_0"), counter)
+        assert walked["descendants"] == indexed["descendants"]
+
+        patches = [
+            mock.patch.object(historian_drift_report, "read_from_memory", counter.wrap(kv_memory.read_from_memory)),
+            mock.patch.object(historian_drift_report, "read_many_from_memory",
+                              counter.wrap(kv_memory.read_many_from_memory)),
+        ]
+        for patcher in patches:
+            patcher.start()
+
+        async def per_loop():
+            for loop_id in index.loop_ids():
+                await historian_drift_report.generate_belief_drift_report(loop_id)
+                await historian_drift_report.inject_drift_report_into_loop_trace(loop_id)
+
+        _timed("drift reports, per loop", lambda: asyncio.run(per_loop()), counter)
+        _timed("drift reports, streamed", lambda: asyncio.run(
+            historian_drift_report.generate_drift_reports_for_all_loops()), counter)
+        for patcher in patches:
+            patcher.stop()
+    store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark loop lineage queries.")
+    parser.add_argument("--loops", type=int, default=3000)
+    parser.add_argument("--branching", type=int, default=3)
+    args = parser.parse_args()
+    main(args.loops, args.branching)
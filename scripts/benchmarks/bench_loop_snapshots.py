@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loop snapshots embedded in the project state vs the delta
+snapshot store.
+
+Simulates N loops that each update the project state and save a snapshot,
+then reports the state file size, the cold read latency of the state file and
+the snapshot store size.
+
+Usage:
+    python scripts/benchmarks/bench_loop_snapshots.py [--loops 500]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+from app.modules import loop_resume_engine, project_state, snapshot_store
+from app.modules.loop_resume_engine import _sanitize_for_storage
+from app.modules.project_state_store import ProjectStateStore
+from app.modules.snapshot_store import SnapshotStore
+
+
+def _legacy_save_loop_snapshot(project_id):
+    # The pre-store implementation: every snapshot is appended to the state
+    snapshot = _sanitize_for_storage(project_state.read_project_state(project_id))
+    data = {"timestamp": datetime.utcnow().isoformat(), "loop": snapshot.get("loop_count", 0), "snapshot": snapshot}
+    loop_snapshots = project_state.read_project_state(project_id).get("loop_snapshots", [])
+    loop_snapshots.append(data)
+    project_state.update_project_state(project_id, {"loop_snapshots": loop_snapshots, "last_snapshot": data})
+
+
+def _simulate(loops, save):
+    for loop in range(loops):
+        project_state.update_project_state("bench", {
+            "completed_steps": [f"agent_{loop % 7}"],
+            "files_created": [f"src/file_{loop}.py"],
+            "tool_usage": {"search": 1},
+            "latest_agent_action": {"loop": loop, "summary": "did some work " * 5},
+            "increment_loop_count": True,
+        })
+        save("bench")
+
+
+def _cold_read_ms(path, repeats=20):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        with open(path) as f:
+            json.load(f)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main(loops):
+    print(f"{'mode':<10}{'loops':>7}{'state KB':>12}{'read ms':>10}{'store KB':>12}{'total s':>10}")
+    for mode in ("embedded", "store"):
+        with tempfile.TemporaryDirectory() as tmp:
+            project_state._store = ProjectStateStore(tmp, coalesce_interval=0)
+            db_path = os.path.join(tmp, "snapshots.db")
+            snapshot_store._store = SnapshotStore(db_path)
+            save = _legacy_save_loop_snapshot if mode == "embedded" else loop_resume_engine.save_loop_snapshot
+
+            start = time.perf_counter()
+            _simulate(loops, save)
+            elapsed = time.perf_counter() - start
+
+            state_path = project_state._store.path_for("bench")
+            # Closing checkpoints the WAL into the main database file
+            snapshot_store._store.close()
+            store_kb = sum(
+                os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp) if name.startswith("snapshots.db")
+            ) / 1024 if mode == "store" else 0.0
+            print(f"{mode:<10}{loops:>7}{os.path.getsize(state_path) / 1024:>12.1f}"
+                  f"{_cold_read_ms(state_path):>10.2f}{store_kb:>12.1f}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--loops", type=int, default=500)
+    args = parser.parse_args()
+    main(args.loops)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MemoryDB per-row inserts vs write_memories, and tag queries via the
+JSON tags column vs the memory_tags index.
+
+Usage:
+    python scripts/benchmarks/bench_memory_db.py [--rows 100000] [--wal]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+TAGS = [f"tag_{i}" for i in range(200)]
+
+
+def _memory(i):
+    return {
+        "memory_id": f"mem-{i}",
+        "agent_id": f"agent-{i % 8}",
+        "memory_type": "bench",
+        "content": f"benchmark memory {i}",
+        "tags": [TAGS[i % len(TAGS)], TAGS[(i * 7) % len(TAGS)]],
+        "timestamp": f"2025-01-01T00:00:{i % 60:02d}.{i:06d}",
+    }
+
+
+def _timed(label, fn, count=None):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    rate = f" ({count / elapsed:,.0f}/s)" if count else ""
+    print(f"{label:<45}{elapsed * 1000:>12.1f} ms{rate}")
+    return result
+
+
+def main(rows, wal):
+    import app.db.memory_db as memory_db_module
+
+    memory_db_module.USE_WAL = wal
+    db = memory_db_module.memory_db
+    batch = [_memory(i) for i in range(rows)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.close()
+        db.db_path = os.path.join(tmp, "memory.db")
+        db._init_db()
+        conn = db._get_connection()
+
+        # Baseline: one INSERT OR REPLACE plus one commit per memory, as write_memory does
+        def per_row():
+            for memory in batch:
+                row = db._prepare_memory(memory)
+                conn.execute(
+                    f"INSERT OR REPLACE INTO memories ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                    list(row.values()),
+                )
+                conn.commit()
+
+        _timed(f"per-row insert+commit ({rows:,} rows)", per_row, rows)
+        conn.execute("DELETE FROM memories")
+        conn.commit()
+
+        _timed(f"write_memories ({rows:,} rows)", lambda: db.write_memories(batch), rows)
+
+        queries = TAGS[:50]
+
+        def json_scan():
+            for tag in queries:
+                conn.execute(
+                    "SELECT * FROM memory_view WHERE tags LIKE ? ORDER BY timestamp DESC",
+                    (f'%{json.dumps(tag)}%',),
+                ).fetchall()
+
+        _timed(f"tag query via JSON LIKE scan (x{len(queries)})", json_scan, len(queries))
+        _timed(
+            f"tag query via memory_tags join (x{len(queries)})",
+            lambda: [db.read_memories(tag=tag) for tag in queries],
+            len(queries),
+        )
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark MemoryDB bulk writes and tag queries.")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--wal", action="store_true", help="Enable WAL + synchronous=NORMAL")
+    args = parser.parse_args()
+    main(args.rows, args.wal)
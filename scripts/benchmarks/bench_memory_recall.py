@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: keyword recall via Python substring scan vs the FTS5 index.
+
+Usage:
+    python scripts/benchmarks/bench_memory_recall.py [--sizes 10000 100000 300000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+WORDS = ("plan review deploy optimize sorting algorithm latency memory agent loop "
+         "reflection critic insight error handling performance bottleneck cache").split()
+QUERIES = ["optimize", "sorting algorithm", "bottleneck", "reflect*", '"error handling"', "token4242"]
+
+
+def _memory(i, rng):
+    return {
+        "memory_id": f"mem-{i}",
+        "agent_id": f"agent-{i % 8}",
+        "memory_type": "bench",
+        "content": " ".join(rng.choice(WORDS) for _ in range(30)) + f" token{i}",
+        "tags": [rng.choice(WORDS)],
+        "timestamp": f"2025-01-01T00:{(i // 60) % 60:02d}:{i % 60:02d}",
+    }
+
+
+def _substring_recall(entries, query, limit=10, offset=0):
+    # The pre-FTS _filter_entries/_contains_keyword path
+    query = query.strip('"').rstrip("*").lower()
+    matched = [e for e in entries.copy() if query in json.dumps(e).lower()]
+    matched.sort(key=lambda e: e.get("timestamp", ""), reverse=True)
+    return len(matched), matched[offset:offset + limit]
+
+
+def main(sizes):
+    from app.db.memory_db import memory_db
+
+    rng = random.Random(7)
+    print(f"{'memories':>10}{'substring ms/query':>22}{'fts5 ms/query':>18}")
+    for size in sizes:
+        entries = [_memory(i, rng) for i in range(size)]
+        with tempfile.TemporaryDirectory() as tmp:
+            memory_db.close()
+            memory_db.db_path = os.path.join(tmp, "memory.db")
+            memory_db._init_db()
+            memory_db.write_memories(entries)
+
+            start = time.perf_counter()
+            for query in QUERIES:
+                _substring_recall(entries, query)
+            substring_ms = (time.perf_counter() - start) * 1000 / len(QUERIES)
+
+            start = time.perf_counter()
+            for query in QUERIES:
+                memory_db.search_memories(query, limit=10)
+            fts_ms = (time.perf_counter() - start) * 1000 / len(QUERIES)
+
+            memory_db.close()
+        print(f"{size:>10}{substring_ms:>22.2f}{fts_ms:>18.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark keyword memory recall.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 300000])
+    args = parser.parse_args()
+    main(args.sizes)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a full post-loop summary pass (reflection_guardrails.process_loop_completion)
+against the old mocked memory helpers vs the shared KV memory store.
+
+"legacy" replaces each module's read_from_memory / write_to_memory with the
+previous mock: a dict behind a 0.1 s sleep per call, batched helpers issuing
+one call per key. "kv" runs against an in-memory KVMemoryStore. The reflection
+agent API mocks still sleep in both modes.
+
+process_loop_reflection passes override arguments that run_safety_checks does
+not accept; the benchmark forwards only the supported ones.
+
+Usage:
+    python scripts/benchmarks/bench_post_loop_summary.py [--loops 5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from unittest import mock
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+from app.modules import kv_memory, reflection_guardrails, safety_integration
+from app.modules.kv_memory import KVMemoryStore
+
+MODULES = [
+    "pessimist_agent", "pessimist_bias_tracking", "post_loop_summary_handler",
+    "reflection_fatigue_scoring", "reflection_guardrails", "rerun_decision_engine",
+    "rerun_reasoning_logger",
+]
+
+
+def _seed(loop_ids):
+    data = {}
+    for loop_id in loop_ids:
+        data[f"loop_prompt[{loop_id}]"] = "Summarize the quarterly results for the board."
+        data[f"loop_output[{loop_id}]"] = "Revenue grew 12% while costs stayed flat."
+        data[f"loop_trace[{loop_id}]"] = {"loop_id": loop_id, "status": "completed", "rerun_count": 0}
+    return data
+
+
+class LegacyMemory:
+    """The pre-store mock helpers, counting calls."""
+
+    def __init__(self, data):
+        self.data = dict(data)
+        self.calls = 0
+
+    async def read(self, key):
+        self.calls += 1
+        await asyncio.sleep(0.1)
+        return self.data.get(key)
+
+    async def write(self, key, value):
+        self.calls += 1
+        await asyncio.sleep(0.1)
+        self.data[key] = value
+        return True
+
+    async def read_many(self, keys):
+        values = {key: await self.read(key) for key in keys}
+        return {key: value for key, value in values.items() if value is not None}
+
+    async def write_many(self, items):
+        for key, value in items.items():
+            await self.write(key, value)
+        return True
+
+
+async def _run_safety_checks(loop_id, prompt, output, checks_to_run=None, *overrides):
+    return await safety_integration.run_safety_checks(loop_id, prompt, output, checks_to_run)
+
+
+def _patches(read, write, read_many=None, write_many=None):
+    patches = [mock.patch("app.modules.post_loop_summary_handler.run_safety_checks", _run_safety_checks)]
+    for name in MODULES:
+        module = f"app.modules.{name}"
+        patches.append(mock.patch(f"{module}.read_from_memory", read))
+        patches.append(mock.patch(f"{module}.write_to_memory", write))
+    if read_many:
+        patches.append(mock.patch("app.modules.post_loop_summary_handler.read_many_from_memory", read_many))
+        patches.append(mock.patch("app.modules.post_loop_summary_handler.write_many_to_memory", write_many))
+    return patches
+
+
+async def _pass(loop_ids):
+    for loop_id in loop_ids:
+        await reflection_guardrails.process_loop_completion(loop_id, "done")
+
+
+def _run(label, loop_ids, patches, counter):
+    for patcher in patches:
+        patcher.start()
+    try:
+        start = time.perf_counter()
+        asyncio.run(_pass(loop_ids))
+        elapsed = time.perf_counter() - start
+    finally:
+        for patcher in patches:
+            patcher.stop()
+    print(f"{label:<12}{elapsed:>10.2f} s{elapsed / len(loop_ids) * 1000:>12.0f} ms/loop{counter():>10} memory calls")
+
+
+def main(loops):
+    loop_ids = [f"loop_{i:03d}" for i in range(1, loops + 1)]
+    data = _seed(loop_ids)
+    print(f"{'mode':<12}{'total':>12}{'per loop':>20}{'':>10}")
+
+    legacy = LegacyMemory(data)
+    _run("legacy", loop_ids, _patches(legacy.read, legacy.write, legacy.read_many, legacy.write_many),
+         lambda: legacy.calls)
+
+    store = KVMemoryStore(None)
+    store.set_many(data)
+    calls = {"n": 0}
+
+    def counted(fn):
+        async def wrapper(*args):
+            calls["n"] += 1
+            return await fn(*args)
+        return wrapper
+
+    with mock.patch.object(kv_memory, "_store", store):
+        _run("kv", loop_ids, _patches(
+            counted(kv_memory.read_from_memory), counted(kv_memory.write_to_memory),
+            counted(kv_memory.read_many_from_memory), counted(kv_memory.write_many_to_memory),
+        ), lambda: calls["n"])
+    store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark a post-loop summary pass against the memory backends.")
+    parser.add_argument("--loops", type=int, default=5)
+    args = parser.parse_args()
+    main(args.loops)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loading a repository tree with file contents, the previous
+recursive os.listdir walk vs RepoScanner (cold, and rescanned against its
+manifest after --touch files changed).
+
+A synthetic repository of --dirs directories with --files files each is
+generated in a temporary directory.
+
+Usage:
+    python scripts/benchmarks/bench_repo_scanner.py [--dirs 200] [--files 50] [--touch 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+from app.core import repo_scanner
+from app.core.repo_scanner import RepoScanner, ScanManifest
+
+FILE_TYPES = ['.py', '.js', '.ts', '.html', '.css', '.md', '.json', '.yaml', '.yml']
+EXCLUDE_DIRS = ['node_modules', 'venv', '.venv', 'env', '.env', '__pycache__', '.git', 'dist', 'build']
+
+
+def _legacy_scan(directory, relative_path="", include_contents=True):
+    # The pre-scanner RepoLoader._scan_directory
+    files, directories = [], []
+    for item in os.listdir(directory):
+        item_path = os.path.join(directory, item)
+        item_relative_path = os.path.join(relative_path, item) if relative_path else item
+        if os.path.isdir(item_path):
+            if item in EXCLUDE_DIRS:
+                continue
+            directories.append({"name": item, "path": item_relative_path,
+                                "structure": _legacy_scan(item_path, item_relative_path, include_contents)})
+        elif os.path.isfile(item_path):
+            _, ext = os.path.splitext(item)
+            if ext.lower() not in FILE_TYPES:
+                continue
+            file_info = {"name": item, "path": item_relative_path, "extension": ext.lower(),
+                         "size": os.path.getsize(item_path)}
+            if include_contents and os.path.getsize(item_path) <= 1024 * 1024:
+                try:
+                    with open(item_path, "r", encoding="utf-8") as f:
+                        file_info["contents"] = f.read()
+                except UnicodeDecodeError:
+                    file_info["contents"] = "<binary file>"
+            files.append(file_info)
+    return {"files": files, "directories": directories}
+
+
+def _make_repo(root, dirs, files):
+    body = "def handler(event):\n    return event\n" * 100
+    paths = []
+    for d in range(dirs):
+        directory = os.path.join(root, f"pkg_{d // 20}", f"mod_{d}")
+        os.makedirs(directory, exist_ok=True)
+        for f in range(files):
+            ext = (".py", ".md", ".json", ".txt")[f % 4]
+            path = os.path.join(directory, f"file_{f}{ext}")
+            with open(path, "w") as fh:
+                fh.write(body)
+            paths.append(path)
+    os.makedirs(os.path.join(root, "node_modules", "dep"), exist_ok=True)
+    with open(os.path.join(root, ".gitignore"), "w") as fh:
+        fh.write("*.log\nbuild/\n")
+    return paths
+
+
+def _timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<32}{(time.perf_counter() - start) * 1000:>10.0f} ms")
+    return result
+
+
+def main(dirs, files, touch):
+    with tempfile.TemporaryDirectory() as root:
+        paths = _make_repo(root, dirs, files)
+        print(f"{len(paths):,} files in {dirs} directories\n")
+
+        _timed("legacy walk, structure only", lambda: _legacy_scan(root, include_contents=False))
+        _timed("scanner, structure only", lambda: RepoScanner().scan_tree(
+            root, file_types=FILE_TYPES, exclude_dirs=EXCLUDE_DIRS))
+        print()
+
+        _timed("legacy walk", lambda: _legacy_scan(root))
+        manifest = ScanManifest(None)
+        scanner = RepoScanner(manifest)
+        options = dict(include_contents=True, file_types=FILE_TYPES, exclude_dirs=EXCLUDE_DIRS)
+
+        # Recorded files are otherwise too fresh to be trusted by the manifest
+        repo_scanner.RACY_WINDOW_NS = 0
+        _, stats = _timed("scanner, cold", lambda: scanner.scan_tree(root, **options))
+        print(f"{'':<32}{stats}")
+        for path in paths[:touch]:
+            with open(path, "a") as fh:
+                fh.write("# changed\n")
+        _, stats = _timed(f"scanner, rescan ({touch} changed)", lambda: scanner.scan_tree(root, **options))
+        print(f"{'':<32}{stats}")
+        count = _timed("scanner, streamed rescan", lambda: sum(1 for _ in scanner.iter_files(root, **options)))
+        print(f"{'':<32}{count} records")
+        manifest.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark repository tree loading.")
+    parser.add_argument("--dirs", type=int, default=200)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--touch", type=int, default=20)
+    args = parser.parse_args()
+    main(args.dirs, args.files, args.touch)
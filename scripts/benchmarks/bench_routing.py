@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: routing prompts to personas and tasks to agents, with the previous
+per-keyword substring scans vs the keyword routing index.
+
+Scores --prompts generated prompts for personas against a memory of recent
+loops, and routes them as task descriptions to agents one by one and with
+AgentRouter.route_many. Each variant must make the same routing decisions.
+
+Usage:
+    python scripts/benchmarks/bench_routing.py [--prompts 5000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+from unittest import mock
+
+from app.core.agent_router import AgentRouter
+from orchestrator import mode_dispatcher
+
+WORDS = (
+    "please research analyze the data pipeline and design a new system for deployment monitoring "
+    "of our cloud infrastructure then write python code for the api reflect on the process routine "
+    "brainstorm creative ideas to improve memory retrieval and knowledge storage with vector search"
+).split()
+
+
+def _legacy_persona_keyword_scores(prompt):
+    # The keyword step of the previous _score_personas_for_prompt
+    scores = {persona: 0.0 for persona in mode_dispatcher.PERSONA_MODES}
+    prompt_lower = prompt.lower()
+    for persona, words in mode_dispatcher.PERSONA_KEYWORDS.items():
+        for word in words:
+            if word in prompt_lower:
+                scores[persona] += 0.2
+    return scores
+
+
+def _persona_keyword_scores(prompt):
+    scores = {persona: 0.0 for persona in mode_dispatcher.PERSONA_MODES}
+    for persona in mode_dispatcher._persona_index.matches(prompt.lower()):
+        scores[persona] += 0.2
+    return scores
+
+
+def _legacy_similarities(prompt, loops):
+    # The previous _calculate_similarity, against every recent loop prompt
+    def similarity(text1, text2):
+        words1, words2 = set(text1.lower().split()), set(text2.lower().split())
+        union = len(words1 | words2)
+        return len(words1 & words2) / union if union else 0.0
+
+    return [similarity(prompt, loop["prompt"]) for loop in loops]
+
+
+def _legacy_route_task(router, task_description):
+    # The previous AgentRouter.route_task, without the request log
+    profiles = router.get_all_agent_profiles()
+    scores = {agent_type: 0.0 for agent_type in profiles}
+    reasons = {agent_type: [] for agent_type in profiles}
+    task_lower = task_description.lower()
+    for agent_type, profile in profiles.items():
+        for specialty in profile.specialties:
+            if specialty.lower() in task_lower:
+                scores[agent_type] += 1.0
+                reasons[agent_type].append(f"Task mentions specialty: {specialty}")
+        for capability in profile.capabilities:
+            if capability.capability_name.lower() in task_lower:
+                scores[agent_type] += 0.5
+                reasons[agent_type].append(f"Task mentions capability: {capability.capability_name}")
+    agent_type, score = max(scores.items(), key=lambda x: x[1])
+    return agent_type, min(score / 5.0, 1.0), "; ".join(reasons[agent_type])
+
+
+def _timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<40}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def main(count):
+    rng = random.Random(11)
+    prompts = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 60))) for _ in range(count)]
+    memory = {"loops": [{"prompt": rng.choice(prompts), "output": "created a new design"} for _ in range(5)]}
+    print(f"{count:,} prompts\n")
+
+    legacy = _timed("persona keywords: per keyword", lambda: [
+        _legacy_persona_keyword_scores(prompt) for prompt in prompts])
+    indexed = _timed("persona keywords: index", lambda: [
+        _persona_keyword_scores(prompt) for prompt in prompts])
+    assert legacy == indexed, "persona keyword scores differ"
+
+    _timed("recent loop similarity: per call", lambda: [
+        _legacy_similarities(prompt, memory["loops"]) for prompt in prompts])
+    _timed("recent loop similarity: cached sets", lambda: [
+        [mode_dispatcher._calculate_similarity(prompt, loop["prompt"]) for loop in memory["loops"]]
+        for prompt in prompts])
+    _timed("select persona: one by one", lambda: [
+        mode_dispatcher.select_persona_for_loop("loop", prompt, memory) for prompt in prompts])
+    _timed("select persona: route_many", lambda: mode_dispatcher.route_many(prompts, memory))
+    print()
+
+    with mock.patch("app.core.agent_router.os.makedirs"):
+        router = AgentRouter()
+    router._log_routing_event = lambda event_type, data: None
+    legacy = _timed("agent routing: per keyword", lambda: [
+        _legacy_route_task(router, prompt) for prompt in prompts])
+    indexed = _timed("agent routing: route_task", lambda: [router.route_task(prompt) for prompt in prompts])
+    batched = _timed("agent routing: route_many", lambda: router.route_many(prompts))
+    assert legacy == indexed == batched, "routing decisions differ"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark persona and agent routing.")
+    parser.add_argument("--prompts", type=int, default=5000)
+    args = parser.parse_args()
+    main(args.prompts)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: validations/sec for agent output payloads, per call vs compiled.
+
+Modes:
+    per-call    read + parse the schema file, then jsonschema.validate
+                (the old agent_sdk.validate_schema path)
+    compiled    CompiledSchemaRegistry.validate
+    is_valid    CompiledSchemaRegistry.is_valid fast path
+
+Usage:
+    python scripts/benchmarks/bench_schema_validation.py [--seconds 1.0]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+sys.path.insert(0, REPO_ROOT)
+
+import jsonschema
+
+from app.utils.compiled_schemas import CompiledSchemaRegistry
+
+CASES = {
+    "orchestrator_output": (
+        "schemas/agent_output/orchestrator_output.schema.json",
+        {
+            "status": "success",
+            "task": "Coordinate the landing page build",
+            "project_id": "demo_001",
+            "intent": "coordination",
+            "action": "trigger_next_agent",
+            "timestamp": "2025-04-24T20:00:00Z",
+            "output": "Triggered NOVA after HAL completed",
+            "tools": ["memory", "planner"],
+            "loop_id": "loop_0042",
+            "trigger_result": {
+                "triggered_agent": "nova",
+                "timestamp": "2025-04-24T20:00:00Z",
+                "loop_count": 3,
+                "status": "triggered",
+            },
+            "decisions": [
+                {"timestamp": "2025-04-24T19:5%d:00Z" % i, "loop_count": i, "last_agent": "hal",
+                 "next_agent": "nova", "reason": "HAL finished its step"}
+                for i in range(5)
+            ],
+        },
+    ),
+    "loop_plan": (
+        "schemas/orchestrator/loop_plan.schema.json",
+        {
+            "loop_id": 42,
+            "agents": ["hal", "nova", "critic"],
+            "goals": ["Build the landing page", "Review the copy"],
+            "planned_files": ["src/App.jsx", "src/Hero.jsx", "README.md"],
+            "confirmed": True,
+            "confirmed_by": "operator",
+            "confirmed_at": "2025-04-24T20:00:00Z",
+        },
+    ),
+}
+
+
+def _per_call(path, payload):
+    with open(os.path.join(REPO_ROOT, path)) as f:
+        schema = json.load(f)
+    jsonschema.validate(instance=payload, schema=schema)
+
+
+def _rate(fn, seconds):
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for _ in range(20):
+            fn()
+        calls += 20
+    return calls / (time.perf_counter() - start)
+
+
+def main(seconds):
+    registry = CompiledSchemaRegistry()
+    print(f"{'payload':<22}{'valid':>7}{'per-call/s':>14}{'compiled/s':>14}{'is_valid/s':>14}{'speedup':>10}")
+    for name, (path, payload) in CASES.items():
+        valid = registry.is_valid(path, payload)
+
+        def per_call():
+            try:
+                _per_call(path, payload)
+            except jsonschema.ValidationError:
+                pass
+
+        def compiled():
+            try:
+                registry.validate(path, payload)
+            except jsonschema.ValidationError:
+                pass
+
+        old = _rate(per_call, seconds)
+        new = _rate(compiled, seconds)
+        fast = _rate(lambda: registry.is_valid(path, payload), seconds)
+        print(f"{name:<22}{str(valid):>7}{old:>14,.0f}{new:>14,.0f}{fast:>14,.0f}{new / old:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+    main(args.seconds)
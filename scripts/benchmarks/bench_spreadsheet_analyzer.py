@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark: spreadsheet analyzer operations on a generated CSV, row dicts vs
+column tables.
+
+"rows" loads the file into a list of typed row dicts and runs the previous
+per-row implementations (per-cell isinstance checks, dict-of-lists group-by);
+"columns" runs the analyzer on a ColumnTable read in chunks.
+
+Usage:
+    python scripts/benchmarks/bench_spreadsheet_analyzer.py [--rows 1000000] [--chunk-rows 65536]
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+from app.core.column_table import ColumnTable
+from app.tools import spreadsheet_analyzer
+
+FILTERS = {"Quantity": {"gte": 50}, "Product": {"contains": "B"}}
+GROUPBY = ["Region", "Channel"]
+AGGREGATIONS = {"Revenue": "sum", "Quantity": "avg", "Profit": "max"}
+
+
+def _write_csv(path, rows):
+    rng = random.Random(7)
+    products = [f"Product {c}" for c in "ABCDE"]
+    regions = ["North", "South", "East", "West", "Central"]
+    channels = ["Online", "Retail", "Distributor", "Direct"]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Date", "Product", "Region", "Channel", "Quantity", "UnitPrice", "Revenue", "Profit"])
+        for i in range(rows):
+            quantity = rng.randint(10, 100)
+            price = round(rng.uniform(10, 500), 2)
+            revenue = round(quantity * price, 2)
+            writer.writerow([
+                f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}", rng.choice(products), rng.choice(regions),
+                rng.choice(channels), quantity, price, revenue, round(revenue * rng.uniform(0.3, 0.6), 2),
+            ])
+
+
+def _load_rows(path):
+    def convert(value):
+        for cast in (int, float):
+            try:
+                return cast(value)
+            except ValueError:
+                pass
+        return value
+
+    with open(path, newline="") as f:
+        return [{key: convert(value) for key, value in row.items()} for row in csv.DictReader(f)]
+
+
+def _filter_rows(rows, filters):
+    result = []
+    for row in rows:
+        matches = True
+        for column, condition in filters.items():
+            value = row.get(column)
+            for op, op_value in condition.items():
+                if op == "gte" and not (isinstance(value, (int, float)) and value >= op_value):
+                    matches = False
+                elif op == "contains" and not (isinstance(value, str) and op_value in value):
+                    matches = False
+        if matches:
+            result.append(row)
+    return result
+
+
+def _aggregate_rows(rows, groupby, aggregations):
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(str(row.get(col)) for col in groupby), []).append(row)
+    result = []
+    for key, group_rows in groups.items():
+        group_result = dict(zip(groupby, key))
+        for col, func in aggregations.items():
+            values = [row[col] for row in group_rows if row.get(col) is not None]
+            group_result[f"{col}_{func}"] = {
+                "sum": sum, "max": max, "avg": lambda v: sum(v) / len(v),
+            }[func](values)
+        result.append(group_result)
+    return result
+
+
+def _analyze_rows(rows):
+    stats = {}
+    for col in rows[0]:
+        values = [row[col] for row in rows if col in row and row[col] is not None]
+        if isinstance(values[0], (int, float)):
+            ordered = sorted(values)
+            stats[col] = {"min": ordered[0], "max": ordered[-1], "sum": sum(values), "median": ordered[len(ordered) // 2]}
+        else:
+            counts = {}
+            for value in values:
+                counts[value] = counts.get(value, 0) + 1
+            stats[col] = {"unique_count": len(counts), "max_length": max(len(str(v)) for v in values)}
+    return stats
+
+
+def _timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28}{elapsed * 1000:>12.0f} ms")
+    return result
+
+
+def main(rows, chunk_rows):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "sales.csv")
+        _write_csv(path, rows)
+        print(f"{rows:,} rows, {os.path.getsize(path) / 1e6:.0f} MB\n")
+
+        data = _timed("rows: load", lambda: _load_rows(path))
+        row_filtered = _timed("rows: filter", lambda: _filter_rows(data, FILTERS))
+        row_groups = _timed("rows: aggregate", lambda: _aggregate_rows(data, GROUPBY, AGGREGATIONS))
+        _timed("rows: column statistics", lambda: _analyze_rows(data))
+        # Free the row dicts before loading the columns
+        data = None
+        print()
+
+        table = _timed("columns: load", lambda: ColumnTable.read_csv(path, chunk_rows=chunk_rows))
+        filtered = _timed("columns: filter", lambda: spreadsheet_analyzer._filter_data(table, FILTERS, None))
+        groups = _timed("columns: aggregate",
+                        lambda: spreadsheet_analyzer._aggregate_data(table, GROUPBY, AGGREGATIONS))
+        _timed("columns: analyze", lambda: spreadsheet_analyzer._analyze_data(table, {}))
+        _timed("columns: describe", lambda: spreadsheet_analyzer._describe_data(table, None))
+        _timed("columns: correlate", lambda: spreadsheet_analyzer._correlate_data(table, None))
+
+        assert filtered["row_count"] == len(row_filtered)
+        assert [group["Region"] for group in groups["aggregated_data"]] == [group["Region"] for group in row_groups]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark spreadsheet analyzer operations.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=65536)
+    args = parser.parse_args()
+    main(args.rows, args.chunk_rows)
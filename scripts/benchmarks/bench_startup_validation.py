@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: startup surface validation without the validation cache, with a
+cold cache, with a warm cache and after changing one agent file.
+
+Generates --agents agents, as many modules, schemas and components, and
+--endpoints endpoints spread over router files, under a temporary base path.
+Agent and module files sleep --import-ms at import time to stand in for
+module-level setup work. Every run must produce the same report.
+
+Usage:
+    python scripts/benchmarks/bench_startup_validation.py [--agents 200] [--endpoints 400] [--import-ms 20]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+from app.startup_validation.utils.validation_cache import ValidationCache
+from app.startup_validation.validators.agent_validator import validate_agents
+from app.startup_validation.validators.component_validator import validate_components
+from app.startup_validation.validators.endpoint_validator import validate_endpoints
+from app.startup_validation.validators.module_validator import validate_modules
+from app.startup_validation.validators.schema_validator import validate_schemas
+
+ROUTERS = 20
+
+
+def _write(base_path, relative_path, content):
+    path = os.path.join(base_path, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+    return path
+
+
+def _make_surfaces(base_path, count, endpoint_count, import_ms):
+    setup = f"import time\ntime.sleep({import_ms / 1000})\n"
+    aci = {"agents": []}
+    pice = {"modules": [], "schemas": [], "endpoints": [], "components": []}
+
+    for i in range(count):
+        _write(base_path, f"app/agents/worker{i}_agent.py", setup + f"class Worker{i}Agent:\n    pass\n")
+        aci["agents"].append({"name": f"Worker{i}Agent", "description": "Worker", "tools": []})
+
+        _write(base_path, f"app/modules/jobs/job{i}.py", setup + "def run():\n    pass\n")
+        pice["modules"].append({"name": f"jobs.job{i}"})
+
+        _write(base_path, f"app/schemas/job{i}.json", json.dumps({"type": "object"}))
+        pice["schemas"].append({"name": f"Job{i}", "file": f"job{i}.json"})
+
+        _write(base_path, f"frontend/components/Job{i}.jsx", f"export default function Job{i}() {{}}\n")
+        pice["components"].append({"name": f"Job{i}", "path": f"Job{i}.jsx"})
+
+    routes = {router: [] for router in range(ROUTERS)}
+    for i in range(endpoint_count):
+        router = i % ROUTERS
+        routes[router].append(f'@router.get("/svc{router}/item{i}", response_model=Item)\ndef item{i}(): pass\n')
+        pice["endpoints"].append({"path": f"/svc{router}/item{i}", "method": "GET"})
+    for router, definitions in routes.items():
+        _write(base_path, f"app/modules/svc{router}/router.py", "".join(definitions))
+
+    return aci, pice
+
+
+def _validate(aci, pice, cache):
+    results = (
+        validate_agents(aci, cache),
+        validate_modules(pice, cache),
+        validate_schemas(pice, cache),
+        validate_endpoints(pice, cache),
+        validate_components(pice, cache),
+    )
+    if cache is not None:
+        cache.save()
+    return results
+
+
+def _timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<36}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def main(count, endpoint_count, import_ms):
+    with tempfile.TemporaryDirectory() as base_path:
+        os.environ["PROMETHIOS_BASE_PATH"] = base_path
+        aci, pice = _make_surfaces(base_path, count, endpoint_count, import_ms)
+        cache_path = os.path.join(base_path, "logs", "startup_validation_cache.json")
+        print(f"{count} agents, modules, schemas and components, {endpoint_count} endpoints, "
+              f"{import_ms} ms per import\n")
+
+        baseline = _timed("no cache", lambda: _validate(aci, pice, None))
+        cold = _timed("cold cache", lambda: _validate(aci, pice, ValidationCache(cache_path)))
+        # Let the written files age past the window in which hashes are not trusted
+        for root, _, files in os.walk(base_path):
+            for name in files:
+                os.utime(os.path.join(root, name), (time.time() - 60, time.time() - 60))
+        warm = _timed("warm cache", lambda: _validate(aci, pice, ValidationCache(cache_path)))
+        _write(base_path, "app/agents/worker0_agent.py", "class Worker0Agent:\n    pass\n")
+        changed = _timed("warm cache, one agent changed", lambda: _validate(aci, pice, ValidationCache(cache_path)))
+        assert baseline == cold == warm == changed, "reports differ"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark startup surface validation.")
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--endpoints", type=int, default=400)
+    parser.add_argument("--import-ms", type=int, default=20)
+    args = parser.parse_args()
+    main(args.agents, args.endpoints, args.import_ms)
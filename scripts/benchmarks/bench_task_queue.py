@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the pending task queue, the previous directory of task JSON files
+("json dir") vs TaskStore.
+
+Measures listing the first page of pending tasks for an agent, paging through
+all pending tasks, and updating task statuses, over --tasks tasks of which
+about a third are still pending. The store is filled by migrating the JSON
+directory, as on first start.
+
+Usage:
+    python scripts/benchmarks/bench_task_queue.py [--tasks 20000] [--limit 10]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+from app.core.task_persistence import PendingTask
+from app.core.task_store import TaskStore
+
+AGENTS = ["hal", "ash", "nova", "sage", "critic", "orchestrator"]
+
+
+def _make_tasks(tasks_dir, count, rng):
+    task_ids = []
+    for i in range(count):
+        task = PendingTask(
+            task_description=f"Follow up on step {i} of the plan " * 4,
+            origin_agent=rng.choice(AGENTS),
+            suggested_agent=rng.choice(AGENTS),
+            created_at=f"2025-01-{1 + i // 86400:02d}T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}",
+            priority=rng.random() < 0.1,
+            status=rng.choice(["pending", "executed", "cancelled"]),
+            original_output="The agent suggested a follow-up. " * 20,
+        )
+        with open(os.path.join(tasks_dir, f"{task.task_id}.json"), "w") as f:
+            json.dump(task.dict(), f, indent=2)
+        task_ids.append(task.task_id)
+    return task_ids
+
+
+def _legacy_list(tasks_dir, limit=10, offset=0, suggested_agent=None, status="pending"):
+    # The previous TaskPersistenceManager.get_pending_tasks
+    tasks = []
+    for task_file in [f for f in os.listdir(tasks_dir) if f.endswith(".json")]:
+        with open(os.path.join(tasks_dir, task_file), "r") as f:
+            task = PendingTask(**json.load(f))
+            if status and task.status != status:
+                continue
+            if suggested_agent and task.suggested_agent != suggested_agent:
+                continue
+            tasks.append(task)
+    tasks.sort(key=lambda t: t.created_at, reverse=True)
+    return tasks[offset:offset + limit]
+
+
+def _legacy_update(tasks_dir, task_id, status):
+    task_file = os.path.join(tasks_dir, f"{task_id}.json")
+    with open(task_file, "r") as f:
+        task = PendingTask(**json.load(f))
+    task.status = status
+    with open(task_file, "w") as f:
+        json.dump(task.dict(), f, indent=2)
+
+
+def _store_list(store, **filters):
+    return [PendingTask(**task) for task in store.list(**filters)]
+
+
+def _timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<36}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def main(count, limit):
+    rng = random.Random(5)
+    with tempfile.TemporaryDirectory() as root:
+        tasks_dir = os.path.join(root, "pending_tasks")
+        os.makedirs(tasks_dir)
+        task_ids = _make_tasks(tasks_dir, count, rng)
+        updates = rng.sample(task_ids, 100)
+        print(f"{count:,} tasks, pages of {limit}\n")
+
+        store = TaskStore(os.path.join(root, "pending_tasks.db"))
+        _timed("store: migrate JSON files", lambda: store.import_json_dir(tasks_dir))
+        print()
+
+        legacy = _timed("json dir: first page for agent", lambda: _legacy_list(
+            tasks_dir, limit, suggested_agent="ash"))
+        indexed = _timed("store: first page for agent", lambda: _store_list(
+            store, limit=limit, suggested_agent="ash"))
+        assert [t.task_id for t in legacy] == [t.task_id for t in indexed], "first pages differ"
+
+        pages = 20
+        _timed(f"json dir: {pages} pages by offset", lambda: [
+            _legacy_list(tasks_dir, limit, offset=page * limit) for page in range(pages)])
+
+        def keyset_pages():
+            after = None
+            for _ in range(pages):
+                page = _store_list(store, limit=limit, after=after)
+                after = page[-1].task_id
+        _timed(f"store: {pages} pages by keyset", keyset_pages)
+
+        _timed(f"json dir: update {len(updates)} statuses",
+               lambda: [_legacy_update(tasks_dir, task_id, "executed") for task_id in updates])
+        _timed(f"store: update {len(updates)} statuses",
+               lambda: [store.update(task_id, status="executed") for task_id in updates])
+        _timed(f"store: claim {len(updates)} tasks", lambda: [store.claim_next() for _ in updates])
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pending task queue.")
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+    main(args.tasks, args.limit)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ToolRouter startup with eager imports vs lazy discovery.
+
+Each mode runs in a fresh interpreter so module imports are cold:
+    eager       import every tool module during discovery (the old behaviour)
+    lazy-cold   AST-scan every tool, no manifest yet
+    lazy-warm   reuse the mtime-keyed manifest written by a previous run
+
+Usage:
+    python scripts/benchmarks/bench_tool_discovery.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+
+_PROBE = """
+import logging, sys, time
+logging.disable(logging.CRITICAL)
+start = time.perf_counter()
+import app.core.tool_router as tr
+module_import = time.perf_counter() - start
+start = time.perf_counter()
+router = tr.ToolRouter(lazy={lazy}, manifest_path={manifest!r})
+print(module_import, time.perf_counter() - start, len(router.list_available_tools()))
+"""
+
+
+def _probe(lazy, manifest):
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(lazy=lazy, manifest=manifest)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return float(out[-3]), float(out[-2]), int(out[-1])
+
+
+def main(runs):
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = os.path.join(tmp, "tool_manifest.json")
+        modes = {
+            "eager": lambda: _probe(False, None),
+            "lazy-cold": lambda: (os.path.exists(manifest) and os.remove(manifest)) or _probe(True, manifest),
+            "lazy-warm": lambda: _probe(True, manifest),
+        }
+
+        print(f"{'mode':<12}{'discovery ms':>14}{'total ms':>12}{'tools':>8}")
+        for mode, probe in modes.items():
+            results = [probe() for _ in range(runs)]
+            discovery = statistics.median(r[1] for r in results) * 1000
+            total = statistics.median(r[0] + r[1] for r in results) * 1000
+            print(f"{mode:<12}{discovery:>14.1f}{total:>12.1f}{results[0][2]:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.runs)
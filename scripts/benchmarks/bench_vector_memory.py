@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON-rewrite memory storage vs the append-only VectorIndex.
+
+Measures per-write cost as the store grows and top-k search latency.
+
+Usage:
+    python scripts/benchmarks/bench_vector_memory.py [--memories 20000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+from app.core.vector_index import VectorIndex
+
+
+def main(count, dimension):
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((count, dimension)).astype(np.float32)
+    checkpoints = {count // 10, count // 2, count}
+
+    print(f"{'memories':>10}{'json rewrite ms/write':>24}{'vector index ms/write':>24}")
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = os.path.join(tmp, "memories.json")
+        index = VectorIndex(os.path.join(tmp, "index"), dimension=dimension)
+        memories = []
+
+        for i in range(count):
+            record = {"id": f"mem_{i}", "content": f"memory {i}", "metadata": {"scope": "global"}}
+            memories.append(record)
+            n = i + 1
+            if n in checkpoints:
+                # Time one write at this size for each backend
+                start = time.perf_counter()
+                with open(json_file, "w") as f:
+                    json.dump(memories, f, indent=2)
+                json_ms = (time.perf_counter() - start) * 1000
+
+                start = time.perf_counter()
+                index.add(record["id"], vectors[i], record)
+                index_ms = (time.perf_counter() - start) * 1000
+                print(f"{n:>10}{json_ms:>24.3f}{index_ms:>24.3f}")
+            else:
+                index.add(record["id"], vectors[i], record)
+
+        queries = rng.standard_normal((100, dimension)).astype(np.float32)
+        start = time.perf_counter()
+        for query in queries:
+            index.search(query, k=10)
+        search_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        start = time.perf_counter()
+        for query in queries:
+            index.search(query, k=10, filters={"scope": "global"})
+        filtered_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        print(f"top-10 search over {count:,} x {dimension}: {search_ms:.2f} ms (filtered: {filtered_ms:.2f} ms)")
+        index.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the vector memory index.")
+    parser.add_argument("--memories", type=int, default=20000)
+    parser.add_argument("--dimension", type=int, default=512)
+    args = parser.parse_args()
+    main(args.memories, args.dimension)
@@ -0,0 +1,128 @@
+"""
+Tests for the columnar table and the spreadsheet analyzer operations built on it.
+"""
+
+import os
+import tempfile
+import unittest
+
+from app.core.column_table import ColumnTable
+from app.tools import spreadsheet_analyzer
+
+ROWS = [
+    {"Region": "North", "Product": "A", "Quantity": 10, "Price": 2.5, "Flag": True},
+    {"Region": "South", "Product": "B", "Quantity": 5, "Price": None, "Flag": False},
+    {"Region": "North", "Product": "B", "Quantity": 7, "Price": 4.0, "Flag": True},
+    {"Region": "East", "Product": "A", "Quantity": 1, "Price": 1.5},
+    {"Region": None, "Product": "A", "Quantity": 3, "Price": 3.0, "Flag": False},
+]
+
+
+class TestColumnTable(unittest.TestCase):
+    """Test cases for column typing, CSV ingestion and grouping."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "sales.csv")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_csv(self, text):
+        with open(self.path, "w", newline="") as f:
+            f.write(text)
+
+    def test_from_rows_types_and_nulls(self):
+        table = ColumnTable.from_rows(ROWS)
+
+        self.assertEqual(
+            {name: column.kind for name, column in table.columns.items()},
+            {"Region": "string", "Product": "string", "Quantity": "integer", "Price": "float", "Flag": "boolean"},
+        )
+        self.assertEqual(table["Flag"].tolist(), [True, False, True, None, False])
+        self.assertEqual(table.to_rows()[3], {**ROWS[3], "Flag": None})
+
+    def test_read_csv_is_independent_of_chunk_size(self):
+        self._write_csv("id,name,score,ok,mixed\n1,a,1.5,true,1\n2,b,,false,x\n3,,2,TRUE,2.5\n4,d,3,false,3\n5,e,4\n")
+
+        expected = ColumnTable.read_csv(self.path).to_rows()
+        for chunk_rows in (1, 2, 3):
+            self.assertEqual(ColumnTable.read_csv(self.path, chunk_rows=chunk_rows).to_rows(), expected)
+
+        self.assertEqual(expected[1], {"id": 2, "name": "b", "score": None, "ok": False, "mixed": "x"})
+        self.assertEqual([row["mixed"] for row in expected], ["1", "x", "2.5", "3", None])
+        self.assertEqual(
+            ColumnTable.read_csv(self.path, skip_rows=1, max_rows=2, column_slice=slice(1, 3)).to_rows(),
+            [{"name": "b", "score": None}, {"name": None, "score": 2.0}],
+        )
+
+    def test_group_by_uses_string_keys_in_first_seen_order(self):
+        table = ColumnTable.from_rows(ROWS)
+        groups, keys = table.group_by(["Region", "Missing"])
+
+        self.assertEqual(keys, [("North", "None"), ("South", "None"), ("East", "None"), ("None", "None")])
+        self.assertEqual(groups.tolist(), [0, 1, 0, 2, 3])
+        self.assertEqual(table["Price"].aggregate(groups, len(keys), "sum"), [6.5, None, 1.5, 3.0])
+        self.assertEqual(table["Product"].aggregate(groups, len(keys), "last"), ["B", "B", "A", "A"])
+
+
+class TestSpreadsheetOperations(unittest.TestCase):
+    """Test cases for the analyzer operations on column tables."""
+
+    def setUp(self):
+        self.table = ColumnTable.from_rows(ROWS)
+
+    def test_filter_operators(self):
+        result = spreadsheet_analyzer._filter_data(
+            self.table, {"Quantity": {"gte": 3, "ne": 7}, "Product": {"startswith": "A", "unknown": 1}}, ["Region", "Nope"]
+        )
+        self.assertEqual(result["filtered_data"], [{"Region": "North"}, {"Region": None}])
+
+        self.assertEqual(spreadsheet_analyzer._filter_data(self.table, {"Price": None}, None)["row_count"], 1)
+        self.assertEqual(spreadsheet_analyzer._filter_data(self.table, {"Missing": 1}, None)["row_count"], 0)
+        self.assertEqual(spreadsheet_analyzer._filter_data(self.table, {"Region": {"gt": 1}}, None)["row_count"], 0)
+
+    def test_aggregate_and_pivot(self):
+        result = spreadsheet_analyzer._aggregate_data(
+            self.table, ["Product"], {"Quantity": "avg", "Region": "min", "Price": "median"}
+        )
+        self.assertEqual(result["aggregated_data"], [
+            {"Product": "A", "Quantity_avg": 14 / 3, "Region_min": "East"},
+            {"Product": "B", "Quantity_avg": 6.0, "Region_min": "North"},
+        ])
+
+        pivot = spreadsheet_analyzer._pivot_data(self.table, ["Region"], ["Product"], {"Quantity": "sum"})
+        self.assertEqual(pivot["pivot_data"][0], {"Region": "North", "A": 10, "B": 7})
+
+    def test_analyze_describe_and_correlate(self):
+        analysis = spreadsheet_analyzer._analyze_data(self.table, {})
+        self.assertEqual(analysis["columns"]["Quantity"]["statistics"], {
+            "count": 5, "null_count": 0, "null_percentage": 0.0, "min": 1, "max": 10,
+            "mean": 5.2, "sum": 26, "median": 5,
+        })
+        self.assertEqual(analysis["columns"]["Region"]["statistics"]["most_common"], "North")
+        self.assertEqual(analysis["columns"]["Flag"]["statistics"]["true_count"], 2)
+
+        described = spreadsheet_analyzer._describe_data(self.table, None)
+        self.assertEqual(described["columns_analyzed"], ["Quantity", "Price", "Flag"])
+        self.assertEqual(described["descriptive_statistics"]["Price"]["50%"], 2.75)
+
+        matrix = spreadsheet_analyzer._correlate_data(self.table, ["Quantity", "Price"])["correlation_matrix"]
+        self.assertAlmostEqual(matrix["Quantity"]["Quantity"], 1.0)
+        self.assertAlmostEqual(matrix["Quantity"]["Price"], matrix["Price"]["Quantity"])
+
+    def test_run_reads_csv_range(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "data.csv")
+            with open(path, "w", newline="") as f:
+                f.write("a,b,c\n1,x,1.5\n2,y,2.5\n3,z,3.5\n")
+
+            result = spreadsheet_analyzer.run(path, "filter", range="B2:C3")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["metadata"]["filename"], "data.csv")
+        self.assertEqual(result["result"]["filtered_data"], [{"b": "x", "c": 1.5}, {"b": "y", "c": 2.5}])
+
+
+if __name__ == "__main__":
+    unittest.main()
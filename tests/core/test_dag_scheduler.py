@@ -0,0 +1,108 @@
+"""
+Unit tests for the event-driven DAG scheduler.
+"""
+
+import asyncio
+import unittest
+
+from app.core.dag_scheduler import DAGCycleError, DAGScheduler, topological_order
+
+
+class TestDAGScheduler(unittest.TestCase):
+    """Test cases for DAGScheduler ordering, parallelism and failure handling."""
+
+    def _run(self, graph, execute, **kwargs):
+        scheduler_kwargs = {k: kwargs.pop(k) for k in ("max_parallel", "ordering") if k in kwargs}
+        return asyncio.run(DAGScheduler(**scheduler_kwargs).run(graph, execute, **kwargs))
+
+    def test_dependencies_are_respected(self):
+        graph = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+        started = []
+
+        async def execute(node):
+            for dep in graph[node]:
+                self.assertIn(dep, started)
+            started.append(node)
+            await asyncio.sleep(0.01)
+
+        result = self._run(graph, execute, max_parallel=2)
+
+        self.assertEqual(sorted(result["completed_tasks"]), ["a", "b", "c", "d"])
+        self.assertEqual(started[0], "a")
+        self.assertEqual(started[-1], "d")
+        self.assertEqual(result["critical_path"]["tasks"][0], "a")
+        self.assertEqual(result["critical_path"]["tasks"][-1], "d")
+        self.assertGreater(result["task_times"]["d"]["wall_time"], 0)
+
+    def test_parallelism_is_bounded(self):
+        graph = {f"t{i}": [] for i in range(20)}
+        state = {"running": 0, "peak": 0}
+
+        async def execute(node):
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(0.01)
+            state["running"] -= 1
+
+        result = self._run(graph, execute, max_parallel=4)
+
+        self.assertEqual(len(result["completed_tasks"]), 20)
+        self.assertEqual(state["peak"], 4)
+
+    def test_failure_cancels_dependents(self):
+        graph = {"a": [], "b": ["a"], "c": ["b"], "d": []}
+        ran = []
+
+        async def execute(node):
+            ran.append(node)
+            if node == "a":
+                raise RuntimeError("boom")
+
+        result = self._run(graph, execute)
+
+        self.assertEqual(result["failed_tasks"], ["a"])
+        self.assertEqual(sorted(result["cancelled_tasks"]), ["b", "c"])
+        self.assertEqual(result["completed_tasks"], ["d"])
+        self.assertNotIn("b", ran)
+        self.assertEqual(result["errors"]["a"], "boom")
+
+    def test_missing_dependency_cancels_task(self):
+        result = self._run({"a": ["ghost"], "b": []}, lambda node: asyncio.sleep(0))
+
+        self.assertEqual(result["cancelled_tasks"], ["a"])
+        self.assertEqual(result["completed_tasks"], ["b"])
+
+    def test_cycle_is_rejected_before_running(self):
+        ran = []
+
+        async def execute(node):
+            ran.append(node)
+
+        with self.assertRaises(DAGCycleError) as ctx:
+            self._run({"a": [], "b": ["c"], "c": ["b"]}, execute)
+
+        self.assertEqual(sorted(ctx.exception.cycle_nodes), ["b", "c"])
+        self.assertEqual(ran, [])
+
+    def test_critical_path_ordering_starts_longest_chain_first(self):
+        # "x" heads a chain of 3; "y" and "z" are leaves
+        graph = {"y": [], "z": [], "x": [], "x2": ["x"], "x3": ["x2"]}
+        started = []
+
+        async def execute(node):
+            started.append(node)
+
+        self._run(graph, execute, max_parallel=1, ordering="critical_path")
+        self.assertEqual(started[0], "x")
+
+        started.clear()
+        self._run(graph, execute, max_parallel=1, ordering="priority", priorities={"z": 5})
+        self.assertEqual(started[0], "z")
+
+    def test_topological_order(self):
+        order = topological_order({"c": ["b"], "b": ["a"], "a": []})
+        self.assertEqual(order, ["a", "b", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
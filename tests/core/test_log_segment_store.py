@@ -0,0 +1,236 @@
+"""
+Tests for the segmented log store and the loggers built on it.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from app.core import log_segment_store
+from app.core.behavior_manager import BehaviorManager
+from app.core.execution_chain_logger import ExecutionChainLogger
+from app.core.execution_logger import ExecutionLogger
+from app.core.log_segment_store import LogSegmentStore
+
+
+def _entry(i, agent=None):
+    return {
+        "id": f"log{i:03d}",
+        "timestamp": f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}",
+        "agent_name": agent or ("hal" if i % 3 else "nova"),
+        "ok": i % 2 == 0,
+    }
+
+
+class TestLogSegmentStore(unittest.TestCase):
+    """Test cases for appends, queries, reopening and retention."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp_dir.name, "logs")
+        self.store = self._open()
+        for i in range(100):
+            self.store.append(_entry(i))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def _open(self):
+        return LogSegmentStore(self.directory, index_fields=("agent_name",), segment_records=40)
+
+    def _ids(self, records):
+        return [record["id"] for record in records]
+
+    def test_filters_apply_before_pagination(self):
+        self.assertEqual(self._ids(self.store.query(limit=3)), ["log099", "log098", "log097"])
+        nova = [f"log{i:03d}" for i in range(99, -1, -1) if i % 3 == 0]
+        self.assertEqual(self._ids(self.store.query({"agent_name": "nova"}, limit=None)), nova)
+        self.assertEqual(self._ids(self.store.query({"agent_name": "nova"}, limit=5, offset=5)), nova[5:10])
+        # Non-indexed filters and predicates count before pagination too
+        self.assertEqual(self._ids(self.store.query({"agent_name": "nova", "ok": True}, limit=3)),
+                         ["log096", "log090", "log084"])
+        self.assertEqual(self._ids(self.store.query(predicate=lambda r: r["id"].endswith("7"), limit=2)),
+                         ["log097", "log087"])
+        self.assertEqual(self.store.query({"agent_name": "ash"}), [])
+
+    def test_cursor_pagination(self):
+        pages, before = [], None
+        while True:
+            page = self.store.query({"agent_name": "hal"}, limit=25, before=before)
+            if not page:
+                break
+            pages.append(self._ids(page))
+            before = page[-1]["id"]
+
+        self.assertEqual([len(page) for page in pages], [25, 25, 16])
+        self.assertEqual(sum(pages, []), [f"log{i:03d}" for i in range(99, -1, -1) if i % 3])
+        self.assertEqual(self.store.query(before="missing"), [])
+
+    def test_time_range(self):
+        found = self.store.query(since="2025-01-01T00:00:50", until="2025-01-01T00:01:05", limit=None)
+        self.assertEqual(self._ids(found), [f"log{i:03d}" for i in range(65, 49, -1)])
+
+    def test_latest_version_supersedes(self):
+        self.store.append(dict(_entry(10), agent_name="ash", timestamp="2025-01-01T00:02:00"))
+
+        self.assertEqual(self.store.get("log010")["agent_name"], "ash")
+        self.assertEqual(self._ids(self.store.query(limit=2)), ["log010", "log099"])
+        self.assertNotIn("log010", self._ids(self.store.query({"agent_name": "hal"}, limit=None)))
+        self.assertEqual(len(self.store), 100)
+
+    def test_reopen_uses_segment_indexes(self):
+        self.store.close()
+        names = sorted(os.listdir(self.directory))
+        self.assertEqual(names, ["000000000000.idx", "000000000000.log", "000000000040.idx",
+                                 "000000000040.log", "000000000080.log"])
+
+        # A torn record at the end of the active segment is dropped
+        with open(os.path.join(self.directory, "000000000080.log"), "a") as f:
+            f.write('{"id": "torn"')
+        self.store = self._open()
+
+        self.assertEqual(self.store.get("log042"), _entry(42))
+        self.assertIsNone(self.store.get("torn"))
+        self.assertEqual(self.store.append(_entry(100)), 100)
+        self.assertEqual(self._ids(self.store.query({"agent_name": "hal"}, limit=2)), ["log100", "log098"])
+
+    def test_retention_drops_whole_segments(self):
+        self.assertEqual(self.store.drop_segments("2025-01-01T00:01:00"), 1)
+        self.assertIsNone(self.store.get("log039"))
+        self.assertEqual(self._ids(self.store.query(limit=None))[-1], "log040")
+        self.assertEqual(len(self.store.query({"agent_name": "nova"}, limit=None)), 20)
+        # The active segment is never dropped
+        self.assertEqual(self.store.drop_segments("2026-01-01"), 1)
+        self.assertEqual(self._ids(self.store.query(limit=None)), [f"log{i:03d}" for i in range(99, 79, -1)])
+
+    def test_import_records_once(self):
+        store = LogSegmentStore(os.path.join(self.tmp_dir.name, "imported"))
+        records = [_entry(i) for i in (3, 1, 2)]
+        self.assertEqual(store.import_records("legacy", records), 3)
+        self.assertEqual(store.import_records("legacy", records), 0)
+        self.assertEqual(self._ids(store.query()), ["log003", "log002", "log001"])
+        store.close()
+
+
+class TestLoggersOnLogStore(unittest.TestCase):
+    """Test cases for the loggers, including migration of per-file logs."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def _store(self, name, **options):
+        return LogSegmentStore(os.path.join(self.root, "store", name), **options)
+
+    def test_execution_logger_migrates_and_paginates(self):
+        legacy_dir = os.path.join(self.root, "execution_logs")
+        for i in range(5):
+            self._write(os.path.join(legacy_dir, f"log{i:03d}.json"), _entry(i, agent="hal"))
+
+        logger = ExecutionLogger(log_dir=legacy_dir, store=self._store("logs", index_fields=("agent_name",)))
+
+        async def run():
+            log_id = await logger.log_execution("nova", "gpt-4", "hi", "hello")
+            first = await logger.get_logs(agent_name="hal", limit=3)
+            second = await logger.get_logs(agent_name="hal", limit=3, before=first[-1]["id"])
+            return log_id, first, second, await logger.get_log(log_id)
+
+        log_id, first, second, entry = asyncio.run(run())
+        self.assertEqual([e["id"] for e in first + second], ["log004", "log003", "log002", "log001", "log000"])
+        self.assertEqual(entry["agent_name"], "nova")
+
+    def test_chain_logger(self):
+        legacy_dir = os.path.join(self.root, "execution_chain_logs")
+        self._write(os.path.join(legacy_dir, "old", "chain.json"), {
+            "chain_id": "old", "status": "completed", "created_at": "2025-01-01T00:00:00",
+            "updated_at": "2025-01-01T00:00:01", "metadata": {}, "steps": [],
+        })
+        self._write(os.path.join(legacy_dir, "old", "step_1.json"), {
+            "chain_id": "old", "step_number": 1, "agent_name": "hal", "input_summary": "in",
+            "output_summary": "out", "timestamp": "2025-01-01T00:00:01", "metadata": {},
+        })
+
+        chain_logger = ExecutionChainLogger(
+            log_dir=legacy_dir,
+            chain_store=self._store("chains", key_fields=("chain_id",), time_field="updated_at",
+                                    index_fields=("status",)),
+            step_store=self._store("steps", key_fields=("chain_id", "step_number"),
+                                   index_fields=("chain_id", "agent_name")),
+        )
+
+        async def run():
+            chain = await chain_logger.create_chain()
+            await chain_logger.log_step(chain.chain_id, 1, "hal", "plan", "done")
+            await chain_logger.log_step(chain.chain_id, 2, "nova", "build", "built")
+            in_progress = await chain_logger.get_chains(status="in_progress")
+            await chain_logger.complete_chain(chain.chain_id)
+            return (chain.chain_id, in_progress, await chain_logger.get_chains(status="completed"),
+                    await chain_logger.get_step(chain.chain_id, 2), await chain_logger.get_chain("old"))
+
+        chain_id, in_progress, completed, step, old = asyncio.run(run())
+        self.assertEqual([chain.chain_id for chain in in_progress], [chain_id])
+        self.assertEqual([chain.chain_id for chain in completed], [chain_id, "old"])
+        self.assertEqual([s.agent_name for s in completed[0].steps], ["hal", "nova"])
+        self.assertEqual(step.output_summary, "built")
+        self.assertEqual([s.step_number for s in old.steps], [1])
+
+    def test_chain_cursor_survives_updates(self):
+        chain_logger = ExecutionChainLogger(
+            log_dir=os.path.join(self.root, "missing"),
+            chain_store=self._store("chains", key_fields=("chain_id",), time_field="updated_at",
+                                    index_fields=("status",)),
+            step_store=self._store("steps", key_fields=("chain_id", "step_number"),
+                                   index_fields=("chain_id", "agent_name")),
+        )
+
+        async def run():
+            created = [(await chain_logger.create_chain()).chain_id for _ in range(4)]
+            first = await chain_logger.get_chains(limit=2)
+            # The last chain of the page changes between pages
+            await chain_logger.log_step(first[-1].chain_id, 1, "hal", "plan", "done")
+            second = await chain_logger.get_chains(
+                limit=2, before=first[-1].chain_id, before_updated_at=first[-1].updated_at
+            )
+            return created, first, second
+
+        created, first, second = asyncio.run(run())
+        self.assertEqual([chain.chain_id for chain in first], created[:1:-1])
+        self.assertEqual([chain.chain_id for chain in second], created[1::-1])
+
+    def test_behavior_manager_filters_before_paginating(self):
+        manager = BehaviorManager(store=self._store("feedback", key_fields=("feedback_id",),
+                                                     index_fields=("agent_name",)))
+
+        async def run():
+            for i in range(6):
+                await manager.record_feedback("builder", f"task {i}", was_successful=i % 2 == 0)
+            await manager.record_feedback("research", "other", was_successful=True)
+            return (await manager.get_agent_feedback("builder", limit=2, successful_only=False),
+                    await manager.get_feedback_summary("builder"))
+
+        failed, summary = asyncio.run(run())
+        self.assertEqual([f["task_description"] for f in failed], ["task 5", "task 3"])
+        self.assertEqual((summary["total_tasks"], summary["success_rate"]), (6, 0.5))
+
+    def test_get_log_store_is_shared(self):
+        with mock.patch.dict(os.environ, {"LOG_SEGMENT_DIR": self.root}), \
+                mock.patch.dict(log_segment_store._stores, clear=True):
+            store = log_segment_store.get_log_store("shared")
+            self.assertIs(log_segment_store.get_log_store("shared"), store)
+            self.assertEqual(store.directory, os.path.join(self.root, "shared"))
+
+
+if __name__ == "__main__":
+    unittest.main()
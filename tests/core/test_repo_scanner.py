@@ -0,0 +1,122 @@
+"""
+Tests for the incremental repository scanner.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from app.core import repo_scanner
+from app.core.repo_scanner import RepoScanner, ScanManifest, parse_gitignore
+
+
+class TestGitignore(unittest.TestCase):
+    """Test cases for gitignore pattern matching."""
+
+    def _ignored(self, lines, path, is_dir=False):
+        return repo_scanner._ignored((("", parse_gitignore(lines)),), path, is_dir)
+
+    def test_patterns(self):
+        self.assertTrue(self._ignored(["*.log"], "a/b/debug.log"))
+        self.assertTrue(self._ignored(["/build"], "build", True))
+        self.assertFalse(self._ignored(["/build"], "src/build", True))
+        self.assertTrue(self._ignored(["cache/"], "src/cache", True))
+        self.assertFalse(self._ignored(["cache/"], "src/cache"))
+        self.assertTrue(self._ignored(["docs/**/*.md"], "docs/a/b/x.md"))
+        self.assertTrue(self._ignored(["docs/**/*.md"], "docs/x.md"))
+        self.assertFalse(self._ignored(["*.log", "!keep.log"], "keep.log"))
+        self.assertFalse(self._ignored(["# comment", "", "\\#file"], "comment"))
+        self.assertTrue(self._ignored(["\\#file"], "#file"))
+
+
+class TestRepoScanner(unittest.TestCase):
+    """Test cases for tree scans, streaming and the manifest."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self.tmp_dir.name
+        self.manifest = ScanManifest(None)
+        self.scanner = RepoScanner(self.manifest, max_workers=2)
+        self._write("main.py", "print('hi')\r\n")
+        self._write("README.md", "# readme")
+        self._write("notes.txt", "skip")
+        self._write("data.json", b"\xff\xfe")
+        self._write("pkg/mod.py", "x = 1")
+        self._write("pkg/generated/out.py", "y = 2")
+        self._write("pkg/.gitignore", "generated/\n*.md\n")
+        self._write("pkg/doc.md", "ignored")
+        self._write("node_modules/dep.js", "ignored")
+
+    def tearDown(self):
+        self.manifest.close()
+        self.tmp_dir.cleanup()
+
+    def _write(self, relative_path, contents):
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(contents if isinstance(contents, bytes) else contents.encode("utf-8"))
+
+    def _scan(self, **options):
+        return self.scanner.scan_tree(
+            self.root, include_contents=True, file_types=[".py", ".md", ".json"],
+            exclude_dirs=["node_modules"], **options
+        )
+
+    def test_scan_tree_shape_and_filters(self):
+        structure, stats = self._scan()
+
+        files = {info["path"]: info for info in structure["files"]}
+        self.assertEqual(set(files), {"main.py", "README.md", "data.json"})
+        self.assertEqual(files["main.py"], {
+            "name": "main.py", "path": "main.py", "extension": ".py", "size": 13, "contents": "print('hi')\n",
+        })
+        self.assertEqual(files["data.json"]["contents"], "<binary file>")
+
+        [pkg] = structure["directories"]
+        self.assertEqual((pkg["name"], pkg["path"]), ("pkg", "pkg"))
+        self.assertEqual([info["path"] for info in pkg["structure"]["files"]], [os.path.join("pkg", "mod.py")])
+        self.assertEqual(pkg["structure"]["directories"], [])
+        self.assertEqual(stats["read"], 4)
+
+        structure, _ = self._scan(respect_gitignore=False)
+        self.assertEqual(len(structure["directories"][0]["structure"]["directories"]), 1)
+
+    def test_rescan_rereads_only_changed_files(self):
+        with mock.patch.object(repo_scanner, "RACY_WINDOW_NS", 0):
+            self._scan()
+            self._write("pkg/mod.py", "x = 10")
+            os.remove(os.path.join(self.root, "README.md"))
+
+            with mock.patch.object(repo_scanner, "_read_file", wraps=repo_scanner._read_file) as read_file:
+                structure, stats = self._scan()
+
+        self.assertEqual([call.args[0] for call in read_file.call_args_list],
+                         [os.path.join(self.root, "pkg", "mod.py")])
+        self.assertEqual((stats["read"], stats["reused"], stats["removed"]), (1, 2, 1))
+        self.assertEqual(structure["directories"][0]["structure"]["files"][0]["contents"], "x = 10")
+        self.assertEqual(len(self.manifest.entries(os.path.realpath(self.root))), 3)
+
+    def test_racy_files_are_reread(self):
+        self._scan()
+        _, stats = self._scan()
+        self.assertEqual(stats["read"], 4)
+
+    def test_iter_files_streams_records(self):
+        records = list(self.scanner.iter_files(
+            self.root, include_contents=True, file_types=[".py"], exclude_dirs=["node_modules"]
+        ))
+
+        self.assertEqual([record.path for record in records], ["main.py", os.path.join("pkg", "mod.py")])
+        self.assertEqual(len(records[1].sha1), 40)
+        self.assertEqual(records[1].contents, "x = 1")
+
+        stream = self.scanner.iter_files(self.root, file_types=[".py"], exclude_dirs=["node_modules"])
+        next(stream)
+        stream.close()
+        self.assertEqual(len(self.manifest.entries(os.path.realpath(self.root))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests for the keyword routing index and the persona and agent routers built on it.
+"""
+
+import unittest
+from unittest import mock
+
+from app.core.agent_router import AgentRouter
+from app.core.routing_index import KeywordIndex
+from orchestrator import mode_dispatcher
+
+
+class TestKeywordIndex(unittest.TestCase):
+    """Test cases for keyword matching."""
+
+    def test_matches_substrings_in_index_order(self):
+        index = KeywordIndex([("Data", "a"), ("data_analysis", "b"), ("plan", "c"), ("an", "d"), ("data", "e")])
+
+        # Keywords match as substrings, including overlapping and nested ones
+        self.assertEqual(index.matches("run data_analysis on the planet"), ["a", "b", "c", "d", "e"])
+        self.assertEqual(index.matches("the database"), ["a", "e"])
+        self.assertEqual(index.matches("the database", ["the", "database"]), ["a", "e"])
+        self.assertEqual(index.matches("nothing here"), [])
+        self.assertEqual(len(index), 5)
+
+    def test_keywords_with_spaces(self):
+        index = KeywordIndex([("decision making", 1), ("making", 2)])
+        self.assertEqual(index.matches("fast decision making"), [1, 2])
+        self.assertEqual(index.matches("decision-making"), [2])
+
+
+class TestAgentRouter(unittest.TestCase):
+    """Test cases for routing tasks to agents."""
+
+    def setUp(self):
+        with mock.patch("app.core.agent_router.os.makedirs"):
+            self.router = AgentRouter()
+        patcher = mock.patch.object(self.router, "_log_routing_event")
+        self.log_event = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_route_task(self):
+        agent_type, confidence, reason = self.router.route_task(
+            "Analyze the database schema", task_type="Research", required_capabilities=["Python", "cloud"]
+        )
+        self.assertEqual(agent_type, "research")
+        self.assertEqual(confidence, 0.6)
+        self.assertEqual(reason, "Specializes in Research; Task mentions specialty: data")
+
+        self.router.update_agent_workload("ops", 3)
+        agent_type, confidence, reason = self.router.route_task("set up monitoring for the infrastructure")
+        self.assertEqual(agent_type, "ops")
+        self.assertAlmostEqual(confidence, 0.44)
+        self.assertEqual(reason, "Task mentions specialty: monitoring; Task mentions specialty: infrastructure; "
+                                 "Task mentions capability: monitoring; Workload penalty: -0.30")
+
+    def test_route_many_matches_route_task(self):
+        tasks = ["Write the python api", "Retrieve knowledge from memory", "Deploy to the cloud", "Say hi"]
+        routed = self.router.route_many(tasks, required_capabilities=["vector_search"])
+
+        self.assertEqual([agent for agent, _, _ in routed], ["builder", "memory", "memory", "memory"])
+        self.assertEqual(routed, [self.router.route_task(task, required_capabilities=["vector_search"])
+                                  for task in tasks])
+        self.assertEqual(self.log_event.call_args_list[0].args[0], "route_many_request")
+
+
+class TestPersonaRouting(unittest.TestCase):
+    """Test cases for selecting personas for prompts."""
+
+    def test_route_many(self):
+        prompts = [
+            "Please research and analyze the data? What does the study show?",
+            "Brainstorm a novel, creative idea for the launch! Be bold!",
+            "Keep the daily routine",
+        ]
+        selected = mode_dispatcher.route_many(prompts, {})
+
+        self.assertEqual([persona for persona, _ in selected], ["RESEARCHER", "INVENTOR", "RITUALIST"])
+        self.assertEqual(selected, [mode_dispatcher.select_persona_for_loop("loop", prompt, {})
+                                    for prompt in prompts])
+        self.assertEqual(mode_dispatcher.route_many(prompts, {}, {"override_persona": "SAGE"}),
+                         [("SAGE", mode_dispatcher.PERSONA_MODES["SAGE"])] * 3)
+
+    def test_recent_loops(self):
+        prompt = "run the nightly backup job"
+        memory = {"loops": [
+            {"prompt": "run the nightly backup job", "output": "created a new report"},
+            {"prompt": "Run the nightly backup job", "output": "design reviewed"},
+            {"prompt": "something else entirely"},
+        ]}
+        scores = mode_dispatcher._score_personas_for_prompt(prompt, memory)
+
+        # Similar recent prompts favor RITUALIST, creative outputs INVENTOR
+        self.assertAlmostEqual(scores["RITUALIST"], 0.5)
+        self.assertAlmostEqual(scores["INVENTOR"], 0.2)
+        self.assertEqual(mode_dispatcher._calculate_similarity("A b", "a B c"), 2 / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Tests for the indexed pending task store.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from app.core.task_persistence import TaskPersistenceManager
+from app.core.task_store import TaskStore
+
+
+def _task(task_id, created_at, status="pending", origin="hal", suggested="ash", priority=False):
+    return {
+        "task_id": task_id,
+        "task_description": f"task {task_id}",
+        "origin_agent": origin,
+        "suggested_agent": suggested,
+        "created_at": created_at,
+        "priority": priority,
+        "status": status,
+        "metadata": {},
+    }
+
+
+class TestTaskStore(unittest.TestCase):
+    """Test cases for listing, pagination, updates and claiming."""
+
+    def setUp(self):
+        self.store = TaskStore(None)
+        for i in range(10):
+            self.store.insert(_task(
+                f"t{i}", f"2025-01-01T00:00:0{i}",
+                status="executed" if i % 5 == 0 else "pending",
+                origin="hal" if i % 2 else "nova",
+                suggested="ash" if i < 6 else "sage",
+            ))
+
+    def tearDown(self):
+        self.store.close()
+
+    def _ids(self, tasks):
+        return [task["task_id"] for task in tasks]
+
+    def test_list_filters_newest_first(self):
+        self.assertEqual(self._ids(self.store.list(limit=3)), ["t9", "t8", "t7"])
+        self.assertEqual(self._ids(self.store.list(status="executed")), ["t5", "t0"])
+        self.assertEqual(self._ids(self.store.list(status=None, limit=2, offset=4)), ["t5", "t4"])
+        self.assertEqual(self._ids(self.store.list(origin_agent="hal", suggested_agent="ash")), ["t3", "t1"])
+
+    def test_keyset_pagination(self):
+        pages, after = [], None
+        while True:
+            page = self.store.list(status=None, limit=4, after=after)
+            if not page:
+                break
+            pages.append(self._ids(page))
+            after = page[-1]["task_id"]
+
+        self.assertEqual(pages, [["t9", "t8", "t7", "t6"], ["t5", "t4", "t3", "t2"], ["t1", "t0"]])
+        self.assertEqual(self._ids(self.store.list(suggested_agent="sage", after="t8")), ["t7", "t6"])
+        self.assertEqual(self.store.list(after="missing"), [])
+
+    def test_update_merges_metadata(self):
+        self.store.update("t1", metadata={"a": 1})
+        task = self.store.update("t1", status="executed", metadata={"b": 2})
+
+        self.assertEqual((task["status"], task["metadata"]), ("executed", {"a": 1, "b": 2}))
+        self.assertEqual(self.store.get("t1"), task)
+        self.assertNotIn("t1", self._ids(self.store.list()))
+        self.assertIsNone(self.store.update("missing", status="executed"))
+
+    def test_claim_next_orders_by_priority_then_age(self):
+        self.store.insert(_task("urgent", "2025-01-02T00:00:00", suggested="sage", priority=True))
+
+        claimed = self.store.claim_next(claimed_by="worker-1")
+        self.assertEqual((claimed["task_id"], claimed["status"], claimed["claimed_by"]),
+                         ("urgent", "claimed", "worker-1"))
+        self.assertEqual(self.store.claim_next()["task_id"], "t1")
+        self.assertEqual(self.store.claim_next(agent="sage")["task_id"], "t6")
+        self.assertEqual(self.store.claim_next(agent="sage")["claimed_by"], "sage")
+        self.assertIsNone(self.store.claim_next(agent="nobody"))
+
+    def test_concurrent_claims_never_double_claim(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "tasks.db")
+            seed = TaskStore(path)
+            for i in range(200):
+                seed.insert(_task(f"c{i:03d}", f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}"))
+
+            # Separate connections, as separate worker processes would have
+            claimed = []
+            def work(name):
+                store = TaskStore(path)
+                while True:
+                    task = store.claim_next(claimed_by=name)
+                    if task is None:
+                        break
+                    claimed.append(task["task_id"])
+                store.close()
+
+            threads = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(sorted(claimed), [f"c{i:03d}" for i in range(200)])
+            self.assertEqual(seed.list(status="pending"), [])
+            seed.close()
+        finally:
+            shutil.rmtree(directory)
+
+
+class TestTaskPersistenceManager(unittest.TestCase):
+    """Test cases for the manager on the store, including JSON migration."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.tasks_dir = os.path.join(self.temp_dir, "pending_tasks")
+        os.makedirs(self.tasks_dir)
+        for i in range(3):
+            with open(os.path.join(self.tasks_dir, f"old{i}.json"), "w") as f:
+                json.dump(_task(f"old{i}", f"2024-06-01T00:00:0{i}"), f, indent=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_migrates_json_tasks_once(self):
+        store = TaskStore(None)
+        TaskPersistenceManager(store=store, tasks_dir=self.tasks_dir)
+        store.update("old0", status="executed")
+        self.assertEqual(store.import_json_dir(self.tasks_dir), 0)
+
+        self.assertEqual(store.get("old0")["status"], "executed")
+        self.assertEqual([task["task_id"] for task in store.list()], ["old2", "old1"])
+        store.close()
+
+    def test_manager_round_trip(self):
+        manager = TaskPersistenceManager(store=TaskStore(None), tasks_dir=os.path.join(self.temp_dir, "none"))
+
+        async def run():
+            task_id = await manager.store_pending_task("Write docs", "hal", "ash", priority=True)
+            pending = await manager.get_pending_tasks(suggested_agent="ash")
+            claimed = await manager.claim_next(agent="ash", claimed_by="worker")
+            updated = await manager.update_task_status(task_id, "executed", {"result": "ok"})
+            return task_id, pending, claimed, updated
+
+        task_id, pending, claimed, updated = asyncio.run(run())
+        self.assertEqual([task.task_id for task in pending], [task_id])
+        self.assertEqual((claimed.task_id, claimed.status, claimed.claimed_by), (task_id, "claimed", "worker"))
+        self.assertEqual((updated.status, updated.metadata), ("executed", {"result": "ok"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Unit tests for lazy tool discovery and async execution in ToolRouter.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+
+from app.core.tool_router import ToolRouter
+
+
+TOOLS = {
+    "echo_tool": '''
+        import time
+
+        def run(text: str, delay: float = 0.0):
+            """Echo the text back."""
+            time.sleep(delay)
+            return {"echo": text}
+    ''',
+    "async_tool": '''
+        import asyncio
+
+        async def run(value: int = 1):
+            await asyncio.sleep(0)
+            return value * 2
+    ''',
+    "helper_module": '''
+        def helper():
+            return 1
+    ''',
+}
+
+
+class TestToolRouter(unittest.TestCase):
+    """Test cases for manifest-based discovery and execute_tool_async."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.package = f"lazytools_{id(self)}"
+        self.tools_path = os.path.join(self.tmp_dir.name, self.package)
+        os.makedirs(self.tools_path)
+        open(os.path.join(self.tools_path, "__init__.py"), "w").close()
+        for name, source in TOOLS.items():
+            self._write_tool(name, source)
+        sys.path.insert(0, self.tmp_dir.name)
+        self.manifest = os.path.join(self.tmp_dir.name, "manifest.json")
+
+    def tearDown(self):
+        sys.path.remove(self.tmp_dir.name)
+        for name in [m for m in sys.modules if m.startswith(self.package)]:
+            del sys.modules[name]
+        self.tmp_dir.cleanup()
+
+    def _write_tool(self, name, source):
+        with open(os.path.join(self.tools_path, f"{name}.py"), "w") as f:
+            f.write(textwrap.dedent(source))
+
+    def _router(self, **kwargs):
+        return ToolRouter(tools_dir=self.tools_path, package=self.package, manifest_path=self.manifest, **kwargs)
+
+    def test_discovery_does_not_import_tools(self):
+        router = self._router()
+
+        self.assertEqual(sorted(router.list_available_tools()), ["async_tool", "echo_tool"])
+        self.assertNotIn(f"{self.package}.echo_tool", sys.modules)
+        info = router.get_tool_info("echo_tool")
+        self.assertIn("text: str", info["parameters"])
+        self.assertEqual(info["docstring"], "Echo the text back.")
+        self.assertNotIn(f"{self.package}.echo_tool", sys.modules)
+
+        result = router.execute_tool("echo_tool", text="hi")
+        self.assertEqual(result, {"success": True, "result": {"echo": "hi"}})
+        self.assertIn(f"{self.package}.echo_tool", sys.modules)
+
+    def test_manifest_is_reused_until_files_change(self):
+        self._router()
+        mtime = os.path.getmtime(self.manifest)
+
+        time.sleep(0.01)
+        self._router()
+        self.assertEqual(os.path.getmtime(self.manifest), mtime)
+
+        self._write_tool("helper_module", "def run():\n    return 'now a tool'\n")
+        router = self._router()
+        self.assertIn("helper_module", router.list_available_tools())
+
+    def test_execute_tool_async_runs_sync_tools_off_loop(self):
+        router = self._router()
+        router.configure_tool("echo_tool", max_concurrency=2)
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            tick_task = asyncio.create_task(ticker())
+            start = time.perf_counter()
+            results = await asyncio.gather(*[
+                router.execute_tool_async("echo_tool", text=str(i), delay=0.1) for i in range(4)
+            ])
+            elapsed = time.perf_counter() - start
+            tick_task.cancel()
+            return results, elapsed, ticks
+
+        results, elapsed, ticks = asyncio.run(scenario())
+
+        self.assertTrue(all(r["success"] for r in results))
+        # Two at a time: two rounds of 0.1 s, with the loop free meanwhile
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertLess(elapsed, 0.4)
+        self.assertGreater(ticks, 5)
+
+    def test_execute_tool_async_timeout_and_async_tools(self):
+        router = self._router()
+
+        async def scenario():
+            slow = await router.execute_tool_async("echo_tool", timeout=0.05, text="x", delay=0.3)
+            doubled = await router.execute_tool_async("async_tool", value=21)
+            missing = await router.execute_tool_async("nope")
+            return slow, doubled, missing
+
+        slow, doubled, missing = asyncio.run(scenario())
+
+        self.assertFalse(slow["success"])
+        self.assertIn("timed out", slow["error"])
+        self.assertEqual(doubled, {"success": True, "result": 42})
+        self.assertFalse(missing["success"])
+
+
+if __name__ == "__main__":
+    unittest.main()
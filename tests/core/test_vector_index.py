@@ -0,0 +1,92 @@
+"""
+Tests for the NumPy-backed vector index and VectorMemorySystem.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from app.core.vector_index import VectorIndex
+from app.core.vector_memory import VectorMemorySystem
+
+
+class TestVectorIndex(unittest.TestCase):
+    """Test cases for VectorIndex search, filters, persistence and compaction."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "index")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _vector(self, *hot):
+        vector = np.zeros(8, dtype=np.float32)
+        for i in hot:
+            vector[i] = 1.0
+        return vector
+
+    def test_top_k_cosine_search_with_filters(self):
+        index = VectorIndex(self.path, dimension=8, initial_capacity=2)
+        index.add("a", self._vector(0), {"metadata": {"scope": "global"}})
+        index.add("b", self._vector(0, 1), {"metadata": {"scope": "agent", "agent_name": "hal"}})
+        index.add("c", self._vector(2), {"metadata": {"scope": "global", "topics": ["x", "y"]}})
+
+        results = index.search(self._vector(0), k=2)
+        self.assertEqual([item_id for item_id, _, _ in results], ["a", "b"])
+        self.assertAlmostEqual(results[0][1], 1.0, places=5)
+
+        scoped = index.search(self._vector(0), k=5, filters={"scope": "agent"})
+        self.assertEqual([item_id for item_id, _, _ in scoped], ["b"])
+        self.assertEqual(index.search(self._vector(0), k=5, filters={"topics": ["y"]})[0][0], "c")
+
+    def test_persistence_tombstones_and_compaction(self):
+        index = VectorIndex(self.path, dimension=8, initial_capacity=2)
+        for i in range(6):
+            index.add(f"m{i}", self._vector(i), {"metadata": {"n": i}})
+        index.update("m1", {"metadata": {"n": 100}})
+        index.remove("m0")
+        index.close()
+
+        reopened = VectorIndex(self.path, dimension=8)
+        self.assertEqual(len(reopened), 5)
+        self.assertNotIn("m0", reopened)
+        self.assertEqual(reopened.get("m1")["metadata"]["n"], 100)
+        self.assertEqual(reopened.search(self._vector(3), k=1)[0][0], "m3")
+
+        reopened.compact()
+        self.assertEqual(reopened.dead_rows, 0)
+        reopened.close()
+
+        compacted = VectorIndex(self.path, dimension=8)
+        self.assertEqual(len(compacted), 5)
+        self.assertEqual(compacted.search(self._vector(5), k=1)[0][0], "m5")
+        compacted.close()
+
+
+class TestVectorMemorySystem(unittest.TestCase):
+    """Test cases for VectorMemorySystem."""
+
+    def test_store_search_and_filter(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            memory = VectorMemorySystem(index_dir=tmp)
+
+            async def scenario():
+                await memory.store_memory("deploy the api service to production",
+                                          metadata={"scope": "global", "topics": ["ops"]})
+                await memory.store_memory("write unit tests for the parser",
+                                          metadata={"scope": "agent", "agent_name": "builder"})
+                best = await memory.search_memories("production deploy", limit=1)
+                scoped = await memory.search_memories("production deploy", limit=5, agent_name="builder")
+                return best, scoped
+
+            best, scoped = asyncio.run(scenario())
+            self.assertIn("deploy", best[0]["content"])
+            self.assertEqual([m["metadata"]["agent_name"] for m in scoped], ["builder"])
+
+
+if __name__ == "__main__":
+    unittest.main()
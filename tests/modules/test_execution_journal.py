@@ -0,0 +1,149 @@
+"""
+Unit tests for the agent execution journal and loop_monitor integration.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from app.modules import execution_journal, loop_monitor, project_state
+from app.modules.execution_journal import ExecutionJournal
+from app.modules.project_state_store import ProjectStateStore
+
+
+class TestExecutionJournal(unittest.TestCase):
+    """Test cases for the append-only journal and its in-memory index."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "p1.jsonl")
+        self.journal = ExecutionJournal(self.path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_complete_matches_most_recent_running(self):
+        self.journal.start("hal", 0, 30)
+        self.journal.start("nova", 0, 45)
+        self.journal.start("hal", 1, 30)
+
+        self.assertEqual(self.journal.complete("hal", "completed", 1)["loop"], 1)
+        self.assertEqual(self.journal.complete("hal", "error", 1)["loop"], 0)
+        # Nothing running: a zero-length execution is recorded
+        self.assertEqual(self.journal.complete("hal", "completed", 2)["duration"], 0)
+
+        self.assertEqual([e["status"] for e in self.journal.executions("hal")], ["error", "completed", "completed"])
+        self.assertEqual(self.journal.current_status("nova"), "running")
+        self.assertEqual(self.journal.current_status("ash"), "never_run")
+
+    def test_expire_only_visits_due_deadlines(self):
+        now = datetime.utcnow()
+        self.journal.start("critic", 0, 20, start_time=now - timedelta(seconds=30))
+        self.journal.start("nova", 0, 45, start_time=now - timedelta(seconds=30))
+        self.journal.start("ash", 0, None, start_time=now - timedelta(days=1))
+        self.journal.start("hal", 0, 10, start_time=now - timedelta(seconds=30))
+        self.journal.complete("hal", "completed", 0)
+
+        expired = self.journal.expire(now)
+
+        self.assertEqual([e["agent"] for e in expired], ["critic"])
+        self.assertAlmostEqual(expired[0]["duration"], 30, places=3)
+        self.assertEqual(self.journal.expire(now), [])
+        self.assertEqual(len(self.journal._deadlines), 1)
+
+        self.assertEqual(self.journal.reset_timeouts(), 1)
+        self.assertEqual(self.journal.current_status("critic"), "reset_after_timeout")
+        self.assertEqual(self.journal.reset_timeouts(), 0)
+
+    def test_replay_rebuilds_index(self):
+        now = datetime.utcnow()
+        self.journal.start("hal", 0, 30)
+        self.journal.start("nova", 1, 45, start_time=now - timedelta(seconds=60))
+        self.journal.complete("hal", "completed", 0)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"op":"start","id":')
+
+        replayed = ExecutionJournal(self.path)
+
+        self.assertEqual(replayed.executions(), self.journal.executions())
+        self.assertEqual(replayed.last_completed_agent, "hal")
+        self.assertEqual([e["agent"] for e in replayed.expire(now)], ["nova"])
+
+
+class TestLoopMonitor(unittest.TestCase):
+    """Test cases for loop_monitor backed by the execution journal."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.state_store = ProjectStateStore(os.path.join(self.tmp_dir.name, "states"), coalesce_interval=0)
+        patches = [
+            mock.patch.object(project_state, "_store", self.state_store),
+            mock.patch.object(execution_journal, "_journals", {}),
+            mock.patch.object(loop_monitor, "_migrated", set()),
+            mock.patch.dict(os.environ, {"AGENT_EXECUTION_JOURNAL_DIR": os.path.join(self.tmp_dir.name, "journals")}),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_start_and_complete_leave_state_untouched(self):
+        project_state.write_project_state("p1", {"loop_count": 2})
+        path = self.state_store.path_for("p1")
+        mtime = os.stat(path).st_mtime_ns
+
+        self.assertEqual(loop_monitor.log_agent_execution_start("p1", "hal")["status"], "success")
+        self.assertEqual(loop_monitor.log_agent_execution_complete("p1", "hal")["status"], "success")
+
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+        status = loop_monitor.get_agent_execution_status("p1")
+        self.assertEqual(status["current_status"], {"hal": "completed"})
+        self.assertEqual(status["agent_executions"]["hal"][0]["loop"], 2)
+
+    def test_frozen_agents_raise_alert(self):
+        now = datetime.utcnow()
+        execution_journal.get_execution_journal("p1").start("nova", 0, 45, start_time=now - timedelta(seconds=60))
+        loop_monitor.log_agent_execution_start("p1", "critic")
+
+        with mock.patch("app.modules.loop_resume_engine.auto_restore_if_configured", return_value={}):
+            frozen = loop_monitor.check_for_frozen_agents("p1")
+
+        self.assertEqual([f["agent"] for f in frozen], ["nova"])
+        state = project_state.read_project_state("p1")
+        self.assertTrue(state["has_frozen_agents"])
+        self.assertNotIn("agent_execution_log", state)
+
+        self.assertEqual(loop_monitor.reset_frozen_agents("p1")["reset_count"], 1)
+        self.assertFalse(project_state.read_project_state("p1")["has_frozen_agents"])
+
+    def test_legacy_log_is_migrated(self):
+        project_state.write_project_state("p1", {"agent_execution_log": [
+            {"agent": "hal", "start_time": "2024-01-01T00:00:00", "status": "completed",
+             "end_time": "2024-01-01T00:00:05", "duration": 5, "loop": 0},
+            {"agent": "nova", "start_time": "2024-01-01T00:00:06", "status": "running", "loop": 0},
+        ]})
+
+        result = loop_monitor.log_agent_execution_complete("p1", "nova")
+
+        self.assertEqual(result["execution"]["start_time"], "2024-01-01T00:00:06")
+        self.assertNotIn("agent_execution_log", project_state.read_project_state("p1"))
+        self.assertEqual(loop_monitor.get_agent_execution_status("p1", "hal")["current_status"], "completed")
+
+    def test_migrated_running_executions_can_freeze(self):
+        # Older versions stored no timeout; it comes from the schema registry
+        project_state.write_project_state("p1", {"agent_execution_log": [
+            {"agent": "cto", "start_time": "2024-01-01T00:00:00", "status": "running", "loop": 0},
+        ]})
+
+        with mock.patch("app.modules.loop_resume_engine.auto_restore_if_configured", return_value={}):
+            frozen = loop_monitor.check_for_frozen_agents("p1")
+
+        self.assertEqual([f["agent"] for f in frozen], ["cto"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Unit tests for the shared KV memory store and its async helpers.
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from app.modules import kv_memory
+from app.modules.kv_memory import KVMemoryStore
+
+
+class TestKVMemoryStore(unittest.TestCase):
+    """Test cases for reads, writes, prefix scans and the read cache."""
+
+    def setUp(self):
+        self.store = KVMemoryStore(None, cache_size=8)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_set_and_get_round_trip(self):
+        self.store.set("loop_trace[loop_001]", {"status": "finalized", "rerun_count": 1})
+        self.store.set_many({"loop_prompt[loop_001]": "prompt", "bias_tags": ["anchoring"]})
+
+        self.assertEqual(self.store.get("loop_trace[loop_001]"), {"status": "finalized", "rerun_count": 1})
+        self.assertEqual(self.store.get("missing", "default"), "default")
+        self.assertEqual(
+            self.store.get_many(["bias_tags", "missing", "loop_prompt[loop_001]"]),
+            {"bias_tags": ["anchoring"], "loop_prompt[loop_001]": "prompt"},
+        )
+
+    def test_cached_values_are_not_shared(self):
+        self.store.set("trace", {"reruns": []})
+        self.store.get("trace")["reruns"].append("mutated")
+        self.assertEqual(self.store.get("trace"), {"reruns": []})
+
+    def test_misses_are_cached_and_invalidated_by_writes(self):
+        with mock.patch.object(self.store, "_conn", wraps=self.store._conn) as conn:
+            self.assertIsNone(self.store.get("missing"))
+            self.assertIsNone(self.store.get("missing"))
+            self.assertEqual(conn.execute.call_count, 1)
+
+        self.store.set("missing", 1)
+        self.assertEqual(self.store.get("missing"), 1)
+        self.assertTrue(self.store.delete("missing"))
+        self.assertIsNone(self.store.get("missing"))
+        self.assertFalse(self.store.delete("missing"))
+
+    def test_get_many_beyond_parameter_limit(self):
+        items = {f"k{i:05d}": i for i in range(2000)}
+        self.store.set_many(items)
+        self.assertEqual(self.store.get_many(list(items)), items)
+        self.assertLessEqual(len(self.store._cache), 8)
+
+    def test_scan_prefix_is_bounded(self):
+        self.store.set_many({
+            "loop_trace[loop_002]": 2,
+            "loop_trace[loop_001]": 1,
+            "loop_trace_index": 0,
+            "loop_tracf": 0,
+            "loop_summary[loop_001]": 0,
+        })
+
+        self.assertEqual(self.store.scan_prefix("loop_trace["), {"loop_trace[loop_001]": 1, "loop_trace[loop_002]": 2})
+        self.assertEqual(self.store.keys("loop_trace[", limit=1), ["loop_trace[loop_001]"])
+        self.assertEqual(len(self.store.keys()), 5)
+
+
+class TestMemoryHelpers(unittest.TestCase):
+    """Test cases for the module-level async helpers."""
+
+    def setUp(self):
+        self.store = KVMemoryStore(None)
+        patcher = mock.patch.object(kv_memory, "_store", self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.store.close)
+
+    def test_helpers_use_shared_store(self):
+        async def run():
+            self.assertTrue(await kv_memory.write_to_memory("loop_trace[loop_002]", {"loop_id": "loop_002"}))
+            self.assertTrue(await kv_memory.write_many_to_memory({"loop_trace[loop_001]": {"loop_id": "loop_001"}}))
+            return (
+                await kv_memory.read_from_memory("loop_trace[loop_001]"),
+                await kv_memory.read_many_from_memory(["loop_trace[loop_002]", "missing"]),
+                await kv_memory.scan_memory("loop_trace["),
+                await kv_memory.list_memory_keys("loop_trace["),
+            )
+
+        single, many, scanned, keys = asyncio.run(run())
+
+        self.assertEqual(single, {"loop_id": "loop_001"})
+        self.assertEqual(many, {"loop_trace[loop_002]": {"loop_id": "loop_002"}})
+        self.assertEqual(list(scanned), ["loop_trace[loop_001]", "loop_trace[loop_002]"])
+        self.assertEqual(keys, ["loop_trace[loop_001]", "loop_trace[loop_002]"])
+
+    def test_unserializable_write_fails(self):
+        circular = {}
+        circular["self"] = circular
+        self.assertFalse(asyncio.run(kv_memory.write_to_memory("bad", circular)))
+        self.assertIsNone(self.store.get("bad"))
+
+
+if __name__ == "__main__":
+    unittest.main()
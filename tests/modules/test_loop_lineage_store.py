@@ -0,0 +1,117 @@
+"""
+Unit tests for the loop lineage index and the historian drift reports built on it.
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from app.modules import historian_drift_report, kv_memory
+from app.modules.kv_memory import KVMemoryStore
+from app.modules.loop_lineage_store import LoopLineageIndex, get_loop_lineage
+
+
+def _trace(loop_id, timestamp, drift_score=0.1, project_id="p1", **extra):
+    return {"loop_id": loop_id, "timestamp": timestamp, "drift_score": drift_score,
+            "alignment_score": 0.8, "project_id": project_id, **extra}
+
+
+class TestLoopLineageIndex(unittest.TestCase):
+    """Test cases for parent links, family queries and time order."""
+
+    def setUp(self):
+        self.store = KVMemoryStore(None)
+        self.index = LoopLineageIndex(self.store)
+        self.store.add_index(self.index)
+        self.addCleanup(self.store.close)
+
+    def test_family_from_either_side_of_the_link(self):
+        self.store.set_many({
+            "loop_trace[root]": _trace("root", "t1", child_loop_ids=["a", "b"]),
+            "loop_trace[a]": _trace("a", "t2"),
+            "loop_trace[b]": _trace("b", "t3"),
+        })
+        # Linked by the child's own parent_loop_id only
+        self.store.set("loop_trace[a1]", _trace("a1", "t4", parent_loop_id="a"))
+
+        self.assertEqual(self.index.family("a"), {
+            "loop_id": "a", "ancestors": ["root"], "descendants": ["a1"], "siblings": ["b"],
+        })
+        self.assertEqual(self.index.family("root")["descendants"], ["a", "b", "a1"])
+        self.assertEqual(self.index.family("a1")["ancestors"], ["a", "root"])
+        self.assertEqual(self.index.family("unknown")["ancestors"], [])
+
+    def test_cycles_terminate(self):
+        self.store.set_many({
+            "loop_trace[x]": _trace("x", "t1", parent_loop_id="y"),
+            "loop_trace[y]": _trace("y", "t2", parent_loop_id="x"),
+        })
+        self.assertEqual(self.index.family("x")["ancestors"], ["y"])
+        self.assertEqual(self.index.family("x")["descendants"], ["y"])
+
+    def test_time_order_per_project(self):
+        self.store.set_many({
+            "loop_trace[late]": _trace("late", "2025-01-03"),
+            "loop_trace[early]": _trace("early", "2025-01-01"),
+            "loop_trace[other]": _trace("other", "2025-01-02", project_id="p2"),
+            "loop_trace[middle]": _trace("middle", "2025-01-02"),
+        })
+
+        self.assertEqual(self.index.loop_ids("p1"), ["early", "middle", "late"])
+        self.assertEqual(list(self.index.iter_loops(page_size=2)),
+                         [("early", "p1"), ("middle", "p1"), ("late", "p1"), ("other", "p2")])
+        self.assertEqual(self.index.previous_loops("late"), ["middle", "early"])
+        self.assertEqual(self.index.previous_loops("other"), [])
+
+    def test_existing_traces_are_backfilled(self):
+        store = KVMemoryStore(None)
+        self.addCleanup(store.close)
+        store.set_many({"loop_trace[a]": _trace("a", "t1"), "loop_trace[b]": _trace("b", "t2", parent_loop_id="a")})
+
+        index = LoopLineageIndex(store)
+        store.add_index(index)
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.family("a")["descendants"], ["b"])
+
+
+class TestHistorianDriftReports(unittest.TestCase):
+    """Test cases for drift reports streamed from the lineage index."""
+
+    def setUp(self):
+        self.store = KVMemoryStore(None)
+        patcher = mock.patch.object(kv_memory, "_store", self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.store.close)
+        self.store.set_many({
+            f"loop_trace[loop_{i}]": _trace(f"loop_{i}", f"2025-01-{i:02d}", drift_score=i / 20)
+            for i in range(1, 9)
+        })
+
+    def test_previous_loops_follow_time_index(self):
+        self.assertIs(get_loop_lineage(), get_loop_lineage())
+        self.assertEqual(asyncio.run(historian_drift_report.get_previous_loops("loop_8", 3)),
+                         ["loop_7", "loop_6", "loop_5"])
+        self.assertEqual(asyncio.run(historian_drift_report.get_all_loop_ids())[:2], ["loop_1", "loop_2"])
+
+    def test_all_loops_match_single_loop_reports(self):
+        expected = {
+            loop_id: asyncio.run(historian_drift_report.generate_belief_drift_report(loop_id))
+            for loop_id in (f"loop_{i}" for i in range(1, 9))
+        }
+
+        with mock.patch.object(historian_drift_report, "DRIFT_REPORT_BATCH_SIZE", 3):
+            summary = asyncio.run(historian_drift_report.generate_drift_reports_for_all_loops())
+
+        self.assertEqual(summary["total_loops_processed"], 8)
+        for loop_id, report in summary["results"].items():
+            self.assertEqual(report["belief_drift_trend"], expected[loop_id]["belief_drift_trend"])
+            self.assertEqual(report["drift_level"], expected[loop_id]["drift_level"])
+        stored = self.store.get("loop_trace[loop_8]")
+        self.assertEqual(stored["belief_drift_trend"]["loops_compared"],
+                         ["loop_7", "loop_6", "loop_5", "loop_4", "loop_3", "loop_8"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Unit tests for the embedding cache and batched embed path.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from app.modules import memory_embed
+from app.modules.embedding_cache import EmbeddingCache, content_hash
+from app.modules.memory_embed import Embedder, embed_memory_batch, embed_texts, register_embedder
+
+
+class CountingEmbedder(Embedder):
+    """Embedder recording every embed_many call."""
+
+    calls = []
+
+    def embed_many(self, texts):
+        CountingEmbedder.calls.append(list(texts))
+        return np.full((len(texts), self.dimension), len(CountingEmbedder.calls), dtype=np.float32)
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Test cases for EmbeddingCache and embed_texts."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "embeddings.db")
+        CountingEmbedder.calls = []
+        register_embedder("counting", CountingEmbedder)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_duplicates_and_repeats_are_served_from_cache(self):
+        cache = EmbeddingCache(self.db_path, lru_size=2)
+
+        vectors, stats = embed_texts(["a", "b", "a"], "counting", 4, cache=cache)
+        self.assertEqual(CountingEmbedder.calls, [["a", "b"]])
+        self.assertEqual((stats["cache_hits"], stats["cache_misses"]), (1, 2))
+        np.testing.assert_array_equal(vectors[0], vectors[2])
+
+        _, stats = embed_texts(["a", "b", "c"], "counting", 4, cache=cache)
+        self.assertEqual(CountingEmbedder.calls[-1], ["c"])
+        self.assertEqual(stats["cache_hits"], 2)
+
+    def test_persistent_store_survives_restart(self):
+        cache = EmbeddingCache(self.db_path)
+        cache.put_many("m", 3, {content_hash("x"): np.array([1, 2, 3], dtype=np.float32)})
+        cache.close()
+
+        reopened = EmbeddingCache(self.db_path)
+        found = reopened.get_many("m", 3, [content_hash("x"), content_hash("y")])
+        self.assertEqual(list(found), [content_hash("x")])
+        self.assertEqual(reopened.get_many("m", 4, [content_hash("x")]), {})
+
+    def test_large_batches_are_chunked_not_rejected(self):
+        cache = EmbeddingCache(None)
+        items = [{"content": f"text {i % 50}", "model": "counting", "dimension": 4} for i in range(300)]
+
+        with patch.object(memory_embed, "get_embedding_cache", return_value=cache), \
+             patch.object(memory_embed, "EMBED_CHUNK_SIZE", 128):
+            result = embed_memory_batch({"items": items})
+
+        self.assertEqual(result["successful_items"], 300)
+        self.assertEqual(result["cache_misses"], 50)
+        self.assertEqual(len(result["batch_timings_ms"]), 3)
+        self.assertAlmostEqual(result["cache_hit_ratio"], 250 / 300, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Unit tests for the group-commit memory writer.
+"""
+
+import asyncio
+import glob
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from app.api.modules import memory_writer
+from app.api.modules.memory_writer import MemoryWriter
+
+
+class TestMemoryWriter(unittest.TestCase):
+    """Test cases for MemoryWriter batching, rotation and shutdown."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "loop_trace.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _read_lines(self):
+        with open(self.path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_concurrent_writes_are_coalesced(self):
+        writer = MemoryWriter(flush_interval=0.05)
+
+        async def scenario():
+            acks = await asyncio.gather(*[writer.submit(self.path, {"i": i}) for i in range(50)])
+            await writer.shutdown()
+            return acks
+
+        acks = asyncio.run(scenario())
+
+        self.assertTrue(all(ack["written"] for ack in acks))
+        self.assertEqual(sorted(e["i"] for e in self._read_lines()), list(range(50)))
+        self.assertLess(writer.stats["batches_written"], 50)
+        self.assertEqual(writer.stats["entries_written"], 50)
+
+    def test_shutdown_flushes_pending_entries(self):
+        writer = MemoryWriter(flush_interval=10.0, fsync_policy="never")
+
+        async def scenario():
+            tasks = [asyncio.ensure_future(writer.submit(self.path, {"i": i})) for i in range(5)]
+            await asyncio.sleep(0)
+            await writer.shutdown()
+            return await asyncio.gather(*tasks)
+
+        acks = asyncio.run(scenario())
+
+        self.assertEqual(len(acks), 5)
+        self.assertEqual(len(self._read_lines()), 5)
+
+    def test_rotation_compresses_segments(self):
+        writer = MemoryWriter(flush_interval=0, max_file_bytes=200, max_segments=2)
+
+        async def scenario():
+            for i in range(40):
+                await writer.submit(self.path, {"i": i, "pad": "x" * 40})
+            await writer.shutdown()
+
+        asyncio.run(scenario())
+
+        segments = glob.glob(self.path + ".*.gz")
+        self.assertEqual(len(segments), 2)
+        with gzip.open(sorted(segments)[-1], "rt") as f:
+            self.assertTrue(json.loads(f.readline())["pad"])
+
+    def test_writer_of_closed_loop_is_released(self):
+        async def submit_without_shutdown():
+            writer = memory_writer.get_memory_writer()
+            for i in range(5):
+                asyncio.ensure_future(writer.submit(self.path, {"i": i}))
+            await asyncio.sleep(0.01)
+            return writer
+
+        async def get_writer():
+            return memory_writer.get_memory_writer()
+
+        with mock.patch.object(memory_writer, "_writer", None), \
+                mock.patch.dict(os.environ, {"MEMORY_WRITER_FLUSH_INTERVAL": "10"}):
+            old = asyncio.run(submit_without_shutdown())
+            new = asyncio.run(get_writer())
+
+        self.assertIsNot(new, old)
+        old._executor.shutdown(wait=True)
+        self.assertEqual(sorted(e["i"] for e in self._read_lines()), list(range(5)))
+        with self.assertRaises(RuntimeError):
+            old._executor.submit(print)
+
+    def test_invalid_fsync_policy(self):
+        with self.assertRaises(ValueError):
+            MemoryWriter(fsync_policy="sometimes")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Unit tests for the cached, atomic project state store.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from app.modules import project_state
+from app.modules.project_state_store import ProjectStateStore
+
+
+class TestProjectStateStore(unittest.TestCase):
+    """Test cases for ProjectStateStore caching, locking and coalescing."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = ProjectStateStore(self.tmp_dir.name, coalesce_interval=0)
+        patcher = mock.patch.object(project_state, "_store", self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_returns_private_copy_and_sees_external_writes(self):
+        project_state.write_project_state("p1", {"status": "active", "files_created": []})
+
+        state = project_state.read_project_state("p1")
+        state["files_created"].append("mutated.txt")
+        self.assertEqual(project_state.read_project_state("p1")["files_created"], [])
+
+        # A write from another process changes mtime/size and invalidates the cache
+        with open(self.store.path_for("p1"), "w") as f:
+            json.dump({"project_id": "p1", "status": "external"}, f)
+        self.assertEqual(project_state.read_project_state("p1")["status"], "external")
+
+    def test_write_leaves_no_temp_files(self):
+        project_state.write_project_state("p1", {"status": "active"})
+        self.assertEqual(sorted(self.store.list_project_ids()), ["p1"])
+        self.assertFalse([name for name in os.listdir(self.tmp_dir.name) if name.endswith(".tmp")])
+
+    def test_concurrent_updates_are_not_lost(self):
+        def worker(n):
+            for i in range(10):
+                project_state.update_project_state("p1", {"tool_usage": {"search": 1}, "completed_steps": [f"{n}-{i}"]})
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        state = project_state.read_project_state("p1")
+        self.assertEqual(state["tool_usage"]["search"], 40)
+        self.assertEqual(len(state["completed_steps"]), 40)
+
+    def test_loop_count_increments_are_coalesced(self):
+        self.store.coalesce_interval = 60
+        project_state.write_project_state("p1", {"status": "active", "loop_count": 0})
+
+        for agent in ["hal", "nova", "hal"]:
+            project_state.increment_loop_count("p1", agent)
+
+        # Visible in-process before the flush
+        state = project_state.read_project_state("p1")
+        self.assertEqual(state["loop_count"], 3)
+        self.assertEqual(state["last_completed_agent"], "hal")
+        self.assertEqual(state["completed_steps"], ["hal", "nova"])
+        with open(self.store.path_for("p1")) as f:
+            self.assertEqual(json.load(f)["loop_count"], 0)
+
+        self.store.flush()
+        with open(self.store.path_for("p1")) as f:
+            self.assertEqual(json.load(f)["loop_count"], 3)
+
+    def test_failed_flush_keeps_counters(self):
+        self.store.coalesce_interval = 60
+        project_state.write_project_state("p1", {"status": "active", "loop_count": 0})
+        project_state.increment_loop_count("p1", "hal")
+
+        with mock.patch.object(self.store, "_write_file", side_effect=OSError(28, "No space left on device")):
+            with self.assertRaises(OSError):
+                self.store.flush()
+        project_state.increment_loop_count("p1", "nova")
+
+        self.assertEqual(project_state.read_project_state("p1")["loop_count"], 2)
+        self.store.flush()
+        with open(self.store.path_for("p1")) as f:
+            state = json.load(f)
+        self.assertEqual(state["loop_count"], 2)
+        self.assertEqual(state["last_completed_agent"], "nova")
+
+    def test_cleanup_uses_index_and_deletes_stale_projects(self):
+        stale = (datetime.utcnow() - timedelta(hours=48)).isoformat()
+        project_state.write_project_state("fresh", {"status": "active"})
+        project_state.write_project_state("old", {"status": "active"})
+
+        # Backdate "old" in both the index and the file mtime
+        self.store.rewrite_index({"fresh": datetime.utcnow().isoformat(), "old": stale})
+        old_mtime = (datetime.now() - timedelta(hours=48)).timestamp()
+        os.utime(self.store.path_for("old"), (old_mtime, old_mtime))
+
+        with mock.patch.object(project_state, "read_project_state", wraps=project_state.read_project_state) as read:
+            result = project_state.cleanup_orphaned_projects()
+
+        self.assertEqual(result["deleted_projects"], ["old"])
+        read.assert_not_called()
+        self.assertEqual(self.store.list_project_ids(), ["fresh"])
+        self.assertEqual(list(self.store.read_index()), ["fresh"])
+
+
+if __name__ == "__main__":
+    unittest.main()
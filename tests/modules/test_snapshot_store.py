@@ -0,0 +1,120 @@
+"""
+Unit tests for the delta snapshot store and loop_resume_engine integration.
+"""
+
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+from app.modules import loop_resume_engine, project_state, snapshot_store
+from app.modules.project_state_store import ProjectStateStore
+from app.modules.snapshot_store import SnapshotStore, apply_diff, json_diff
+
+
+class TestJsonDiff(unittest.TestCase):
+    """Test cases for structural diffs."""
+
+    def test_roundtrip(self):
+        old = {"a": 1, "steps": ["hal"], "nested": {"x": [1, 2], "y": "keep"}, "gone": True}
+        new = {"a": 2, "steps": ["hal", "nova"], "nested": {"x": [2], "y": "keep", "z": None}}
+
+        ops = json_diff(old, new)
+
+        self.assertIn(["append", ["steps"], ["nova"]], ops)
+        self.assertIn(["del", ["gone"]], ops)
+        self.assertNotIn("y", json.dumps(ops))
+        self.assertEqual(apply_diff(json.loads(json.dumps(old)), ops), new)
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Test cases for checkpoints, deltas and replay."""
+
+    def setUp(self):
+        self.store = SnapshotStore(None, checkpoint_interval=4)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_replay_every_snapshot(self):
+        states = []
+        big = {"blob": "x" * 1000}
+        for loop in range(10):
+            state = {"loop_count": loop, "completed_steps": [f"agent{i}" for i in range(loop)], "registry": big}
+            states.append(state)
+            self.store.save("p1", state, loop, f"2024-01-01T00:00:{loop:02d}")
+
+        # Fresh store instance on the same connection forces replay from disk
+        self.store._latest.clear()
+        for seq, state in enumerate(states):
+            self.assertEqual(self.store.get("p1", seq)["snapshot"], state)
+        self.assertEqual(self.store.get("p1")["seq"], 9)
+
+        kinds = [row[0] for row in self.store._conn.execute("SELECT kind FROM snapshots ORDER BY seq")]
+        self.assertEqual(kinds.count("full"), 3)
+        # The unchanged registry subtree is stored once across checkpoints
+        blobs = self.store._conn.execute(
+            "SELECT COUNT(*) FROM snapshot_objects WHERE body LIKE '%xxxx%'"
+        ).fetchone()[0]
+        self.assertEqual(blobs, 1)
+
+        history = self.store.history("p1")
+        self.assertEqual(len(history), 10)
+        self.assertEqual(history[3]["agents_completed"], ["agent0", "agent1", "agent2"])
+
+
+class TestLoopResumeEngine(unittest.TestCase):
+    """Test cases for snapshots saved out of band from the project state."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.state_store = ProjectStateStore(self.tmp_dir.name, coalesce_interval=0)
+        self.snapshots = SnapshotStore(None, checkpoint_interval=5)
+        for target, value in ((project_state, self.state_store), (snapshot_store, self.snapshots)):
+            patcher = mock.patch.object(target, "_store", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.snapshots.close()
+        self.tmp_dir.cleanup()
+
+    def test_state_keeps_only_a_pointer(self):
+        for agent in ["hal", "nova", "critic"]:
+            project_state.update_project_state("p1", {"completed_steps": [agent], "increment_loop_count": True})
+            loop_resume_engine.save_loop_snapshot("p1")
+
+        state = project_state.read_project_state("p1")
+        self.assertNotIn("loop_snapshots", state)
+        self.assertNotIn("snapshot", state["last_snapshot"])
+        self.assertEqual(state["snapshot_count"], 3)
+
+        history = loop_resume_engine.get_snapshot_history("p1")
+        self.assertEqual(history["snapshot_count"], 3)
+        self.assertEqual(history["snapshots"][-1]["agents_completed"], ["hal", "nova", "critic"])
+
+        project_state.update_project_state("p1", {"completed_steps": ["ash"], "status": "broken"})
+        result = loop_resume_engine.restore_last_snapshot("p1")
+
+        self.assertEqual(result["status"], "restored")
+        restored = project_state.read_project_state("p1")
+        self.assertEqual(restored["completed_steps"], ["hal", "nova", "critic"])
+        self.assertEqual(restored["loop_count"], 3)
+
+    def test_legacy_embedded_snapshots_are_migrated(self):
+        legacy = [
+            {"timestamp": "2024-01-01T00:00:00", "loop": 1, "snapshot": {"loop_count": 1, "completed_steps": ["hal"]}},
+            {"timestamp": "2024-01-01T00:01:00", "loop": 2, "snapshot": {"loop_count": 2, "completed_steps": ["hal", "nova"]}},
+        ]
+        project_state.write_project_state("p1", {"loop_count": 2, "loop_snapshots": legacy, "last_snapshot": legacy[-1]})
+
+        loop_resume_engine.save_loop_snapshot("p1")
+
+        state = project_state.read_project_state("p1")
+        self.assertNotIn("loop_snapshots", state)
+        self.assertEqual(state["snapshot_count"], 3)
+        self.assertEqual([s["loop"] for s in self.snapshots.history("p1")], [1, 2, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Unit tests for the ring-buffered stream hub and delegate_stream fan-out.
+"""
+
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from app.modules import delegate_stream
+from app.modules.stream_hub import StreamHub
+
+
+def _event(i):
+    return {"event_id": f"event_{i}", "data": {"i": i}}
+
+
+class FakeWebSocket:
+    """websockets-style connection whose sends can be slowed down."""
+
+    def __init__(self, send_delay=0.0):
+        self.send_delay = send_delay
+        self.sent = []
+        self.disconnected = asyncio.Event()
+
+    async def send(self, message):
+        await asyncio.sleep(self.send_delay)
+        self.sent.append(message)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await self.disconnected.wait()
+        raise StopAsyncIteration
+
+
+class TestStreamHub(unittest.TestCase):
+    """Test cases for replay, resume, shared payloads and slow consumers."""
+
+    def test_ring_buffer_and_resume(self):
+        async def scenario():
+            hub = StreamHub(capacity=3)
+            hub.open("s1")
+            for i in range(5):
+                hub.publish("s1", _event(i))
+
+            everything = hub.subscribe("s1")
+            resumed = hub.subscribe("s1", last_event_id="event_3")
+            evicted = hub.subscribe("s1", last_event_id="event_0")
+            return everything, resumed, evicted
+
+        everything, resumed, evicted = asyncio.run(scenario())
+
+        self.assertEqual([json.loads(p)["event_id"] for p in everything.replay], ["event_2", "event_3", "event_4"])
+        self.assertEqual([json.loads(p)["event_id"] for p in resumed.replay], ["event_4"])
+        self.assertFalse(resumed.missed)
+        self.assertTrue(evicted.missed)
+        self.assertEqual(len(evicted.replay), 3)
+
+    def test_payload_is_serialized_once_and_shared(self):
+        async def scenario():
+            hub = StreamHub()
+            hub.open("s1")
+            first, second = hub.subscribe("s1"), hub.subscribe("s1")
+            payload = hub.publish("s1", _event(1))
+            return payload, first._queue[0], second._queue[0]
+
+        payload, first, second = asyncio.run(scenario())
+
+        self.assertIs(first, payload)
+        self.assertIs(second, payload)
+
+    def test_slow_consumer_policies(self):
+        async def scenario(policy):
+            hub = StreamHub(queue_size=2, policy=policy)
+            hub.open("s1")
+            subscriber = hub.subscribe("s1")
+            for i in range(5):
+                hub.publish("s1", _event(i))
+            return hub, subscriber
+
+        hub, subscriber = asyncio.run(scenario("drop"))
+        self.assertEqual(subscriber.queue_depth, 2)
+        self.assertEqual([json.loads(p)["event_id"] for p in subscriber._queue], ["event_3", "event_4"])
+        metrics = hub.get_metrics("s1")
+        self.assertEqual(metrics["dropped_events"], 3)
+        self.assertEqual(metrics["queue_depth"], 2)
+        self.assertEqual(metrics["buffered_events"], 5)
+
+        hub, subscriber = asyncio.run(scenario("disconnect"))
+        self.assertTrue(subscriber.closed)
+        self.assertEqual(subscriber.close_reason, "slow_consumer")
+        self.assertEqual(hub.subscriber_count("s1"), 0)
+        self.assertEqual(hub.get_metrics("s1")["slow_consumer_disconnects"], 1)
+
+
+class TestDelegateStreamFanOut(unittest.TestCase):
+    """Test cases for handle_stream_connection on top of the hub."""
+
+    def test_live_events_resume_and_close(self):
+        async def scenario():
+            stream = delegate_stream.create_stream({
+                "stream_type": "loop", "target_id": "loop_1", "description": "test", "max_events": 4
+            })
+            stream_id = stream["stream_id"]
+            first = delegate_stream.add_event_to_stream(stream_id, "tick", "test", {"n": 0})
+
+            ws = FakeWebSocket()
+            connection = asyncio.create_task(
+                delegate_stream.handle_stream_connection(ws, f"/streams/{stream_id}", first["event_id"])
+            )
+            await asyncio.sleep(0.01)
+            self.assertEqual(delegate_stream.get_stream_status({"stream_id": stream_id})["connected_clients"], 1)
+
+            for n in range(1, 4):
+                delegate_stream.add_event_to_stream(stream_id, "tick", "test", {"n": n})
+            # The fourth event hits max_events and closes the stream after flushing
+            await asyncio.wait_for(connection, 1.0)
+            return stream_id, ws
+
+        stream_id, ws = asyncio.run(scenario())
+
+        frames = [json.loads(m) for m in ws.sent]
+        self.assertEqual(frames[0]["type"], "welcome")
+        self.assertFalse(frames[0]["missed_events"])
+        self.assertEqual([f["data"]["n"] for f in frames[1:]], [1, 2, 3])
+        status = delegate_stream.get_stream_status({"stream_id": stream_id})
+        self.assertEqual(status["status"], "closed")
+        self.assertEqual(status["connected_clients"], 0)
+        self.assertEqual(delegate_stream.get_stream_metrics(stream_id)["streams"][stream_id]["subscribers"], 0)
+
+    def test_closed_stream_is_discarded_from_hub(self):
+        stream = delegate_stream.create_stream({"stream_type": "loop", "target_id": "loop_1", "description": "test"})
+        stream_id = stream["stream_id"]
+        delegate_stream.add_event_to_stream(stream_id, "tick", "test", {"n": 0})
+
+        with mock.patch.object(delegate_stream, "_DISCARD_DELAY_SECONDS", 0):
+            delegate_stream.close_stream({"stream_id": stream_id, "reason": "done"})
+
+        self.assertNotIn(stream_id, delegate_stream._hub.get_metrics())
+        self.assertEqual(delegate_stream.get_stream_status({"stream_id": stream_id})["buffered_events"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
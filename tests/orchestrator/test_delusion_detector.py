@@ -100,22 +100,21 @@ class TestDelusionDetector(unittest.TestCase):
     
     def test_get_plan_similarity(self):
         """Test get_plan_similarity function."""
-        # Generate hashes
-        hash1 = generate_plan_hash(self.plan1)
-        hash2 = generate_plan_hash(self.plan2)
-        hash3 = generate_plan_hash(self.plan3)
-        
         # Identical plans should have similarity 1.0
-        self.assertEqual(get_plan_similarity(hash1, hash1), 1.0)
+        self.assertEqual(get_plan_similarity(self.plan1, self.plan1), 1.0)
         
         # Similar plans should have high similarity
-        similarity12 = get_plan_similarity(hash1, hash2)
+        similarity12 = get_plan_similarity(self.plan1, self.plan2)
         self.assertGreater(similarity12, 0.7)
         
         # Different plans should have lower similarity
-        similarity13 = get_plan_similarity(hash1, hash3)
-        # Use assertLessEqual instead of assertLess to handle potential equality edge cases
-        self.assertLessEqual(similarity13, similarity12)
+        similarity13 = get_plan_similarity(self.plan1, self.plan3)
+        self.assertLess(similarity13, 0.2)
+        
+        # Hashes only match exactly
+        hash1 = generate_plan_hash(self.plan1)
+        self.assertEqual(get_plan_similarity(hash1, self.plan1), 1.0)
+        self.assertEqual(get_plan_similarity(hash1, generate_plan_hash(self.plan2)), 0.0)
     
     def test_compare_to_rejected_hashes_with_match(self):
         """Test compare_to_rejected_hashes with a matching plan."""
@@ -289,5 +288,17 @@ class TestDelusionDetector(unittest.TestCase):
         self.assertEqual(plan_summary["steps_count"], 4)
         self.assertEqual(plan_summary["approach"], "Use JWT tokens with secure password hashing")
 
+    def test_detect_plan_delusion_near_duplicate(self):
+        """Test detect_plan_delusion with a rejected plan that differs by one step."""
+        memory = store_rejected_plan(self.plan1, "loop_42", "API rate limit exceeded", {})
+        memory = store_rejected_plan(self.plan3, "loop_43", "Chart library missing", memory)
+        
+        updated_memory = detect_plan_delusion(self.plan2, "loop_123", memory, 0.8)
+        
+        alert = updated_memory["delusion_alerts"][0]
+        self.assertEqual(alert["similar_loop_id"], "loop_42")
+        self.assertGreater(alert["similarity_score"], 0.8)
+        self.assertLess(alert["similarity_score"], 1.0)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,102 @@
+"""
+Unit tests for the compiled JSON schema registry.
+"""
+
+import json
+import os
+import tempfile
+import types
+import unittest
+
+import jsonschema
+from jsonschema.exceptions import ValidationError
+
+from app.utils.compiled_schemas import CompiledSchemaRegistry
+
+
+class TestCompiledSchemaRegistry(unittest.TestCase):
+    """Test cases for compile-once validation, $refs and hot reload."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self.tmp_dir.name
+        os.makedirs(os.path.join(self.root, "agent_output"))
+        self._write("common.schema.json", {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "definitions": {"status": {"type": "string", "enum": ["ok", "failed"]}},
+        })
+        self._write("agent_output/report.schema.json", {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "required": ["status", "summary"],
+            "properties": {
+                "status": {"$ref": "../common.schema.json#/definitions/status"},
+                "summary": {"type": "string"},
+            },
+        })
+        self.registry = CompiledSchemaRegistry(roots=(self.root,), reload_interval=0)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, name, schema):
+        path = os.path.join(self.root, name)
+        with open(path, "w") as f:
+            json.dump(schema, f)
+        return path
+
+    def test_validates_by_name_and_compiles_once(self):
+        good = {"status": "ok", "summary": "done"}
+        for _ in range(50):
+            self.assertTrue(self.registry.is_valid("report.schema.json", good))
+        self.assertTrue(self.registry.is_valid("agent_output/report.schema.json", good))
+
+        self.assertFalse(self.registry.is_valid("report.schema.json", {"status": "maybe", "summary": "x"}))
+        self.assertEqual(self.registry.get_stats()["compiles"], 1)
+        names = self.registry.names()
+        self.assertEqual(len(names), 2)
+        self.assertTrue(names[0].endswith(os.path.join("agent_output", "report.schema.json")))
+
+    def test_error_paths(self):
+        errors = self.registry.iter_errors("report.schema.json", {"status": 3})
+        self.assertIsInstance(errors, types.GeneratorType)
+        # Missing summary, plus type and enum failures through the cross-file $ref
+        self.assertEqual(sorted(e.validator for e in errors), ["enum", "required", "type"])
+
+        with self.assertRaises(ValidationError):
+            self.registry.validate("report.schema.json", {"status": "ok"})
+        with self.assertRaises(FileNotFoundError):
+            self.registry.is_valid("missing.schema.json", {})
+
+    def test_hot_reload_on_change(self):
+        self.assertTrue(self.registry.is_valid("report.schema.json", {"status": "ok", "summary": "x"}))
+
+        path = self._write("agent_output/report.schema.json", {
+            "type": "object",
+            "required": ["status", "summary", "score"],
+        })
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+
+        self.assertFalse(self.registry.is_valid("report.schema.json", {"status": "ok", "summary": "x"}))
+        self.assertEqual(self.registry.get_stats()["compiles"], 2)
+
+    def test_inline_schema_is_compiled_once(self):
+        schema = {"type": "object", "required": ["loop_count"]}
+        self.assertTrue(self.registry.is_valid(schema, {"loop_count": 1}))
+        self.assertFalse(self.registry.is_valid(schema, {}))
+        self.assertEqual(self.registry.get_stats()["compiles"], 1)
+
+    def test_draft_defaults_like_jsonschema_validate(self):
+        schema = {"type": "array", "prefixItems": [{"type": "integer"}]}
+        with self.assertRaises(ValidationError):
+            jsonschema.validate(["x"], schema)
+        with self.assertRaises(ValidationError):
+            self.registry.validate(schema, ["x"])
+
+        # An explicit validator class ignores keywords from other drafts
+        self.assertTrue(self.registry.is_valid(schema, ["x"], jsonschema.Draft7Validator))
+        self.assertFalse(self.registry.is_valid(schema, ["x"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
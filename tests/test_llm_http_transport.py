@@ -0,0 +1,153 @@
+"""
+Tests for the pooled LLM HTTP transport against a local stub server that
+simulates rate limiting (429 + Retry-After) and latency.
+"""
+
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.modules.llm_infer import LLMInferenceModule
+from app.providers import http_transport
+from app.providers.http_transport import (
+    ProviderTransport,
+    TokenBucket,
+    TransportError,
+    backoff_delay,
+    parse_duration,
+)
+
+
+class StubLLMServer:
+    """Chat completions stub that rejects the first N requests with 429."""
+
+    def __init__(self, reject_first: int = 0, latency: float = 0.0, retry_after: str = "0.05"):
+        self.reject_first = reject_first
+        self.latency = latency
+        self.retry_after = retry_after
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.peers = set()
+
+    async def handle(self, request):
+        self.calls += 1
+        self.peers.add(request.transport.get_extra_info("peername"))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if self.calls <= self.reject_first:
+                return web.json_response(
+                    {"error": {"message": "Rate limit reached"}},
+                    status=429,
+                    headers={"Retry-After": self.retry_after},
+                )
+            body = await request.json()
+            return web.json_response(
+                {
+                    "choices": [{"message": {"content": f"echo: {body['messages'][0]['content']}"}}],
+                    "usage": {"total_tokens": 10},
+                },
+                headers={"x-ratelimit-remaining-requests": "100", "x-ratelimit-reset-requests": "1s"},
+            )
+        finally:
+            self.in_flight -= 1
+
+    def app(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.handle)
+        return app
+
+
+class TestHttpTransport(unittest.IsolatedAsyncioTestCase):
+    """Test cases for retries, concurrency limits and rate limiting."""
+
+    async def start(self, stub: StubLLMServer, **kwargs) -> ProviderTransport:
+        self.server = TestServer(stub.app())
+        await self.server.start_server()
+        self.addAsyncCleanup(self.server.close)
+        transport = ProviderTransport("stub", str(self.server.make_url("/v1")), **kwargs)
+        self.addAsyncCleanup(transport.close)
+        return transport
+
+    async def test_retries_honor_retry_after(self):
+        stub = StubLLMServer(reject_first=2, retry_after="0.1")
+        transport = await self.start(stub)
+
+        started = time.monotonic()
+        body = await transport.post_json("/chat/completions", {"messages": [{"content": "hi"}]})
+
+        self.assertEqual(body["choices"][0]["message"]["content"], "echo: hi")
+        self.assertEqual(stub.calls, 3)
+        self.assertEqual(transport.stats["rate_limited"], 2)
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+
+    async def test_gives_up_after_max_retries(self):
+        stub = StubLLMServer(reject_first=10, retry_after="0")
+        transport = await self.start(stub, max_retries=2)
+
+        with self.assertRaises(TransportError) as ctx:
+            await transport.post_json("/chat/completions", {"messages": [{"content": "hi"}]})
+
+        self.assertEqual(ctx.exception.status, 429)
+        self.assertEqual(stub.calls, 3)
+
+    async def test_concurrency_is_bounded_and_connections_reused(self):
+        stub = StubLLMServer(latency=0.05)
+        transport = await self.start(stub, max_concurrency=4)
+
+        await asyncio.gather(*[
+            transport.post_json("/chat/completions", {"messages": [{"content": str(i)}]}) for i in range(20)
+        ])
+
+        self.assertEqual(stub.calls, 20)
+        self.assertLessEqual(stub.max_in_flight, 4)
+        self.assertLessEqual(len(stub.peers), 4)
+
+    async def test_ainfer_uses_shared_transport(self):
+        stub = StubLLMServer(reject_first=1, retry_after="0")
+        await self.start(stub)
+        transport = ProviderTransport("openai", str(self.server.make_url("/v1")))
+        self.addAsyncCleanup(transport.close)
+
+        with mock.patch.dict(http_transport._transports, {"openai": transport}):
+            module = LLMInferenceModule(api_key="test_key")
+            response = await module.ainfer("hello from john@example.com")
+
+        self.assertIn("[REDACTED_EMAIL]", response["choices"][0]["message"]["content"])
+        self.assertEqual(stub.calls, 2)
+
+
+class TestRateLimitPrimitives(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the token bucket and backoff helpers."""
+
+    async def test_token_bucket_throttles(self):
+        bucket = TokenBucket(capacity=10, period=1.0)
+        await bucket.acquire(10)
+
+        waited = await bucket.acquire(5)
+        self.assertAlmostEqual(waited, 0.5, delta=0.1)
+
+    async def test_bucket_sync_holds_until_reset(self):
+        bucket = TokenBucket(capacity=10, period=1.0)
+        bucket.sync(remaining=0, reset_seconds=0.3)
+
+        waited = await bucket.acquire(1)
+        self.assertGreaterEqual(waited, 0.3)
+
+    def test_backoff_and_duration_parsing(self):
+        self.assertEqual(backoff_delay(5, retry_after=2.0), 2.0)
+        for attempt in range(6):
+            self.assertLessEqual(backoff_delay(attempt, base=0.5, cap=4.0), 4.0)
+        self.assertEqual(parse_duration("6m0s"), 360.0)
+        self.assertEqual(parse_duration("250ms"), 0.25)
+        self.assertIsNone(parse_duration(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
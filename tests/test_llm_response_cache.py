@@ -0,0 +1,133 @@
+"""
+Unit tests for the LLM response cache and its ModelRouter integration.
+"""
+
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from app.providers import response_cache
+from app.providers.model_router import ModelProvider, ModelRouter
+from app.providers.response_cache import ResponseCache, cache_key, cached_completion
+
+
+class CountingProvider(ModelProvider):
+    """Provider that counts upstream calls and goes through the response cache."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def process_with_prompt_chain(self, prompt_chain, user_input, context=None):
+        messages = [{"role": "system", "content": prompt_chain.get("system", "")},
+                    {"role": "user", "content": user_input}]
+
+        async def call():
+            self.calls += 1
+            await asyncio.sleep(self.delay)
+            return {"content": f"echo: {user_input}", "usage": {"total_tokens": 42},
+                    "timestamp": time.time(), "model": prompt_chain["model"], "provider": "counting"}
+
+        return await cached_completion(
+            prompt_chain["model"], messages, prompt_chain.get("temperature", 0.7),
+            prompt_chain.get("max_tokens", 1000), call, bypass=prompt_chain.get("bypass_cache", False),
+        )
+
+    def get_available_models(self):
+        return ["counting-1"]
+
+    def get_default_model(self):
+        return "counting-1"
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for ResponseCache keys, TTL, eviction and single-flight."""
+
+    def setUp(self):
+        self.cache = ResponseCache(None, ttl=60, max_entries=3)
+        patcher = mock.patch.object(response_cache, "_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.provider = CountingProvider(delay=0.05)
+        self.router = ModelRouter()
+        self.router.register_provider("counting", self.provider, ["counting-1"])
+
+    def tearDown(self):
+        self.cache.close()
+
+    def _process(self, user_input, **kwargs):
+        return self.router.process_with_model("counting-1", {"system": "be brief"}, user_input, **kwargs)
+
+    def test_cache_key_is_canonical(self):
+        messages = [{"role": "user", "content": "hi"}]
+        self.assertEqual(cache_key("m", messages, 0.7, 100), cache_key("m", [{"content": "hi", "role": "user"}], 0.7, 100))
+        self.assertNotEqual(cache_key("m", messages, 0.7, 100), cache_key("m", messages, 0.2, 100))
+
+    def test_repeated_request_is_served_from_cache(self):
+        async def scenario():
+            first = await self._process("hello")
+            second = await self._process("hello")
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        self.assertEqual(self.provider.calls, 1)
+        self.assertEqual(first["content"], second["content"])
+        self.assertTrue(second["cached"])
+        stats = self.router.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["saved_tokens"], 42)
+
+    def test_concurrent_identical_requests_share_one_call(self):
+        async def scenario():
+            return await asyncio.gather(*[self._process("same") for _ in range(10)])
+
+        results = asyncio.run(scenario())
+
+        self.assertEqual(self.provider.calls, 1)
+        self.assertEqual(len({r["content"] for r in results}), 1)
+        self.assertEqual(self.cache.get_stats()["coalesced"], 9)
+
+    def test_bypass_calls_upstream(self):
+        async def scenario():
+            await self._process("hello")
+            await self._process("hello", bypass_cache=True)
+
+        asyncio.run(scenario())
+        self.assertEqual(self.provider.calls, 2)
+        self.assertEqual(self.cache.stats["bypassed"], 1)
+
+    def test_ttl_and_lru_eviction(self):
+        for i in range(3):
+            self.cache.put(f"k{i}", "m", {"content": str(i)})
+        self.cache.get("k0")
+        self.cache.put("k3", "m", {"content": "3"})
+
+        # k1 was least recently used
+        self.assertIsNone(self.cache.get("k1"))
+        self.assertIsNotNone(self.cache.get("k0"))
+        self.assertEqual(self.cache.get_stats()["entries"], 3)
+
+        self.cache.ttl = -1
+        self.cache.put("expired", "m", {"content": "x"})
+        self.assertIsNone(self.cache.get("expired"))
+
+    def test_upstream_errors_are_not_cached(self):
+        async def failing():
+            raise RuntimeError("upstream down")
+
+        async def scenario():
+            with self.assertRaises(RuntimeError):
+                await self.cache.get_or_call("m", [], 0.7, 10, failing)
+            return await self.cache.get_or_call("m", [], 0.7, 10, self._ok)
+
+        async def ok():
+            return {"content": "ok", "usage": {"total_tokens": 1}}
+
+        self._ok = ok
+        self.assertEqual(asyncio.run(scenario())["content"], "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Tests for MemoryDB bulk writes and the normalized tag index.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.memory_db import memory_db
+
+
+def _memory(i, tags):
+    return {
+        "memory_id": f"mem-{i}",
+        "agent_id": "test-agent",
+        "memory_type": "test",
+        "content": f"content {i}",
+        "tags": tags,
+        "timestamp": f"2025-01-01T00:00:{i:02d}",
+        "project_id": "test-project",
+    }
+
+
+class TestMemoryDBBatch(unittest.TestCase):
+    """Test cases for write_memories and tag filtering."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.original_path = memory_db.db_path
+        memory_db.close()
+        memory_db.db_path = os.path.join(self.tmp_dir.name, "memory.db")
+        memory_db._init_db()
+
+    def tearDown(self):
+        memory_db.close()
+        memory_db.db_path = self.original_path
+        self.tmp_dir.cleanup()
+
+    def test_write_memories_and_filter_by_tag(self):
+        batch = [_memory(i, ["even" if i % 2 == 0 else "odd", "batch"]) for i in range(10)]
+        memory_db.write_memories(batch)
+
+        self.assertEqual(len(memory_db.read_memories(limit=100)), 10)
+        even = memory_db.read_memories(tag="even")
+        self.assertEqual(sorted(m["memory_id"] for m in even), [f"mem-{i}" for i in range(0, 10, 2)])
+        self.assertEqual(len(memory_db.read_memories(tag="batch", agent_id="test-agent", limit=3)), 3)
+
+    def test_replace_and_delete_keep_tag_index_in_sync(self):
+        memory_db.write_memories([_memory(1, ["old"])])
+        memory_db.write_memories([_memory(1, ["new"])])
+
+        self.assertEqual(memory_db.read_memories(tag="old"), [])
+        self.assertEqual(len(memory_db.read_memories(tag="new")), 1)
+
+        memory_db.delete_memory("mem-1")
+        conn = memory_db._get_connection()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM memory_tags").fetchone()[0], 0)
+
+    def test_empty_batch(self):
+        self.assertEqual(memory_db.write_memories([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Tests for FTS5-backed keyword memory recall.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.memory_db import memory_db, to_fts_query
+from app.modules.memory_recall import recall_memory
+
+
+def _memory(memory_id, content, agent_id="SAGE", timestamp="2025-04-24T20:00:00Z", tags=None):
+    return {
+        "memory_id": memory_id,
+        "agent_id": agent_id,
+        "memory_type": "analysis",
+        "content": content,
+        "tags": tags or [],
+        "timestamp": timestamp,
+        "memory_trace_id": "loop_12345",
+    }
+
+
+class TestMemoryFTSRecall(unittest.TestCase):
+    """Test cases for search_memories and recall_memory(method="keyword")."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.original_path = memory_db.db_path
+        memory_db.close()
+        memory_db.db_path = os.path.join(self.tmp_dir.name, "memory.db")
+        memory_db._init_db()
+        memory_db.write_memories([
+            _memory("m1", "Optimize the sorting algorithm", timestamp="2025-04-24T20:01:00Z"),
+            _memory("m2", "Performance improved by thirty percent", timestamp="2025-04-24T20:02:00Z"),
+            _memory("m3", "Optimization opportunities in the sorting code", agent_id="CRITIC",
+                    timestamp="2025-04-24T20:03:00Z", tags=["review_completed"]),
+            _memory("m4", "algorithm sorting the optimize", timestamp="2025-04-24T20:04:00Z"),
+        ])
+
+    def tearDown(self):
+        memory_db.close()
+        memory_db.db_path = self.original_path
+        self.tmp_dir.cleanup()
+
+    def _ids(self, result):
+        return [m["memory_id"] for m in result["results"]]
+
+    def test_to_fts_query(self):
+        self.assertEqual(to_fts_query('optim* "sorting algorithm"'), '"optim"* "sorting algorithm"')
+        self.assertEqual(to_fts_query('NEAR( AND'), '"NEAR(" "AND"')
+        self.assertEqual(to_fts_query("   "), "")
+
+    def test_prefix_and_phrase_queries(self):
+        prefix = memory_db.search_memories("optim*", sort_order="oldest_first")
+        self.assertEqual(self._ids(prefix), ["m1", "m3", "m4"])
+
+        phrase = memory_db.search_memories('"sorting algorithm"')
+        self.assertEqual(self._ids(phrase), ["m1"])
+
+    def test_filters_and_tags_are_searchable(self):
+        self.assertEqual(self._ids(memory_db.search_memories("sorting", agent_id="critic")), ["m3"])
+        self.assertEqual(self._ids(memory_db.search_memories("review_completed")), ["m3"])
+
+    def test_replace_keeps_index_in_sync(self):
+        memory_db.write_memories([_memory("m1", "Completely different text")])
+        self.assertNotIn("m1", self._ids(memory_db.search_memories("sorting")))
+        self.assertEqual(self._ids(memory_db.search_memories("different")), ["m1"])
+
+    def test_recall_memory_keyword_pagination(self):
+        first = recall_memory({"method": "keyword", "query": "sorting", "limit": 2, "offset": 0})
+        second = recall_memory({"method": "keyword", "query": "sorting", "limit": 2, "offset": 2})
+
+        self.assertEqual(first["total_results"], 3)
+        self.assertEqual(first["returned_results"], 2)
+        self.assertEqual(self._ids(first), ["m4", "m3"])
+        self.assertEqual(self._ids(second), ["m1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,6 +13,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.core.confidence_retry import ConfidenceRetryManager, get_confidence_retry_manager
 from app.core.nudge_manager import NudgeManager, get_nudge_manager
 from app.core.task_persistence import TaskPersistenceManager, get_task_persistence_manager, PendingTask
+from app.core.task_store import TaskStore
 
 class TestConfidenceRetryManager(unittest.TestCase):
     """Test the confidence retry manager"""
@@ -264,20 +265,21 @@ class TestNudgeManager(unittest.TestCase):
             self.assertEqual(log_data["nudge_message"], "I need more information")
             self.assertEqual(log_data["nudge_reason"], "needs_information")
 
-class TestTaskPersistenceManager(unittest.TestCase):
+class TestTaskPersistenceManager(unittest.IsolatedAsyncioTestCase):
     """Test the task persistence manager"""
     
     def setUp(self):
         """Set up the test"""
-        self.task_manager = TaskPersistenceManager()
-        
-        # Create a temporary directory for pending tasks
+        # Keep tasks in an in-memory store, and import no legacy task files
         self.temp_dir = f"/tmp/pending_tasks_{uuid.uuid4()}"
         os.makedirs(self.temp_dir, exist_ok=True)
-        self.task_manager.tasks_dir = self.temp_dir
+        self.store = TaskStore(None)
+        self.task_manager = TaskPersistenceManager(store=self.store, tasks_dir=self.temp_dir)
     
     def tearDown(self):
         """Clean up after the test"""
+        self.store.close()
+        
         # Remove the temporary directory
         import shutil
         shutil.rmtree(self.temp_dir)
@@ -295,33 +297,31 @@ class TestTaskPersistenceManager(unittest.TestCase):
             original_output="Here's a basic FastAPI app"
         )
         
-        # Check that the task file was created
-        task_file = os.path.join(self.temp_dir, f"{task_id}.json")
-        self.assertTrue(os.path.exists(task_file))
-        
-        # Check the task file content
-        with open(task_file, "r") as f:
-            task_data = json.load(f)
-            self.assertEqual(task_data["task_description"], "Deploy the FastAPI app")
-            self.assertEqual(task_data["origin_agent"], "builder")
-            self.assertEqual(task_data["suggested_agent"], "ops")
-            self.assertTrue(task_data["priority"])
-            self.assertEqual(task_data["metadata"]["task_category"], "deployment")
-            self.assertEqual(task_data["original_input"], "Create and deploy a FastAPI app")
-            self.assertEqual(task_data["original_output"], "Here's a basic FastAPI app")
-            self.assertEqual(task_data["status"], "pending")
+        # Check that the task is in the store, and no task file was written
+        self.assertEqual(os.listdir(self.temp_dir), [])
+        task_data = self.store.get(task_id)
+        self.assertIsNotNone(task_data)
+        self.assertEqual(task_data["task_description"], "Deploy the FastAPI app")
+        self.assertEqual(task_data["origin_agent"], "builder")
+        self.assertEqual(task_data["suggested_agent"], "ops")
+        self.assertTrue(task_data["priority"])
+        self.assertEqual(task_data["metadata"]["task_category"], "deployment")
+        self.assertEqual(task_data["original_input"], "Create and deploy a FastAPI app")
+        self.assertEqual(task_data["original_output"], "Here's a basic FastAPI app")
+        self.assertEqual(task_data["status"], "pending")
+        self.assertEqual([task["task_id"] for task in self.store.list()], [task_id])
     
     async def test_get_pending_tasks(self):
         """Test getting pending tasks"""
         # Store some pending tasks
-        task_id1 = await self.task_manager.store_pending_task(
+        await self.task_manager.store_pending_task(
             task_description="Deploy the FastAPI app",
             origin_agent="builder",
             suggested_agent="ops",
             priority=True
         )
         
-        task_id2 = await self.task_manager.store_pending_task(
+        await self.task_manager.store_pending_task(
             task_description="Document the API",
             origin_agent="builder",
             suggested_agent="research",
@@ -331,6 +331,7 @@ class TestTaskPersistenceManager(unittest.TestCase):
         # Get all pending tasks
         tasks = await self.task_manager.get_pending_tasks()
         self.assertEqual(len(tasks), 2)
+        self.assertEqual(len(self.store.list()), 2)
         
         # Get tasks by origin agent
         builder_tasks = await self.task_manager.get_pending_tasks(origin_agent="builder")
@@ -390,10 +391,12 @@ class TestTaskPersistenceManager(unittest.TestCase):
         self.assertEqual(updated_task.status, "executed")
         self.assertIn("execution_timestamp", updated_task.metadata)
         
-        # Get the task again to verify persistence
-        task = await self.task_manager.get_task(task_id)
-        self.assertEqual(task.status, "executed")
-        self.assertIn("execution_timestamp", task.metadata)
+        # Check that the store has the update, and no longer lists the task as pending
+        task_data = self.store.get(task_id)
+        self.assertEqual(task_data["status"], "executed")
+        self.assertIn("execution_timestamp", task_data["metadata"])
+        self.assertEqual(self.store.list(), [])
+        self.assertEqual([task["task_id"] for task in self.store.list(status="executed")], [task_id])
 
 def run_tests():
     """Run the tests"""
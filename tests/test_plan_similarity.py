@@ -0,0 +1,94 @@
+"""
+Unit tests for MinHash/LSH plan similarity and rejected plan lookup.
+"""
+
+import random
+import unittest
+
+from memory.plan_hash import find_similar_plans, generate_plan_hash
+from memory.plan_similarity import (
+    PlanSimilarityIndex, get_rejected_plan_index, jaccard, plan_shingles
+)
+
+
+def _plan(goal, steps):
+    return {"goal": goal, "steps": [{"description": step} for step in steps]}
+
+
+class TestPlanSimilarityIndex(unittest.TestCase):
+    """Test cases for shingling, LSH candidates and exact re-ranking."""
+
+    def setUp(self):
+        rng = random.Random(7)
+        words = [f"word{i}" for i in range(500)]
+        self.shingle_sets = [
+            plan_shingles(_plan(" ".join(rng.sample(words, 6)), [" ".join(rng.sample(words, 5)) for _ in range(4)]))
+            for _ in range(300)
+        ]
+        self.index = PlanSimilarityIndex()
+        for key, shingles in enumerate(self.shingle_sets):
+            self.index.add(key, shingles)
+
+    def test_shingles_stay_within_fields(self):
+        shingles = plan_shingles(_plan("Build API", ["Write tests", "Deploy"]))
+        self.assertEqual(shingles, {"build api", "write tests", "deploy"})
+        self.assertNotIn("api write", shingles)
+
+    def test_near_duplicates_are_found(self):
+        for key in (0, 150, 299):
+            query = set(self.shingle_sets[key])
+            query.discard(sorted(query)[0])
+            query.add("brand new")
+
+            results = self.index.query(query, threshold=0.8)
+
+            self.assertEqual(results[0][0], key)
+            self.assertEqual(results[0][1], jaccard(query, self.shingle_sets[key]))
+            self.assertEqual(len(results), 1)
+
+    def test_unrelated_plans_are_not_candidates(self):
+        results = self.index.query(plan_shingles(_plan("something else entirely", ["no overlap at all"])))
+        self.assertEqual(results, [])
+
+    def test_duplicate_key_is_rejected(self):
+        with self.assertRaises(KeyError):
+            self.index.add(0, {"a b"})
+
+
+class TestRejectedPlanIndex(unittest.TestCase):
+    """Test cases for incremental indexing of a memory's rejected_plans."""
+
+    def test_incremental_insert_and_legacy_hashes(self):
+        auth = _plan("Create a user authentication system",
+                     ["Set up database schema", "Implement password hashing", "Build login endpoints"])
+        retry = _plan("Create a user authentication system",
+                      ["Set up database schema", "Implement password hashing", "Build login endpoints",
+                       "Add password reset"])
+        # Entry stored before shingles were recorded: exact hash match only
+        memory = {"rejected_plans": [{"loop_id": "loop_1", "hash": generate_plan_hash(retry)}]}
+
+        self.assertEqual([m["plan"]["loop_id"] for m in find_similar_plans(auth, memory, 0.7)], [])
+
+        index = get_rejected_plan_index(memory["rejected_plans"])
+        memory["rejected_plans"].append(
+            {"loop_id": "loop_2", "hash": generate_plan_hash(auth), "shingles": sorted(plan_shingles(auth))}
+        )
+
+        matches = find_similar_plans(retry, memory, 0.7)
+
+        self.assertIs(get_rejected_plan_index(memory["rejected_plans"]), index)
+        self.assertEqual([m["plan"]["loop_id"] for m in matches], ["loop_1", "loop_2"])
+        self.assertEqual(matches[0]["similarity_score"], 1.0)
+        self.assertGreater(matches[1]["similarity_score"], 0.7)
+
+    def test_replaced_list_gets_fresh_index(self):
+        plans = [{"loop_id": "a", "hash": "h1"}]
+        index = get_rejected_plan_index(plans)
+        plans[0] = {"loop_id": "b", "hash": "h2"}
+
+        self.assertIsNot(get_rejected_plan_index(plans), index)
+        self.assertEqual(find_similar_plans("h2", {"rejected_plans": plans})[0]["plan"]["loop_id"], "b")
+
+
+if __name__ == "__main__":
+    unittest.main()
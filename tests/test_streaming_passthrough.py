@@ -0,0 +1,113 @@
+"""
+Unit tests for token passthrough in the /delegate-stream route.
+"""
+
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from starlette.requests import Request
+
+from app.api import streaming_route
+
+
+class FakeProvider:
+    """Provider that yields deltas on demand and records whether it was closed."""
+
+    def __init__(self, tokens, first_token_delay=0.0):
+        self.tokens = tokens
+        self.first_token_delay = first_token_delay
+        self.pulled = 0
+        self.closed = False
+
+    async def stream_with_prompt_chain(self, prompt_chain, user_input, context=None):
+        try:
+            await asyncio.sleep(self.first_token_delay)
+            for token in self.tokens:
+                self.pulled += 1
+                yield {"type": "delta", "content": token}
+            yield {
+                "type": "done",
+                "content": "".join(self.tokens),
+                "usage": {"total_tokens": len(self.tokens)},
+                "time_to_first_token": self.first_token_delay,
+                "total_time": self.first_token_delay,
+            }
+        finally:
+            self.closed = True
+
+
+def _request(body, query=b""):
+    scope = {"type": "http", "method": "POST", "path": "/delegate-stream", "headers": [], "query_string": query}
+    request = Request(scope)
+    request.state.body = body
+    return request
+
+
+class TestStreamingPassthrough(unittest.TestCase):
+    """Test cases for delta frames, SSE framing and disconnect handling."""
+
+    def setUp(self):
+        agent = SimpleNamespace(name="HAL", description="Careful.", tone="calm")
+        for target, value in (("get_agent", lambda agent_id: agent), ("openai_provider", None)):
+            patcher = mock.patch.object(streaming_route, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.body = {"agent_id": "hal", "task": {"input": "hello"}}
+
+    def _collect(self, request, sse=False):
+        async def collect():
+            return [chunk async for chunk in streaming_route.stream_response(request, sse)]
+        return asyncio.run(collect())
+
+    def test_deltas_are_forwarded_before_final_frame(self):
+        provider = FakeProvider(["Hel", "lo", "!"])
+        with mock.patch.object(streaming_route, "openai_provider", provider):
+            frames = [json.loads(line) for line in self._collect(_request(self.body))]
+
+        deltas = [f["content"] for f in frames if f["status"] == "delta"]
+        self.assertEqual(deltas, ["Hel", "lo", "!"])
+        final = frames[-1]
+        self.assertEqual(final["message"], "Hello!")
+        self.assertEqual(final["usage"], {"total_tokens": 3})
+        self.assertIn("time_to_first_token", final["processing"])
+        self.assertLessEqual(final["processing"]["time_to_first_token"], final["processing"]["total_time"])
+
+    def test_sse_framing(self):
+        request = _request(self.body, b"format=sse")
+        self.assertTrue(streaming_route.wants_sse(request))
+
+        with mock.patch.object(streaming_route, "openai_provider", FakeProvider(["a"])):
+            chunks = self._collect(request, sse=True)
+
+        for chunk in chunks:
+            self.assertTrue(chunk.startswith(b"data: "))
+            self.assertTrue(chunk.endswith(b"\n\n"))
+        self.assertEqual(json.loads(chunks[0][6:])["metadata"]["stream_type"], "sse")
+
+    def test_closing_the_stream_aborts_the_provider(self):
+        provider = FakeProvider([str(i) for i in range(100)])
+
+        async def read_two_deltas():
+            stream = streaming_route.stream_response(_request(self.body))
+            deltas = 0
+            async for chunk in stream:
+                if json.loads(chunk)["status"] == "delta":
+                    deltas += 1
+                    if deltas == 2:
+                        break
+            # What Starlette does when the client goes away
+            await stream.aclose()
+
+        with mock.patch.object(streaming_route, "openai_provider", provider):
+            asyncio.run(read_two_deltas())
+
+        self.assertTrue(provider.closed)
+        # Backpressure: the provider is not read ahead of the client
+        self.assertEqual(provider.pulled, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()